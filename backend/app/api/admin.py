@@ -0,0 +1,135 @@
+"""
+Admin Endpoints - Diagnose eines laufenden Workers (nur mit ADMIN_TOKEN)
+Hinter dem Shard Router mit `?shard=n` einen Worker wählen
+"""
+import asyncio
+import secrets
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException
+from fastapi.responses import PlainTextResponse
+from ..core.config import settings
+from ..services.memory_accounting import memory_accounting
+from ..services.profiler import profiler, to_collapsed, top_functions
+from ..services.tracing import tracer
+
+
+async def require_admin(x_admin_token: Optional[str] = Header(default=None)):
+    """
+    Header X-Admin-Token muss ADMIN_TOKEN entsprechen (leer = Endpoints aus)
+    """
+    if not settings.admin_token:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if not x_admin_token or not secrets.compare_digest(x_admin_token, settings.admin_token):
+        raise HTTPException(status_code=403, detail="Ungültiger Admin-Token")
+
+
+router = APIRouter(prefix="/admin", tags=["Admin"], dependencies=[Depends(require_admin)])
+
+
+def _profile_response(result: dict, format: str):
+    if format == "collapsed":
+        # Direkt in flamegraph.pl / speedscope
+        return PlainTextResponse(to_collapsed(result["stacks"]), headers={
+            "X-Profile-Mode": result["mode"], "X-Profile-Unit": result["unit"]
+        })
+    return {**result, "top": top_functions(result["stacks"])}
+
+
+@router.post("/profile")
+async def profile_worker(duration_s: float = 10.0, interval_ms: Optional[float] = None,
+                         all_threads: bool = False, format: str = "collapsed"):
+    """
+    Worker `duration_s` Sekunden abtasten (Sampling, Event-Loop-Thread)
+    format: collapsed (Text, eine Zeile pro Stack) | json (inkl. Top-Funktionen)
+    """
+    if format not in ("collapsed", "json"):
+        raise HTTPException(status_code=400, detail="format muss 'collapsed' oder 'json' sein")
+    if profiler.busy:
+        raise HTTPException(status_code=409, detail="Es läuft bereits ein Profil")
+    try:
+        result = await profiler.sample(duration_s, interval_ms or settings.profiler_interval_ms, all_threads)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return _profile_response(result, format)
+
+
+@router.post("/profile/next")
+async def profile_next(kind: str, match: str, timeout_s: float = 30.0, format: str = "collapsed"):
+    """
+    Nächsten passenden Request (kind=request, match=Pfad-Präfix) oder
+    Socket.IO-Event (kind=event, match=Event-Name) mitschneiden (Gewicht in µs)
+    """
+    if format not in ("collapsed", "json"):
+        raise HTTPException(status_code=400, detail="format muss 'collapsed' oder 'json' sein")
+    if profiler.busy:
+        raise HTTPException(status_code=409, detail="Es läuft bereits ein Profil")
+    try:
+        result = await profiler.capture_next(kind, match, timeout_s)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except asyncio.TimeoutError:
+        raise HTTPException(status_code=408, detail=f"Kein passender {kind} in {timeout_s}s")
+    return _profile_response(result, format)
+
+
+@router.get("/profile/status")
+async def profile_status():
+    """
+    Läuft gerade ein Profil? Zähler bisheriger Profile
+    """
+    return profiler.snapshot()
+
+
+@router.get("/traces")
+async def list_traces(limit: int = 20, min_duration_ms: float = 0.0, name: Optional[str] = None):
+    """
+    Neueste Traces (Wurzel-Span & Anzahl Spans), optional nur langsame / nach Name
+    """
+    return {"tracing": tracer.snapshot(), "traces": tracer.traces(limit, min_duration_ms, name)}
+
+
+@router.get("/traces/{trace_id}")
+async def get_trace(trace_id: str):
+    """
+    Alle Spans eines Traces (nach Start sortiert, mit Tiefe)
+    """
+    spans = tracer.trace(trace_id)
+    if not spans:
+        raise HTTPException(status_code=404, detail="Trace nicht (mehr) im Buffer")
+    return {"trace_id": trace_id, "spans": spans}
+
+
+@router.post("/traces/sampling")
+async def set_trace_sampling(rate: float):
+    """
+    Sampling-Rate zur Laufzeit ändern (0 = aus, 1 = jeder Request/Event)
+    """
+    if not 0.0 <= rate <= 1.0:
+        raise HTTPException(status_code=400, detail="rate muss zwischen 0 und 1 liegen")
+    tracer.sample_rate = rate
+    return tracer.snapshot()
+
+
+@router.get("/memory")
+async def memory_report(top: int = 20):
+    """
+    Geschätzter Speicher: Summen (gesamt & nach Status), Bytes pro Track/Spieler/Karte/Client,
+    die `top` größten Sessions (Deck, Spieler, Timelines, Sockets)
+    Letzter Report des Hintergrund-Tasks (`age_s`), höchstens 100 Sessions
+    """
+    return await memory_accounting.current(top)
+
+
+@router.get("/memory/capacity")
+async def memory_capacity(playlist_size: int, players: int = 4, budget_mb: Optional[float] = None,
+                          cards: Optional[int] = None):
+    """
+    Wie viele Sessions mit `playlist_size` Tracks & `players` Spielern passen in `budget_mb`
+    (Standard MEMORY_BUDGET_MB)?
+    """
+    try:
+        return memory_accounting.capacity(playlist_size, players, budget_mb, cards,
+                                          report=await memory_accounting.current(0))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
@@ -1,20 +1,25 @@
 """
 Spotify Authentication Endpoints
+Nur der Host (Header X-Host-Token) bindet einen Spotify Login an seine Session
 """
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query
+from starlette.concurrency import run_in_threadpool
+from typing import Optional
+from ..core.host_auth import owner_from_state, require_host
 from ..services.spotify_service import spotify_service
 
 router = APIRouter(prefix="/auth", tags=["Authentication"])
 
 
 @router.get("/login")
-async def spotify_login():
+async def spotify_login(owner: str = Depends(require_host)):
     """
     Starte Spotify OAuth Flow
+    `owner`: Session ID des Hosts (eigener Spotify Client pro Session)
     Returns: Authorization URL
     """
     try:
-        auth_url = spotify_service.get_auth_url()
+        auth_url = spotify_service.get_auth_url(owner)
         return {
             "auth_url": auth_url,
             "message": "Öffne diese URL im Browser zum Login"
@@ -24,15 +29,19 @@ async def spotify_login():
 
 
 @router.get("/callback")
-async def spotify_callback(code: str = Query(...)):
+async def spotify_callback(code: str = Query(...), state: Optional[str] = None):
     """
     Spotify OAuth Callback
-    Wird von Spotify nach erfolgreichem Login aufgerufen
+    Wird von Spotify nach erfolgreichem Login aufgerufen (`state` = signierter Owner)
     """
+    owner = owner_from_state(state)
+    if owner is None:
+        raise HTTPException(status_code=400, detail="Auth Error: ungültiger state")
     try:
-        token_info = spotify_service.authenticate_with_code(code)
+        token_info = await run_in_threadpool(spotify_service.authenticate_with_code, code, owner)
         return {
             "message": "Login erfolgreich!",
+            "owner": owner,
             "access_token": token_info['access_token'],
             "expires_in": token_info['expires_in']
         }
@@ -41,12 +50,12 @@ async def spotify_callback(code: str = Query(...)):
 
 
 @router.post("/set-token")
-async def set_user_token(access_token: str):
+async def set_user_token(access_token: str, owner: str = Depends(require_host)):
     """
-    Setze User Access Token manuell
+    Setze User Access Token manuell (nur für die eigene Session)
     """
     try:
-        spotify_service.set_user_token(access_token)
+        spotify_service.set_user_token(access_token, owner)
         return {"message": "Token gesetzt"}
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
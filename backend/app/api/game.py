@@ -3,18 +3,27 @@ Game Endpoints - Session, Players, Gameplay
 """
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
+from starlette.concurrency import run_in_threadpool
 from typing import List, Dict, Optional
+from ..core.config import settings
+from ..core.host_auth import host_token
 from ..services.game_service import game_service
-from ..services.websocket_service import broadcast_to_session
+from ..services.search_index import KINDS, track_search
+from ..services.websocket_service import broadcast_to_session, push_new_track, spectator_hub
+from ..services.turn_scheduler import turn_scheduler
+from ..services.playlist_loader import playlist_loader
+from ..services.handoff import handoff
 from ..models.game import (
     GameSession, 
+    CreateSessionResponse,
     Player, 
     GuessRequest, 
     GuessResult,
     PlacementRequest,
     PlacementResult,
     TimelineCard,
-    GameMode
+    GameMode,
+    DeckOrder
 )
 
 router = APIRouter(prefix="/game", tags=["Game"])
@@ -24,6 +33,7 @@ class CreateSessionRequest(BaseModel):
     host_name: str
     playlist_id: Optional[str] = None
     game_mode: Optional[GameMode] = GameMode.ORIGINAL
+    turn_time_limit: Optional[int] = None  # Sekunden pro Zug (0 = kein Limit)
 
 
 class AddPlayerRequest(BaseModel):
@@ -33,30 +43,42 @@ class AddPlayerRequest(BaseModel):
 
 class LoadPlaylistRequest(BaseModel):
     session_id: str
-    playlist_id: str
+    playlist_id: Optional[str] = None
+    playlist_ids: List[str] = []  # Weitere Playlists, zu einem Deck ohne Duplikate kombiniert
+    streaming: Optional[bool] = None  # None = settings.playlist_streaming
+    deck_order: DeckOrder = DeckOrder.SHUFFLE  # balanced / skip_bad_years nutzen die Track-Statistik
+    
+    def all_playlist_ids(self) -> List[str]:
+        """playlist_id + playlist_ids, doppelte IDs entfernt (Reihenfolge bleibt)"""
+        ids = [self.playlist_id] if self.playlist_id else []
+        return list(dict.fromkeys(ids + self.playlist_ids))
 
 
 class NextTrackRequest(BaseModel):
     session_id: str
 
 
-@router.post("/session/create", response_model=GameSession)
+@router.post("/session/create", response_model=CreateSessionResponse)
 async def create_session(request: CreateSessionRequest):
     """
     Erstelle neue Game Session
     """
+    if handoff.draining:
+        raise HTTPException(status_code=503, detail="Server startet neu - bitte gleich nochmal versuchen")
     try:
         session = game_service.create_session(
             host_name=request.host_name,
             playlist_id=request.playlist_id,
-            game_mode=request.game_mode or GameMode.ORIGINAL
+            game_mode=request.game_mode or GameMode.ORIGINAL,
+            turn_time_limit=request.turn_time_limit
         )
         
         # Hole den Host-Spieler
         host_player = game_service.players.get(session.session_id, [])[0] if game_service.players.get(session.session_id) else None
         
-        # Füge host_player_id zur Response hinzu
+        # Füge host_player_id & host_token zur Response hinzu
         response = session.model_dump()
+        response['host_token'] = host_token(session.session_id)
         if host_player:
             response['host_player_id'] = host_player.player_id
         
@@ -93,16 +115,36 @@ async def add_player(request: AddPlayerRequest):
 @router.post("/session/playlist/load")
 async def load_playlist(request: LoadPlaylistRequest):
     """
-    Lade Playlist in Session
+    Lade Playlist(s) in Session
+    Mehrere Playlists werden parallel geladen und ohne Duplikate zu einem Deck kombiniert
+    Streaming: erste Page sofort, Rest im Hintergrund (Event `playlist_loaded`)
     """
+    playlist_ids = request.all_playlist_ids()
+    if not playlist_ids:
+        raise HTTPException(status_code=400, detail="playlist_id oder playlist_ids erforderlich")
+    if len(playlist_ids) > settings.max_playlists_per_deck:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Maximal {settings.max_playlists_per_deck} Playlists pro Deck"
+        )
+    
+    streaming = settings.playlist_streaming if request.streaming is None else request.streaming
     try:
-        track_count = game_service.load_playlist(
-            session_id=request.session_id,
-            playlist_id=request.playlist_id
+        if streaming:
+            result = await playlist_loader.load(request.session_id, playlist_ids, request.deck_order)
+            return {"message": "Playlist geladen", **result}
+        
+        # Spotify-Requests blockieren (Scheduler) - nicht im Event-Loop, das Deck aber schon
+        tracks = await run_in_threadpool(
+            game_service.fetch_playlist_tracks, request.session_id, playlist_ids
+        )
+        track_count = game_service.set_playlist_deck(
+            request.session_id, playlist_ids, tracks, request.deck_order
         )
         return {
             "message": "Playlist geladen",
-            "track_count": track_count
+            "track_count": track_count,
+            "skipped": game_service.deck_builders[request.session_id].rejected
         }
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
@@ -117,6 +159,19 @@ async def start_game(session_id: str):
     """
     try:
         result = game_service.start_game(session_id)
+        
+        # WebSocket: Ersten Track + nächste Handles direkt pushen (kein zweiter Roundtrip)
+        await push_new_track(
+            session_id,
+            track=result['current_track'],
+            track_number=result['current_track_index'] + 1,
+            total_tracks=result['total_tracks'],
+            upcoming=result['upcoming']
+        )
+        
+        # Zug-Timer starten
+        await turn_scheduler.announce_turn(session_id, reason="start")
+        
         return result
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
@@ -145,6 +200,7 @@ async def submit_guess(guess: GuessRequest):
     """
     try:
         result = game_service.check_guess(guess)
+        spectator_hub.mark_dirty(guess.session_id)
         return result
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
@@ -158,7 +214,15 @@ async def next_track(request: NextTrackRequest):
     Gehe zum nächsten Track
     """
     try:
+        previous_player = game_service.sessions[request.session_id].current_player_turn \
+            if request.session_id in game_service.sessions else None
         result = game_service.next_track(request.session_id)
+        
+        # WebSocket: Track + nächste Handles pushen, Zug weitergeben
+        await turn_scheduler.push_next_track_result(
+            request.session_id, result, reason="next", previous_player=previous_player
+        )
+        
         return result
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
@@ -178,6 +242,33 @@ async def get_leaderboard(session_id: str) -> List[Dict]:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get("/deck/stats/{session_id}")
+async def get_deck_stats(session_id: str) -> Dict:
+    """
+    Jahres-Statistik des Decks: Histogramm, Spannweite, Dichte gleicher Jahre
+    Zeigt dem Host, wie schwer die Playlist ist
+    """
+    try:
+        return game_service.get_deck_stats(session_id)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/autocomplete")
+async def autocomplete(q: str, session_id: Optional[str] = None, kind: Optional[str] = None,
+                       limit: int = settings.autocomplete_max_results) -> List[Dict]:
+    """
+    Vorschläge für Titel/Künstler aus dem Deck der Session & dem Katalog
+    Lokaler Index - kein Spotify Request pro Tastendruck
+    """
+    if kind is not None and kind not in KINDS:
+        raise HTTPException(status_code=400, detail=f"kind muss einer von {', '.join(KINDS)} sein")
+    limit = max(1, min(limit, settings.autocomplete_max_results))
+    return track_search.search(q, session_id=session_id, kind=kind, limit=limit)
+
+
 # =====================================================
 # TIMELINE-ENDPOINTS (HITSTER Original)
 # =====================================================
@@ -200,6 +291,7 @@ async def place_card(placement: PlacementRequest):
         })
         
         if result.won_game:
+            turn_scheduler.cancel(placement.session_id)
             await broadcast_to_session(placement.session_id, 'game_won', {
                 'player_id': placement.player_id,
                 'final_score': result.new_score
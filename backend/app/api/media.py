@@ -0,0 +1,64 @@
+"""
+Media Endpoints - Preview-Audio für Gäste ohne Spotify Premium
+"""
+from fastapi import APIRouter, HTTPException, Request
+from starlette.concurrency import run_in_threadpool
+from typing import Optional
+import requests
+from ..core.config import settings
+from ..core.range_response import RangeFileResponse
+from ..services.game_service import game_service
+from ..services.preview_cache import MEDIA_TYPE, preview_cache, valid_track_id
+from ..services.spotify_scheduler import SpotifyBusyError
+from ..services.spotify_service import spotify_service
+
+router = APIRouter(prefix="/media", tags=["Media"])
+
+
+async def _preview_url(track_id: str, session_id: Optional[str]) -> Optional[str]:
+    """
+    preview_url aus dem Deck der Session, sonst von Spotify
+    Spotify nur mit Client Credentials: `session_id` kennt jeder Mitspieler,
+    der User-Token des Hosts braucht X-Host-Token (siehe /playlist)
+    """
+    if session_id:
+        track = game_service.find_track(session_id, track_id)
+        if track is not None:
+            return track.preview_url
+    track = await run_in_threadpool(spotify_service.get_track_info, track_id, None)
+    return track.preview_url
+
+
+@router.api_route("/preview/{track_id}", methods=["GET", "HEAD"])
+async def get_preview(track_id: str, request: Request, session_id: Optional[str] = None):
+    """
+    30s-Vorschau eines Tracks (audio/mpeg, Range-Requests zum Spulen)
+    Clips kommen aus dem Disk-Cache; beim ersten Abruf einmalig vom Spotify CDN
+    """
+    if not valid_track_id(track_id):
+        raise HTTPException(status_code=400, detail="Ungültige Track ID")
+
+    handle = preview_cache.open(track_id)
+    if handle is None:
+        try:
+            url = await _preview_url(track_id, session_id)
+        except SpotifyBusyError as e:
+            raise HTTPException(status_code=503, detail=str(e))
+        except Exception as e:
+            raise HTTPException(status_code=404, detail=f"Track nicht gefunden: {str(e)}")
+        if not url:
+            raise HTTPException(status_code=404, detail="Keine Vorschau für diesen Track")
+
+        try:
+            handle = await run_in_threadpool(preview_cache.fetch, track_id, url)
+        except (requests.RequestException, ValueError) as e:
+            raise HTTPException(status_code=502, detail=f"Vorschau nicht ladbar: {str(e)}")
+
+    return RangeFileResponse(
+        handle,
+        media_type=MEDIA_TYPE,
+        range_header=request.headers.get("range"),
+        if_none_match=request.headers.get("if-none-match"),
+        send_body=request.method != "HEAD",
+        max_age=settings.preview_max_age_s
+    )
@@ -1,8 +1,12 @@
 """
 Spotify Playlist Endpoints
+Mit `owner` (Header X-Host-Token) über den Spotify Client des Hosts, sonst Client Credentials
 """
-from fastapi import APIRouter, HTTPException
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException
+from starlette.concurrency import run_in_threadpool
+from typing import List, Optional
+from ..core.host_auth import optional_host
+from ..services.spotify_scheduler import Priority, SpotifyBusyError
 from ..services.spotify_service import spotify_service
 from ..models.game import PlaylistInfo, SpotifyTrack
 
@@ -10,36 +14,44 @@ router = APIRouter(prefix="/playlist", tags=["Playlist"])
 
 
 @router.get("/{playlist_id}", response_model=PlaylistInfo)
-async def get_playlist(playlist_id: str):
+async def get_playlist(playlist_id: str, owner: Optional[str] = Depends(optional_host)):
     """
     Hole Playlist Informationen & Tracks
     """
     try:
-        playlist_info = spotify_service.get_playlist_tracks(playlist_id)
+        playlist_info = await run_in_threadpool(
+            spotify_service.get_playlist_tracks, playlist_id, Priority.DISCOVERY, owner
+        )
         return playlist_info
+    except SpotifyBusyError as e:
+        raise HTTPException(status_code=503, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=404, detail=f"Playlist nicht gefunden: {str(e)}")
 
 
 @router.get("/track/{track_id}", response_model=SpotifyTrack)
-async def get_track(track_id: str):
+async def get_track(track_id: str, owner: Optional[str] = Depends(optional_host)):
     """
     Hole einzelnen Track
     """
     try:
-        track = spotify_service.get_track_info(track_id)
+        track = await run_in_threadpool(spotify_service.get_track_info, track_id, owner)
         return track
+    except SpotifyBusyError as e:
+        raise HTTPException(status_code=503, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=404, detail=f"Track nicht gefunden: {str(e)}")
 
 
 @router.get("/search/tracks", response_model=List[SpotifyTrack])
-async def search_tracks(query: str, limit: int = 20):
+async def search_tracks(query: str, limit: int = 20, owner: Optional[str] = Depends(optional_host)):
     """
     Suche nach Tracks
     """
     try:
-        tracks = spotify_service.search_tracks(query, limit)
+        tracks = await run_in_threadpool(spotify_service.search_tracks, query, limit, owner)
         return tracks
+    except SpotifyBusyError as e:
+        raise HTTPException(status_code=503, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Search Error: {str(e)}")
@@ -0,0 +1,71 @@
+"""
+Admission Control Middleware
+Verzögert oder verwirft unwichtige Requests, wenn die Event-Loop überlastet ist
+"""
+import asyncio
+import json
+from typing import Dict
+from .config import settings
+
+
+# Zähler für /metrics
+admission_stats: Dict[str, int] = {"deferred": 0, "shed": 0}
+
+
+class AdmissionControlMiddleware:
+    """
+    ASGI Middleware (nur HTTP)
+    
+    - Lag unter `loop_lag_defer_ms`: alles normal
+    - Lag über `loop_lag_defer_ms`: Requests auf `low_priority_paths` warten
+      (max. `loop_lag_max_defer_ms`), bis sich die Loop erholt
+    - Lag über `loop_lag_shed_ms`: diese Requests bekommen sofort 503
+    
+    Spielzüge (Platzieren, Raten, nächster Track) sind nie betroffen.
+    """
+    
+    DEFER_STEP = 0.05  # Sekunden zwischen zwei Prüfungen
+    
+    def __init__(self, app, monitor):
+        self.app = app
+        self.monitor = monitor
+    
+    def _is_low_priority(self, path: str) -> bool:
+        return any(path.startswith(prefix) for prefix in settings.low_priority_prefixes)
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self.monitor.should_defer() \
+                or not self._is_low_priority(scope["path"]):
+            await self.app(scope, receive, send)
+            return
+        
+        if self.monitor.level != "shed":
+            admission_stats["deferred"] += 1
+            # Echte Zeit zählen: unter Lag schläft jedes sleep() um den Lag länger
+            loop = asyncio.get_running_loop()
+            deadline = loop.time() + settings.loop_lag_max_defer_ms / 1000.0
+            while self.monitor.should_defer() and self.monitor.level != "shed":
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                await asyncio.sleep(min(self.DEFER_STEP, remaining))
+        
+        if self.monitor.level == "shed":
+            admission_stats["shed"] += 1
+            await self._reject(send)
+            return
+        
+        await self.app(scope, receive, send)
+    
+    async def _reject(self, send):
+        body = json.dumps({"detail": "Server ausgelastet - bitte gleich nochmal versuchen"}).encode()
+        await send({
+            "type": "http.response.start",
+            "status": 503,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"retry-after", b"1")
+            ]
+        })
+        await send({"type": "http.response.body", "body": body})
@@ -1,8 +1,9 @@
 """
 Core Configuration & Settings
 """
+import os
 from pydantic_settings import BaseSettings
-from typing import List
+from typing import List, Optional
 
 
 class Settings(BaseSettings):
@@ -11,13 +12,34 @@ class Settings(BaseSettings):
     # App Info
     app_name: str = "Hister 2.0"
     app_version: str = "2.0.0"
-    debug: bool = True
+    debug: bool = True  # Socket.IO Paket-Logs & FastAPI Debug (python -m app.server setzt False)
     
     # Spotify API
     spotify_client_id: str
     spotify_client_secret: str
     spotify_redirect_uri: str = "http://localhost:8000/callback"
     
+    # Spotify Transport (live | record | replay) - Record/Replay für Offline-Builds
+    spotify_transport: str = "live"
+    spotify_fixture_path: str = "fixtures/spotify.json.gz"
+    spotify_replay_latency_ms: float = 0.0  # Künstliche Antwortzeit im Replay
+    spotify_replay_jitter_ms: float = 0.0  # Zusätzliche, gleichverteilte Streuung
+    spotify_replay_429_rate: float = 0.0  # Anteil der Requests mit 429 (Rate Limit)
+    spotify_replay_retry_after_s: int = 1  # Retry-After Header der 429-Antworten
+    spotify_replay_seed: Optional[int] = None
+    
+    # Spotify Scheduler (ausgehende Requests)
+    spotify_requests_per_second: float = 8.0  # Server-weites Rate-Limit
+    spotify_request_burst: int = 10
+    spotify_max_retries: int = 3  # Wiederholungen nach 429
+    spotify_low_priority_max_wait_s: float = 5.0  # Suche/Discovery geben danach auf
+    
+    # Spotify Client Pool (ein Client pro Host)
+    spotify_http_pool_size: int = 20  # Keep-Alive Verbindungen zu Spotify
+    spotify_token_refresh_margin_s: int = 300  # Token so lange vor Ablauf erneuern
+    spotify_token_check_interval_s: float = 30.0  # Prüfintervall des Refresh-Threads
+    spotify_client_idle_ttl_s: int = 6 * 3600  # Inaktive Host-Clients danach entfernen
+    
     # Security
     secret_key: str
     algorithm: str = "HS256"
@@ -34,6 +56,124 @@ class Settings(BaseSettings):
     # Database
     database_url: str = "sqlite:///./hister.db"
     
+    # Gameplay
+    playlist_streaming: bool = True  # Erste Page sofort, Rest im Hintergrund
+    max_playlists_per_deck: int = 10  # Playlists, die zu einem Deck kombiniert werden dürfen
+    playlist_fetch_workers: int = 4  # Parallele Spotify-Requests beim Laden mehrerer Playlists
+    prefetch_track_count: int = 3  # Vorab gepushte Playback-Handles (URI + Dauer)
+    # Standard-Zeitlimit pro Zug (0 = kein Limit) - aus, bis das Frontend den Countdown zeigt
+    turn_time_limit_seconds: int = 0
+    turn_timer_tick_ms: int = 250  # Auflösung des Timing Wheels
+    turn_timer_slots: int = 512  # Slots im Timing Wheel (eine Umdrehung = Slots * Tick)
+    
+    # Autocomplete (lokaler Suchindex, kein Spotify)
+    search_catalog_path: str = ""  # Optionaler globaler Katalog (JSONL mit title/artist)
+    autocomplete_min_chars: int = 2
+    autocomplete_max_results: int = 8
+    
+    # Preview-Audio (Proxy & Disk-Cache für die 30s-Clips aus `preview_url`)
+    preview_cache_dir: str = "cache/previews"
+    preview_cache_max_mb: int = 256  # Ältester Clip fliegt raus, sobald der Cache größer wird
+    preview_max_clip_mb: int = 5  # Größere Antworten vom Origin werden verworfen
+    preview_prefetch_count: int = 3  # Aktueller + nächste N Tracks vorab laden (0 = aus)
+    preview_fetch_workers: int = 4  # Parallele Downloads im Hintergrund
+    preview_fetch_timeout_s: float = 10.0
+    preview_max_age_s: int = 86400  # Cache-Control für Clients (Clips ändern sich nicht)
+    
+    # Event Log (Append-only pro Session, Snapshots, Crash Recovery)
+    event_log_dir: str = ""  # Leer = kein Event Log
+    event_log_segment_kb: int = 1024  # Neues Segment ab dieser Größe
+    event_log_snapshot_every: int = 200  # Events pro Session zwischen zwei Snapshots
+    event_log_fsync: bool = False  # fsync pro Event (langsam, übersteht auch Stromausfall)
+    event_log_max_open_files: int = 256  # Offene Segment-Dateien (LRU)
+    event_log_recover: bool = True  # Sessions beim Start aus dem Log wiederherstellen
+    
+    # Export beendeter Spiele für Auswertungen (Arrow IPC, Hintergrund-Thread)
+    game_export_dir: str = ""  # Leer = kein Export
+    game_export_batch_games: int = 50  # Spiele pro geschriebenem Batch
+    game_export_flush_s: float = 30.0  # Spätestens nach so vielen Sekunden schreiben
+    game_export_rotate_mb: int = 64  # Neue Datei ab dieser Größe
+    game_export_queue_max: int = 10000  # Darüber werden beendete Spiele verworfen
+    
+    # Track-Statistik (Schwierigkeit pro Track, deck_order beim Playlist-Laden)
+    track_stats_path: str = "cache/track_stats.bin"  # Leer = nur im Speicher
+    track_stats_save_interval_s: float = 60.0  # Speichern (nur bei Änderungen)
+    track_stats_min_samples: int = 8  # Platzierungen, bevor ein Track als "falsches Jahr" gilt
+    track_stats_bad_year_accuracy: float = 0.2  # Höchstens so viele richtig = falsches Jahr
+    track_stats_strata: int = 4  # Schwierigkeitsgruppen für deck_order=balanced
+    
+    # Neustart ohne Spielabbruch (SIGTERM: Drain, Sessions in Datei, neuer Prozess lädt sie)
+    handoff_path: str = "cache/handoff.bin"  # Leer = aus
+    handoff_max_age_s: int = 300  # Ältere Dateien werden beim Start ignoriert
+    handoff_notify_grace_s: float = 0.5  # Zeit für `server_restarting`, bevor Verbindungen schließen
+    handoff_reconnect_delay_ms: int = 1000  # Empfohlene Wartezeit der Clients bis zum Reconnect
+    
+    # Produktions-Server (python -m app.server)
+    server_host: str = "0.0.0.0"
+    server_port: int = 8000
+    server_workers: int = 1  # >1: Worker hinter dem Shard Router (sticky per session_id)
+    server_loop: str = "auto"  # auto | uvloop | asyncio
+    server_http: str = "auto"  # auto | httptools | h11
+    server_log_level: str = "warning"
+    server_access_log: bool = False
+    server_restart_delay_s: float = 1.0  # Pause, bevor ein abgestürzter Worker neu startet
+    
+    # Admin-Endpoints (/admin/*, Header X-Admin-Token)
+    admin_token: str = ""  # Leer = Admin-Endpoints aus (404)
+    
+    # Profiler (/admin/profile)
+    profiler_max_duration_s: float = 30.0  # Längstes Profil / längste Wartezeit auf einen Request
+    profiler_interval_ms: float = 5.0  # Standard-Abtastintervall
+    profiler_min_interval_ms: float = 1.0
+    
+    # Tracing (/admin/traces) - Spans von Request/Socket-Event bis Emit
+    tracing_sample_rate: float = 0.0  # Anteil gesampelter Traces (0 = aus, zur Laufzeit änderbar)
+    tracing_buffer_size: int = 4096  # Abgeschlossene Spans im Ring Buffer
+    
+    # Memory Accounting (/admin/memory) - geschätzter Speicher pro Session
+    memory_budget_mb: float = 512.0  # Standard-Budget der Kapazitätsprojektion
+    memory_projection_cards: int = 10  # Timeline-Karten pro Spieler in der Projektion (Karten zum Sieg)
+    memory_measure_budget_ms: float = 20.0  # Messzeit am Stück (Report: danach schätzen, Hintergrund: Loop freigeben)
+    memory_refresh_interval_s: float = 30.0  # Report im Hintergrund neu bauen (0 = nur auf Abruf)
+    
+    # Sharding (Sessions per Consistent Hashing auf mehrere Worker-Prozesse verteilt)
+    shard_count: int = 1  # 1 = ein Prozess, kein Sharding
+    shard_index: int = 0  # Eigener Shard (setzt der Router beim Start der Worker)
+    shard_vnodes: int = 64  # Virtuelle Knoten pro Shard im Hash-Ring
+    shard_base_port: int = 8100  # Worker lauschen auf base_port + shard_index
+    shard_proxy_timeout_s: float = 60.0  # Länger als Engine.IO Long-Polling
+    
+    def shard_path(self, path: str) -> str:
+        """Eigene Datei bzw. eigener Ordner pro Shard (leer bleibt leer)"""
+        if not path or self.shard_count <= 1:
+            return path
+        root, ext = os.path.splitext(path.rstrip("/\\"))
+        return f"{root}.shard-{self.shard_index}{ext}"
+    
+    # Zuschauer (Spectator Mode)
+    spectator_updates_per_second: float = 2.0  # Max. Snapshots pro Sekunde & Session
+    spectator_fanout_batch: int = 500  # Sends pro Batch, danach Event-Loop freigeben
+    
+    # Event-Loop Überwachung & Load Shedding
+    loop_lag_sample_interval_ms: int = 100  # Messintervall des Lag-Samplers
+    loop_lag_defer_ms: float = 50.0  # Ab hier werden unwichtige Requests verzögert
+    loop_lag_shed_ms: float = 200.0  # Ab hier werden unwichtige Requests abgelehnt (503)
+    loop_lag_max_defer_ms: int = 1000  # Maximale Wartezeit verzögerter Requests
+    low_priority_paths: str = "/playlist/search,/game/lobbies"  # Kommagetrennte Prefixe
+    
+    @property
+    def low_priority_prefixes(self) -> List[str]:
+        """Convert comma-separated string to list"""
+        return [p.strip() for p in self.low_priority_paths.split(',') if p.strip()]
+    
+    # Socket.IO Backpressure
+    socket_events_per_second: float = 10.0  # Rate-Limit pro Client (sid)
+    socket_event_burst: int = 20
+    socket_max_payload_bytes: int = 4096  # Max. Größe weitergeleiteter Client-Daten
+    socket_max_message_bytes: int = 65536  # Harte Grenze auf Engine.IO Ebene
+    socket_room_queue_size: int = 64  # Ausgehende Events pro Room
+    socket_client_queue_limit: int = 256  # Ab hier gilt ein Client als langsam
+    
     class Config:
         env_file = ".env"
         case_sensitive = False
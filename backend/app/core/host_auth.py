@@ -0,0 +1,73 @@
+"""
+Host-Nachweis pro Session
+Die session_id kennen alle Mitspieler - den Spotify Login einer Session darf
+aber nur der Host binden.
+
+- Beim Erstellen bekommt der Host ein `host_token` = HMAC(SECRET_KEY, session_id)
+  (kein Speicher: gilt auch nach Neustart, Handoff und auf jedem Shard)
+- Der OAuth `state` ist ebenso signiert: der Owner im Callback kommt vom Server
+"""
+import hashlib
+import hmac
+import secrets
+from typing import Optional
+from fastapi import Header, HTTPException
+from .config import settings
+
+
+def _sign(purpose: str, session_id: str) -> str:
+    message = f"{purpose}:{session_id}".encode("utf-8")
+    return hmac.new(settings.secret_key.encode("utf-8"), message, hashlib.sha256).hexdigest()
+
+
+def host_token(session_id: str) -> str:
+    """
+    Token, mit dem sich der Host einer Session ausweist
+    """
+    return _sign("host", session_id)
+
+
+def verify_host_token(session_id: Optional[str], token: Optional[str]) -> bool:
+    if not session_id or not token:
+        return False
+    return secrets.compare_digest(token.encode("utf-8"), host_token(session_id).encode("utf-8"))
+
+
+def oauth_state(session_id: str) -> str:
+    """
+    Signierter OAuth `state` (`<session_id>.<signatur>`)
+    """
+    return f"{session_id}.{_sign('oauth', session_id)}"
+
+
+def owner_from_state(state: Optional[str]) -> Optional[str]:
+    """
+    Session ID aus einem signierten `state` (None = fehlt oder gefälscht)
+    """
+    if not state or "." not in state:
+        return None
+    session_id, signature = state.rsplit(".", 1)
+    expected = _sign("oauth", session_id).encode("utf-8")
+    if not session_id or not secrets.compare_digest(signature.encode("utf-8"), expected):
+        return None
+    return session_id
+
+
+async def optional_host(owner: Optional[str] = None,
+                        x_host_token: Optional[str] = Header(default=None)) -> Optional[str]:
+    """
+    Dependency: `owner` nur mit passendem Header X-Host-Token
+    Returns: Owner (None = ohne Owner, Client Credentials)
+    """
+    if owner is None:
+        return None
+    if not verify_host_token(owner, x_host_token):
+        raise HTTPException(status_code=403, detail="Ungültiger Host-Token")
+    return owner
+
+
+async def require_host(owner: str, x_host_token: Optional[str] = Header(default=None)) -> str:
+    """
+    Dependency: wie `optional_host`, `owner` ist Pflicht
+    """
+    return await optional_host(owner, x_host_token)
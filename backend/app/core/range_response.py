@@ -0,0 +1,145 @@
+"""
+Datei-Response mit HTTP Range Support
+
+Starlettes FileResponse (0.35) kennt keine Range-Requests, Browser-Audio
+braucht sie aber zum Spulen (und Safari schon zum Abspielen).
+- `Range: bytes=a-b`, `bytes=a-`, `bytes=-n` (ein Bereich) -> 206 + Content-Range
+- nicht erfüllbarer Bereich -> 416, passender `If-None-Match` -> 304
+- Body blockweise per os.pread aus dem Threadpool (256 KiB pro Block)
+
+Zero-Copy ist unter uvicorn NICHT aktiv: der Pfad über die ASGI-Extension
+`http.response.zerocopysend` (sendfile) wird nur genutzt, wenn der Server sie
+in `scope["extensions"]` anbietet - uvicorn (0.27) tut das nicht, es gibt
+keinen anderen Weg an den Socket. Jeder Body läuft also über os.pread;
+/metrics zählt unter `previews` beide Wege (`zerocopy_bodies`, `pread_bodies`).
+"""
+import os
+import re
+from typing import BinaryIO, Dict, Optional, Tuple
+
+from starlette.concurrency import run_in_threadpool
+from starlette.responses import Response
+from starlette.types import Receive, Scope, Send
+
+
+ZEROCOPY_EXTENSION = "http.response.zerocopysend"  # nur andere ASGI-Server, nicht uvicorn
+body_stats = {"zerocopy_bodies": 0, "pread_bodies": 0}  # Zähler für /metrics
+_RANGE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+def parse_range(header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """
+    Einzelnen Byte-Bereich parsen
+    Returns: (start, end) inklusive, None = ganze Datei (auch bei Mehrfach-Bereichen)
+    Raises: ValueError wenn der Bereich nicht erfüllbar ist
+    """
+    if not header:
+        return None
+    match = _RANGE.match(header.strip())
+    if match is None:
+        return None
+    first, last = match.groups()
+    if not first and not last:
+        return None
+
+    if not first:
+        # Suffix: die letzten n Bytes
+        length = int(last)
+        if length == 0 or size == 0:
+            raise ValueError("Leerer Bereich")
+        return max(size - length, 0), size - 1
+
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        raise ValueError("Bereich außerhalb der Datei")
+    return start, end
+
+
+class RangeFileResponse(Response):
+    """
+    Liefert eine offene Datei (ganz oder Bereich) und schließt sie danach
+    """
+
+    chunk_size = 256 * 1024
+
+    def __init__(
+        self,
+        file: BinaryIO,
+        media_type: str,
+        range_header: Optional[str] = None,
+        if_none_match: Optional[str] = None,
+        send_body: bool = True,
+        max_age: int = 0
+    ):
+        self.file = file
+        self.media_type = media_type
+        self.background = None
+        self.send_body = send_body
+
+        stat = os.fstat(file.fileno())
+        size = stat.st_size
+        etag = f'"{stat.st_mtime_ns:x}-{size:x}"'
+        headers: Dict[str, str] = {"accept-ranges": "bytes", "etag": etag}
+        if max_age:
+            headers["cache-control"] = f"public, max-age={max_age}"
+
+        self.offset, self.count = 0, size
+        if if_none_match and etag in (tag.strip() for tag in if_none_match.split(",")):
+            self.status_code = 304
+            self.count = 0
+        else:
+            try:
+                byte_range = parse_range(range_header, size)
+            except ValueError:
+                self.status_code = 416
+                self.count = 0
+                headers["content-range"] = f"bytes */{size}"
+            else:
+                self.status_code = 200
+                if byte_range is not None:
+                    start, end = byte_range
+                    self.status_code = 206
+                    self.offset, self.count = start, end - start + 1
+                    headers["content-range"] = f"bytes {start}-{end}/{size}"
+            headers["content-length"] = str(self.count)
+
+        self.init_headers(headers)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        try:
+            await send({
+                "type": "http.response.start",
+                "status": self.status_code,
+                "headers": self.raw_headers
+            })
+            if not self.send_body or self.count == 0:
+                await send({"type": "http.response.body", "body": b"", "more_body": False})
+            elif ZEROCOPY_EXTENSION in scope.get("extensions", {}):
+                body_stats["zerocopy_bodies"] += 1
+                await send({
+                    "type": ZEROCOPY_EXTENSION,
+                    "file": self.file,
+                    "offset": self.offset,
+                    "count": self.count,
+                    "more_body": False
+                })
+            else:
+                body_stats["pread_bodies"] += 1
+                await self._send_chunks(send)
+        finally:
+            self.file.close()
+
+    async def _send_chunks(self, send: Send) -> None:
+        fd = self.file.fileno()
+        offset = self.offset
+        remaining = self.count
+        while remaining > 0:
+            chunk = await run_in_threadpool(os.pread, fd, min(self.chunk_size, remaining), offset)
+            if not chunk:
+                break  # Datei kürzer als erwartet
+            offset += len(chunk)
+            remaining -= len(chunk)
+            await send({"type": "http.response.body", "body": chunk, "more_body": remaining > 0})
+        if remaining > 0:
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
@@ -0,0 +1,63 @@
+"""
+Sharding - Zuordnung Session -> Worker-Prozess per Consistent Hashing
+
+Jeder Shard bekommt `shard_vnodes` Punkte auf einem 64-Bit-Ring, eine
+session_id gehört dem Shard mit dem nächsten Punkt im Uhrzeigersinn.
+Der Hash (BLAKE2b) ist über Prozesse hinweg stabil - Router und Worker
+kommen unabhängig voneinander auf denselben Shard.
+
+Neue Sessions erzeugt der Worker, bei dem `/game/session/create` landet:
+er würfelt so lange UUIDs, bis eine ihm selbst gehört (im Mittel
+`shard_count` Versuche). Damit braucht der Router keine Tabelle.
+"""
+import uuid
+from bisect import bisect
+from hashlib import blake2b
+from typing import List
+
+from .config import settings
+
+
+def _hash(key: str) -> int:
+    return int.from_bytes(blake2b(key.encode(), digest_size=8).digest(), "big")
+
+
+class HashRing:
+    """
+    Consistent-Hashing-Ring über `shards` Shards (0..shards-1)
+    """
+
+    def __init__(self, shards: int, vnodes: int = 64):
+        if shards < 1:
+            raise ValueError("Mindestens ein Shard erforderlich")
+        self.shards = shards
+        points = sorted(
+            (_hash(f"shard-{shard}#{vnode}"), shard)
+            for shard in range(shards)
+            for vnode in range(vnodes)
+        )
+        self._keys: List[int] = [point for point, _ in points]
+        self._owners: List[int] = [shard for _, shard in points]
+
+    def owner(self, key: str) -> int:
+        """Shard, dem `key` gehört"""
+        if self.shards == 1:
+            return 0
+        idx = bisect(self._keys, _hash(key))
+        return self._owners[idx % len(self._owners)]
+
+
+def new_session_id(ring: "HashRing" = None, shard_index: int = None) -> str:
+    """
+    Neue session_id, die dem eigenen Shard gehört
+    """
+    ring = ring or shard_ring
+    shard_index = settings.shard_index if shard_index is None else shard_index
+    while True:
+        session_id = str(uuid.uuid4())
+        if ring.owner(session_id) == shard_index:
+            return session_id
+
+
+# Singleton Instance
+shard_ring = HashRing(settings.shard_count, settings.shard_vnodes)
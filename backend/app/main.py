@@ -1,12 +1,35 @@
 """
 Hister 2.0 - FastAPI Main Application
 """
+import asyncio
+import signal
+import threading
+from datetime import datetime
+from typing import List
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 import socketio
 from .core.config import settings
-from .api import auth, playlist, game, lobby
-from .services.websocket_service import sio
+from .core.admission import AdmissionControlMiddleware, admission_stats
+from .core.range_response import body_stats
+from .api import auth, playlist, game, lobby, media, admin
+from .services.websocket_service import sio, get_socket_stats
+from .services.loop_monitor import loop_monitor
+from .services.spotify_scheduler import spotify_scheduler
+from .services.spotify_service import spotify_service
+from .services.search_index import track_search
+from .services.preview_cache import preview_cache
+from .services.event_log import event_log
+from .services.game_export import game_exporter
+from .services.track_stats import track_stats
+from .services.game_service import game_service
+from .services.snapshot import recover
+from .services.handoff import handoff
+from .services.turn_scheduler import turn_scheduler
+from .services.profiler import ProfilerMiddleware, instrument_socketio, profiler
+from .services.tracing import TracingMiddleware, trace_socketio, tracer
+from .services.memory_accounting import memory_accounting
 
 # FastAPI App
 app = FastAPI(
@@ -14,7 +37,8 @@ app = FastAPI(
     version=settings.app_version,
     description="🎵 Music Quiz Game - Rate Titel, Interpret & Jahrzehnt!",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    debug=settings.debug
 )
 
 # Socket.IO ASGI App
@@ -24,6 +48,15 @@ socket_app = socketio.ASGIApp(
     socketio_path='/socket.io'
 )
 
+# Profiler: nächsten angeforderten Request mitschneiden (/admin/profile/next)
+app.add_middleware(ProfilerMiddleware, profiler=profiler)
+instrument_socketio(sio, profiler)
+# Tracing: Socket.IO-Events & Emits (HTTP-Requests: Middleware unten, ganz außen)
+trace_socketio(sio, tracer)
+
+# Admission Control (innerhalb von CORS, damit auch 503 CORS-Header bekommt)
+app.add_middleware(AdmissionControlMiddleware, monitor=loop_monitor)
+
 # CORS Middleware
 app.add_middleware(
     CORSMiddleware,
@@ -31,13 +64,114 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Trace-Id"],
 )
 
+# Tracing: Wurzel-Span pro Request (außen, damit Admission & CORS mitzählen)
+app.add_middleware(TracingMiddleware, tracer=tracer)
+
 # Include Routers
 app.include_router(auth.router)
 app.include_router(playlist.router)
 app.include_router(game.router)
 app.include_router(lobby.router)
+app.include_router(media.router)
+app.include_router(admin.router)
+
+
+@app.on_event("startup")
+async def startup():
+    """
+    Hintergrund-Tasks starten
+    """
+    loop_monitor.start()
+    # Speicher-Report im Hintergrund (in Scheiben, /metrics liest nur den letzten)
+    memory_accounting.start()
+    # App-Token & HTTP-Verbindung vorwärmen, Tokens im Hintergrund erneuern
+    spotify_service.pool.start()
+    # Track-Statistik periodisch speichern (nur bei Änderungen)
+    track_stats.start()
+    # Suchkatalog im Hintergrund laden (kann groß sein, Suche bis dahin ohne Katalog)
+    track_search.start_loading()
+    # Sessions des Vorgängers übernehmen, bevor Requests angenommen werden
+    if handoff.enabled:
+        restored = handoff.restore(game_service)
+        _rearm_turns(restored)
+        if restored:
+            print(f"♻️ {len(restored)} Sessions aus dem Handoff übernommen ({handoff.stats['restore_ms']} ms)")
+        _install_drain_handler()
+    if event_log.enabled and settings.event_log_recover:
+        _recover_sessions()
+
+
+def _recover_sessions() -> None:
+    """
+    Laufende Sessions aus dem Event Log wiederherstellen & Zug-Timer neu starten
+    """
+    restored = recover(game_service, event_log)
+    _rearm_turns(restored)
+    if restored:
+        print(f"♻️ {len(restored)} Sessions aus dem Event Log wiederhergestellt")
+
+
+def _rearm_turns(session_ids: List[str]) -> None:
+    """
+    Zug-Timer wiederhergestellter Sessions neu starten
+    """
+    now = datetime.now()
+    for session_id in session_ids:
+        session = game_service.sessions[session_id]
+        if session.status == "playing" and session.turn_deadline is not None:
+            # Während des Neustarts abgelaufene Züge laufen sofort ab
+            turn_scheduler.arm(session_id, max((session.turn_deadline - now).total_seconds(), 0.001))
+
+
+def _install_drain_handler() -> None:
+    """
+    SIGTERM (Deploy) zuerst in den Drain-Modus, danach normal beenden
+    """
+    if threading.current_thread() is not threading.main_thread():
+        return
+    loop = asyncio.get_running_loop()
+    try:
+        loop.add_signal_handler(signal.SIGTERM, lambda: loop.create_task(_drain()))
+    except (NotImplementedError, RuntimeError):
+        pass  # Windows / keine Signale in diesem Kontext
+
+
+async def _drain() -> None:
+    """
+    Keine neuen Lobbys, Züge anhalten, Clients zum Reconnect auffordern
+    """
+    if handoff.draining:
+        return
+    print("🚦 SIGTERM - Drain, Sessions werden beim Beenden übergeben")
+    handoff.begin_drain()
+    turn_scheduler.stop()
+    await sio.emit('server_restarting', {'reconnect_in_ms': settings.handoff_reconnect_delay_ms})
+    await asyncio.sleep(settings.handoff_notify_grace_s)
+    # Weiter wie Ctrl+C: uvicorn schließt Listener & Verbindungen, dann shutdown()
+    signal.raise_signal(signal.SIGINT)
+
+
+@app.on_event("shutdown")
+async def shutdown():
+    """
+    Hintergrund-Tasks stoppen
+    """
+    if handoff.enabled:
+        # Keine Requests mehr unterwegs - Zustand ist konsistent
+        turn_scheduler.stop()
+        handoff.write(game_service)
+    await loop_monitor.stop()
+    await memory_accounting.stop()
+    spotify_service.pool.stop()
+    spotify_service.requests_session.close()  # Aufnahme (record): Fixtures speichern
+    preview_cache.stop()
+    event_log.close_all()
+    # Wartende beendete Spiele noch schreiben
+    game_exporter.stop()
+    track_stats.stop()
 
 
 @app.get("/")
@@ -58,14 +192,50 @@ async def root():
 async def health_check():
     """
     Health Check
+    Antwortet mit 503, solange die Event-Loop über `loop_lag_shed_ms` liegt
+    oder der Server vor einem Neustart drainiert
     """
-    return {
-        "status": "healthy",
+    if handoff.draining:
+        # Loadbalancer sollen keine neuen Clients mehr schicken
+        return JSONResponse(status_code=503, content={
+            "status": "draining", "app": settings.app_name, "version": settings.app_version
+        })
+    loop = loop_monitor.snapshot()
+    overloaded = loop["level"] == "shed"
+    body = {
+        "status": "overloaded" if overloaded else "healthy",
         "app": settings.app_name,
-        "version": settings.app_version
+        "version": settings.app_version,
+        "loop_lag_ms": loop["lag_ms"],
+        "load_level": loop["level"]
+    }
+    if overloaded:
+        return JSONResponse(status_code=503, content=body)
+    return body
+
+
+@app.get("/metrics")
+async def metrics():
+    """
+    Laufzeit-Zähler (Socket.IO Backpressure, Event-Loop, Load Shedding, Spotify, Previews, Export, Handoff, Profiler, Tracing, Speicher)
+    """
+    return {
+        "sockets": get_socket_stats(),
+        "loop": loop_monitor.snapshot(),
+        "admission": admission_stats,
+        "spotify": spotify_scheduler.snapshot(),
+        "spotify_clients": spotify_service.pool.snapshot(),
+        "previews": {**preview_cache.snapshot(), **body_stats},
+        "game_export": game_exporter.snapshot(),
+        "track_stats": track_stats.snapshot(),
+        "handoff": handoff.snapshot(),
+        "profiler": profiler.snapshot(),
+        "tracing": tracer.snapshot(),
+        "memory": memory_accounting.snapshot()
     }
 
 
 if __name__ == "__main__":
+    # Entwicklung (Reload) - Produktion: python -m app.server
     import uvicorn
     uvicorn.run("app.main:socket_app", host="0.0.0.0", port=8000, reload=True)
@@ -15,6 +15,13 @@ class GameMode(str, Enum):
     TEAMWORK = "teamwork" # Kooperativ
 
 
+class DeckOrder(str, Enum):
+    """Reihenfolge des Decks beim Laden"""
+    SHUFFLE = "shuffle"                # Zufällig
+    BALANCED = "balanced"              # Schwierigkeit gleichmäßig verteilt (Track-Statistik)
+    SKIP_BAD_YEARS = "skip_bad_years"  # Zufällig, fast immer falsch platzierte Tracks raus
+
+
 class SpotifyTrack(BaseModel):
     """Spotify Track Metadata"""
     track_id: str
@@ -43,6 +50,8 @@ class GameSession(BaseModel):
     session_id: str
     host_name: str
     playlist_id: Optional[str] = None
+    playlist_ids: List[str] = []  # Alle Playlists des Decks (playlist_id ist die erste)
+    deck_order: DeckOrder = DeckOrder.SHUFFLE
     current_track_index: int = 0
     started_at: Optional[datetime] = None
     status: str = "waiting"  # waiting, playing, finished
@@ -52,6 +61,14 @@ class GameSession(BaseModel):
     win_condition: int = 10  # Anzahl Karten zum Gewinnen
     current_player_turn: Optional[str] = None  # player_id des Spielers am Zug
     round_number: int = 0
+    turn_time_limit: int = 0  # Sekunden pro Zug (0 = kein Limit)
+    turn_deadline: Optional[datetime] = None  # Wann wird der aktuelle Zug übersprungen?
+
+
+class CreateSessionResponse(GameSession):
+    """Neue Session samt Host-Daten (nur für den Host)"""
+    host_player_id: Optional[str] = None
+    host_token: str  # Header X-Host-Token für /auth & Playlists mit owner
 
 
 class Player(BaseModel):
@@ -0,0 +1,162 @@
+"""
+Produktions-Start - ohne Reload, ohne Debug-Logs, schnellste Event-Loop & HTTP-Parser
+
+- Event-Loop: uvloop, falls installiert (sonst asyncio)
+- HTTP-Parser: httptools, falls installiert (sonst h11)
+- DEBUG aus: Socket.IO/Engine.IO loggen nicht mehr jedes Paket, kein Access-Log
+- SERVER_WORKERS = 1: ein Prozess, uvicorn direkt
+- SERVER_WORKERS > 1: Worker-Prozesse hinter dem Shard Router
+  (`app.shard_router`) - Sessions & Socket.IO-Verbindungen landen per
+  session_id immer beim selben Worker. `uvicorn --workers` geht nicht: die
+  Worker teilen sich den Port ohne Zuordnung, jeder hat aber seinen eigenen
+  GameService. Abgestürzte Worker startet der Supervisor neu; beim Beenden
+  bekommen alle Worker SIGTERM (Drain & Handoff, siehe handoff.py).
+
+Alles über Settings / .env (SERVER_*), Entwicklung weiter mit `python -m app.main`.
+
+Start (im backend/ Ordner):
+    python -m app.server
+    SERVER_WORKERS=4 python -m app.server
+"""
+import importlib.util
+import os
+import signal
+import subprocess
+import threading
+from typing import Dict, List, Optional, Sequence
+
+from .core.config import settings
+from .shard_router import ShardRouter, spawn_worker, wait_for_workers
+
+
+LOOPS = ("uvloop", "asyncio")
+HTTP_PARSERS = ("httptools", "h11")
+
+
+def select_implementation(requested: str, candidates: Sequence[str]) -> str:
+    """
+    "auto" -> erste installierte Implementierung (schnellste zuerst)
+    Sonst die gewünschte, falls bekannt & installiert
+    """
+    if requested == "auto":
+        return next(name for name in candidates if importlib.util.find_spec(name) is not None)
+    if requested not in candidates:
+        raise ValueError(f"Unbekannte Implementierung '{requested}' (erlaubt: auto, {', '.join(candidates)})")
+    if importlib.util.find_spec(requested) is None:
+        raise ValueError(f"'{requested}' ist nicht installiert")
+    return requested
+
+
+def uvicorn_options() -> Dict:
+    """
+    uvicorn-Optionen aus den Settings (für Worker, Router & Einzelprozess)
+    """
+    return {
+        "loop": select_implementation(settings.server_loop, LOOPS),
+        "http": select_implementation(settings.server_http, HTTP_PARSERS),
+        "log_level": settings.server_log_level,
+        "access_log": settings.server_access_log
+    }
+
+
+def worker_args(options: Dict) -> List[str]:
+    """
+    uvicorn-Optionen als Kommandozeile für `spawn_worker`
+    """
+    args = ["--loop", options["loop"], "--http", options["http"]]
+    if not options["access_log"]:
+        args.append("--no-access-log")
+    return args
+
+
+class WorkerSupervisor:
+    """
+    Startet die Worker und startet abgestürzte neu (eigener Thread)
+    """
+
+    def __init__(self, count: int, base_port: int, extra_args: Sequence[str] = (),
+                 env: Optional[Dict[str, str]] = None, restart_delay_s: float = 1.0,
+                 stats: Optional[Dict[str, int]] = None, **spawn_kwargs):
+        self.count = count
+        self.base_port = base_port
+        self.extra_args = list(extra_args)
+        self.env = env or {}
+        self.restart_delay_s = restart_delay_s
+        self.spawn_kwargs = spawn_kwargs
+        self.stats = stats if stats is not None else {}
+        self.stats.setdefault("worker_restarts", 0)
+        self.workers: List[subprocess.Popen] = []
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _spawn(self, index: int) -> subprocess.Popen:
+        return spawn_worker(index, self.count, base_port=self.base_port, extra_args=self.extra_args,
+                            env=self.env, **self.spawn_kwargs)
+
+    def start(self) -> None:
+        self.workers = [self._spawn(index) for index in range(self.count)]
+        self._thread = threading.Thread(target=self._watch, name="worker-supervisor", daemon=True)
+        self._thread.start()
+
+    def _watch(self) -> None:
+        while not self._stopping.wait(0.5):
+            for index, worker in enumerate(self.workers):
+                code = worker.poll()
+                if code is None:
+                    continue
+                print(f"⚠️  Worker {index} beendet (Exit {code}) - Neustart in {self.restart_delay_s}s")
+                # Pause gegen Crash-Schleifen, Abbruch beim Beenden
+                if self._stopping.wait(self.restart_delay_s):
+                    return
+                self.workers[index] = self._spawn(index)
+                self.stats["worker_restarts"] += 1
+
+    def stop(self, timeout: float = 30.0) -> None:
+        """
+        Überwachung beenden, Worker per SIGTERM herunterfahren (Drain & Handoff)
+        """
+        self._stopping.set()
+        if self._thread is not None:
+            self._thread.join()
+        for worker in self.workers:
+            if worker.poll() is None:
+                worker.send_signal(signal.SIGTERM)
+        for worker in self.workers:
+            try:
+                worker.wait(timeout=timeout)
+            except subprocess.TimeoutExpired:
+                worker.kill()
+
+
+def main():
+    import uvicorn
+
+    # Kein Debug in Produktion - auch für die Worker-Prozesse
+    settings.debug = False
+    os.environ["DEBUG"] = "false"
+    options = uvicorn_options()
+    print(f"🚀 Hister {settings.app_version}: {settings.server_workers} Worker, "
+          f"Loop {options['loop']}, HTTP {options['http']}, Port {settings.server_port}")
+
+    if settings.server_workers <= 1:
+        uvicorn.run("app.main:socket_app", host=settings.server_host, port=settings.server_port, **options)
+        return
+
+    upstreams = [f"http://127.0.0.1:{settings.shard_base_port + index}" for index in range(settings.server_workers)]
+    router = ShardRouter(upstreams)
+    supervisor = WorkerSupervisor(
+        settings.server_workers, settings.shard_base_port, extra_args=worker_args(options),
+        restart_delay_s=settings.server_restart_delay_s,
+        stats=router.stats,  # Neustarts in /metrics des Routers
+        log_level=options["log_level"]
+    )
+    supervisor.start()
+    try:
+        wait_for_workers(upstreams)
+        uvicorn.run(router, host=settings.server_host, port=settings.server_port, **options)
+    finally:
+        supervisor.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+"""
+Deck Builder - Mehrere Playlists zu einem Deck ohne Duplikate
+
+Duplikate werden beim Einlesen erkannt (auch während des Streamings):
+- gleiche `track_id`
+- gleicher Titel + Hauptkünstler nach Normalisierung, Remaster-/Versions-
+  Zusätze entfernt ("Song - Remastered 2011" == "Song")
+
+Gemerkt werden nur 8-Byte Hashes, der Speicher wächst also nur mit der Zahl
+der eindeutigen Tracks. Tracks ohne lesbares Jahr im `release_date` werden
+verworfen, bevor sie eine Platzierung crashen können.
+"""
+import hashlib
+import re
+from datetime import date
+from functools import lru_cache
+from typing import Callable, Dict, Iterable, List, Optional, Set
+
+from ..models.game import SpotifyTrack
+from .search_index import normalize_text
+
+
+# Zusätze, die denselben Song bezeichnen: "(Remastered 2009)", "- 2011 Remaster", "[Mono Version]" ...
+_VERSION_KEYWORD = re.compile(
+    r"\b(?:remaster(?:ed)?|mono|stereo|single|radio edit|album version|version|edit|deluxe|anniversary)\b",
+    re.IGNORECASE
+)
+_DASHES = ("-", "–", "—")
+_BRACKETS = {")": "(", "]": "["}
+_FEATURING = re.compile(r"\s*[(\[]?\b(?:feat|ft|featuring)\b\.?.*$", re.IGNORECASE)
+MIN_YEAR = 1000
+
+
+def parse_year(release_date: Optional[str]) -> Optional[int]:
+    """
+    Jahr aus Spotify `release_date` ('1994', '1994-08', '1994-08-23')
+    Returns: None wenn nicht lesbar oder unplausibel
+    """
+    if not release_date or len(release_date) < 4:
+        return None
+    try:
+        year = int(release_date[:4])
+    except ValueError:
+        return None
+    if year < MIN_YEAR or year > date.today().year + 1:
+        return None
+    return year
+
+
+def _suffix_start(title: str) -> int:
+    """
+    Start des letzten Zusatzes: "(...)", "[...]" oder " - ..." (-1 = keiner)
+    Nur rückwärts bis zum Zusatz gesucht - linear, auch bei Titeln mit vielen " - "
+    """
+    closing = title[-1:]
+    if closing in _BRACKETS:
+        start = title.rfind(_BRACKETS[closing])
+        if start < 0 or any(char in title[start + 1:-1] for char in "()[]"):
+            return -1
+        return start
+    end = len(title)
+    while True:
+        # Bindestrich mit Leerzeichen davor oder danach ("Re-Edit" ist kein Trenner)
+        start = max(title.rfind(dash, 0, end) for dash in _DASHES)
+        if start <= 0:
+            return -1
+        if title[start - 1].isspace() or title[start + 1:start + 2].isspace():
+            break
+        end = start
+    if any(char in title[start:] for char in "()[]"):
+        return -1
+    return start
+
+
+def strip_version(title: str) -> str:
+    """
+    'Bohemian Rhapsody - Remastered 2011' -> 'Bohemian Rhapsody'
+    Entfernt Zusätze von hinten, solange sie ein Versions-Stichwort enthalten
+    """
+    stripped = title
+    while True:
+        rest = stripped.rstrip()
+        start = _suffix_start(rest)
+        if start < 0 or not _VERSION_KEYWORD.search(rest, start):
+            return stripped
+        shorter = rest[:start].rstrip()
+        if not shorter:
+            return stripped
+        stripped = shorter
+
+
+def dedup_key(track: SpotifyTrack) -> int:
+    """
+    8-Byte Hash aus normalisiertem Titel + Hauptkünstler
+    """
+    return _dedup_key(track.title, track.artist)
+
+
+@lru_cache(maxsize=1 << 16)
+def _dedup_key(title: str, artist: str) -> int:
+    # Gecacht: dieselben Tracks kommen in vielen Decks vor (gleiche Playlists)
+    title = normalize_text(_FEATURING.sub("", strip_version(title)))
+    artist = normalize_text(artist.split(",")[0])
+    digest = hashlib.blake2b(f"{title}\x1f{artist}".encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "big")
+
+
+class DeckBuilder:
+    """
+    Filtert Tracks aus mehreren Playlists (in Lade-Reihenfolge, erster gewinnt)
+    """
+
+    def __init__(self, playlist_ids: Iterable[str] = (), exclude: Optional[Callable[[str], bool]] = None):
+        self.playlist_ids = list(playlist_ids)
+        self.exclude = exclude  # track_id -> True = nicht ins Deck (z.B. bekannt falsches Jahr)
+        self._ids: Set[str] = set()
+        self._keys: Set[int] = set()
+        self.stats: Dict[str, int] = {
+            "accepted": 0,
+            "duplicate_ids": 0,
+            "duplicate_titles": 0,
+            "invalid_dates": 0,
+            "bad_years": 0
+        }
+
+    def accept(self, track: SpotifyTrack) -> bool:
+        """
+        True wenn der Track neu und spielbar ist (und merkt ihn sich)
+        """
+        if track.track_id in self._ids:
+            self.stats["duplicate_ids"] += 1
+            return False
+        if parse_year(track.release_date) is None:
+            self.stats["invalid_dates"] += 1
+            return False
+        if self.exclude is not None and self.exclude(track.track_id):
+            self._ids.add(track.track_id)
+            self.stats["bad_years"] += 1
+            return False
+
+        key = dedup_key(track)
+        self._ids.add(track.track_id)
+        if key in self._keys:
+            self.stats["duplicate_titles"] += 1
+            return False
+        self._keys.add(key)
+        self.stats["accepted"] += 1
+        return True
+
+    def filter(self, tracks: Iterable[SpotifyTrack]) -> List[SpotifyTrack]:
+        return [track for track in tracks if self.accept(track)]
+
+    def seed(self, tracks: List[SpotifyTrack]) -> None:
+        """
+        Bereits gefiltertes Deck übernehmen (Restore) - nur merken, nicht erneut prüfen
+        """
+        self._ids.update(track.track_id for track in tracks)
+        self._keys.update(dedup_key(track) for track in tracks)
+        self.stats["accepted"] += len(tracks)
+
+    @property
+    def rejected(self) -> int:
+        return (self.stats["duplicate_ids"] + self.stats["duplicate_titles"]
+                + self.stats["invalid_dates"] + self.stats["bad_years"])
@@ -0,0 +1,139 @@
+"""
+Deck Table - Jahr & Jahrzehnt pro Track als Integer-Spalten
+
+Das Jahr wird einmal beim Einlesen aus `release_date` geparst und in
+kompakten `array`-Spalten (2 Byte pro Wert) abgelegt; Platzierung, Start-Karten
+und Jahrzehnt-Guess lesen nur noch Integer. Die Deck-Statistik zählt die
+Jahres-Spalte in einem Durchlauf (Counter über das Array) und rechnet alles
+Weitere auf dem Histogramm (höchstens ein paar hundert Jahre) - auch bei
+10.000 Tracks im Millisekunden-Bereich.
+"""
+import math
+import re
+from array import array
+from collections import Counter
+from typing import Dict, Iterable, Optional
+
+from ..models.game import SpotifyTrack
+from .deck_builder import parse_year
+
+
+_DIGITS = re.compile(r"\d+")
+
+
+def decade_of(year: int) -> int:
+    return year - year % 10
+
+
+def parse_decade(text: Optional[str]) -> Optional[int]:
+    """
+    Jahrzehnt aus einem Guess: '1980er', '1980', '1984', '80er', "80's" -> 1980
+    Zweistellig: 00/10/20 -> 2000er/2010er/2020er, sonst 19xx
+    """
+    if not text:
+        return None
+    match = _DIGITS.search(text)
+    if match is None:
+        return None
+    digits = match.group()
+    if len(digits) == 4:
+        return decade_of(int(digits))
+    if len(digits) == 2:
+        value = int(digits)
+        return decade_of((2000 if value < 30 else 1900) + value)
+    return None
+
+
+class DeckTable:
+    """
+    Spalten `years` / `decades`, Zeile pro track_id
+    """
+
+    def __init__(self, tracks: Iterable[SpotifyTrack] = ()):
+        self.years = array("H")
+        self.decades = array("H")
+        self._rows: Dict[str, int] = {}
+        self.add(tracks)
+
+    def __len__(self) -> int:
+        return len(self.years)
+
+    def add(self, tracks: Iterable[SpotifyTrack]) -> None:
+        for track in tracks:
+            self._row(track)
+
+    def _row(self, track: SpotifyTrack) -> int:
+        row = self._rows.get(track.track_id)
+        if row is None:
+            year = parse_year(track.release_date)
+            if year is None:
+                raise ValueError(f"Track {track.track_id} hat kein gültiges Jahr ({track.release_date!r})")
+            row = len(self.years)
+            self.years.append(year)
+            self.decades.append(decade_of(year))
+            self._rows[track.track_id] = row
+        return row
+
+    def year(self, track: SpotifyTrack) -> int:
+        """Jahr des Tracks (unbekannte Tracks werden einmalig aufgenommen)"""
+        return self.years[self._row(track)]
+
+    def decade(self, track: SpotifyTrack) -> int:
+        return self.decades[self._row(track)]
+
+    def stats(self) -> Dict:
+        """
+        Schwierigkeit des Decks auf einen Blick
+        - histogram / decades: Tracks pro Jahr bzw. Jahrzehnt
+        - spread: Jahre zwischen ältestem und neuestem Track, dazu Standardabweichung
+        - duplicate_year_density: Wahrscheinlichkeit, dass zwei zufällige Karten
+          dasselbe Jahr haben (hoch = viele knappe Platzierungen)
+        """
+        count = len(self.years)
+        if count == 0:
+            return {
+                "track_count": 0,
+                "min_year": None,
+                "max_year": None,
+                "spread": 0,
+                "mean_year": None,
+                "median_year": None,
+                "stdev": 0.0,
+                "unique_years": 0,
+                "duplicate_year_density": 0.0,
+                "histogram": {},
+                "decades": {}
+            }
+
+        histogram = sorted(Counter(self.years).items())
+        decades = Counter()
+        total = 0
+        squares = 0
+        same_year_pairs = 0
+        median = None
+        seen = 0
+        for year, n in histogram:
+            decades[decade_of(year)] += n
+            total += year * n
+            squares += year * year * n
+            same_year_pairs += n * (n - 1)
+            seen += n
+            if median is None and seen * 2 >= count:
+                median = year
+
+        mean = total / count
+        variance = max(squares / count - mean * mean, 0.0)
+        pairs = count * (count - 1)
+        return {
+            "track_count": count,
+            "min_year": histogram[0][0],
+            "max_year": histogram[-1][0],
+            "spread": histogram[-1][0] - histogram[0][0],
+            "mean_year": round(mean, 1),
+            "median_year": median,
+            "stdev": round(math.sqrt(variance), 2),
+            "unique_years": len(histogram),
+            "duplicate_year_density": round(same_year_pairs / pairs, 4) if pairs else 0.0,
+            "histogram": {str(year): n for year, n in histogram},
+            "decades": {f"{decade}er": n for decade, n in sorted(decades.items())}
+        }
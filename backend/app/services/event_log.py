@@ -0,0 +1,341 @@
+"""
+Event Log - Append-only Log aller Spiel-Änderungen pro Session
+
+Jede Mutation im GameService wird als kompaktes, typisiertes Event
+geschrieben. Häufige Events (Guess, Platzierung, Zugwechsel) sind feste
+Binär-Records mit der Spieler-ID als 16 Byte UUID; seltene Events (Session,
+Beitritt, Deck) tragen JSON.
+
+Record:   [Typ: u8][Länge: u32][Payload]
+
+Layout (ein Ordner pro Session):
+    {event_log_dir}/{session_id}/00000001.seg              Segmente, rotieren ab event_log_segment_kb
+    {event_log_dir}/{session_id}/00000003-000000004096.snap Snapshot nach Segment 3, Offset 4096
+
+Segmente werden nur angehängt und beim Lesen per mmap eingeblendet. Nach
+einem Neustart beginnt jede Session ein neues Segment; ein beim Absturz
+halb geschriebener Record am Segmentende wird beim Replay ignoriert.
+Replay & Snapshots: siehe snapshot.py
+"""
+import json
+import mmap
+import os
+import struct
+import threading
+import uuid
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from enum import IntEnum
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Tuple
+
+from ..core.config import settings
+from ..models.game import SpotifyTrack
+
+
+class EventType(IntEnum):
+    SESSION_CREATED = 1  # JSON: Session-Felder
+    PLAYER_JOINED = 2    # JSON: player_id, name, tokens
+    PLAYER_LEFT = 3      # PLAYER
+    DECK_SET = 4         # JSON: playlist_id(s), deck_order, Tracks in Deck-Reihenfolge
+    DECK_EXTENDED = 5    # JSON: neue Tracks + Zielpositionen (Fisher-Yates, balanced: Einfügen)
+    GAME_STARTED = 6     # JSON: started_at, turn_deadline
+    GUESS = 7            # GUESS
+    CARD_PLACED = 8      # CARD_PLACED
+    TRACK_ADVANCED = 9   # TRACK_ADVANCED
+    TURN_ADVANCED = 10   # TURN_ADVANCED
+    STATUS_CHANGED = 11  # STATUS
+    SESSION_DELETED = 12
+
+
+HEADER = struct.Struct("<BI")
+PLAYER = struct.Struct("<16s")
+GUESS = struct.Struct("<16sB")  # Spieler, Punkte
+CARD_PLACED = struct.Struct("<16sHBbB")  # Spieler, Position, korrekt, Token-Änderung, gewonnen
+TRACK_ADVANCED = struct.Struct("<IB")  # neuer Track-Index, Playlist zu Ende
+TURN_ADVANCED = struct.Struct("<16sIq")  # Spieler am Zug (0 = keiner), Runde, Deadline
+STATUS = struct.Struct("<B")
+
+STATUSES = ("waiting", "playing", "finished")
+NO_PLAYER = bytes(16)
+TRACK_FIELDS = (
+    "track_id", "title", "artist", "album", "release_date",
+    "decade", "duration_ms", "preview_url", "uri"
+)
+SEGMENT_SUFFIX = ".seg"
+SNAPSHOT_SUFFIX = ".snap"
+DELETED_MARKER = "DELETED"  # Session gelöscht, bei Recovery überspringen
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+
+
+# =====================================================
+# KODIERUNG
+# =====================================================
+
+def player_key(player_id: Optional[str]) -> bytes:
+    """player_id (UUID) -> 16 Byte"""
+    return uuid.UUID(player_id).bytes if player_id else NO_PLAYER
+
+
+def player_id_of(key: bytes) -> Optional[str]:
+    return str(uuid.UUID(bytes=bytes(key))) if key != NO_PLAYER else None
+
+
+def encode_time(value: Optional[datetime]) -> int:
+    """datetime -> Mikrosekunden seit 1970 (exakt umkehrbar, 0 = None)"""
+    return (value - _EPOCH) // _MICROSECOND if value is not None else 0
+
+
+def decode_time(value: int) -> Optional[datetime]:
+    return _EPOCH + timedelta(microseconds=value) if value else None
+
+
+def track_row(track: SpotifyTrack) -> List[Any]:
+    return [getattr(track, field) for field in TRACK_FIELDS]
+
+
+def track_from_row(row: List[Any]) -> SpotifyTrack:
+    return SpotifyTrack(**dict(zip(TRACK_FIELDS, row)))
+
+
+def pack_json(data: Dict) -> bytes:
+    return json.dumps(data, separators=(",", ":"), ensure_ascii=False).encode()
+
+
+# =====================================================
+# SCHREIBEN
+# =====================================================
+
+class _SessionWriter:
+    """Offenes Segment einer Session"""
+
+    __slots__ = ("directory", "segment", "offset", "file", "since_snapshot")
+
+    def __init__(self, directory: str, segment: int):
+        self.directory = directory
+        self.segment = segment
+        self.offset = 0
+        self.file: Optional[BinaryIO] = None
+        self.since_snapshot = 0
+
+    def path(self) -> str:
+        return os.path.join(self.directory, f"{self.segment:08d}{SEGMENT_SUFFIX}")
+
+
+class EventLog:
+    """
+    Segmentiertes Append-only Log, ein Ordner pro Session
+    """
+
+    def __init__(self, directory: str, segment_bytes: int = 1024 * 1024, snapshot_every: int = 200,
+                 fsync: bool = False, max_open_files: int = 256):
+        self.directory = directory
+        self.segment_bytes = segment_bytes
+        self.snapshot_every = snapshot_every
+        self.fsync = fsync
+        self.max_open_files = max_open_files
+        self._writers: Dict[str, _SessionWriter] = {}
+        self._open_files: "OrderedDict[str, _SessionWriter]" = OrderedDict()  # LRU der offenen Segmente
+        self._lock = threading.Lock()
+        self.stats = {"events": 0, "bytes": 0, "segments": 0, "snapshots": 0}
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.directory)
+
+    def session_dir(self, session_id: str) -> str:
+        return os.path.join(self.directory, session_id)
+
+    def append(self, session_id: str, event: EventType, payload: bytes = b"") -> bool:
+        """
+        Event anhängen (Flush pro Event: übersteht einen Prozess-Absturz)
+        Returns: True wenn ein Snapshot fällig ist
+        """
+        record = HEADER.pack(event, len(payload)) + payload
+        with self._lock:
+            writer = self._writer(session_id)
+            if writer.offset >= self.segment_bytes:
+                self._rotate(session_id, writer)
+            if writer.file is None:
+                self._open(session_id, writer)
+            self._open_files.move_to_end(session_id)
+            writer.file.write(record)
+            writer.file.flush()
+            if self.fsync:
+                os.fsync(writer.file.fileno())
+            writer.offset += len(record)
+            writer.since_snapshot += 1
+            self.stats["events"] += 1
+            self.stats["bytes"] += len(record)
+            return self.snapshot_every > 0 and writer.since_snapshot >= self.snapshot_every
+
+    def _writer(self, session_id: str) -> _SessionWriter:
+        writer = self._writers.get(session_id)
+        if writer is None:
+            directory = self.session_dir(session_id)
+            os.makedirs(directory, exist_ok=True)
+            segments = list_segments(directory)
+            # Nach Neustart immer ein neues Segment (nie hinter einen halben Record schreiben)
+            writer = _SessionWriter(directory, segments[-1][0] + 1 if segments else 1)
+            self.stats["segments"] += 1
+            self._writers[session_id] = writer
+        return writer
+
+    def _open(self, session_id: str, writer: _SessionWriter) -> None:
+        if len(self._open_files) >= self.max_open_files:
+            _, oldest = self._open_files.popitem(last=False)
+            oldest.file.close()
+            oldest.file = None
+        writer.file = open(writer.path(), "ab")
+        writer.offset = writer.file.tell()
+        self._open_files[session_id] = writer
+
+    def _rotate(self, session_id: str, writer: _SessionWriter) -> None:
+        if writer.file is not None:
+            writer.file.close()
+            writer.file = None
+            self._open_files.pop(session_id, None)
+        writer.segment += 1
+        writer.offset = 0
+        self.stats["segments"] += 1
+
+    def position(self, session_id: str) -> Tuple[int, int]:
+        """Aktuelles Log-Ende einer Session: (Segment, Offset)"""
+        with self._lock:
+            writer = self._writers.get(session_id)
+            return (writer.segment, writer.offset) if writer else (0, 0)
+
+    def write_snapshot(self, session_id: str, state: Dict, keep: int = 2) -> str:
+        """
+        Snapshot am aktuellen Log-Ende speichern (ältere bis auf `keep` löschen)
+        Returns: Pfad der Snapshot-Datei
+        """
+        with self._lock:
+            writer = self._writer(session_id)
+            segment, offset = writer.segment, writer.offset
+            writer.since_snapshot = 0
+
+        directory = self.session_dir(session_id)
+        path = os.path.join(directory, f"{segment:08d}-{offset:012d}{SNAPSHOT_SUFFIX}")
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(pack_json(state))
+            if self.fsync:
+                os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+        self.stats["snapshots"] += 1
+
+        for _, _, old_path in list_snapshots(directory)[:-keep]:
+            os.remove(old_path)
+        return path
+
+    def close(self, session_id: str, deleted: bool = False) -> None:
+        """
+        Segment einer Session schließen
+        deleted: nach SESSION_DELETED - Log bleibt für Post-Mortems, Recovery überspringt es
+        """
+        with self._lock:
+            writer = self._writers.pop(session_id, None)
+            self._open_files.pop(session_id, None)
+            if writer is not None and writer.file is not None:
+                writer.file.close()
+        if deleted and os.path.isdir(self.session_dir(session_id)):
+            open(os.path.join(self.session_dir(session_id), DELETED_MARKER), "wb").close()
+
+    def close_all(self) -> None:
+        with self._lock:
+            for writer in self._writers.values():
+                if writer.file is not None:
+                    writer.file.close()
+            self._writers.clear()
+            self._open_files.clear()
+
+    def session_ids(self) -> List[str]:
+        """Alle Sessions mit Log (für Recovery)"""
+        if not self.enabled or not os.path.isdir(self.directory):
+            return []
+        return sorted(entry.name for entry in os.scandir(self.directory) if entry.is_dir())
+
+
+# =====================================================
+# LESEN
+# =====================================================
+
+def list_segments(directory: str) -> List[Tuple[int, str]]:
+    """[(Segment-Nummer, Pfad)] aufsteigend"""
+    if not os.path.isdir(directory):
+        return []
+    return sorted(
+        (int(name[:-len(SEGMENT_SUFFIX)]), os.path.join(directory, name))
+        for name in os.listdir(directory) if name.endswith(SEGMENT_SUFFIX)
+    )
+
+
+def list_snapshots(directory: str) -> List[Tuple[int, int, str]]:
+    """[(Segment, Offset, Pfad)] aufsteigend"""
+    if not os.path.isdir(directory):
+        return []
+    snapshots = []
+    for name in os.listdir(directory):
+        if name.endswith(SNAPSHOT_SUFFIX):
+            segment, offset = name[:-len(SNAPSHOT_SUFFIX)].split("-")
+            snapshots.append((int(segment), int(offset), os.path.join(directory, name)))
+    return sorted(snapshots)
+
+
+def map_segment(path: str):
+    """
+    Segment read-only einblenden (leere Segmente: b"", mmap kann keine 0 Bytes)
+    """
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return b""
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def iter_events(directory: str) -> Iterator[Tuple[EventType, Dict]]:
+    """
+    Alle Events einer Session dekodiert (für Post-Mortems, nicht für Replay)
+    """
+    for _, path in list_segments(directory):
+        buffer = map_segment(path)
+        offset, end = 0, len(buffer)
+        while offset + HEADER.size <= end:
+            event, length = HEADER.unpack_from(buffer, offset)
+            start = offset + HEADER.size
+            if start + length > end:
+                break
+            yield EventType(event), decode_payload(EventType(event), buffer[start:start + length])
+            offset = start + length
+
+
+def decode_payload(event: EventType, payload: bytes) -> Dict:
+    if event == EventType.GUESS:
+        player, points = GUESS.unpack(payload)
+        return {"player_id": player_id_of(player), "points": points}
+    if event == EventType.CARD_PLACED:
+        player, position, correct, tokens, won = CARD_PLACED.unpack(payload)
+        return {"player_id": player_id_of(player), "position": position, "correct": bool(correct),
+                "token_delta": tokens, "won": bool(won)}
+    if event == EventType.TRACK_ADVANCED:
+        index, finished = TRACK_ADVANCED.unpack(payload)
+        return {"current_track_index": index, "finished": bool(finished)}
+    if event == EventType.TURN_ADVANCED:
+        player, round_number, deadline = TURN_ADVANCED.unpack(payload)
+        return {"current_player_turn": player_id_of(player), "round_number": round_number,
+                "turn_deadline": decode_time(deadline)}
+    if event == EventType.PLAYER_LEFT:
+        return {"player_id": player_id_of(PLAYER.unpack(payload)[0])}
+    if event == EventType.STATUS_CHANGED:
+        return {"status": STATUSES[STATUS.unpack(payload)[0]]}
+    return json.loads(payload) if payload else {}
+
+
+# Singleton Instance
+event_log = EventLog(
+    directory=settings.shard_path(settings.event_log_dir),
+    segment_bytes=settings.event_log_segment_kb * 1024,
+    snapshot_every=settings.event_log_snapshot_every,
+    fsync=settings.event_log_fsync,
+    max_open_files=settings.event_log_max_open_files
+)
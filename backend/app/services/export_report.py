@@ -0,0 +1,30 @@
+"""
+Auswertung exportierter Spiele (Kommandozeile)
+
+Start (im backend/ Ordner):
+    python -m app.services.export_report data/exports
+    python -m app.services.export_report --hardest 50 --min-placements 10
+
+Mit Shards (SHARD_COUNT > 1) liest der Bericht auch alle `<ordner>.shard-N` mit.
+"""
+import argparse
+import json
+
+from ..core.config import settings
+from .game_export import aggregate
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Exportierte Spiele auswerten")
+    parser.add_argument("directory", nargs="?", default=settings.game_export_dir)
+    parser.add_argument("--hardest", type=int, default=20, help="Anzahl schwerster Tracks")
+    parser.add_argument("--min-placements", type=int, default=5,
+                        help="Nur Tracks mit mindestens so vielen Platzierungen")
+    args = parser.parse_args()
+    if not args.directory:
+        parser.error("Kein Export-Ordner (Argument oder GAME_EXPORT_DIR)")
+    print(json.dumps(aggregate(args.directory, args.hardest, args.min_placements), indent=2, default=str))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,413 @@
+"""
+Game Export - Beendete Spiele spaltenweise für Auswertungen sichern
+
+Der GameService sammelt pro laufendem Spiel Guesses & Platzierungen in einem
+GameRecord. Ist das Spiel beendet (Sieg oder Playlist leer), landet der
+Record in einer Queue; ein Hintergrund-Thread schreibt gesammelte Records als
+Arrow Record Batches - nie im Request-Pfad.
+
+Layout (eine Tabelle pro Ordner, Arrow IPC Stream-Format):
+    {game_export_dir}/games/games-20240301-181500-0001.arrows
+    {game_export_dir}/placements/...
+    {game_export_dir}/guesses/...
+Neue Datei ab game_export_rotate_mb und nach jedem Neustart. Eine beim
+Absturz halb geschriebene Datei ist bis zum letzten vollständigen Batch lesbar.
+
+Auswertung offline: read_table / aggregate (samt `data/exports.shard-N`), oder
+    python -m app.services.export_report data/exports
+pyarrow wird erst beim ersten Schreiben/Lesen importiert.
+"""
+import glob
+import os
+import queue
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..core.config import settings
+
+
+TABLES = ("games", "placements", "guesses")
+SUFFIX = ".arrows"
+
+_STOP = object()
+
+
+def _schemas():
+    import pyarrow as pa
+
+    return {
+        "games": pa.schema([
+            ("game_id", pa.string()),
+            ("game_mode", pa.string()),
+            ("started_at", pa.timestamp("us")),
+            ("finished_at", pa.timestamp("us")),
+            ("duration_s", pa.float64()),
+            ("reason", pa.string()),  # won | deck_exhausted
+            ("players", pa.int16()),
+            ("rounds", pa.int32()),
+            ("deck_size", pa.int32()),
+            ("tracks_played", pa.int32()),
+            ("placements", pa.int32()),
+            ("correct_placements", pa.int32()),
+            ("guesses", pa.int32()),
+            ("winner_id", pa.string())
+        ]),
+        "placements": pa.schema([
+            ("game_id", pa.string()),
+            ("game_mode", pa.string()),
+            ("round", pa.int32()),
+            ("player_id", pa.string()),
+            ("track_id", pa.string()),
+            ("release_year", pa.int16()),
+            ("position", pa.int32()),
+            ("timeline_length", pa.int16()),  # Karten vor dem Einsortieren
+            ("correct", pa.bool_()),
+            ("earned_token", pa.bool_())
+        ]),
+        "guesses": pa.schema([
+            ("game_id", pa.string()),
+            ("game_mode", pa.string()),
+            ("round", pa.int32()),
+            ("player_id", pa.string()),
+            ("track_id", pa.string()),
+            ("correct_title", pa.bool_()),
+            ("correct_artist", pa.bool_()),
+            ("correct_decade", pa.bool_()),
+            ("points", pa.int8())
+        ])
+    }
+
+
+# =====================================================
+# AUFZEICHNUNG (im Request-Pfad, nur Tupel anhängen)
+# =====================================================
+
+class GameRecord:
+    """
+    Verlauf eines laufenden Spiels
+    """
+
+    __slots__ = ("game_id", "game_mode", "started_at", "placements", "guesses", "summary")
+
+    def __init__(self, game_id: str, game_mode: str, started_at: datetime):
+        self.game_id = game_id
+        self.game_mode = game_mode
+        self.started_at = started_at
+        # (round, player_id, track_id, release_year, position, timeline_length, correct, earned_token)
+        self.placements: List[Tuple] = []
+        # (round, player_id, track_id, correct_title, correct_artist, correct_decade, points)
+        self.guesses: List[Tuple] = []
+        self.summary: Dict[str, Any] = {}
+
+    def add_placement(self, round_number: int, player_id: str, track_id: str, release_year: int,
+                      position: int, timeline_length: int, correct: bool, earned_token: bool) -> None:
+        self.placements.append((round_number, player_id, track_id, release_year,
+                                position, timeline_length, correct, earned_token))
+
+    def add_guess(self, round_number: int, player_id: str, track_id: str, correct_title: bool,
+                  correct_artist: bool, correct_decade: bool, points: int) -> None:
+        self.guesses.append((round_number, player_id, track_id, correct_title,
+                             correct_artist, correct_decade, points))
+
+    def finish(self, reason: str, players: int, rounds: int, deck_size: int,
+               tracks_played: int, winner_id: Optional[str]) -> "GameRecord":
+        finished_at = datetime.now()
+        self.summary = {
+            "finished_at": finished_at,
+            "duration_s": (finished_at - self.started_at).total_seconds(),
+            "reason": reason,
+            "players": players,
+            "rounds": rounds,
+            "deck_size": deck_size,
+            "tracks_played": tracks_played,
+            "winner_id": winner_id
+        }
+        return self
+
+
+def _columns(records: List[GameRecord]) -> Dict[str, Dict[str, list]]:
+    """Records -> Spalten pro Tabelle"""
+    games: Dict[str, list] = {name: [] for name in (
+        "game_id", "game_mode", "started_at", "finished_at", "duration_s", "reason", "players", "rounds",
+        "deck_size", "tracks_played", "placements", "correct_placements", "guesses", "winner_id"
+    )}
+    placement_names = ("round", "player_id", "track_id", "release_year", "position",
+                       "timeline_length", "correct", "earned_token")
+    guess_names = ("round", "player_id", "track_id", "correct_title", "correct_artist",
+                   "correct_decade", "points")
+    placements: Dict[str, list] = {"game_id": [], "game_mode": [], **{name: [] for name in placement_names}}
+    guesses: Dict[str, list] = {"game_id": [], "game_mode": [], **{name: [] for name in guess_names}}
+
+    for record in records:
+        summary = record.summary
+        for name, value in (
+            ("game_id", record.game_id), ("game_mode", record.game_mode), ("started_at", record.started_at),
+            ("placements", len(record.placements)),
+            ("correct_placements", sum(1 for row in record.placements if row[6])),
+            ("guesses", len(record.guesses))
+        ):
+            games[name].append(value)
+        for name in ("finished_at", "duration_s", "reason", "players", "rounds",
+                     "deck_size", "tracks_played", "winner_id"):
+            games[name].append(summary[name])
+
+        for table, rows, names in ((placements, record.placements, placement_names),
+                                   (guesses, record.guesses, guess_names)):
+            table["game_id"].extend([record.game_id] * len(rows))
+            table["game_mode"].extend([record.game_mode] * len(rows))
+            for name, values in zip(names, zip(*rows)):
+                table[name].extend(values)
+    return {"games": games, "placements": placements, "guesses": guesses}
+
+
+# =====================================================
+# SCHREIBEN (Hintergrund-Thread)
+# =====================================================
+
+class _TableWriter:
+    """Offene Arrow-Datei einer Tabelle, rotiert ab rotate_bytes"""
+
+    def __init__(self, directory: str, table: str, schema, rotate_bytes: int):
+        self.directory = os.path.join(directory, table)
+        self.table = table
+        self.schema = schema
+        self.rotate_bytes = rotate_bytes
+        self.sequence = 0
+        self.sink = None
+        self.writer = None
+
+    def write(self, batch) -> None:
+        import pyarrow as pa
+
+        if self.writer is None:
+            os.makedirs(self.directory, exist_ok=True)
+            self.sequence += 1
+            name = f"{self.table}-{datetime.now():%Y%m%d-%H%M%S}-{self.sequence:04d}{SUFFIX}"
+            self.sink = pa.OSFile(os.path.join(self.directory, name), "wb")
+            self.writer = pa.ipc.new_stream(self.sink, self.schema)
+        self.writer.write_batch(batch)
+        self.sink.flush()
+        if self.sink.tell() >= self.rotate_bytes:
+            self.close()
+
+    def close(self) -> None:
+        if self.writer is not None:
+            self.writer.close()
+            self.sink.close()
+            self.writer = None
+            self.sink = None
+
+
+class GameExporter:
+    """
+    Queue + Hintergrund-Thread, der beendete Spiele batchweise schreibt
+    Ein Batch wird geschrieben, sobald `batch_games` Spiele warten oder
+    der älteste wartende Record `flush_seconds` alt ist.
+    """
+
+    def __init__(self, directory: str, batch_games: int = 50, flush_seconds: float = 30.0,
+                 rotate_bytes: int = 64 * 1024 * 1024, queue_max: int = 10000):
+        self.directory = directory
+        self.batch_games = max(1, batch_games)
+        self.flush_seconds = flush_seconds
+        self.rotate_bytes = rotate_bytes
+        self._queue: "queue.Queue" = queue.Queue(maxsize=queue_max)
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self.stats = {"queued": 0, "dropped": 0, "games": 0, "batches": 0, "errors": 0}
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.directory)
+
+    def submit(self, record: GameRecord) -> bool:
+        """
+        Beendetes Spiel einreihen (blockiert nie)
+        Returns: False wenn die Queue voll ist (Record wird verworfen)
+        """
+        self._ensure_thread()
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            self.stats["dropped"] += 1
+            return False
+        self.stats["queued"] += 1
+        return True
+
+    def flush(self, timeout: float = 10.0) -> bool:
+        """
+        Wartende Records sofort schreiben und darauf warten (Tests, Shutdown)
+        """
+        if self._thread is None or not self._thread.is_alive():
+            return True
+        done = threading.Event()
+        self._queue.put(done)
+        return done.wait(timeout)
+
+    def stop(self, timeout: float = 10.0) -> None:
+        """Rest schreiben, Dateien schließen, Thread beenden"""
+        with self._lock:
+            thread = self._thread
+            self._thread = None
+        if thread is not None and thread.is_alive():
+            self._queue.put(_STOP)
+            thread.join(timeout)
+
+    def snapshot(self) -> Dict:
+        return {**self.stats, "pending": self._queue.qsize()}
+
+    def _ensure_thread(self) -> None:
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="game-export", daemon=True)
+                self._thread.start()
+
+    def _run(self) -> None:
+        writers: Dict[str, _TableWriter] = {}
+        pending: List[GameRecord] = []
+        deadline = 0.0
+        while True:
+            timeout = max(deadline - time.monotonic(), 0.0) if pending else None
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None  # Zeit abgelaufen
+
+            if isinstance(item, GameRecord):
+                if not pending:
+                    deadline = time.monotonic() + self.flush_seconds
+                pending.append(item)
+                if len(pending) < self.batch_games:
+                    continue
+
+            if pending:
+                self._write(writers, pending)
+                pending = []
+            if isinstance(item, threading.Event):
+                item.set()
+            elif item is _STOP:
+                break
+
+        for writer in writers.values():
+            writer.close()
+
+    def _write(self, writers: Dict[str, _TableWriter], records: List[GameRecord]) -> None:
+        try:
+            import pyarrow as pa
+
+            if not writers:
+                for table, schema in _schemas().items():
+                    writers[table] = _TableWriter(self.directory, table, schema, self.rotate_bytes)
+            for table, columns in _columns(records).items():
+                writer = writers[table]
+                batch = pa.RecordBatch.from_pydict(columns, schema=writer.schema)
+                if batch.num_rows:
+                    writer.write(batch)
+            self.stats["games"] += len(records)
+            self.stats["batches"] += 1
+        except Exception as e:
+            self.stats["errors"] += 1
+            print(f"⚠️ Game Export fehlgeschlagen ({len(records)} Spiele verworfen): {e}")
+
+
+# =====================================================
+# LESEN & AUSWERTEN (offline)
+# =====================================================
+
+def shard_dirs(directory: str) -> List[str]:
+    """
+    Export-Ordner samt der Ordner aller Shards (`settings.shard_path`: `<ordner>.shard-N`)
+    """
+    root, ext = os.path.splitext(directory.rstrip("/\\"))
+    shards = glob.glob(f"{glob.escape(root)}.shard-*{glob.escape(ext)}")
+    return [directory] + sorted(path for path in shards if os.path.isdir(path))
+
+
+def list_files(directory: str, table: str) -> List[str]:
+    files = []
+    for base in shard_dirs(directory):
+        folder = os.path.join(base, table)
+        if os.path.isdir(folder):
+            files.extend(sorted(os.path.join(folder, name) for name in os.listdir(folder) if name.endswith(SUFFIX)))
+    return files
+
+
+def read_table(directory: str, table: str):
+    """
+    Alle Dateien einer Tabelle als pyarrow.Table (halb geschriebene bis zum letzten vollständigen Batch)
+    """
+    import pyarrow as pa
+
+    if table not in TABLES:
+        raise ValueError(f"Unbekannte Tabelle: {table}")
+    schema = _schemas()[table]
+    batches = []
+    for path in list_files(directory, table):
+        with pa.OSFile(path, "rb") as source:
+            try:
+                reader = pa.ipc.open_stream(source)
+                while True:
+                    batches.append(reader.read_next_batch())
+            except StopIteration:
+                pass
+            except (OSError, pa.ArrowInvalid):
+                pass  # abgeschnittenes Ende (Absturz beim Schreiben)
+    return pa.Table.from_batches(batches, schema=schema)
+
+
+def aggregate(directory: str, hardest: int = 20, min_placements: int = 5) -> Dict:
+    """
+    Kennzahlen über alle exportierten Spiele:
+    Spiel-Länge & Guess-Trefferquote pro GameMode, schwerste Tracks (Platzierung)
+    """
+    import pyarrow.compute as pc
+
+    games = read_table(directory, "games")
+    guesses = read_table(directory, "guesses")
+    placements = read_table(directory, "placements")
+
+    def by_mode(table, aggregations):
+        if table.num_rows == 0:
+            return {}
+        grouped = table.group_by("game_mode").aggregate(aggregations)
+        return {row.pop("game_mode"): row for row in grouped.to_pylist()}
+
+    length = by_mode(games, [
+        ("game_id", "count"), ("duration_s", "mean"), ("rounds", "mean"),
+        ("tracks_played", "mean"), ("placements", "mean")
+    ])
+    accuracy = by_mode(guesses, [
+        ("correct_title", "mean"), ("correct_artist", "mean"), ("correct_decade", "mean"), ("points", "mean")
+    ])
+
+    tracks: List[Dict] = []
+    if placements.num_rows:
+        per_track = placements.group_by(["track_id", "release_year"]).aggregate([
+            ("correct", "mean"), ("correct", "count")
+        ])
+        per_track = per_track.filter(pc.greater_equal(per_track["correct_count"], min_placements))
+        per_track = per_track.sort_by([("correct_mean", "ascending"), ("correct_count", "descending")])
+        tracks = per_track.slice(0, hardest).to_pylist()
+
+    return {
+        "games": games.num_rows,
+        "placements": placements.num_rows,
+        "guesses": guesses.num_rows,
+        "game_length_by_mode": length,
+        "guess_accuracy_by_mode": accuracy,
+        "hardest_tracks": tracks
+    }
+
+
+# Singleton Instance
+game_exporter = GameExporter(
+    directory=settings.shard_path(settings.game_export_dir),
+    batch_games=settings.game_export_batch_games,
+    flush_seconds=settings.game_export_flush_s,
+    rotate_bytes=settings.game_export_rotate_mb * 1024 * 1024,
+    queue_max=settings.game_export_queue_max
+)
@@ -1,9 +1,14 @@
 """
 Game Service - Spiel-Logik & Session Management
 """
+import contextvars
+import random
 import uuid
-from typing import Dict, List, Optional
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, TypeVar
+from datetime import datetime, timedelta
+from ..core.config import settings
+from ..core.sharding import new_session_id
 from ..models.game import (
     GameSession,
     Player,
@@ -13,29 +18,94 @@ from ..models.game import (
     TimelineCard,
     PlacementRequest,
     PlacementResult,
-    GameMode
+    GameMode,
+    DeckOrder
 )
-from .spotify_service import spotify_service
+from .deck_builder import DeckBuilder
+from .deck_table import DeckTable, parse_decade
+from .event_log import (
+    CARD_PLACED,
+    GUESS,
+    PLAYER,
+    STATUS,
+    STATUSES,
+    TRACK_ADVANCED,
+    TURN_ADVANCED,
+    EventLog,
+    EventType,
+    encode_time,
+    event_log as default_event_log,
+    pack_json,
+    player_key,
+    track_row
+)
+from .game_export import GameExporter, GameRecord, game_exporter as default_game_exporter
+from .preview_cache import preview_cache
+from .search_index import normalize_text, track_search
+from .snapshot import capture_session, session_fields
+from .spotify_service import PlaylistStream, spotify_service
+from .track_stats import TrackStats, track_stats as default_track_stats
+from .tracing import trace_methods
+
 
+T = TypeVar("T")
 
+
+@trace_methods("service")
 class GameService:
     """
     Game Service
     Verwaltet Sessions, Spieler, Scores und Spiel-Logik
     """
     
-    def __init__(self):
+    def __init__(
+        self,
+        event_log: Optional[EventLog] = None,
+        exporter: Optional[GameExporter] = None,
+        track_stats: Optional[TrackStats] = None
+    ):
         # In-Memory Storage (später durch DB ersetzen)
         self.sessions: Dict[str, GameSession] = {}
         self.players: Dict[str, List[Player]] = {}  # session_id -> [players]
         self.track_queues: Dict[str, List[SpotifyTrack]] = {}  # session_id -> [tracks]
         self.solutions: Dict[str, SpotifyTrack] = {}  # session_id -> current_track
+        self.deck_builders: Dict[str, DeckBuilder] = {}  # session_id -> Duplikat-Filter des Decks
+        self.deck_tables: Dict[str, DeckTable] = {}  # session_id -> Jahr/Jahrzehnt-Spalten des Decks
+        # Append-only Log aller Mutationen (aus, wenn event_log_dir leer ist)
+        self.event_log = event_log if event_log is not None else default_event_log
+        # Verlauf laufender Spiele, nach Spielende an den Export (aus, wenn game_export_dir leer ist)
+        self.exporter = exporter if exporter is not None else default_game_exporter
+        self.game_records: Dict[str, GameRecord] = {}
+        # Schwierigkeit pro Track über alle Spiele (für deck_order)
+        self.track_stats = track_stats if track_stats is not None else default_track_stats
+    
+    def _log(self, session_id: str, event: EventType, payload: Callable[[], bytes] = bytes) -> None:
+        """
+        Mutation ins Event Log schreiben (Payload wird nur bei aktivem Log gebaut)
+        Alle event_log_snapshot_every Events folgt ein Snapshot der Session
+        (nicht nach SESSION_DELETED - dann ist der Zustand schon entfernt)
+        """
+        if not self.event_log.enabled:
+            return
+        if self.event_log.append(session_id, event, payload()) and session_id in self.sessions:
+            self.event_log.write_snapshot(session_id, capture_session(self, session_id))
     
-    def create_session(self, host_name: str, playlist_id: Optional[str] = None, game_mode: GameMode = GameMode.ORIGINAL) -> GameSession:
+    def _log_player_joined(self, session_id: str, player: Player) -> None:
+        self._log(session_id, EventType.PLAYER_JOINED, lambda: pack_json({
+            "player_id": player.player_id, "name": player.name, "tokens": player.tokens
+        }))
+    
+    def create_session(
+        self,
+        host_name: str,
+        playlist_id: Optional[str] = None,
+        game_mode: GameMode = GameMode.ORIGINAL,
+        turn_time_limit: Optional[int] = None
+    ) -> GameSession:
         """
         Erstelle neue Game Session
         """
-        session_id = str(uuid.uuid4())
+        session_id = new_session_id()
         
         # Token-Anzahl je nach Modus
         token_count = {
@@ -53,11 +123,13 @@ class GameService:
             status="waiting",
             game_mode=game_mode,
             win_condition=10,
-            round_number=0
+            round_number=0,
+            turn_time_limit=settings.turn_time_limit_seconds if turn_time_limit is None else turn_time_limit
         )
         
         self.sessions[session_id] = session
         self.players[session_id] = []
+        self._log(session_id, EventType.SESSION_CREATED, lambda: pack_json(session_fields(session)))
         
         # Host automatisch als ersten Spieler hinzufügen
         host_player = Player(
@@ -71,6 +143,7 @@ class GameService:
         )
         self.players[session_id].append(host_player)
         
+        self._log_player_joined(session_id, host_player)
         return session
     
     def add_player(self, session_id: str, player_name: str) -> Player:
@@ -102,6 +175,7 @@ class GameService:
         )
         
         self.players[session_id].append(player)
+        self._log_player_joined(session_id, player)
         return player
     
     def remove_player(self, session_id: str, player_id: str) -> bool:
@@ -122,6 +196,7 @@ class GameService:
         
         if removed:
             print(f"🚪 Spieler {player_id} aus Session {session_id} entfernt")
+            self._log(session_id, EventType.PLAYER_LEFT, lambda: PLAYER.pack(player_key(player_id)))
             # Prüfe ob Host entfernt wurde (erster Spieler)
             if initial_count > 0 and len(self.players[session_id]) == 0:
                 print(f"⚠️ Letzter Spieler verlassen - lösche Session")
@@ -141,30 +216,261 @@ class GameService:
         self.players.pop(session_id, None)
         self.track_queues.pop(session_id, None)
         self.solutions.pop(session_id, None)
+        self.deck_builders.pop(session_id, None)
+        self.deck_tables.pop(session_id, None)
+        self.game_records.pop(session_id, None)
+        spotify_service.release_client(session_id)
+        track_search.drop_session(session_id)
+        self._log(session_id, EventType.SESSION_DELETED)
+        if self.event_log.enabled:
+            self.event_log.close(session_id, deleted=True)
         
         print(f"🗑️ Session {session_id} gelöscht")
         return True
     
-    def load_playlist(self, session_id: str, playlist_id: str) -> int:
+    def load_playlist(self, session_id: str, playlist_id: str, deck_order: DeckOrder = DeckOrder.SHUFFLE) -> int:
         """
         Lade Playlist und mische Tracks
         Returns: Anzahl der Tracks
         """
+        return self.load_playlists(session_id, [playlist_id], deck_order)
+    
+    def load_playlists(
+        self,
+        session_id: str,
+        playlist_ids: List[str],
+        deck_order: DeckOrder = DeckOrder.SHUFFLE
+    ) -> int:
+        """
+        Lade mehrere Playlists parallel und mische sie zu einem Deck ohne Duplikate
+        Returns: Anzahl der Tracks
+        """
+        tracks = self.fetch_playlist_tracks(session_id, playlist_ids)
+        return self.set_playlist_deck(session_id, playlist_ids, tracks, deck_order)
+    
+    def fetch_playlist_tracks(self, session_id: str, playlist_ids: List[str]) -> List[SpotifyTrack]:
+        """
+        Alle Tracks mehrerer Playlists von Spotify laden (parallel, Reihenfolge bleibt erhalten)
+        Blockiert (Spotify) - im Threadpool aufrufen, das Deck setzt set_playlist_deck im Event-Loop
+        """
+        if session_id not in self.sessions:
+            raise ValueError(f"Session {session_id} nicht gefunden")
+        
+        # Playlists von Spotify laden (mit dem Spotify-Login des Hosts, falls vorhanden)
+        playlists = self._fetch_playlists(
+            lambda playlist_id: spotify_service.get_playlist_tracks(playlist_id, owner=session_id),
+            playlist_ids
+        )
+        return [track for playlist in playlists for track in playlist.tracks]
+    
+    def set_playlist_deck(
+        self,
+        session_id: str,
+        playlist_ids: List[str],
+        tracks: List[SpotifyTrack],
+        deck_order: DeckOrder = DeckOrder.SHUFFLE
+    ) -> int:
+        """
+        Geladene Tracks mehrerer Playlists als ein Deck ohne Duplikate setzen
+        Returns: Anzahl der Tracks
+        """
+        if session_id not in self.sessions:
+            raise ValueError(f"Session {session_id} nicht gefunden")  # während des Ladens gelöscht
+        
+        builder = self._deck_builder(playlist_ids, deck_order)
+        return self.set_deck(session_id, playlist_ids[0], tracks, builder, deck_order)
+    
+    def fetch_playlist_streams(self, session_id: str, playlist_ids: List[str]) -> List[PlaylistStream]:
+        """
+        Lade nur die erste Page jeder Playlist (ein API Request pro Playlist, parallel)
+        Blockiert (Spotify) - im Threadpool aufrufen, das Deck setzt set_stream_deck im Event-Loop
+        Returns: ein Stream pro Playlist
+        """
         if session_id not in self.sessions:
             raise ValueError(f"Session {session_id} nicht gefunden")
         
-        # Playlist von Spotify laden
-        playlist_info = spotify_service.get_playlist_tracks(playlist_id)
+        return self._fetch_playlists(
+            lambda playlist_id: spotify_service.open_playlist_stream(playlist_id, owner=session_id),
+            playlist_ids
+        )
+    
+    def set_stream_deck(
+        self,
+        session_id: str,
+        playlist_ids: List[str],
+        streams: List[PlaylistStream],
+        deck_order: DeckOrder = DeckOrder.SHUFFLE
+    ) -> DeckBuilder:
+        """
+        Erste Pages der Streams als Deck setzen, die restlichen Pages kommen über extend_deck dazu
+        Returns: Duplikat-Filter des Decks
+        """
+        if session_id not in self.sessions:
+            raise ValueError(f"Session {session_id} nicht gefunden")  # während des Ladens gelöscht
+        
+        builder = self._deck_builder(playlist_ids, deck_order)
+        tracks = [track for stream in streams for track in stream.info.tracks]
+        self.set_deck(session_id, playlist_ids[0], tracks, builder, deck_order)
+        return builder
+    
+    def _deck_builder(self, playlist_ids: List[str], deck_order: DeckOrder) -> DeckBuilder:
+        """
+        Duplikat-Filter des Decks (bei SKIP_BAD_YEARS ohne Tracks mit bekannt falschem Jahr)
+        """
+        return DeckBuilder(playlist_ids, exclude=self.track_stats.exclude(deck_order))
+    
+    def _fetch_playlists(self, fetch: Callable[[str], T], playlist_ids: List[str]) -> List[T]:
+        """
+        Spotify-Requests für mehrere Playlists parallel (Reihenfolge bleibt erhalten)
+        """
+        if not playlist_ids:
+            raise ValueError("Keine Playlist angegeben")
+        if len(playlist_ids) == 1:
+            return [fetch(playlist_ids[0])]
+        
+        workers = min(len(playlist_ids), settings.playlist_fetch_workers)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            # Kontext pro Aufruf kopieren - Spotify-Spans hängen am Trace des Requests
+            futures = [executor.submit(contextvars.copy_context().run, fetch, playlist_id)
+                       for playlist_id in playlist_ids]
+            return [future.result() for future in futures]
+    
+    def set_deck(
+        self,
+        session_id: str,
+        playlist_id: str,
+        tracks: List[SpotifyTrack],
+        builder: Optional[DeckBuilder] = None,
+        deck_order: DeckOrder = DeckOrder.SHUFFLE
+    ) -> int:
+        """
+        Filtere Duplikate & ungültige Tracks, mische und setze sie als Deck der Session
+        deck_order=BALANCED verteilt danach die Schwierigkeit (Track-Statistik) gleichmäßig
+        Returns: Anzahl der Tracks
+        """
+        if builder is None:
+            builder = self._deck_builder([playlist_id], deck_order)
         
-        # Tracks mischen
-        shuffled_tracks = spotify_service.shuffle_tracks(playlist_info.tracks)
+        # Duplikate raus, dann mischen
+        shuffled_tracks = spotify_service.shuffle_tracks(builder.filter(tracks))
+        shuffled_tracks = self.track_stats.order(shuffled_tracks, deck_order)
         
         # Speichern
         self.track_queues[session_id] = shuffled_tracks
-        self.sessions[session_id].playlist_id = playlist_id
+        self.deck_builders[session_id] = builder
+        self.deck_tables[session_id] = DeckTable(shuffled_tracks)
+        session = self.sessions[session_id]
+        session.playlist_id = playlist_id
+        session.playlist_ids = builder.playlist_ids
+        session.deck_order = deck_order
+        
+        # Autocomplete-Index über das Deck
+        track_search.index_session(session_id, shuffled_tracks)
         
+        self._log(session_id, EventType.DECK_SET, lambda: pack_json({
+            "playlist_id": playlist_id,
+            "playlist_ids": session.playlist_ids,
+            "deck_order": deck_order.value,
+            "tracks": [track_row(track) for track in shuffled_tracks]
+        }))
         return len(shuffled_tracks)
     
+    def extend_deck(self, session_id: str, tracks: List[SpotifyTrack]) -> int:
+        """
+        Füge nachgeladene Tracks fair ins Deck ein (Inside-Out Fisher-Yates)
+        Duplikate zum bisherigen Deck werden vorher verworfen.
+        
+        Jeder neue Track landet gleichverteilt auf einer noch nicht gespielten
+        Position; der verdrängte Track wandert ans Ende. Bereits gespielte und
+        vorab gepushte Tracks (current + prefetch) bleiben unverändert.
+        
+        deck_order=BALANCED: die neuen Tracks werden unter sich balanciert und
+        in gleichen Abständen in den ungespielten Rest eingefädelt - jeder
+        Abschnitt des Decks bleibt gemischt leicht & schwer (zufällig verteilte
+        Positionen würden die Balance mit jeder Page weiter auflösen).
+        Returns: Neue Deck-Größe
+        """
+        if session_id not in self.track_queues:
+            raise ValueError(f"Session {session_id} hat kein Deck")
+        
+        builder = self.deck_builders.get(session_id)
+        if builder is not None:
+            tracks = builder.filter(tracks)
+        
+        deck = self.track_queues[session_id]
+        session = self.sessions[session_id]
+        protected = 0
+        if session.status != "waiting":
+            protected = min(session.current_track_index + 1 + settings.prefetch_track_count, len(deck))
+        
+        balanced = session.deck_order == DeckOrder.BALANCED
+        if balanced:
+            tracks = self.track_stats.order(tracks, DeckOrder.BALANCED)
+            positions = self._interleave(deck, protected, tracks)
+        else:
+            positions = []
+            for track in tracks:
+                j = random.randint(protected, len(deck))
+                positions.append(j)
+                if j == len(deck):
+                    deck.append(track)
+                else:
+                    deck.append(deck[j])
+                    deck[j] = track
+        
+        if tracks:
+            # positions: Tauschpositionen (Fisher-Yates) bzw. Einfügepositionen (balanced)
+            self._log(session_id, EventType.DECK_EXTENDED, lambda: pack_json({
+                "tracks": [track_row(track) for track in tracks], "positions": positions,
+                "insert": balanced
+            }))
+        self._deck_table(session_id).add(tracks)
+        track_search.add_tracks(session_id, tracks)
+        return len(deck)
+    
+    @staticmethod
+    def _interleave(deck: List[SpotifyTrack], start: int, tracks: List[SpotifyTrack]) -> List[int]:
+        """
+        Füge `tracks` ab `start` in gleichen Abständen (zufälliger Versatz) ins Deck ein
+        Returns: Positionen der neuen Tracks im fertigen Deck (aufsteigend)
+        """
+        if not tracks:
+            return []
+        total = len(deck) - start + len(tracks)
+        offset = random.random()
+        positions = [start + int((idx + offset) * total / len(tracks)) for idx in range(len(tracks))]
+        
+        rest = iter(deck[start:])
+        merged: List[SpotifyTrack] = []
+        for track, position in zip(tracks, positions):
+            while start + len(merged) < position:
+                merged.append(next(rest))
+            merged.append(track)
+        merged.extend(rest)
+        deck[start:] = merged
+        return positions
+    
+    def _deck_table(self, session_id: str) -> DeckTable:
+        """
+        Jahr/Jahrzehnt-Spalten des Decks (für direkt gesetzte Decks beim ersten Zugriff gebaut)
+        """
+        table = self.deck_tables.get(session_id)
+        if table is None:
+            table = DeckTable(self.track_queues.get(session_id, []))
+            self.deck_tables[session_id] = table
+        return table
+    
+    def get_deck_stats(self, session_id: str) -> Dict:
+        """
+        Jahres-Statistik des Decks (Histogramm, Spannweite, Dichte gleicher Jahre)
+        """
+        if session_id not in self.sessions:
+            raise ValueError(f"Session {session_id} nicht gefunden")
+        if session_id not in self.track_queues:
+            raise ValueError("Keine Tracks geladen")
+        
+        return {"session_id": session_id, **self._deck_table(session_id).stats()}
+    
     def start_game(self, session_id: str) -> Dict:
         """
         Starte das Spiel
@@ -192,11 +498,22 @@ class GameService:
         # Ersten Spieler setzen
         if len(players) > 0:
             session.current_player_turn = players[0].player_id
+        self._reset_turn_deadline(session)
         
         # Ersten Track für Gameplay laden (nicht die Start-Karten)
         if session.current_track_index < len(self.track_queues[session_id]):
             current_track = self.track_queues[session_id][session.current_track_index]
             self.solutions[session_id] = current_track
+            self._prefetch_previews(session_id)
+        
+        if self.exporter.enabled:
+            self.game_records[session_id] = GameRecord(session_id, session.game_mode.value, session.started_at)
+        
+        # Erst nach allen Änderungen loggen (ein fälliger Snapshot sieht den fertigen Zustand)
+        self._log(session_id, EventType.GAME_STARTED, lambda: pack_json({
+            "started_at": encode_time(session.started_at),
+            "turn_deadline": encode_time(session.turn_deadline)
+        }))
         
         return {
             "session_id": session_id,
@@ -210,7 +527,8 @@ class GameService:
                 "uri": current_track.uri,
                 "duration_ms": current_track.duration_ms
                 # KEINE Lösung senden!
-            }
+            },
+            "upcoming": self.get_upcoming_tracks(session_id)
         }
     
     def get_current_track_for_playback(self, session_id: str) -> Dict:
@@ -233,7 +551,8 @@ class GameService:
             "uri": current_track.uri,
             "duration_ms": current_track.duration_ms,
             "track_number": session.current_track_index + 1,
-            "total_tracks": len(tracks)
+            "total_tracks": len(tracks),
+            "upcoming": self.get_upcoming_tracks(session_id)
         }
     
     def check_guess(self, guess: GuessRequest) -> GuessResult:
@@ -259,7 +578,7 @@ class GameService:
             correct_artist = self._fuzzy_match(guess.artist_guess, solution.artist)
         
         if guess.decade_guess:
-            correct_decade = guess.decade_guess.strip() == solution.decade
+            correct_decade = parse_decade(guess.decade_guess) == self._deck_table(session_id).decade(solution)
         
         # Punkte berechnen
         points = 0
@@ -270,10 +589,20 @@ class GameService:
         if correct_decade:
             points += 1
         
+        self.track_stats.record_guess(
+            solution.track_id, correct_title, correct_artist,
+            correct_decade if guess.decade_guess else None
+        )
+        
         # Spieler-Score updaten
         player = self._find_player(session_id, guess.player_id)
         if player:
             player.score += points
+            self._log(session_id, EventType.GUESS, lambda: GUESS.pack(player_key(player.player_id), points))
+            record = self.game_records.get(session_id)
+            if record is not None:
+                record.add_guess(self.sessions[session_id].round_number, player.player_id, solution.track_id,
+                                 correct_title, correct_artist, correct_decade, points)
         
         return GuessResult(
             correct_title=correct_title,
@@ -302,6 +631,9 @@ class GameService:
         
         if session.current_track_index >= len(tracks):
             session.status = "finished"
+            session.turn_deadline = None
+            self._log_track_advanced(session, True)
+            self._export_game(session_id, "deck_exhausted")
             return {
                 "status": "finished",
                 "message": "Alle Songs gespielt!",
@@ -311,18 +643,133 @@ class GameService:
         # Nächsten Track laden
         current_track = tracks[session.current_track_index]
         self.solutions[session_id] = current_track
+        self._prefetch_previews(session_id)
+        self._log_track_advanced(session, False)
+        
+        # Nächster Spieler ist am Zug
+        self.advance_turn(session_id)
         
         return {
             "status": "playing",
             "track_number": session.current_track_index + 1,
             "total_tracks": len(tracks),
+            "current_player": session.current_player_turn,
+            "round_number": session.round_number,
             "track": {
                 "track_id": current_track.track_id,
                 "uri": current_track.uri,
                 "duration_ms": current_track.duration_ms
-            }
+            },
+            "upcoming": self.get_upcoming_tracks(session_id)
         }
     
+    def advance_turn(self, session_id: str) -> Optional[str]:
+        """
+        Gib den Zug an den nächsten Spieler weiter
+        Nach dem letzten Spieler beginnt eine neue Runde
+        Returns: player_id des Spielers am Zug
+        """
+        if session_id not in self.sessions:
+            raise ValueError(f"Session {session_id} nicht gefunden")
+        
+        session = self.sessions[session_id]
+        players = self.players.get(session_id, [])
+        
+        if not players:
+            session.current_player_turn = None
+            session.turn_deadline = None
+            self._log_turn(session)
+            return None
+        
+        current_idx = next(
+            (idx for idx, p in enumerate(players) if p.player_id == session.current_player_turn),
+            None
+        )
+        
+        if current_idx is None:
+            # Spieler am Zug hat die Session verlassen
+            next_idx = 0
+        else:
+            next_idx = (current_idx + 1) % len(players)
+            if next_idx == 0:
+                session.round_number += 1
+        
+        session.current_player_turn = players[next_idx].player_id
+        self._reset_turn_deadline(session)
+        self._log_turn(session)
+        return session.current_player_turn
+    
+    def _log_track_advanced(self, session: GameSession, finished: bool) -> None:
+        self._log(session.session_id, EventType.TRACK_ADVANCED,
+                  lambda: TRACK_ADVANCED.pack(session.current_track_index, finished))
+    
+    def _log_turn(self, session: GameSession) -> None:
+        self._log(session.session_id, EventType.TURN_ADVANCED, lambda: TURN_ADVANCED.pack(
+            player_key(session.current_player_turn), session.round_number, encode_time(session.turn_deadline)
+        ))
+    
+    def set_status(self, session_id: str, status: str) -> None:
+        """
+        Setze den Session-Status direkt (z.B. Spielstart über WebSocket)
+        """
+        if session_id not in self.sessions:
+            raise ValueError(f"Session {session_id} nicht gefunden")
+        if status not in STATUSES:
+            raise ValueError(f"Ungültiger Status: {status}")
+        self.sessions[session_id].status = status
+        self._log(session_id, EventType.STATUS_CHANGED, lambda: STATUS.pack(STATUSES.index(status)))
+    
+    def _reset_turn_deadline(self, session: GameSession) -> None:
+        """
+        Setze die Deadline des aktuellen Zuges (None ohne Zeitlimit)
+        """
+        if session.turn_time_limit > 0 and session.status == "playing":
+            session.turn_deadline = datetime.now() + timedelta(seconds=session.turn_time_limit)
+        else:
+            session.turn_deadline = None
+    
+    def get_upcoming_tracks(self, session_id: str, count: Optional[int] = None) -> List[Dict]:
+        """
+        Playback-Handles der nächsten Tracks (nur URI & Dauer, KEINE Lösung)
+        Damit Clients & Playback-Device vorladen können
+        """
+        session = self.sessions.get(session_id)
+        if session is None:
+            return []
+        
+        count = settings.prefetch_track_count if count is None else count
+        tracks = self.track_queues.get(session_id, [])
+        start = session.current_track_index + 1
+        
+        return [
+            {"uri": track.uri, "duration_ms": track.duration_ms}
+            for track in tracks[start:start + count]
+        ]
+    
+    def find_track(self, session_id: str, track_id: str) -> Optional[SpotifyTrack]:
+        """
+        Track aus dem Deck einer Session (aktueller Track zuerst, sonst Suche im Deck)
+        """
+        current = self.solutions.get(session_id)
+        if current is not None and current.track_id == track_id:
+            return current
+        for track in self.track_queues.get(session_id, []):
+            if track.track_id == track_id:
+                return track
+        return None
+    
+    def _prefetch_previews(self, session_id: str) -> None:
+        """
+        Preview-Clips für aktuellen + nächste Tracks im Hintergrund in den Cache laden
+        """
+        count = settings.preview_prefetch_count
+        session = self.sessions.get(session_id)
+        if not count or session is None:
+            return
+        start = session.current_track_index
+        tracks = self.track_queues.get(session_id, [])[start:start + 1 + count]
+        preview_cache.prefetch((track.track_id, track.preview_url) for track in tracks)
+    
     def get_leaderboard(self, session_id: str) -> List[Dict]:
         """
         Hole Leaderboard für Session
@@ -361,8 +808,12 @@ class GameService:
         Fuzzy String Matching (einfache Version)
         Später: Levenshtein Distance oder difflib
         """
-        guess_clean = guess.strip().lower()
-        solution_clean = solution.strip().lower()
+        # Gleiche Normalisierung wie Autocomplete (Akzente, Satzzeichen, Groß/klein)
+        guess_clean = normalize_text(guess)
+        solution_clean = normalize_text(solution)
+        
+        if not guess_clean:
+            return False
         
         # Exakte Übereinstimmung
         if guess_clean == solution_clean:
@@ -397,7 +848,7 @@ class GameService:
         
         session = self.sessions[session_id]
         current_track = self.solutions[session_id]
-        track_year = int(current_track.release_date[:4])
+        track_year = self._deck_table(session_id).year(current_track)
         
         # Prüfe ob Position in Timeline korrekt ist
         is_correct = self._check_timeline_position(
@@ -405,6 +856,9 @@ class GameService:
             position,
             track_year
         )
+        self.track_stats.record_placement(current_track.track_id, is_correct)
+        record = self.game_records.get(session_id)
+        timeline_length = len(player.timeline)
         
         # Token-Check (PRO/EXPERT Modus)
         earned_token = False
@@ -447,6 +901,12 @@ class GameService:
             if player.score >= session.win_condition:
                 player.has_won = True
                 session.status = "finished"
+                session.turn_deadline = None
+                self._log_placement(session_id, player, position, True, earned_token, True)
+                if record is not None:
+                    record.add_placement(session.round_number, player_id, current_track.track_id, track_year,
+                                         position, timeline_length, True, earned_token)
+                self._export_game(session_id, "won", winner_id=player_id)
                 return PlacementResult(
                     correct=True,
                     won_game=True,
@@ -458,6 +918,10 @@ class GameService:
                     player_timeline=player.timeline
                 )
         
+        self._log_placement(session_id, player, position, is_correct, earned_token, False)
+        if record is not None:
+            record.add_placement(session.round_number, player_id, current_track.track_id, track_year,
+                                 position, timeline_length, is_correct, earned_token)
         return PlacementResult(
             correct=is_correct,
             won_game=False,
@@ -469,6 +933,31 @@ class GameService:
             player_timeline=player.timeline if is_correct else []
         )
     
+    def _log_placement(self, session_id: str, player: Player, position: int,
+                       correct: bool, earned_token: bool, won: bool) -> None:
+        # Falsche Positionen können außerhalb der Timeline liegen - nur korrekte zählen beim Replay
+        self._log(session_id, EventType.CARD_PLACED, lambda: CARD_PLACED.pack(
+            player_key(player.player_id), position if correct else 0, correct, int(earned_token), won
+        ))
+    
+    def _export_game(self, session_id: str, reason: str, winner_id: Optional[str] = None) -> None:
+        """
+        Beendetes Spiel an den Export übergeben (Schreiben im Hintergrund)
+        """
+        record = self.game_records.pop(session_id, None)
+        if record is None:
+            return
+        session = self.sessions[session_id]
+        tracks = self.track_queues.get(session_id, [])
+        self.exporter.submit(record.finish(
+            reason=reason,
+            players=len(self.players.get(session_id, [])),
+            rounds=session.round_number,
+            deck_size=len(tracks),
+            tracks_played=min(session.current_track_index + 1, len(tracks)),
+            winner_id=winner_id
+        ))
+    
     def _check_timeline_position(
         self, 
         timeline: List[TimelineCard], 
@@ -519,11 +1008,12 @@ class GameService:
         
         players = self.players.get(session_id, [])
         tracks = self.track_queues[session_id]
+        table = self._deck_table(session_id)
         
         for idx, player in enumerate(players):
             if idx < len(tracks):
                 track = tracks[idx]
-                year = int(track.release_date[:4])
+                year = table.year(track)
                 
                 start_card = TimelineCard(
                     position=0,
@@ -0,0 +1,176 @@
+"""
+Handoff - laufende Spiele über einen Neustart retten (Zero-Downtime Deploy)
+
+Ablauf bei SIGTERM (siehe main.py):
+1. Drain: keine neuen Lobbys (503), /health meldet "draining", Zug-Timer stehen,
+   Socket-Trennungen entfernen keine Spieler mehr
+2. Alle Clients bekommen `server_restarting` und verbinden sich neu
+3. uvicorn beendet sich normal; im Shutdown (keine Requests mehr unterwegs)
+   schreibt `write` alle Sessions in eine Datei
+4. Der neue Prozess lädt die Datei beim Start, bevor er Requests annimmt,
+   und verschiebt Zug-Deadlines um die Zeit des Neustarts
+
+Datei (zlib-komprimiertes JSON, atomar ersetzt):
+    {"version": 1, "written_at": µs, "tracks": [[...]], "sessions": [snapshot, ...]}
+Snapshots wie im Event Log (snapshot.py), Decks & Lösung aber als Index in
+die gemeinsame Track-Tabelle - Sessions derselben Playlist teilen sich die
+Zeilen (Track-IDs sind eindeutig).
+"""
+import json
+import os
+import tempfile
+import time
+import zlib
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Tuple
+
+from ..core.config import settings
+from ..models.game import SpotifyTrack
+from .event_log import decode_time, encode_time, track_from_row, track_row
+from .snapshot import SNAPSHOT_VERSION, SessionState, player_fields, restore, session_fields
+
+
+HANDOFF_VERSION = 1
+
+
+def dump_sessions(service) -> Tuple[bytes, int]:
+    """
+    Alle Sessions des GameService als komprimierte Handoff-Datei
+    Returns: (Inhalt, Anzahl Sessions)
+    """
+    index: Dict[str, int] = {}  # track_id -> Zeile
+    rows: List[List[Any]] = []
+
+    def ref(track: SpotifyTrack) -> int:
+        position = index.get(track.track_id)
+        if position is None:
+            position = index[track.track_id] = len(rows)
+            rows.append(track_row(track))
+        return position
+
+    sessions = []
+    for session_id, session in service.sessions.items():
+        deck = service.track_queues.get(session_id)
+        solution = service.solutions.get(session_id)
+        sessions.append({
+            "version": SNAPSHOT_VERSION,
+            "session": session_fields(session),
+            "players": [player_fields(player) for player in service.players.get(session_id, [])],
+            "deck": [ref(track) for track in deck] if deck is not None else None,
+            "solution": ref(solution) if solution is not None else None
+        })
+
+    payload = json.dumps({
+        "version": HANDOFF_VERSION,
+        "written_at": encode_time(datetime.now()),
+        "tracks": rows,
+        "sessions": sessions
+    }, separators=(",", ":"), ensure_ascii=False).encode()
+    return zlib.compress(payload, 1), len(sessions)
+
+
+def load_sessions(data: bytes) -> Tuple[datetime, List[SessionState], List[SpotifyTrack]]:
+    """
+    Handoff-Datei lesen
+    Returns: (Schreibzeitpunkt, Zustände, Track-Tabelle als Models)
+    """
+    content = json.loads(zlib.decompress(data))
+    if content.get("version") != HANDOFF_VERSION:
+        raise ValueError(f"Unbekannte Handoff-Version {content.get('version')}")
+    rows = content["tracks"]
+    states = []
+    for snapshot in content["sessions"]:
+        if snapshot["deck"] is not None:
+            snapshot["deck"] = [rows[position] for position in snapshot["deck"]]
+        if snapshot["solution"] is not None:
+            snapshot["solution"] = rows[snapshot["solution"]]
+        states.append(SessionState.from_snapshot(snapshot))
+    return decode_time(content["written_at"]), states, [track_from_row(row) for row in rows]
+
+
+class Handoff:
+    """
+    Drain-Status & Handoff-Datei eines Prozesses
+    """
+
+    def __init__(self, path: str, max_age_s: float = 300.0):
+        self.path = path
+        self.max_age_s = max_age_s
+        self.draining = False
+        self.stats: Dict[str, Any] = {}  # Zahlen des letzten Schreibens / Ladens
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.path)
+
+    def begin_drain(self) -> None:
+        self.draining = True
+
+    def write(self, service) -> Dict[str, Any]:
+        """
+        Alle Sessions in die Handoff-Datei schreiben (im Shutdown)
+        """
+        started = time.perf_counter()
+        data, count = dump_sessions(service)
+        directory = os.path.dirname(self.path) or "."
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".handoff-")
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+        self.stats = {"written_sessions": count, "bytes": len(data),
+                      "write_ms": round((time.perf_counter() - started) * 1000, 1)}
+        print(f"💾 Handoff: {count} Sessions in {self.path} ({len(data) / 2**20:.1f} MB, "
+              f"{self.stats['write_ms']} ms)")
+        return self.stats
+
+    def restore(self, service) -> List[str]:
+        """
+        Sessions aus der Handoff-Datei übernehmen (beim Start) und Datei löschen
+        Returns: wiederhergestellte session_ids
+        """
+        if not self.enabled or not os.path.exists(self.path):
+            return []
+        started = time.perf_counter()
+        try:
+            with open(self.path, "rb") as f:
+                written_at, states, tracks = load_sessions(f.read())
+        except (OSError, ValueError, zlib.error) as e:
+            print(f"⚠️  Handoff {self.path} nicht lesbar, starte ohne: {e}")
+            return []
+        finally:
+            os.remove(self.path)  # Nur einmal laden - ein späterer Absturz soll alte Spiele nicht zurückholen
+
+        downtime = datetime.now() - written_at
+        if downtime > timedelta(seconds=self.max_age_s):
+            print(f"⚠️  Handoff ist {downtime.total_seconds():.0f}s alt - ignoriert")
+            return []
+
+        shared = {track.track_id: track for track in tracks}
+        restored = []
+        for state in states:
+            session_id = restore(service, state, lambda row: shared[row[0]])
+            session = service.sessions[session_id]
+            if session.turn_deadline is not None:
+                # Zeit des Neustarts zählt nicht zum Zug
+                session.turn_deadline += downtime
+            restored.append(session_id)
+        self.stats = {**self.stats, "restored_sessions": len(restored),
+                      "restore_ms": round((time.perf_counter() - started) * 1000, 1),
+                      "downtime_ms": round(downtime.total_seconds() * 1000, 1)}
+        return restored
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Metriken für /metrics
+        """
+        return {"enabled": self.enabled, "draining": self.draining, **self.stats}
+
+
+# Singleton Instance
+handoff = Handoff(
+    path=settings.shard_path(settings.handoff_path),
+    max_age_s=settings.handoff_max_age_s
+)
@@ -0,0 +1,85 @@
+"""
+Event-Loop Lag Monitor
+Misst, wie verspätet die asyncio Event-Loop Timer ausführt
+"""
+import asyncio
+from typing import Dict, Optional
+from ..core.config import settings
+
+
+class LoopLagMonitor:
+    """
+    Loop Lag Sampler
+    
+    Ein Task schläft `interval` und misst die Verspätung beim Aufwachen.
+    Der geglättete Wert steigt schnell (Überlast sofort sichtbar) und fällt
+    langsam (kein Flattern an den Schwellwerten).
+    """
+    
+    RISE = 0.5  # Glättung bei steigendem Lag
+    FALL = 0.1  # Glättung bei fallendem Lag
+    
+    def __init__(self):
+        self.lag_ms: float = 0.0  # Geglätteter Lag
+        self.last_ms: float = 0.0  # Letzte Messung
+        self.max_ms: float = 0.0  # Maximum seit Start
+        self.samples: int = 0
+        self._task: Optional[asyncio.Task] = None
+    
+    def start(self) -> None:
+        """Starte den Sampler in der laufenden Event-Loop"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+    
+    async def stop(self) -> None:
+        """Stoppe den Sampler"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+    
+    def record(self, lag_ms: float) -> None:
+        """Neue Messung einrechnen"""
+        alpha = self.RISE if lag_ms > self.lag_ms else self.FALL
+        self.lag_ms += alpha * (lag_ms - self.lag_ms)
+        self.last_ms = lag_ms
+        self.max_ms = max(self.max_ms, lag_ms)
+        self.samples += 1
+    
+    @property
+    def level(self) -> str:
+        """Lastzustand: ok, defer (verzögern) oder shed (ablehnen)"""
+        if self.lag_ms >= settings.loop_lag_shed_ms:
+            return "shed"
+        if self.lag_ms >= settings.loop_lag_defer_ms:
+            return "defer"
+        return "ok"
+    
+    def should_defer(self) -> bool:
+        """Unwichtige Arbeit zurückstellen?"""
+        return self.lag_ms >= settings.loop_lag_defer_ms
+    
+    def snapshot(self) -> Dict:
+        """Aktueller Zustand für /health & /metrics"""
+        return {
+            "lag_ms": round(self.lag_ms, 3),
+            "last_ms": round(self.last_ms, 3),
+            "max_ms": round(self.max_ms, 3),
+            "level": self.level,
+            "samples": self.samples
+        }
+    
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        interval = settings.loop_lag_sample_interval_ms / 1000.0
+        while True:
+            expected = loop.time() + interval
+            await asyncio.sleep(interval)
+            self.record(max(loop.time() - expected, 0.0) * 1000.0)
+
+
+# Singleton Instance
+loop_monitor = LoopLagMonitor()
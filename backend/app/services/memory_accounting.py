@@ -0,0 +1,495 @@
+"""
+Memory Accounting - geschätzter Speicher pro Session (/admin/memory)
+
+Pro Session vier Teile (+ Session-Objekt selbst):
+- deck:      Track-Queue, Duplikat-Filter, Jahr-Spalten, Autocomplete-Index
+- players:   Player-Objekte (ohne Timeline)
+- timelines: Timeline-Karten aller Spieler
+- sockets:   Registry-Einträge der verbundenen Clients & Zuschauer, Room-Queue
+
+Kein Heap-Walk: jeder Teil hat einen billigen Fingerabdruck (Objekt-IDs &
+Längen). Gemessen (sys.getsizeof über die Objekte des Teils) wird nur, wenn
+sich der Fingerabdruck seit der letzten Messung geändert hat - ein Report
+kostet sonst nur einen Durchlauf über Sessions & Spieler. Große Container
+(Deck, Index) werden dabei nur stichprobenartig vermessen und hochgerechnet,
+eine Messung kostet so unabhängig von der Deck-Größe unter 1 ms. Sockets sind
+klein und werden jedes Mal gezählt.
+
+Bei tausenden Sessions kostet auch dieser Durchlauf einige 100 ms. Deshalb
+baut ein Hintergrund-Task den Report alle MEMORY_REFRESH_INTERVAL_S in
+Scheiben (nach MEMORY_MEASURE_BUDGET_MS gibt er den Event-Loop frei) und misst
+dabei alles Geänderte; /admin/memory liefert den letzten fertigen Report,
+/metrics nur dessen Kennzahlen.
+
+Schätzung: Allocator-Verschnitt und von mehreren Sessions geteilte Objekte
+(z.B. Tracks nach einem Handoff) sind nicht berücksichtigt bzw. zählen pro Session.
+"""
+import asyncio
+import itertools
+import os
+import sys
+import time
+from enum import Enum
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from pydantic import BaseModel
+
+from ..core.config import settings
+from ..models.game import GameSession, Player, SpotifyTrack, TimelineCard
+from .deck_builder import DeckBuilder
+from .deck_table import DeckTable
+from .game_service import game_service
+from .rate_limiter import TokenBucket
+from .search_index import SearchIndex, track_search
+from .websocket_service import (
+    client_buckets,
+    connected_clients,
+    outboxes,
+    player_ids,
+    player_sessions,
+    sio,
+    spectator_room,
+    spectator_sessions,
+    spectators
+)
+
+
+PARTS = ("deck", "players", "timelines", "session")
+MB = 1024 * 1024
+REPORT_TOP = 100  # Größte Sessions im zwischengespeicherten Report
+SAMPLE_ITEMS = 64  # Größere Container: nur jedes n-te Element messen & hochrechnen
+try:
+    _PAGE_SIZE = os.sysconf("SC_PAGE_SIZE")
+except (AttributeError, ValueError, OSError):  # kein sysconf (Windows)
+    _PAGE_SIZE = 4096
+
+
+def deep_sizeof(obj: Any, seen: Set[int]) -> int:
+    """
+    Größe von `obj` samt allem, was es referenziert (ohne bereits Gezähltes in `seen`)
+    Funktionen, Klassen & Enum-Werte gehören niemandem allein und zählen nicht
+    """
+    if obj is None or isinstance(obj, (bool, Enum)) or id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, (str, bytes, int, float)):
+        return size
+    if isinstance(obj, dict):
+        return size + _items_sizeof(obj.items(), len(obj),
+                                    lambda item: deep_sizeof(item[0], seen) + deep_sizeof(item[1], seen))
+    if isinstance(obj, (list, tuple, set, frozenset)):
+        return size + _items_sizeof(obj, len(obj), lambda item: deep_sizeof(item, seen))
+    if isinstance(obj, BaseModel):
+        return (size + deep_sizeof(obj.__dict__, seen)
+                + deep_sizeof(obj.__pydantic_fields_set__, seen)
+                + deep_sizeof(obj.__pydantic_extra__, seen))
+    if callable(obj):
+        return 0
+    if hasattr(obj, "__dict__"):
+        size += deep_sizeof(vars(obj), seen)
+    for slot in getattr(type(obj), "__slots__", ()):
+        size += deep_sizeof(getattr(obj, slot, None), seen)
+    return size
+
+
+def _items_sizeof(items: Iterable, count: int, measure: Callable[[Any], int]) -> int:
+    """
+    Summe der Elemente, ab SAMPLE_ITEMS aus einer gleichmäßigen Stichprobe hochgerechnet
+    (Decks & Indizes bestehen aus gleichartigen Elementen)
+    """
+    if count <= SAMPLE_ITEMS:
+        return sum(measure(item) for item in items)
+    sample = [measure(item) for item in itertools.islice(items, 0, None, count // SAMPLE_ITEMS)]
+    return sum(sample) * count // len(sample)
+
+
+def _entry_share(registry: Dict, key: Any) -> int:
+    """
+    Anteil eines Eintrags an einer globalen Registry (Tabelle anteilig, Key & Wert ganz)
+    """
+    if key not in registry:
+        return 0
+    seen: Set[int] = set()
+    return (sys.getsizeof(registry) // len(registry)
+            + deep_sizeof(key, seen) + deep_sizeof(registry[key], seen))
+
+
+def process_rss_bytes() -> Optional[int]:
+    """
+    Resident Set Size des Prozesses (nur Linux, sonst None)
+    """
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def socket_registry_bytes(session_id: str) -> Tuple[int, int]:
+    """
+    Socket-Registry einer Session: Client-Sets, sid-Zuordnungen, Rate-Limits,
+    Socket.IO-Rooms & wartende Room-Events
+    Returns: (Bytes, Anzahl Clients)
+    """
+    sids = [*connected_clients.get(session_id, ()), *spectators.get(session_id, ())]
+    seen: Set[int] = set()
+    size = deep_sizeof(connected_clients.get(session_id), seen) + deep_sizeof(spectators.get(session_id), seen)
+    for sid in sids:
+        for registry in (player_sessions, player_ids, spectator_sessions, client_buckets):
+            size += _entry_share(registry, sid)
+    rooms = sio.manager.rooms.get("/", {})
+    for room in (session_id, spectator_room(session_id)):
+        size += deep_sizeof(rooms.get(room), seen)
+        outbox = outboxes.get(room)
+        if outbox is not None:
+            size += deep_sizeof(outbox.items, seen)
+    return size, len(sids)
+
+
+class MemoryAccounting:
+    """
+    Schätzt den Speicher der Sessions eines GameService, misst nur Geändertes neu
+    """
+
+    def __init__(self, service, socket_bytes: Callable[[str], Tuple[int, int]] = socket_registry_bytes):
+        self.service = service
+        self.socket_bytes = socket_bytes
+        # session_id -> Teil -> (Fingerabdruck, Bytes)
+        self._cache: Dict[str, Dict[str, Tuple[Any, int]]] = {}
+        self._sample: Optional[Dict[str, int]] = None
+        # Einheit -> [Bytes, Anzahl] aller bisherigen Messungen (Grundlage der Schätzungen)
+        self._measured: Dict[str, List[int]] = {unit: [0, 0] for unit in ("track", "player", "card", "session")}
+        self.stats: Dict[str, Any] = {"reports": 0, "measured": 0, "reused": 0, "estimated": 0,
+                                      "last_report_ms": 0.0, "refreshes": 0, "slices": 0,
+                                      "last_refresh_ms": 0.0, "max_slice_ms": 0.0}
+        self.latest: Optional[Dict[str, Any]] = None  # Letzter Report des Hintergrund-Tasks
+        self.latest_at: Optional[float] = None  # time.monotonic() beim Fertigstellen
+        self._task: Optional[asyncio.Task] = None
+
+    # ----- Fingerabdrücke & Messung pro Teil -----
+    # Jeder Teil: (Fingerabdruck, Messung, Schätzung aus Durchschnittswerten)
+
+    def _deck(self, session_id: str) -> Tuple[Any, Callable, Callable]:
+        service = self.service
+        queue = service.track_queues.get(session_id)
+        parts = (queue, service.deck_builders.get(session_id), service.deck_tables.get(session_id),
+                 track_search.sessions.get(session_id),
+                 track_search._deferred.get(session_id))  # Deck, dessen Index noch nicht gebaut ist
+        fingerprint = tuple((id(part), len(part) if hasattr(part, "__len__") else 0)
+                            for part in parts if part is not None)
+        seen: Set[int] = set()
+
+        def measure() -> int:
+            size = sum(deep_sizeof(part, seen) for part in parts)
+            self._learn("track", size, len(queue or ()))
+            return size
+        return fingerprint, measure, lambda: len(queue or ()) * self._units()["track"]
+
+    def _people(self, session_id: str) -> Tuple[Any, Callable, Callable]:
+        players = self.service.players.get(session_id, [])
+        fingerprint = (id(players), tuple((id(p), id(p.timeline), len(p.timeline)) for p in players))
+
+        def measure() -> Tuple[int, int]:
+            # Timelines zuerst - die Player-Objekte zählen sie dann nicht noch einmal
+            seen: Set[int] = set()
+            timelines = sum(deep_sizeof(player.timeline, seen) for player in players)
+            size = deep_sizeof(players, seen)
+            self._learn("player", size, len(players))
+            self._learn("card", timelines, sum(len(player.timeline) for player in players))
+            return size, timelines
+        return fingerprint, measure, lambda: (len(players) * self._units()["player"],
+                                              sum(len(p.timeline) for p in players) * self._units()["card"])
+
+    def _session(self, session_id: str) -> Tuple[Any, Callable, Callable]:
+        # Aktueller Track (solutions) liegt im Deck und zählt dort
+        session = self.service.sessions.get(session_id)
+        record = self.service.game_records.get(session_id)
+        fingerprint = (id(session), id(record),
+                       (len(record.placements), len(record.guesses)) if record is not None else None)
+        seen: Set[int] = set()
+
+        def measure() -> int:
+            size = deep_sizeof(session, seen) + deep_sizeof(record, seen)
+            self._learn("session", size, 1)
+            return size
+        return fingerprint, measure, lambda: self._units()["session"]
+
+    def session_bytes(self, session_id: str, deadline: float = float("inf")) -> Dict[str, Any]:
+        """
+        Bytes pro Teil einer Session (aus dem Cache, falls unverändert)
+        Nach `deadline` (perf_counter) werden geänderte Teile nur noch geschätzt
+        und beim nächsten Report gemessen
+        """
+        cache = self._cache.setdefault(session_id, {})
+        result: Dict[str, Any] = {"estimated": False}
+        for part, (fingerprint, measure, estimate) in (("deck", self._deck(session_id)),
+                                                       ("people", self._people(session_id)),
+                                                       ("session", self._session(session_id))):
+            cached = cache.get(part)
+            if cached is not None and cached[0] == fingerprint:
+                self.stats["reused"] += 1
+                value = cached[1]
+            elif time.perf_counter() < deadline:
+                self.stats["measured"] += 1
+                value = measure()
+                cache[part] = (fingerprint, value)
+            else:
+                self.stats["estimated"] += 1
+                value = estimate()
+                result["estimated"] = True
+            if part == "people":
+                result["players"], result["timelines"] = value
+            else:
+                result[part] = value
+        result["sockets"], result["clients"] = self.socket_bytes(session_id)
+        result["total"] = sum(result[part] for part in (*PARTS, "sockets"))
+        return result
+
+    # ----- Report -----
+
+    def report(self, top: int = 20) -> Dict[str, Any]:
+        """
+        Summen (gesamt & nach Status), Durchschnitt pro Track/Spieler/Client,
+        die `top` größten Sessions
+        Synchron in einem Stück - nach MEMORY_MEASURE_BUDGET_MS wird Geändertes nur geschätzt
+        """
+        started = time.perf_counter()
+        deadline = started + settings.memory_measure_budget_ms / 1000.0
+        builder = _ReportBuilder(self)
+        for session_id in list(self.service.sessions):
+            builder.add(session_id, deadline)
+        self.stats["reports"] += 1
+        self.stats["last_report_ms"] = round((time.perf_counter() - started) * 1000, 3)
+        return builder.result(top)
+
+    async def refresh(self) -> Dict[str, Any]:
+        """
+        Report in Scheiben bauen: nach jeweils MEMORY_MEASURE_BUDGET_MS gibt der
+        Lauf den Event-Loop frei. Gemessen wird alles Geänderte (keine Schätzung),
+        dazwischen gelöschte Sessions fallen heraus.
+        """
+        started = time.perf_counter()
+        budget = settings.memory_measure_budget_ms / 1000.0
+        builder = _ReportBuilder(self)
+        slice_started = started
+        slices = 1
+        for session_id in list(self.service.sessions):
+            builder.add(session_id)
+            now = time.perf_counter()
+            if now - slice_started >= budget:
+                self._record_slice(now - slice_started)
+                await asyncio.sleep(0)
+                slice_started = time.perf_counter()
+                slices += 1
+        self._record_slice(time.perf_counter() - slice_started)
+
+        self.stats["refreshes"] += 1
+        self.stats["slices"] += slices
+        self.stats["last_refresh_ms"] = round((time.perf_counter() - started) * 1000, 3)
+        self.latest = builder.result(REPORT_TOP)
+        self.latest_at = time.monotonic()
+        return self.latest
+
+    def _record_slice(self, seconds: float) -> None:
+        self.stats["max_slice_ms"] = max(self.stats["max_slice_ms"], round(seconds * 1000, 3))
+
+    async def current(self, top: int = 20) -> Dict[str, Any]:
+        """
+        Letzter Report des Hintergrund-Tasks (ohne laufenden Task: jetzt neu bauen)
+        """
+        if self.latest is None or not self.running:
+            await self.refresh()
+        report = dict(self.latest)
+        report["largest"] = report["largest"][:top]
+        report["age_s"] = round(time.monotonic() - self.latest_at, 3)
+        return report
+
+    # ----- Hintergrund-Task -----
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        """Report periodisch im Hintergrund neu bauen (idempotent)"""
+        if settings.memory_refresh_interval_s > 0 and not self.running:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.refresh()
+            except Exception as e:  # Sessions ändern sich während des Laufs - nächster Lauf
+                print(f"⚠️  Memory Accounting fehlgeschlagen: {e}")
+            await asyncio.sleep(settings.memory_refresh_interval_s)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Metriken für /metrics - nur Kennzahlen des letzten Reports, kein neuer Durchlauf
+        """
+        latest = self.latest
+        return {
+            "sessions": latest["sessions"] if latest is not None else None,
+            "bytes_total": latest["bytes"]["total"] if latest is not None else None,
+            "process_rss_bytes": process_rss_bytes(),
+            "age_s": round(time.monotonic() - self.latest_at, 3) if self.latest_at is not None else None,
+            **self.stats
+        }
+
+    # ----- Kapazität -----
+
+    def _sample_bytes(self) -> Dict[str, int]:
+        """
+        Bytes pro Einheit aus einem synthetischen Deck (solange es keine Sessions gibt)
+        """
+        if self._sample is None:
+            count = 100
+            tracks = [SpotifyTrack(
+                track_id=f"{idx:022d}", title=f"Sample Track Title {idx:04d}", artist=f"Sample Artist {idx:03d}",
+                album=f"Sample Album Name {idx:04d}", release_date=f"{1960 + idx % 60}-01-01",
+                decade=f"{1960 + idx % 60 - idx % 10}er", duration_ms=200000,
+                preview_url=f"https://p.scdn.co/mp3-preview/{idx:040d}", uri=f"spotify:track:{idx:022d}"
+            ) for idx in range(count)]
+            builder = DeckBuilder(["sample"])
+            deck = builder.filter(tracks)
+            index = SearchIndex()
+            index.add_tracks(deck)
+            card = TimelineCard(position=0, track_id=tracks[0].track_id, title=tracks[0].title,
+                                artist=tracks[0].artist, year=1960)
+            player = Player(player_id="00000000-0000-0000-0000-000000000000", name="Sample Player",
+                            session_id="sample", timeline=[])
+            session = GameSession(session_id="0" * 22, host_name="Sample Host")
+            self._sample = {
+                "track": deep_sizeof([deck, builder, DeckTable(deck), index], set()) // count,
+                "player": deep_sizeof(player, set()),
+                "card": deep_sizeof(card, set()),
+                "session": deep_sizeof(session, set()),
+                # sid in Client-Set, sid->Session, sid->Spieler & Rate-Limit (ohne Engine.IO-Socket)
+                "client": 3 * sys.getsizeof("x" * 20) + deep_sizeof(TokenBucket(1.0, 1.0), set())
+            }
+        return self._sample
+
+    def _learn(self, unit: str, size: int, count: int) -> None:
+        measured = self._measured[unit]
+        measured[0] += size
+        measured[1] += count
+
+    def _units(self) -> Dict[str, int]:
+        """
+        Bytes pro Einheit für Schätzungen: Durchschnitt aller Messungen, sonst Beispiel
+        """
+        units = {unit: size // count for unit, (size, count) in self._measured.items() if count}
+        if len(units) < len(self._measured):
+            units = {**self._sample_bytes(), **units}
+        return units
+
+    def _per_unit(self, totals: Dict[str, int], counts: Dict[str, int]) -> Dict[str, Any]:
+        """
+        Durchschnitt pro Track / Spieler / Karte / Client / Session (live, sonst Beispiel)
+        """
+        per_unit: Dict[str, Any] = {"source": "live" if counts["tracks"] else "sample"}
+        for unit, part, count in (("track", "deck", "tracks"), ("player", "players", "players"),
+                                  ("card", "timelines", "cards"), ("client", "sockets", "clients"),
+                                  ("session", "session", "sessions")):
+            per_unit[unit] = totals[part] // counts[count] if counts[count] else self._sample_bytes()[unit]
+        return per_unit
+
+    def capacity(self, playlist_size: int, players: int = 4, budget_mb: Optional[float] = None,
+                 cards: Optional[int] = None, report: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Wie viele Sessions mit `playlist_size` Tracks & `players` Spielern passen
+        in `budget_mb`? (Timelines mit `cards` Karten, Standard: Karten zum Sieg)
+        Vom Budget geht zuerst ab, was der Prozess ohne Sessions belegt (RSS - Sessions).
+        `report`: vorhandener Report (sonst wird einer gebaut)
+        """
+        if playlist_size < 1 or players < 1:
+            raise ValueError("playlist_size und players müssen mindestens 1 sein")
+        budget_mb = settings.memory_budget_mb if budget_mb is None else budget_mb
+        if budget_mb <= 0:
+            raise ValueError("budget_mb muss größer als 0 sein")
+        cards = settings.memory_projection_cards if cards is None else cards
+
+        report = self.report(top=0) if report is None else report
+        unit = report["per_unit"]
+        per_session = unit["session"] + playlist_size * unit["track"] \
+            + players * (unit["player"] + cards * unit["card"] + unit["client"])
+
+        budget = int(budget_mb * MB)
+        rss = report["process_rss_bytes"]
+        baseline = max(rss - report["bytes"]["total"], 0) if rss is not None else 0
+        return {
+            "playlist_size": playlist_size,
+            "players": players,
+            "cards": cards,
+            "budget_bytes": budget,
+            "baseline_bytes": baseline,
+            "per_session_bytes": per_session,
+            "sessions": max(budget - baseline, 0) // per_session,
+            "sessions_ignoring_baseline": budget // per_session,
+            "per_unit": unit
+        }
+
+
+class _ReportBuilder:
+    """
+    Summen eines Reports, Session für Session aufgebaut
+    """
+
+    def __init__(self, accounting: MemoryAccounting):
+        self.accounting = accounting
+        self.service = accounting.service
+        for session_id in list(accounting._cache):
+            if session_id not in self.service.sessions:
+                del accounting._cache[session_id]
+        self.totals = dict.fromkeys((*PARTS, "sockets", "total"), 0)
+        self.by_status: Dict[str, Dict[str, int]] = {}
+        self.counts = {"sessions": 0, "tracks": 0, "players": 0, "cards": 0, "clients": 0}
+        self.sessions: List[Dict[str, Any]] = []
+
+    def add(self, session_id: str, deadline: float = float("inf")) -> None:
+        service = self.service
+        session = service.sessions.get(session_id)
+        if session is None:
+            return  # Zwischen zwei Scheiben gelöscht
+        sizes = self.accounting.session_bytes(session_id, deadline)
+        players = service.players.get(session_id, [])
+        counts = self.counts
+        counts["sessions"] += 1
+        counts["tracks"] += len(service.track_queues.get(session_id, ()))
+        counts["players"] += len(players)
+        counts["cards"] += sum(len(player.timeline) for player in players)
+        counts["clients"] += sizes["clients"]
+        for part in self.totals:
+            self.totals[part] += sizes[part]
+        status = self.by_status.setdefault(session.status, {"sessions": 0, "bytes": 0})
+        status["sessions"] += 1
+        status["bytes"] += sizes["total"]
+        self.sessions.append({"session_id": session_id, "status": session.status,
+                              "tracks": len(service.track_queues.get(session_id, ())),
+                              "players": len(players), **sizes})
+
+    def result(self, top: int) -> Dict[str, Any]:
+        self.sessions.sort(key=lambda entry: entry["total"], reverse=True)
+        return {
+            **self.counts,
+            "bytes": self.totals,
+            "by_status": self.by_status,
+            "per_unit": self.accounting._per_unit(self.totals, self.counts),
+            "process_rss_bytes": process_rss_bytes(),
+            "largest": self.sessions[:top],
+            "accounting": dict(self.accounting.stats)
+        }
+
+
+# Singleton Instance
+memory_accounting = MemoryAccounting(game_service)
@@ -0,0 +1,117 @@
+"""
+Playlist Loader - Streaming-Import großer Playlists
+
+Die erste Page (ein API Request pro Playlist) wird sofort zum Deck, das
+Spiel kann starten. Die restlichen Pages lädt ein Hintergrund-Task
+(Spotify-Requests im Threadpool, mehrere Playlists parallel) und mischt sie
+über GameService.extend_deck im Event-Loop ein - dadurch nie gleichzeitig mit
+Spielzügen. Duplikate filtert der DeckBuilder der Session.
+"""
+import asyncio
+import contextvars
+from typing import Dict, List
+from starlette.concurrency import run_in_threadpool
+from ..models.game import DeckOrder
+from .deck_builder import DeckBuilder
+from .game_service import game_service
+from .spotify_service import PlaylistStream
+from .websocket_service import broadcast_to_session
+
+
+class PlaylistLoader:
+    """
+    Ein Lade-Task pro Session
+    """
+
+    def __init__(self):
+        self.tasks: Dict[str, asyncio.Task] = {}
+
+    def is_loading(self, session_id: str) -> bool:
+        task = self.tasks.get(session_id)
+        return task is not None and not task.done()
+
+    def cancel(self, session_id: str) -> None:
+        """
+        Laufenden Import abbrechen (z.B. andere Playlist geladen)
+        """
+        task = self.tasks.pop(session_id, None)
+        if task is not None:
+            task.cancel()
+
+    async def load(self, session_id: str, playlist_ids: List[str],
+                   deck_order: DeckOrder = DeckOrder.SHUFFLE) -> Dict:
+        """
+        Erste Page jeder Playlist laden, Rest im Hintergrund
+        Returns: Deck-Größe jetzt & erwartete Gesamtgröße (vor Duplikat-Filter)
+        """
+        self.cancel(session_id)
+        # Nur die Spotify-Requests im Threadpool - das Deck ändert sich im Event-Loop
+        streams = await run_in_threadpool(game_service.fetch_playlist_streams, session_id, playlist_ids)
+        builder = game_service.set_stream_deck(session_id, playlist_ids, streams, deck_order)
+
+        track_count = len(game_service.track_queues[session_id])
+        expected_total = sum(stream.expected_total for stream in streams)
+        loading = any(len(stream.info.tracks) < stream.expected_total for stream in streams)
+        if loading:
+            self.tasks[session_id] = asyncio.get_running_loop().create_task(
+                self._consume(session_id, builder, streams)
+            )
+
+        return {
+            "track_count": track_count,
+            "expected_total": expected_total,
+            "skipped": builder.rejected,
+            "loading": loading
+        }
+
+    async def _consume(self, session_id: str, builder: DeckBuilder, streams: List[PlaylistStream]) -> None:
+        """
+        Restliche Pages aller Playlists parallel laden und ins Deck mischen
+        """
+        errors: List[str] = []
+        try:
+            await asyncio.gather(*(
+                self._consume_stream(session_id, builder, stream, errors) for stream in streams
+            ))
+        finally:
+            if self.tasks.get(session_id) is asyncio.current_task():
+                self.tasks.pop(session_id, None)
+
+        if game_service.deck_builders.get(session_id) is not builder:
+            return  # Session gelöscht oder neue Playlist
+
+        total = len(game_service.track_queues.get(session_id, []))
+        print(f"📥 Playlists {', '.join(builder.playlist_ids)} komplett: {total} Tracks "
+              f"({builder.rejected} übersprungen) in Session {session_id}")
+        await broadcast_to_session(session_id, 'playlist_loaded', {
+            'session_id': session_id,
+            'playlist_id': builder.playlist_ids[0],
+            'playlist_ids': builder.playlist_ids,
+            'total_tracks': total,
+            'skipped': builder.rejected,
+            'error': "; ".join(errors) or None
+        })
+
+    async def _consume_stream(self, session_id: str, builder: DeckBuilder,
+                              stream: PlaylistStream, errors: List[str]) -> None:
+        """
+        Pages einer Playlist - Spotify im Threadpool, Deck-Änderung im Event-Loop
+        """
+        loop = asyncio.get_running_loop()
+        playlist_id = stream.info.playlist_id
+        try:
+            while True:
+                # run_in_executor kopiert den Kontext nicht (Trace des Lade-Requests)
+                page = await loop.run_in_executor(None, contextvars.copy_context().run, next, stream.pages, None)
+                if page is None:
+                    return
+                if game_service.deck_builders.get(session_id) is not builder:
+                    return
+                game_service.extend_deck(session_id, page)
+        except Exception as e:
+            errors.append(f"{playlist_id}: {e}")
+            print(f"⚠️  Playlist {playlist_id} nur teilweise geladen: {e}")
+
+
+# Singleton Instance
+playlist_loader = PlaylistLoader()
@@ -0,0 +1,250 @@
+"""
+Preview Cache - 30s-Vorschau-Clips lokal auf Platte
+
+Gäste ohne Spotify Premium hören den Track über `/media/preview/{track_id}`.
+Jeder Clip wird nur einmal vom CDN geladen und danach von Platte
+ausgeliefert - spart Bandbreite im Venue-WLAN, egal wie viele Handys
+zuhören. Der Cache ist ein LRU mit Byte-Grenze (ältester Clip fliegt raus);
+nach einem Neustart wird der Ordner nach Änderungszeit wieder eingelesen.
+
+Downloads sind blockierend (requests) und laufen im Threadpool bzw. im
+eigenen Prefetch-Pool. Gleichzeitige Anfragen für denselben Clip teilen sich
+einen Download. Ein verdrängter Clip, der gerade ausgeliefert wird, bleibt
+über den offenen File-Handle lesbar.
+"""
+import os
+import re
+import tempfile
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import suppress
+from typing import BinaryIO, Dict, Iterable, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from ..core.config import settings
+
+
+SUFFIX = ".mp3"
+MEDIA_TYPE = "audio/mpeg"
+_TRACK_ID = re.compile(r"^[A-Za-z0-9_-]{1,64}$")
+_CHUNK_SIZE = 64 * 1024
+
+
+def valid_track_id(track_id: str) -> bool:
+    """Track IDs landen im Dateinamen - nur harmlose Zeichen"""
+    return bool(_TRACK_ID.match(track_id))
+
+
+class PreviewCache:
+    """
+    LRU-Cache für Preview-Clips (track_id -> Datei)
+    """
+
+    def __init__(self, directory: str, max_bytes: int, max_clip_bytes: int,
+                 workers: int = 4, timeout: float = 10.0):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.max_clip_bytes = max_clip_bytes
+        self.workers = workers
+        self.timeout = timeout
+        self._entries: "OrderedDict[str, int]" = OrderedDict()  # track_id -> Bytes, älteste zuerst
+        self._bytes = 0
+        self._loaded = False
+        self._lock = threading.Lock()
+        self._inflight: Dict[str, threading.Event] = {}
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._http: Optional[requests.Session] = None
+        self.stats: Dict[str, int] = {
+            "hits": 0,
+            "misses": 0,
+            "fetches": 0,
+            "fetch_errors": 0,
+            "evictions": 0,
+            "prefetched": 0
+        }
+
+    def _path(self, track_id: str) -> str:
+        return os.path.join(self.directory, track_id + SUFFIX)
+
+    def _load_locked(self) -> None:
+        """Bestehende Clips beim ersten Zugriff einlesen (älteste zuerst)"""
+        if self._loaded:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        files = []
+        for entry in os.scandir(self.directory):
+            if not entry.is_file():
+                continue
+            if entry.name.startswith(".part-"):
+                with suppress(OSError):
+                    os.remove(entry.path)  # abgebrochener Download
+            elif entry.name.endswith(SUFFIX):
+                stat = entry.stat()
+                files.append((stat.st_mtime, entry.name[:-len(SUFFIX)], stat.st_size))
+        for _, track_id, size in sorted(files):
+            self._entries[track_id] = size
+            self._bytes += size
+        self._loaded = True
+        self._evict_locked()
+
+    def _evict_locked(self) -> None:
+        while self._bytes > self.max_bytes and len(self._entries) > 1:
+            track_id, size = self._entries.popitem(last=False)
+            self._bytes -= size
+            self.stats["evictions"] += 1
+            with suppress(FileNotFoundError):
+                os.remove(self._path(track_id))
+
+    def _open(self, track_id: str, count_hit: bool) -> Optional[BinaryIO]:
+        with self._lock:
+            self._load_locked()
+            if track_id not in self._entries:
+                return None
+            try:
+                handle = open(self._path(track_id), "rb")
+            except FileNotFoundError:
+                self._bytes -= self._entries.pop(track_id)
+                return None
+            self._entries.move_to_end(track_id)
+            if count_hit:
+                self.stats["hits"] += 1
+            return handle
+
+    def open(self, track_id: str) -> Optional[BinaryIO]:
+        """
+        Clip aus dem Cache öffnen
+        Returns: None wenn nicht im Cache
+        """
+        return self._open(track_id, count_hit=True)
+
+    def fetch(self, track_id: str, url: str) -> BinaryIO:
+        """
+        Clip aus dem Cache oder vom Origin laden (blockierend)
+        Raises: requests.RequestException / ValueError wenn der Download scheitert
+        """
+        handle = self.open(track_id)
+        if handle is not None:
+            return handle
+
+        with self._lock:
+            self.stats["misses"] += 1
+        self._ensure(track_id, url)
+        handle = self._open(track_id, count_hit=False)
+        if handle is None:
+            raise ValueError(f"Preview {track_id} passt nicht in den Cache")
+        return handle
+
+    def _ensure(self, track_id: str, url: str) -> None:
+        """Download, falls der Clip fehlt - pro Clip höchstens einer gleichzeitig"""
+        while True:
+            with self._lock:
+                self._load_locked()
+                if track_id in self._entries:
+                    return
+                event = self._inflight.get(track_id)
+                if event is None:
+                    event = threading.Event()
+                    self._inflight[track_id] = event
+                    break
+            event.wait(self.timeout)
+
+        try:
+            self._download(track_id, url)
+        finally:
+            with self._lock:
+                self._inflight.pop(track_id, None)
+            event.set()
+
+    def _download(self, track_id: str, url: str) -> None:
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, prefix=".part-")
+        size = 0
+        try:
+            with os.fdopen(fd, "wb") as out, \
+                    self._session().get(url, stream=True, timeout=self.timeout) as response:
+                response.raise_for_status()
+                for chunk in response.iter_content(_CHUNK_SIZE):
+                    size += len(chunk)
+                    if size > self.max_clip_bytes:
+                        raise ValueError(f"Preview {track_id} größer als {self.max_clip_bytes} Bytes")
+                    out.write(chunk)
+            os.replace(tmp_path, self._path(track_id))
+        except BaseException:
+            with suppress(FileNotFoundError):
+                os.remove(tmp_path)
+            with self._lock:
+                self.stats["fetch_errors"] += 1
+            raise
+
+        with self._lock:
+            self.stats["fetches"] += 1
+            previous = self._entries.pop(track_id, None)
+            if previous is not None:
+                self._bytes -= previous
+            self._entries[track_id] = size
+            self._bytes += size
+            self._evict_locked()
+
+    def _session(self) -> requests.Session:
+        if self._http is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_maxsize=max(self.workers, 10))
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            self._http = session
+        return self._http
+
+    def prefetch(self, clips: Iterable[Tuple[str, Optional[str]]]) -> int:
+        """
+        Clips im Hintergrund laden (blockiert nicht)
+        Returns: Anzahl gestarteter Downloads
+        """
+        started = 0
+        for track_id, url in clips:
+            if not url or not valid_track_id(track_id):
+                continue
+            with self._lock:
+                if track_id in self._inflight or (self._loaded and track_id in self._entries):
+                    continue
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="preview")
+            self._executor.submit(self._prefetch_one, track_id, url)
+            started += 1
+        return started
+
+    def _prefetch_one(self, track_id: str, url: str) -> None:
+        try:
+            self._ensure(track_id, url)
+        except Exception as e:
+            print(f"⚠️  Preview {track_id} nicht vorgeladen: {e}")
+            return
+        with self._lock:
+            self.stats["prefetched"] += 1
+
+    def stop(self) -> None:
+        """Prefetch-Pool beenden (laufende Downloads laufen aus)"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            return {
+                "clips": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "inflight": len(self._inflight),
+                **self.stats
+            }
+
+
+# Singleton Instance
+preview_cache = PreviewCache(
+    directory=settings.preview_cache_dir,
+    max_bytes=settings.preview_cache_max_mb * 1024 * 1024,
+    max_clip_bytes=settings.preview_max_clip_mb * 1024 * 1024,
+    workers=settings.preview_fetch_workers,
+    timeout=settings.preview_fetch_timeout_s
+)
@@ -0,0 +1,337 @@
+"""
+Profiler - CPU-Profile eines laufenden Workers ohne Neustart (/admin/profile)
+
+Zwei Arten, beide liefern Collapsed Stacks ("a;b;c 42" pro Zeile, direkt
+lesbar für flamegraph.pl, speedscope, inferno):
+
+- Sampling: ein Hintergrund-Thread liest alle `interval_ms` den Stack des
+  Event-Loop-Threads (`sys._current_frames`), gewichtet mit der Zeit seit dem
+  letzten Sample (µs) - zeitlich begrenzt, kostet den Worker nur die kurzen
+  GIL-Übernahmen des Threads
+- Einzelner Request / Socket-Event: der nächste passende Request (Pfad-Präfix)
+  bzw. das nächste Socket.IO-Event wird deterministisch mitgeschnitten
+  (`sys.setprofile`, gewichtet in µs). Gezählt wird nur, solange der Task
+  dieses Requests/Events läuft - andere Tasks dazwischen nicht. Kostet nur
+  während dieses einen Requests.
+
+Es läuft immer höchstens ein Profil gleichzeitig.
+"""
+import asyncio
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Any, Dict, List, Optional
+
+from ..core.config import settings
+
+
+# Stacks enden hier: darunter liegen nur Event-Loop & Server-Start
+# (Handle._run bei asyncio, Runner.run bei uvloop - dessen Loop ist C-Code;
+# asyncio.Runner gibt es erst ab Python 3.11)
+_LOOP_ROOTS = {asyncio.events.Handle._run.__code__}
+_RUNNER = getattr(getattr(asyncio, "runners", None), "Runner", None)
+if _RUNNER is not None:
+    _LOOP_ROOTS.add(_RUNNER.run.__code__)
+IDLE = "(idle)"
+
+
+def frame_name(frame) -> str:
+    # co_qualname ("Klasse.methode") ab Python 3.11, davor nur co_name
+    code = frame.f_code
+    return f"{frame.f_globals.get('__name__', '?')}:{getattr(code, 'co_qualname', code.co_name)}"
+
+
+def collapse(frame, limit: int) -> str:
+    """
+    Stack als "äußerster;...;innerster" (bis zur Event-Loop bzw. `limit` Frames)
+    """
+    names = []
+    while frame is not None and len(names) < limit and frame.f_code not in _LOOP_ROOTS:
+        names.append(frame_name(frame))
+        frame = frame.f_back
+    return ";".join(reversed(names))
+
+
+def top_functions(stacks: Dict[str, int], limit: int = 20) -> List[Dict[str, Any]]:
+    """
+    Funktionen nach Eigenzeit (letzter Frame) und Gesamtzeit (irgendwo im Stack)
+    """
+    own: Counter = Counter()
+    total: Counter = Counter()
+    for stack, weight in stacks.items():
+        frames = stack.split(";")
+        own[frames[-1]] += weight
+        for name in set(frames):
+            total[name] += weight
+    return [{"function": name, "self": weight, "total": total[name]}
+            for name, weight in own.most_common(limit)]
+
+
+class _Sampler(threading.Thread):
+    """
+    Liest periodisch die Stacks eines (oder aller) Threads
+    """
+
+    def __init__(self, thread_id: Optional[int], interval_s: float, depth: int):
+        super().__init__(name="profiler-sampler", daemon=True)
+        self.thread_id = thread_id
+        self.interval_s = interval_s
+        self.depth = depth
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self._halt = threading.Event()
+
+    def run(self) -> None:
+        own = threading.get_ident()
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        last = time.perf_counter_ns()
+        while not self._halt.wait(self.interval_s):
+            frames = sys._current_frames()
+            # Gewicht = Zeit seit dem letzten Sample: solange Python-Code die GIL hält,
+            # kommt der Thread seltener dran - Zählen würde CPU-Last unterschätzen
+            now = time.perf_counter_ns()
+            weight, last = (now - last) // 1000, now
+            self.samples += 1
+            if self.thread_id is not None:
+                frame = frames.get(self.thread_id)
+                if frame is not None:
+                    self.stacks[collapse(frame, self.depth) or IDLE] += weight
+                continue
+            for ident, frame in frames.items():
+                if ident == own:
+                    continue
+                if ident not in names:
+                    names = {thread.ident: thread.name for thread in threading.enumerate()}
+                self.stacks[f"{names.get(ident, ident)};{collapse(frame, self.depth) or IDLE}"] += weight
+
+    def stop(self) -> None:
+        self._halt.set()
+        self.join()
+
+
+class _TaskTracer:
+    """
+    sys.setprofile-Mitschnitt, der nur Zeit des Ziel-Tasks zählt (µs pro Stack)
+    """
+
+    def __init__(self, task: asyncio.Task, depth: int, max_s: float):
+        self.task = task
+        self.loop = task.get_loop()
+        self.depth = depth
+        self.deadline = time.perf_counter_ns() + int(max_s * 1e9)
+        self.stacks: Counter = Counter()
+        self.truncated = False
+        self._names: Dict[Any, str] = {}  # Frame -> Stack (Frames leben nur während des Mitschnitts)
+        self._current: Optional[str] = None
+        self._last = 0
+
+    def _stack(self, frame) -> str:
+        stack = self._names.get(frame)
+        if stack is None:
+            stack = self._names[frame] = collapse(frame, self.depth)
+        return stack
+
+    def __call__(self, frame, event, arg):
+        now = time.perf_counter_ns()
+        if self._current is not None:
+            self.stacks[self._current] += now - self._last
+        self._last = now
+        if now > self.deadline:
+            self.truncated = True
+            self._current = None
+            sys.setprofile(None)
+            return
+        if asyncio.current_task(self.loop) is not self.task:
+            self._current = None
+        elif event == "c_call":
+            self._current = f"{self._stack(frame)};{getattr(arg, '__qualname__', repr(arg))}"
+        elif event == "return":
+            self._current = self._stack(frame.f_back) if frame.f_back is not None else None
+        else:
+            self._current = self._stack(frame)
+
+    def start(self) -> None:
+        self._last = time.perf_counter_ns()
+        sys.setprofile(self)
+
+    def stop(self) -> Dict[str, int]:
+        sys.setprofile(None)
+        return {stack: round(ns / 1000) for stack, ns in self.stacks.items() if stack and ns >= 500}
+
+
+class Profiler:
+    """
+    Verwaltet das (eine) laufende Profil eines Workers
+    """
+
+    def __init__(self, max_duration_s: float = 30.0, min_interval_ms: float = 1.0, max_depth: int = 64):
+        self.max_duration_s = max_duration_s
+        self.min_interval_ms = min_interval_ms
+        self.max_depth = max_depth
+        self._busy = False
+        self._armed: Optional[Dict[str, Any]] = None  # wartet auf Request/Event
+        self.stats: Dict[str, int] = {"sampling": 0, "captures": 0, "capture_timeouts": 0}
+
+    @property
+    def busy(self) -> bool:
+        return self._busy
+
+    def _claim(self) -> None:
+        if self._busy:
+            raise RuntimeError("Es läuft bereits ein Profil")
+        self._busy = True
+
+    async def sample(self, duration_s: float, interval_ms: float, all_threads: bool = False) -> Dict[str, Any]:
+        """
+        Worker `duration_s` lang abtasten (Event-Loop-Thread oder alle Threads)
+        """
+        if not 0 < duration_s <= self.max_duration_s:
+            raise ValueError(f"duration_s muss zwischen 0 und {self.max_duration_s} liegen")
+        if interval_ms < self.min_interval_ms:
+            raise ValueError(f"interval_ms muss mindestens {self.min_interval_ms} sein")
+        self._claim()
+        sampler = _Sampler(None if all_threads else threading.get_ident(), interval_ms / 1000.0, self.max_depth)
+        started = time.perf_counter()
+        try:
+            sampler.start()
+            await asyncio.sleep(duration_s)
+        finally:
+            sampler.stop()  # wartet höchstens ein Intervall
+            self._busy = False
+        self.stats["sampling"] += 1
+        return {
+            "mode": "sampling",
+            "duration_s": round(time.perf_counter() - started, 3),
+            "interval_ms": interval_ms,
+            "samples": sampler.samples,
+            "unit": "us",
+            "stacks": dict(sampler.stacks)
+        }
+
+    async def capture_next(self, kind: str, match: str, timeout_s: float) -> Dict[str, Any]:
+        """
+        Nächsten Request (Pfad beginnt mit `match`) bzw. nächstes Socket-Event
+        (`match` = Event-Name) mitschneiden
+        """
+        if kind not in ("request", "event"):
+            raise ValueError("kind muss 'request' oder 'event' sein")
+        if not 0 < timeout_s <= self.max_duration_s:
+            raise ValueError(f"timeout_s muss zwischen 0 und {self.max_duration_s} liegen")
+        self._claim()
+        done = asyncio.get_running_loop().create_future()
+        self._armed = {"kind": kind, "match": match, "done": done}
+        try:
+            return await asyncio.wait_for(asyncio.shield(done), timeout_s)
+        except asyncio.TimeoutError:
+            if self._armed is not None:
+                self.stats["capture_timeouts"] += 1
+                raise
+            # Mitschnitt läuft schon - auf Ende des Requests/Events warten
+            return await asyncio.wait_for(done, self.max_duration_s)
+        finally:
+            self._armed = None
+            self._busy = False
+
+    def wants(self, kind: str, name: str) -> bool:
+        """
+        Soll dieser Request / dieses Event mitgeschnitten werden? (billig, wenn nichts wartet)
+        """
+        armed = self._armed
+        if armed is None or armed["kind"] != kind:
+            return False
+        return name.startswith(armed["match"]) if kind == "request" else name == armed["match"]
+
+    def capture(self, name: str) -> "_Capture":
+        """
+        Context Manager um die Verarbeitung (im Task des Requests/Events)
+        """
+        armed, self._armed = self._armed, None  # nur einmal
+        return _Capture(self, armed, name)
+
+    def snapshot(self) -> Dict[str, Any]:
+        armed = self._armed
+        return {"busy": self._busy, "armed": {"kind": armed["kind"], "match": armed["match"]} if armed else None,
+                **self.stats}
+
+
+class _Capture:
+    def __init__(self, profiler: Profiler, armed: Optional[Dict[str, Any]], name: str):
+        self.profiler = profiler
+        self.armed = armed
+        self.name = name
+        self.tracer: Optional[_TaskTracer] = None
+
+    def __enter__(self):
+        if self.armed is not None and not self.armed["done"].done():
+            self.tracer = _TaskTracer(asyncio.current_task(), self.profiler.max_depth, self.profiler.max_duration_s)
+            self.started = time.perf_counter()
+            self.tracer.start()
+        return self
+
+    def __exit__(self, *exc):
+        if self.tracer is None:
+            return False
+        stacks = self.tracer.stop()
+        self.profiler.stats["captures"] += 1
+        done = self.armed["done"]
+        if not done.done():
+            done.set_result({
+                "mode": self.armed["kind"],
+                "target": self.name,
+                "duration_s": round(time.perf_counter() - self.started, 6),
+                "truncated": self.tracer.truncated,
+                "unit": "us",
+                "stacks": stacks
+            })
+        return False
+
+
+def instrument_socketio(sio, profiler: "Profiler") -> None:
+    """
+    Socket.IO-Handler so einpacken, dass `capture_next("event", ...)` greift
+    (connect/disconnect ausgenommen - socketio ruft sie mit variabler Signatur)
+    """
+    for event, handler in list(sio.handlers.get("/", {}).items()):
+        if event in ("connect", "disconnect") or not asyncio.iscoroutinefunction(handler):
+            continue
+
+        async def wrapper(*args, _event=event, _handler=handler):
+            if profiler.wants("event", _event):
+                with profiler.capture(_event):
+                    return await _handler(*args)
+            return await _handler(*args)
+
+        wrapper.__wrapped__ = handler
+        sio.handlers["/"][event] = wrapper
+
+
+class ProfilerMiddleware:
+    """
+    ASGI Middleware: schneidet den nächsten passenden Request mit, falls angefordert
+    """
+
+    def __init__(self, app, profiler: Profiler):
+        self.app = app
+        self.profiler = profiler
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and self.profiler.wants("request", scope["path"]):
+            with self.profiler.capture(scope["path"]):
+                await self.app(scope, receive, send)
+            return
+        await self.app(scope, receive, send)
+
+
+def to_collapsed(stacks: Dict[str, int]) -> str:
+    """
+    Collapsed-Stack-Format (flamegraph.pl / speedscope)
+    """
+    return "".join(f"{stack} {weight}\n" for stack, weight in sorted(stacks.items()) if stack)
+
+
+# Singleton Instance
+profiler = Profiler(
+    max_duration_s=settings.profiler_max_duration_s,
+    min_interval_ms=settings.profiler_min_interval_ms
+)
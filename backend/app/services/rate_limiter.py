@@ -0,0 +1,49 @@
+"""
+Rate Limiting - Token Bucket
+"""
+import time
+from typing import Optional
+
+
+class TokenBucket:
+    """
+    Token Bucket
+    Füllt sich mit `rate` Tokens pro Sekunde bis maximal `burst` Tokens
+    """
+
+    __slots__ = ("rate", "burst", "tokens", "updated_at")
+
+    def __init__(self, rate: float, burst: float, now: Optional[float] = None):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated_at = time.monotonic() if now is None else now
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self.updated_at
+        if elapsed > 0:
+            self.tokens = min(self.burst, self.tokens + elapsed * self.rate)
+            self.updated_at = now
+
+    def try_acquire(self, tokens: float = 1.0, now: Optional[float] = None) -> bool:
+        """
+        Nimm Tokens, falls verfügbar
+        Returns: False wenn das Limit erreicht ist
+        """
+        self._refill(time.monotonic() if now is None else now)
+        if self.tokens >= tokens:
+            self.tokens -= tokens
+            return True
+        return False
+
+    def time_until_available(self, tokens: float = 1.0, now: Optional[float] = None) -> float:
+        """
+        Sekunden bis `tokens` verfügbar sind (0 wenn sofort)
+        """
+        self._refill(time.monotonic() if now is None else now)
+        missing = tokens - self.tokens
+        if missing <= 0:
+            return 0.0
+        if self.rate <= 0:
+            return float("inf")
+        return missing / self.rate
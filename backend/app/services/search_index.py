@@ -0,0 +1,251 @@
+"""
+Track Search Index - Autocomplete für Titel & Künstler ohne Spotify-Requests
+
+Pro Session ein Index über das geladene Deck, dazu optional ein globaler
+Katalog (JSONL-Datei mit `title`/`artist`). Lookups laufen über sortierte
+Wort-Listen (Prefix-Suche per bisect) und bleiben damit unter einer
+Millisekunde, auch bei großen Katalogen.
+"""
+import bisect
+import heapq
+import json
+import os
+import re
+import threading
+import unicodedata
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from ..core.config import settings
+from ..models.game import SpotifyTrack
+
+
+KINDS = ("title", "artist")
+_SEPARATORS = re.compile(r"[\W_]+")
+
+
+@lru_cache(maxsize=1 << 16)
+def normalize_text(text: str) -> str:
+    """
+    Gemeinsame Normalisierung für Antwortprüfung & Autocomplete
+    'Beyoncé - Crazy in Love!' -> 'beyonce crazy in love'
+    Gecacht: dieselben Titel kommen in vielen Sessions vor (gleiche Playlists)
+    """
+    decomposed = unicodedata.normalize("NFKD", text.casefold())
+    stripped = "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+    return _SEPARATORS.sub(" ", stripped).strip()
+
+
+class SearchIndex:
+    """
+    Prefix-Index über Wörter
+
+    Jedes Wort eines Eintrags landet als (wort, eintrag_id) in einer
+    sortierten Liste. Ein Query-Wort trifft alle Einträge mit einem Wort,
+    das so beginnt (bisect auf den Bereich [wort, wort + '\\uffff')).
+    Ganze Einträge liegen zusätzlich sortiert vor (Treffer, die mit der Query
+    beginnen, ebenfalls per bisect).
+    """
+
+    def __init__(self):
+        self.entries: List[Tuple[str, str, str]] = []  # (kind, Anzeige, normalisiert)
+        self._seen: Set[Tuple[str, str]] = set()
+        self._words: List[Tuple[str, int]] = []
+        self._pending: List[Tuple[str, int]] = []
+        self._starts: List[Tuple[str, int]] = []  # (normalisiert, eintrag_id), sortiert
+        self._pending_starts: List[Tuple[str, int]] = []
+        self._ranks: List[Tuple[int, str, str]] = []  # eintrag_id -> (Länge, Anzeige, kind)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def add(self, kind: str, text: str) -> None:
+        normalized = normalize_text(text)
+        if not normalized or (kind, normalized) in self._seen:
+            return
+        self._seen.add((kind, normalized))
+        entry_id = len(self.entries)
+        self.entries.append((kind, text, normalized))
+        self._ranks.append((len(normalized), text, kind))
+        self._pending.extend((word, entry_id) for word in set(normalized.split()))
+        self._pending_starts.append((normalized, entry_id))
+
+    def add_tracks(self, tracks: Iterable[SpotifyTrack]) -> None:
+        for track in tracks:
+            self.add("title", track.title)
+            self.add("artist", track.artist)
+
+    def _flush(self) -> None:
+        """Neue Wörter einsortieren (gesammelt, ein Sortiervorgang pro Batch)"""
+        if self._pending:
+            self._words.extend(self._pending)
+            self._words.sort()
+            self._pending = []
+            self._starts.extend(self._pending_starts)
+            self._starts.sort()
+            self._pending_starts = []
+
+    @staticmethod
+    def _range(items: List[Tuple[str, int]], prefix: str) -> Set[int]:
+        lo = bisect.bisect_left(items, (prefix,))
+        hi = bisect.bisect_left(items, (prefix + "\uffff",))
+        return {entry_id for _, entry_id in items[lo:hi]}
+
+    def _prefix_matches(self, prefix: str) -> Set[int]:
+        return self._range(self._words, prefix)
+
+    def search(self, query: str, kind: Optional[str] = None, limit: int = 8) -> List[Dict]:
+        """
+        Einträge, bei denen jedes Query-Wort Anfang eines Wortes ist
+        Sortierung: Eintrag beginnt mit der Query, dann kürzere Einträge
+        """
+        self._flush()
+        normalized = normalize_text(query)
+        words = normalized.split()
+        if not words:
+            return []
+
+        # Längstes (meist seltenstes) Wort zuerst → kleinste Zwischenmenge
+        candidates: Optional[Set[int]] = None
+        for word in sorted(words, key=len, reverse=True):
+            matches = self._prefix_matches(word)
+            candidates = matches if candidates is None else candidates & matches
+            if not candidates:
+                return []
+
+        entries = self.entries
+        if kind:
+            candidates = {entry_id for entry_id in candidates if entries[entry_id][0] == kind}
+
+        # Nur die besten `limit` per Heap statt alle Kandidaten zu sortieren (kurze
+        # Prefixe treffen tausende) - erst Einträge, die mit der Query beginnen
+        rank = self._ranks.__getitem__  # vorberechnet: kein Python-Aufruf pro Kandidat
+        starts = candidates & self._range(self._starts, normalized)
+        best = heapq.nsmallest(limit, starts, key=rank)
+        if len(best) < limit:
+            best += heapq.nsmallest(limit - len(best), candidates - starts, key=rank)
+        return [{"text": entries[entry_id][1], "kind": entries[entry_id][0]} for entry_id in best]
+
+
+class TrackSearch:
+    """
+    Session-Indizes + globaler Katalog
+    """
+
+    def __init__(self):
+        self.sessions: Dict[str, SearchIndex] = {}
+        self._deferred: Dict[str, List[SpotifyTrack]] = {}  # Decks, deren Index noch fehlt
+        self._catalog: Optional[SearchIndex] = None
+        self._catalog_lock = threading.Lock()
+        self._loader: Optional[threading.Thread] = None
+        self._empty = SearchIndex()  # Platzhalter, bis der Katalog geladen ist
+
+    def index_session(self, session_id: str, tracks: Iterable[SpotifyTrack], lazy: bool = False) -> None:
+        """
+        Index für das Deck einer Session (ersetzt einen alten Index)
+        lazy=True: erst bei der ersten Suche bauen (z.B. tausende Sessions beim Neustart)
+        """
+        self._deferred.pop(session_id, None)
+        if lazy:
+            self.sessions.pop(session_id, None)
+            self._deferred[session_id] = list(tracks)
+            return
+        index = SearchIndex()
+        index.add_tracks(tracks)
+        self.sessions[session_id] = index
+
+    def add_tracks(self, session_id: str, tracks: Iterable[SpotifyTrack]) -> None:
+        """Tracks zum bestehenden Index einer Session hinzufügen"""
+        deferred = self._deferred.get(session_id)
+        if deferred is not None:
+            deferred.extend(tracks)
+            return
+        self.sessions.setdefault(session_id, SearchIndex()).add_tracks(tracks)
+
+    def drop_session(self, session_id: str) -> None:
+        self.sessions.pop(session_id, None)
+        self._deferred.pop(session_id, None)
+
+    def session_index(self, session_id: str) -> Optional[SearchIndex]:
+        deferred = self._deferred.pop(session_id, None)
+        if deferred is not None:
+            self.index_session(session_id, deferred)
+        return self.sessions.get(session_id)
+
+    def start_loading(self) -> threading.Thread:
+        """
+        Katalog im Hintergrund-Thread laden (nur einmal, kann groß sein)
+        Returns: Lade-Thread
+        """
+        with self._catalog_lock:
+            if self._loader is None:
+                self._loader = threading.Thread(target=self._load, name="search-catalog", daemon=True)
+                self._loader.start()
+            return self._loader
+
+    def _load(self) -> None:
+        self._catalog = self.load_catalog(settings.search_catalog_path)
+
+    @property
+    def catalog(self) -> SearchIndex:
+        """
+        Globaler Katalog - bis er geladen ist ein leerer Index
+        Autocomplete läuft auf der Event-Loop: nie auf das Laden warten
+        """
+        catalog = self._catalog
+        if catalog is None:
+            self.start_loading()
+            return self._empty
+        return catalog
+
+    @staticmethod
+    def load_catalog(path: str) -> SearchIndex:
+        """
+        JSONL-Katalog laden: eine Zeile pro Track mit `title` und/oder `artist`
+        """
+        index = SearchIndex()
+        if not path:
+            return index
+        if not os.path.exists(path):
+            print(f"⚠️  Suchkatalog {path} nicht gefunden")
+            return index
+
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                item = json.loads(line)
+                for kind in KINDS:
+                    if item.get(kind):
+                        index.add(kind, item[kind])
+        print(f"🔎 Suchkatalog geladen: {len(index)} Einträge")
+        return index
+
+    def search(self, query: str, session_id: Optional[str] = None,
+               kind: Optional[str] = None, limit: int = 8) -> List[Dict]:
+        """
+        Treffer aus dem Session-Deck zuerst, dann aus dem Katalog
+        """
+        if len(normalize_text(query)) < settings.autocomplete_min_chars:
+            return []
+
+        results: List[Dict] = []
+        seen: Set[Tuple[str, str]] = set()
+        sources = [self.session_index(session_id)] if session_id else []
+        sources.append(self.catalog)
+        for index in sources:
+            if index is None:
+                continue
+            for hit in index.search(query, kind, limit):
+                key = (hit["kind"], normalize_text(hit["text"]))
+                if key not in seen:
+                    seen.add(key)
+                    results.append(hit)
+            if len(results) >= limit:
+                break
+        return results[:limit]
+
+
+# Singleton Instance
+track_search = TrackSearch()
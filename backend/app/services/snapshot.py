@@ -0,0 +1,406 @@
+"""
+Snapshots & Replay - Sessions aus dem Event Log wiederherstellen
+
+Eine Session = neuester Snapshot + alle Events danach. Der Replay läuft auf
+schlanken Zustandsobjekten (Dicts, Listen, __slots__) statt auf
+Pydantic-Models; Events werden direkt aus dem gemappten Segment dekodiert
+(struct.unpack_from, keine Kopie). Erst am Ende baut `restore` einmal die
+Models für den GameService.
+
+Snapshot (JSON):
+    {"version": 1, "session": {...}, "players": [...], "deck": [[...]] | null, "solution": [...] | null}
+Zeitpunkte als Mikrosekunden seit 1970 (0 = None), Tracks als Zeilen in
+der Reihenfolge von event_log.TRACK_FIELDS.
+"""
+import json
+import mmap
+import os
+from typing import Any, Callable, Dict, List, Optional
+
+from ..models.game import DeckOrder, GameMode, GameSession, Player, SpotifyTrack, TimelineCard
+from .deck_builder import DeckBuilder
+from .event_log import (
+    CARD_PLACED,
+    DELETED_MARKER,
+    GUESS,
+    HEADER,
+    STATUSES,
+    TRACK_ADVANCED,
+    TURN_ADVANCED,
+    EventLog,
+    EventType,
+    decode_time,
+    encode_time,
+    list_segments,
+    list_snapshots,
+    map_segment,
+    player_id_of,
+    player_key,
+    track_from_row,
+    track_row
+)
+from .search_index import track_search
+
+
+SNAPSHOT_VERSION = 1
+
+
+# =====================================================
+# LIVE-ZUSTAND -> SNAPSHOT
+# =====================================================
+
+def session_fields(session: GameSession) -> Dict[str, Any]:
+    return {
+        "session_id": session.session_id,
+        "host_name": session.host_name,
+        "playlist_id": session.playlist_id,
+        "playlist_ids": list(session.playlist_ids),
+        "deck_order": session.deck_order.value,
+        "current_track_index": session.current_track_index,
+        "started_at": encode_time(session.started_at),
+        "status": session.status,
+        "game_mode": session.game_mode.value,
+        "win_condition": session.win_condition,
+        "current_player_turn": session.current_player_turn,
+        "round_number": session.round_number,
+        "turn_time_limit": session.turn_time_limit,
+        "turn_deadline": encode_time(session.turn_deadline)
+    }
+
+
+def player_fields(player: Player) -> Dict[str, Any]:
+    return {
+        "player_id": player.player_id,
+        "name": player.name,
+        "score": player.score,
+        "tokens": player.tokens,
+        "has_won": player.has_won,
+        "timeline": [[card.track_id, card.title, card.artist, card.year, card.is_correct]
+                     for card in player.timeline]
+    }
+
+
+def capture_session(service, session_id: str) -> Dict[str, Any]:
+    """
+    Snapshot einer Session aus dem GameService
+    """
+    deck = service.track_queues.get(session_id)
+    solution = service.solutions.get(session_id)
+    return {
+        "version": SNAPSHOT_VERSION,
+        "session": session_fields(service.sessions[session_id]),
+        "players": [player_fields(player) for player in service.players.get(session_id, [])],
+        "deck": [track_row(track) for track in deck] if deck is not None else None,
+        "solution": track_row(solution) if solution is not None else None
+    }
+
+
+# =====================================================
+# REPLAY-ZUSTAND
+# =====================================================
+
+class PlayerState:
+    __slots__ = ("player_id", "name", "score", "tokens", "timeline", "has_won")
+
+    def __init__(self, player_id: str, name: str, score: int, tokens: int,
+                 timeline: List[List[Any]], has_won: bool):
+        self.player_id = player_id
+        self.name = name
+        self.score = score
+        self.tokens = tokens
+        self.timeline = timeline
+        self.has_won = has_won
+
+
+class SessionState:
+    """
+    Zustand einer Session während des Replays
+    `session["current_player_turn"]` ist hier der 16-Byte-Key (NO_PLAYER = keiner)
+    """
+
+    __slots__ = ("session", "players", "deck", "solution", "deleted", "events")
+
+    def __init__(self):
+        self.session: Dict[str, Any] = {}
+        self.players: Dict[bytes, PlayerState] = {}  # Beitritts-Reihenfolge
+        self.deck: Optional[List[List[Any]]] = None
+        self.solution: Optional[List[Any]] = None
+        self.deleted = False
+        self.events = 0
+
+    @classmethod
+    def from_snapshot(cls, snapshot: Dict[str, Any]) -> "SessionState":
+        if snapshot.get("version") != SNAPSHOT_VERSION:
+            raise ValueError(f"Unbekannte Snapshot-Version {snapshot.get('version')}")
+        state = cls()
+        state._set_session(snapshot["session"])
+        for data in snapshot["players"]:
+            state.players[player_key(data["player_id"])] = PlayerState(
+                data["player_id"], data["name"], data["score"], data["tokens"],
+                data["timeline"], data["has_won"]
+            )
+        state.deck = snapshot["deck"]
+        state.solution = snapshot["solution"]
+        return state
+
+    def _set_session(self, data: Dict[str, Any]) -> None:
+        self.session = dict(data)
+        self.session["current_player_turn"] = player_key(data["current_player_turn"])
+
+    # --- seltene Events (JSON) ---
+
+    def _session_created(self, buffer, start: int, length: int) -> None:
+        self._set_session(json.loads(buffer[start:start + length]))
+
+    def _player_joined(self, buffer, start: int, length: int) -> None:
+        data = json.loads(buffer[start:start + length])
+        self.players[player_key(data["player_id"])] = PlayerState(
+            data["player_id"], data["name"], 0, data["tokens"], [], False
+        )
+
+    def _player_left(self, buffer, start: int, length: int) -> None:
+        self.players.pop(buffer[start:start + 16], None)
+
+    def _deck_set(self, buffer, start: int, length: int) -> None:
+        data = json.loads(buffer[start:start + length])
+        self.session["playlist_id"] = data["playlist_id"]
+        self.session["playlist_ids"] = data["playlist_ids"]
+        self.session["deck_order"] = data.get("deck_order", DeckOrder.SHUFFLE.value)
+        self.deck = data["tracks"]
+
+    def _deck_extended(self, buffer, start: int, length: int) -> None:
+        data = json.loads(buffer[start:start + length])
+        deck = self.deck
+        if data.get("insert"):
+            # Balanciertes Deck: Einfügepositionen aufsteigend (GameService._interleave)
+            for row, j in zip(data["tracks"], data["positions"]):
+                deck.insert(j, row)
+            return
+        for row, j in zip(data["tracks"], data["positions"]):
+            if j == len(deck):
+                deck.append(row)
+            else:
+                deck.append(deck[j])
+                deck[j] = row
+
+    def _game_started(self, buffer, start: int, length: int) -> None:
+        data = json.loads(buffer[start:start + length])
+        session = self.session
+        deck = self.deck
+        players = list(self.players.values())
+        session["status"] = "playing"
+        session["started_at"] = data["started_at"]
+        session["round_number"] = 1
+
+        # Start-Karten wie GameService.give_start_card
+        for idx, player in enumerate(players):
+            if idx < len(deck):
+                row = deck[idx]
+                player.timeline = [[row[0], row[1], row[2], int(row[4][:4]), True]]
+                player.score = 1
+
+        session["current_track_index"] = len(players)
+        if players:
+            session["current_player_turn"] = player_key(players[0].player_id)
+        session["turn_deadline"] = data["turn_deadline"]
+        if len(players) < len(deck):
+            self.solution = deck[len(players)]
+
+    # --- häufige Events (struct) ---
+
+    def _guess(self, buffer, start: int, length: int) -> None:
+        key, points = GUESS.unpack_from(buffer, start)
+        player = self.players.get(key)
+        if player is not None:
+            player.score += points
+
+    def _card_placed(self, buffer, start: int, length: int) -> None:
+        key, position, correct, token_delta, won = CARD_PLACED.unpack_from(buffer, start)
+        if not correct:
+            return
+        player = self.players[key]
+        row = self.solution
+        player.timeline.insert(position, [row[0], row[1], row[2], int(row[4][:4]), True])
+        player.score += 1
+        player.tokens += token_delta
+        if won:
+            player.has_won = True
+            self.session["status"] = "finished"
+            self.session["turn_deadline"] = 0
+
+    def _track_advanced(self, buffer, start: int, length: int) -> None:
+        index, finished = TRACK_ADVANCED.unpack_from(buffer, start)
+        session = self.session
+        session["current_track_index"] = index
+        if finished:
+            session["status"] = "finished"
+            session["turn_deadline"] = 0
+        else:
+            self.solution = self.deck[index]
+
+    def _turn_advanced(self, buffer, start: int, length: int) -> None:
+        session = self.session
+        session["current_player_turn"], session["round_number"], session["turn_deadline"] = \
+            TURN_ADVANCED.unpack_from(buffer, start)
+
+    def _status_changed(self, buffer, start: int, length: int) -> None:
+        self.session["status"] = STATUSES[buffer[start]]
+
+    def _session_deleted(self, buffer, start: int, length: int) -> None:
+        self.deleted = True
+
+
+# =====================================================
+# REPLAY
+# =====================================================
+
+# Handler-Tabelle, Index = EventType (einmal gebaut, ungebundene Funktionen)
+_HANDLERS: List[Optional[Callable]] = [None] * (max(EventType) + 1)
+for _event, _handler in (
+    (EventType.SESSION_CREATED, SessionState._session_created),
+    (EventType.PLAYER_JOINED, SessionState._player_joined),
+    (EventType.PLAYER_LEFT, SessionState._player_left),
+    (EventType.DECK_SET, SessionState._deck_set),
+    (EventType.DECK_EXTENDED, SessionState._deck_extended),
+    (EventType.GAME_STARTED, SessionState._game_started),
+    (EventType.GUESS, SessionState._guess),
+    (EventType.CARD_PLACED, SessionState._card_placed),
+    (EventType.TRACK_ADVANCED, SessionState._track_advanced),
+    (EventType.TURN_ADVANCED, SessionState._turn_advanced),
+    (EventType.STATUS_CHANGED, SessionState._status_changed),
+    (EventType.SESSION_DELETED, SessionState._session_deleted)
+):
+    _HANDLERS[_event] = _handler
+
+
+def apply_events(state: SessionState, buffer, offset: int = 0) -> int:
+    """
+    Events aus `buffer` (bytes oder mmap) ab `offset` anwenden
+    Returns: Offset hinter dem letzten vollständigen Record
+    """
+    handlers = _HANDLERS
+    unpack_header = HEADER.unpack_from
+    header_size = HEADER.size
+    end = len(buffer)
+    count = 0
+    try:
+        while offset + header_size <= end:
+            event, length = unpack_header(buffer, offset)
+            start = offset + header_size
+            if start + length > end:
+                break  # halb geschriebener Record (Absturz beim Schreiben)
+            handlers[event](state, buffer, start, length)
+            offset = start + length
+            count += 1
+    except (IndexError, TypeError) as e:
+        if event >= len(handlers) or handlers[event] is None:
+            raise ValueError(f"Unbekannter Event-Typ {event} bei Offset {offset}") from e
+        raise
+    finally:
+        state.events += count
+    return offset
+
+
+def replay_session(directory: str) -> SessionState:
+    """
+    Session aus neuestem Snapshot + Log-Rest aufbauen
+    """
+    state = SessionState()
+    start_segment, start_offset = 0, 0
+    snapshots = list_snapshots(directory)
+    if snapshots:
+        start_segment, start_offset, path = snapshots[-1]
+        with open(path, "rb") as f:
+            state = SessionState.from_snapshot(json.load(f))
+
+    for index, path in list_segments(directory):
+        if index < start_segment:
+            continue
+        buffer = map_segment(path)
+        try:
+            apply_events(state, buffer, start_offset if index == start_segment else 0)
+        finally:
+            if isinstance(buffer, mmap.mmap):
+                buffer.close()
+    return state
+
+
+def restore(service, state: SessionState,
+            make_track: Callable[[List[Any]], SpotifyTrack] = track_from_row) -> str:
+    """
+    Replay-Zustand als Models in den GameService übernehmen
+    make_track: Zeile -> SpotifyTrack (z.B. gemeinsame Objekte für mehrere Sessions)
+    Returns: session_id
+    """
+    data = state.session
+    session_id = data["session_id"]
+    service.sessions[session_id] = GameSession(
+        session_id=session_id,
+        host_name=data["host_name"],
+        playlist_id=data["playlist_id"],
+        playlist_ids=data["playlist_ids"],
+        deck_order=DeckOrder(data.get("deck_order", DeckOrder.SHUFFLE.value)),
+        current_track_index=data["current_track_index"],
+        started_at=decode_time(data["started_at"]),
+        status=data["status"],
+        game_mode=GameMode(data["game_mode"]),
+        win_condition=data["win_condition"],
+        current_player_turn=player_id_of(data["current_player_turn"]),
+        round_number=data["round_number"],
+        turn_time_limit=data["turn_time_limit"],
+        turn_deadline=decode_time(data["turn_deadline"])
+    )
+    service.players[session_id] = [
+        Player(
+            player_id=player.player_id,
+            name=player.name,
+            score=player.score,
+            session_id=session_id,
+            tokens=player.tokens,
+            timeline=[
+                TimelineCard(position=position, track_id=card[0], title=card[1],
+                             artist=card[2], year=card[3], is_correct=card[4])
+                for position, card in enumerate(player.timeline)
+            ],
+            has_won=player.has_won
+        )
+        for player in state.players.values()
+    ]
+
+    service.deck_tables.pop(session_id, None)
+    if state.deck is not None:
+        deck = [make_track(row) for row in state.deck]
+        builder = DeckBuilder(data["playlist_ids"] or [data["playlist_id"]])
+        builder.seed(deck)  # Duplikat-Filter für nachgeladene Pages wieder füllen
+        service.track_queues[session_id] = deck
+        service.deck_builders[session_id] = builder
+        track_search.index_session(session_id, deck, lazy=True)  # Autocomplete erst bei Bedarf
+    if state.solution is not None:
+        # Gleiches Objekt wie im Deck, falls der Track noch an seiner Stelle liegt
+        index = data["current_track_index"]
+        deck = service.track_queues.get(session_id, [])
+        if index < len(deck) and deck[index].track_id == state.solution[0]:
+            service.solutions[session_id] = deck[index]
+        else:
+            service.solutions[session_id] = make_track(state.solution)
+    return session_id
+
+
+def recover(service, log: EventLog) -> List[str]:
+    """
+    Alle nicht gelöschten Sessions aus dem Log in den GameService laden
+    Sessions, die schon da sind (z.B. aus dem Handoff), bleiben unverändert
+    Returns: wiederhergestellte session_ids
+    """
+    restored = []
+    for session_id in log.session_ids():
+        if session_id in service.sessions:
+            continue
+        directory = log.session_dir(session_id)
+        if os.path.exists(os.path.join(directory, DELETED_MARKER)):
+            continue
+        state = replay_session(directory)
+        if state.deleted or not state.session:
+            continue
+        restored.append(restore(service, state))
+    return restored
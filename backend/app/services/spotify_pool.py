@@ -0,0 +1,252 @@
+"""
+Spotify Client Pool - ein Spotify Client pro Host (Session)
+
+- Jeder Host hat seinen eigenen User-Token statt eines globalen `user_client`
+- Alle Clients teilen sich eine HTTP-Session (Keep-Alive Verbindungspool)
+- Tokens liegen im Speicher (kein `.spotify_cache` auf der Platte) und werden
+  von einem Hintergrund-Thread vor Ablauf erneuert - Requests im Spiel warten
+  nie auf einen Token-Refresh
+"""
+import threading
+import time
+from typing import Dict, Optional
+
+import spotipy
+from spotipy.cache_handler import MemoryCacheHandler
+from spotipy.oauth2 import SpotifyClientCredentials, SpotifyOAuth
+
+from ..core.config import settings
+
+
+APP_OWNER = "__app__"  # Client Credentials (öffentliche Daten)
+
+
+class PooledClient:
+    """
+    Ein Spotify Client samt Auth Manager (None = statischer Token)
+    """
+
+    __slots__ = ("owner", "client", "auth_manager", "last_used", "refreshes")
+
+    def __init__(self, owner: str, client: spotipy.Spotify, auth_manager=None):
+        self.owner = owner
+        self.client = client
+        self.auth_manager = auth_manager
+        self.last_used = time.monotonic()
+        self.refreshes = 0
+
+    def expires_in(self, now: float) -> Optional[float]:
+        """
+        Sekunden bis der Token abläuft (None = kein Token oder nicht erneuerbar)
+        """
+        if self.auth_manager is None:
+            return None
+        token = self.auth_manager.cache_handler.get_cached_token()
+        if not token:
+            return 0.0
+        return token["expires_at"] - now
+
+
+class SpotifyClientPool:
+    """
+    Keyed Pool von Spotify Clients (Owner = Session ID des Hosts)
+    """
+
+    def __init__(self, client_id: str, client_secret: str, redirect_uri: str, scope: str,
+                 requests_session):
+        self.client_id = client_id
+        self.client_secret = client_secret
+        self.redirect_uri = redirect_uri
+        self.scope = scope
+        self.requests_session = requests_session
+
+        self._clients: Dict[str, PooledClient] = {}
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+        self.stats: Dict[str, int] = {
+            "created": 0,
+            "refreshes": 0,
+            "refresh_errors": 0,
+            "evicted": 0
+        }
+
+    def set_transport(self, requests_session) -> None:
+        """
+        Anderen HTTP Transport nutzen (bestehende Clients werden verworfen)
+        """
+        with self._lock:
+            self.requests_session = requests_session
+            self._clients.clear()
+
+    def _spotify(self, **kwargs) -> spotipy.Spotify:
+        return spotipy.Spotify(requests_session=self.requests_session, **kwargs)
+
+    def _oauth(self, state: Optional[str] = None) -> SpotifyOAuth:
+        return SpotifyOAuth(
+            client_id=self.client_id,
+            client_secret=self.client_secret,
+            redirect_uri=self.redirect_uri,
+            scope=self.scope,
+            state=state,
+            open_browser=False,
+            cache_handler=MemoryCacheHandler(),
+            requests_session=self.requests_session
+        )
+
+    def _put(self, owner: str, client: spotipy.Spotify, auth_manager=None) -> PooledClient:
+        entry = PooledClient(owner, client, auth_manager)
+        with self._lock:
+            self._clients[owner] = entry
+            self.stats["created"] += 1
+        return entry
+
+    @staticmethod
+    def _require_owner(owner: Optional[str]) -> str:
+        # User-Tokens gehören immer genau einer Session - kein gemeinsamer Token
+        if not owner or owner == APP_OWNER:
+            raise ValueError("User-Token nur mit Owner (Session ID des Hosts)")
+        return owner
+
+    def authorize_url(self, state: str) -> str:
+        """
+        OAuth URL - `state` (signierter Owner) kommt zurück zum Callback
+        """
+        return self._oauth(state).get_authorize_url()
+
+    def authenticate(self, code: str, owner: str) -> Dict:
+        """
+        Tausche Authorization Code gegen Token und lege den Client des Owners an
+        Returns: Token Info
+        """
+        owner = self._require_owner(owner)
+        oauth = self._oauth()
+        oauth.get_access_token(code, as_dict=False, check_cache=False)
+        self._put(owner, self._spotify(auth_manager=oauth), oauth)
+        return oauth.cache_handler.get_cached_token()
+
+    def set_token(self, access_token: str, owner: str) -> None:
+        """
+        Statischer Access Token (ohne Refresh Token, läuft nach ~1h ab)
+        """
+        self._put(self._require_owner(owner), self._spotify(auth=access_token))
+
+    def get(self, owner: Optional[str] = None) -> spotipy.Spotify:
+        """
+        Client des Owners, sonst Client Credentials (nur öffentliche Daten)
+        Nie der User-Token einer anderen Session
+        """
+        with self._lock:
+            entry = self._clients.get(owner) if owner and owner != APP_OWNER else None
+            if entry is not None:
+                entry.last_used = time.monotonic()
+                return entry.client
+        return self._app_client().client
+
+    def release(self, owner: str) -> None:
+        """
+        Client eines Owners entfernen (z.B. Session gelöscht)
+        """
+        with self._lock:
+            self._clients.pop(owner, None)
+
+    def _app_client(self) -> PooledClient:
+        with self._lock:
+            entry = self._clients.get(APP_OWNER)
+        if entry is not None:
+            entry.last_used = time.monotonic()
+            return entry
+
+        credentials = SpotifyClientCredentials(
+            client_id=self.client_id,
+            client_secret=self.client_secret,
+            cache_handler=MemoryCacheHandler(),
+            requests_session=self.requests_session
+        )
+        with self._lock:
+            # Ein anderer Thread war schneller
+            if APP_OWNER in self._clients:
+                return self._clients[APP_OWNER]
+        return self._put(APP_OWNER, self._spotify(auth_manager=credentials), credentials)
+
+    def _refresh(self, entry: PooledClient) -> None:
+        manager = entry.auth_manager
+        if isinstance(manager, SpotifyOAuth):
+            token = manager.cache_handler.get_cached_token()
+            manager.refresh_access_token(token["refresh_token"])
+        else:
+            manager.get_access_token(as_dict=False, check_cache=False)
+        entry.refreshes += 1
+
+    def maintain(self, now: Optional[float] = None) -> int:
+        """
+        Ein Durchlauf: Tokens kurz vor Ablauf erneuern, inaktive Clients entfernen
+        Returns: Anzahl erneuerter Tokens
+        """
+        wall = time.time() if now is None else now
+        idle_cutoff = time.monotonic() - settings.spotify_client_idle_ttl_s
+
+        with self._lock:
+            entries = list(self._clients.values())
+
+        refreshed = 0
+        for entry in entries:
+            if entry.owner != APP_OWNER and entry.last_used < idle_cutoff:
+                self.release(entry.owner)
+                self.stats["evicted"] += 1
+                continue
+
+            remaining = entry.expires_in(wall)
+            if remaining is None or remaining > settings.spotify_token_refresh_margin_s:
+                continue
+            try:
+                self._refresh(entry)
+                refreshed += 1
+                self.stats["refreshes"] += 1
+            except Exception as e:
+                self.stats["refresh_errors"] += 1
+                print(f"⚠️  Spotify Token-Refresh für {entry.owner} fehlgeschlagen: {e}")
+        return refreshed
+
+    def _run(self):
+        """Hintergrund-Thread: App-Token vorwärmen, dann periodisch erneuern"""
+        try:
+            self._app_client()
+        except Exception as e:
+            print(f"⚠️  Spotify Client Credentials nicht verfügbar: {e}")
+        while True:
+            self.maintain()
+            if self._stop.wait(settings.spotify_token_check_interval_s):
+                return
+
+    def start(self) -> None:
+        """Refresh-Thread starten (idempotent)"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="spotify-token-refresh", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def snapshot(self) -> Dict:
+        """
+        Metriken für /metrics
+        """
+        now = time.time()
+        with self._lock:
+            entries = list(self._clients.values())
+        expiring = [entry.expires_in(now) for entry in entries]
+        expiring = [value for value in expiring if value is not None]
+        return {
+            "clients": len(entries),
+            "user_clients": sum(1 for entry in entries if entry.owner != APP_OWNER),
+            "min_token_ttl_s": round(min(expiring), 1) if expiring else None,
+            "refresher_running": self._thread is not None and self._thread.is_alive(),
+            **self.stats
+        }
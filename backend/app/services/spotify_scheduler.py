@@ -0,0 +1,204 @@
+"""
+Spotify Scheduler - Zentrale Warteschlange für ausgehende Spotify Requests
+
+Alle Spotify-Aufrufe laufen hier durch:
+- Token Bucket begrenzt die Request-Rate des ganzen Servers
+- 429-Antworten pausieren alle Requests für die Dauer aus `Retry-After`
+- Prioritäten: Spiel (Playlist laden) vor Discovery vor Suche
+- Suche & Discovery geben nach einer maximalen Wartezeit auf (SpotifyBusyError)
+
+Spotipy ist synchron - Aufrufer blockieren ihren Thread (Threadpool),
+nie den Event-Loop.
+"""
+import heapq
+import itertools
+import threading
+import time
+from collections import deque
+from enum import IntEnum
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+from spotipy.exceptions import SpotifyException
+
+from ..core.config import settings
+from .rate_limiter import TokenBucket
+from .tracing import tracer
+
+
+class Priority(IntEnum):
+    """Kleiner Wert = wichtiger"""
+    GAME = 0
+    DISCOVERY = 1
+    SEARCH = 2
+
+
+class SpotifyBusyError(Exception):
+    """Request hat zu lange auf einen Slot gewartet"""
+
+
+class SpotifyScheduler:
+    """
+    Priorisierte Warteschlange mit Token Bucket & Retry-After
+
+    Wartende Requests liegen in einem Heap (Priorität, Reihenfolge). Nur der
+    Kopf des Heaps darf ein Token nehmen; alle anderen schlafen auf der
+    Condition. Ein Retry nach 429 behält seinen Platz in der Warteschlange.
+    """
+
+    WAIT_SAMPLES = 512  # Wartezeiten pro Priorität für Perzentile
+
+    def __init__(self, rate: float, burst: int, max_retries: int = 3,
+                 low_priority_max_wait: Optional[float] = None,
+                 default_retry_after: float = 1.0,
+                 clock: Callable[[], float] = time.monotonic):
+        self.clock = clock
+        self.bucket = TokenBucket(rate, burst, now=clock())
+        self.max_retries = max_retries
+        self.low_priority_max_wait = low_priority_max_wait
+        self.default_retry_after = default_retry_after
+
+        self._cond = threading.Condition()
+        self._heap: List[tuple] = []
+        self._seq = itertools.count()
+        self.blocked_until = 0.0
+        self.in_flight = 0
+
+        self.stats: Dict[str, int] = {
+            "calls": 0,
+            "rate_limited": 0,
+            "retries": 0,
+            "timeouts": 0,
+            "errors": 0
+        }
+        self._waits: Dict[Priority, Deque[float]] = {
+            priority: deque(maxlen=self.WAIT_SAMPLES) for priority in Priority
+        }
+
+    def call(self, priority: Priority, fn: Callable, *args, **kwargs) -> Any:
+        """
+        Führe `fn` aus, sobald Rate-Limit & Priorität es erlauben
+        Raises: SpotifyBusyError (nur Discovery/Suche), SpotifyException
+        """
+        with tracer.span(f"spotify {getattr(fn, '__name__', 'call')}", "spotify", priority=priority.name):
+            return self._call(priority, fn, *args, **kwargs)
+
+    def _call(self, priority: Priority, fn: Callable, *args, **kwargs) -> Any:
+        max_wait = None if priority == Priority.GAME else self.low_priority_max_wait
+        seq = next(self._seq)
+        attempt = 0
+
+        while True:
+            self._acquire(priority, seq, max_wait)
+            try:
+                result = fn(*args, **kwargs)
+            except SpotifyException as e:
+                with self._cond:
+                    self.in_flight -= 1
+                    if e.http_status != 429 or attempt >= self.max_retries:
+                        self.stats["errors"] += 1
+                        raise
+                    self.stats["rate_limited"] += 1
+                    self.stats["retries"] += 1
+                    pause = self._retry_after(e)
+                    self.blocked_until = max(self.blocked_until, self.clock() + pause)
+                    self._cond.notify_all()
+                print(f"⏳ Spotify Rate-Limit - pausiere {pause:.1f}s ({priority.name})")
+                attempt += 1
+                continue
+            except Exception:
+                with self._cond:
+                    self.in_flight -= 1
+                    self.stats["errors"] += 1
+                raise
+
+            with self._cond:
+                self.in_flight -= 1
+                self.stats["calls"] += 1
+            return result
+
+    def _acquire(self, priority: Priority, seq: int, max_wait: Optional[float]) -> None:
+        """
+        Warte bis dieser Request Kopf der Warteschlange ist und ein Token bekommt
+        """
+        entry = (int(priority), seq)
+        started = self.clock()
+        deadline = started + max_wait if max_wait is not None else None
+
+        with self._cond:
+            heapq.heappush(self._heap, entry)
+            while True:
+                now = self.clock()
+                timeout = None
+                if self._heap[0] == entry:
+                    timeout = max(self.blocked_until - now, self.bucket.time_until_available(1, now))
+                    if timeout <= 0 and self.bucket.try_acquire(1, now):
+                        heapq.heappop(self._heap)
+                        self.in_flight += 1
+                        self._waits[priority].append(now - started)
+                        # Nächster Kopf muss seine Wartezeit neu berechnen
+                        self._cond.notify_all()
+                        return
+
+                if deadline is not None:
+                    if now >= deadline:
+                        self._heap.remove(entry)
+                        heapq.heapify(self._heap)
+                        self.stats["timeouts"] += 1
+                        self._cond.notify_all()
+                        raise SpotifyBusyError(
+                            f"Spotify ausgelastet - {priority.name} Request nach {max_wait:.1f}s abgebrochen"
+                        )
+                    timeout = deadline - now if timeout is None else min(timeout, deadline - now)
+
+                self._cond.wait(timeout)
+
+    def _retry_after(self, error: SpotifyException) -> float:
+        """Wartezeit aus dem Retry-After Header (Sekunden)"""
+        headers = error.headers or {}
+        value = headers.get("Retry-After") or headers.get("retry-after")
+        try:
+            return max(float(value), 0.0)
+        except (TypeError, ValueError):
+            return self.default_retry_after
+
+    def snapshot(self) -> Dict:
+        """
+        Metriken für /metrics: Warteschlange, Pausen, Wartezeiten
+        """
+        with self._cond:
+            depth = {priority.name.lower(): 0 for priority in Priority}
+            for priority, _ in self._heap:
+                depth[Priority(priority).name.lower()] += 1
+            waits = {priority: sorted(samples) for priority, samples in self._waits.items()}
+            return {
+                "queue_depth": depth,
+                "in_flight": self.in_flight,
+                "blocked_for_s": round(max(self.blocked_until - self.clock(), 0.0), 3),
+                "tokens": round(self.bucket.tokens, 2),
+                **self.stats,
+                "wait_ms": {
+                    priority.name.lower(): self._summarize(samples)
+                    for priority, samples in waits.items()
+                }
+            }
+
+    @staticmethod
+    def _summarize(ordered: List[float]) -> Dict:
+        if not ordered:
+            return {"count": 0, "p50": 0.0, "p95": 0.0, "max": 0.0}
+        last = len(ordered) - 1
+        return {
+            "count": len(ordered),
+            "p50": round(ordered[int(last * 0.5)] * 1000, 2),
+            "p95": round(ordered[int(last * 0.95)] * 1000, 2),
+            "max": round(ordered[last] * 1000, 2)
+        }
+
+
+# Singleton Instance
+spotify_scheduler = SpotifyScheduler(
+    rate=settings.spotify_requests_per_second,
+    burst=settings.spotify_request_burst,
+    max_retries=settings.spotify_max_retries,
+    low_priority_max_wait=settings.spotify_low_priority_max_wait_s
+)
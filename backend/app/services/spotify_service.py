@@ -1,12 +1,28 @@
 """
 Spotify API Service - Integration mit Spotipy
 """
-import spotipy
-from spotipy.oauth2 import SpotifyOAuth, SpotifyClientCredentials
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Iterator
 import random
 from ..core.config import settings
+from ..core.host_auth import oauth_state
 from ..models.game import SpotifyTrack, PlaylistInfo
+from .deck_builder import parse_year
+from .deck_table import decade_of
+from .spotify_pool import SpotifyClientPool
+from .spotify_scheduler import Priority, spotify_scheduler
+from .spotify_transport import build_requests_session
+
+
+class PlaylistStream:
+    """
+    Playlist, deren erste Page schon geladen ist
+    `pages` lädt die restlichen Pages nacheinander (blockierend, für Threads)
+    """
+    
+    def __init__(self, info: PlaylistInfo, expected_total: int, pages: Iterator[List[SpotifyTrack]]):
+        self.info = info
+        self.expected_total = expected_total
+        self.pages = pages
 
 
 class SpotifyService:
@@ -21,98 +37,110 @@ class SpotifyService:
         self.redirect_uri = settings.spotify_redirect_uri
         self.scope = "user-read-playback-state user-modify-playback-state playlist-read-private playlist-read-collaborative"
         
-        # Client Credentials für öffentliche Daten
-        self.client = None
-        # OAuth für User-spezifische Aktionen
-        self.oauth = None
-        self.user_client = None
-    
-    def get_auth_url(self) -> str:
-        """
-        Generiere Spotify Authorization URL für OAuth Flow
-        """
-        self.oauth = SpotifyOAuth(
+        # Gemeinsame Warteschlange für alle ausgehenden Requests
+        self.scheduler = spotify_scheduler
+        
+        # Clients pro Host (Owner = Session ID), HTTP Transport live/Aufnahme/Replay
+        self.pool = SpotifyClientPool(
             client_id=self.client_id,
             client_secret=self.client_secret,
             redirect_uri=self.redirect_uri,
             scope=self.scope,
-            cache_path=".spotify_cache"
+            requests_session=build_requests_session()
         )
-        return self.oauth.get_authorize_url()
     
-    def authenticate_with_code(self, code: str) -> Dict[str, Any]:
+    @property
+    def requests_session(self):
+        return self.pool.requests_session
+    
+    def set_transport(self, requests_session):
+        """
+        HTTP Transport austauschen (z.B. ReplaySession in Tests & Benchmarks)
+        """
+        self.pool.set_transport(requests_session)
+    
+    def get_auth_url(self, owner: str) -> str:
+        """
+        Generiere Spotify Authorization URL für OAuth Flow
+        `owner` (Session ID des Hosts) kommt signiert als `state` zum Callback zurück
+        """
+        return self.pool.authorize_url(oauth_state(owner))
+    
+    def authenticate_with_code(self, code: str, owner: str) -> Dict[str, Any]:
         """
         Authentifiziere mit Authorization Code
         Returns: Token Info
         """
-        if not self.oauth:
-            self.oauth = SpotifyOAuth(
-                client_id=self.client_id,
-                client_secret=self.client_secret,
-                redirect_uri=self.redirect_uri,
-                scope=self.scope
-            )
-        
-        token_info = self.oauth.get_access_token(code)
-        self.user_client = spotipy.Spotify(auth=token_info['access_token'])
-        return token_info
+        return self.pool.authenticate(code, owner)
     
-    def set_user_token(self, access_token: str):
+    def set_user_token(self, access_token: str, owner: str):
         """
         Setze User Access Token für authentifizierte Requests
         """
-        self.user_client = spotipy.Spotify(auth=access_token)
+        self.pool.set_token(access_token, owner)
     
-    def get_playlist_tracks(self, playlist_id: str) -> PlaylistInfo:
+    def release_client(self, owner: str):
         """
-        Hole alle Tracks aus einer Playlist
+        Entferne den Client eines Hosts
         """
-        if not self.user_client:
-            # Fallback auf Client Credentials
-            if not self.client:
-                self.client = spotipy.Spotify(
-                    client_credentials_manager=SpotifyClientCredentials(
-                        client_id=self.client_id,
-                        client_secret=self.client_secret
-                    )
-                )
-            sp = self.client
-        else:
-            sp = self.user_client
-        
-        # Playlist Info
-        playlist = sp.playlist(playlist_id)
+        self.pool.release(owner)
+    
+    def open_playlist_stream(self, playlist_id: str, priority: Priority = Priority.GAME,
+                             owner: Optional[str] = None) -> "PlaylistStream":
+        """
+        Lade nur die erste Page (eingebettet in der Playlist, ein Request)
+        Weitere Pages liefert `PlaylistStream.pages()` bei Bedarf
+        """
+        # Client des Hosts, Fallback auf Client Credentials
+        sp = self.pool.get(owner)
         
-        # Alle Tracks holen (Pagination beachten)
-        tracks = []
-        results = sp.playlist_tracks(playlist_id)
+        playlist = self._call(priority, sp.playlist, playlist_id)
+        first_page = playlist['tracks']
         
-        while results:
-            for item in results['items']:
-                if item['track']:  # Manchmal sind Tracks None
-                    track = self._parse_track(item['track'])
-                    tracks.append(track)
-            
-            # Nächste Page
-            if results['next']:
-                results = sp.next(results)
-            else:
-                results = None
+        def pages() -> Iterator[List[SpotifyTrack]]:
+            results = first_page
+            while results['next']:
+                results = self._call(priority, sp.next, results)
+                yield self._parse_items(results['items'])
         
-        return PlaylistInfo(
-            playlist_id=playlist_id,
-            name=playlist['name'],
-            owner=playlist['owner']['display_name'],
-            total_tracks=len(tracks),
-            tracks=tracks
+        first_tracks = self._parse_items(first_page['items'])
+        return PlaylistStream(
+            info=PlaylistInfo(
+                playlist_id=playlist_id,
+                name=playlist['name'],
+                owner=playlist['owner']['display_name'],
+                total_tracks=len(first_tracks),
+                tracks=first_tracks
+            ),
+            expected_total=first_page.get('total', len(first_tracks)),
+            pages=pages()
         )
     
-    def get_track_info(self, track_id: str) -> SpotifyTrack:
+    def get_playlist_tracks(self, playlist_id: str, priority: Priority = Priority.GAME,
+                            owner: Optional[str] = None) -> PlaylistInfo:
+        """
+        Hole alle Tracks aus einer Playlist
+        Jede Page ist ein eigener Request im Scheduler
+        """
+        stream = self.open_playlist_stream(playlist_id, priority, owner)
+        tracks = list(stream.info.tracks)
+        for page in stream.pages:
+            tracks.extend(page)
+        
+        return stream.info.model_copy(update={"tracks": tracks, "total_tracks": len(tracks)})
+    
+    def _parse_items(self, items: List[Dict]) -> List[SpotifyTrack]:
+        """
+        Parse Playlist Items (Manchmal sind Tracks None, z.B. entfernte Songs)
+        """
+        return [self._parse_track(item['track']) for item in items if item['track']]
+    
+    def get_track_info(self, track_id: str, owner: Optional[str] = None) -> SpotifyTrack:
         """
         Hole Metadaten für einen einzelnen Track
         """
-        sp = self.user_client or self._get_client()
-        track_data = sp.track(track_id)
+        sp = self.pool.get(owner)
+        track_data = self._call(Priority.DISCOVERY, sp.track, track_id)
         return self._parse_track(track_data)
     
     def shuffle_tracks(self, tracks: List[SpotifyTrack]) -> List[SpotifyTrack]:
@@ -151,32 +179,23 @@ class SpotifyService:
         Berechne Jahrzehnt aus Release Date
         z.B. '1994-08-23' -> '1990er'
         """
-        try:
-            year = int(release_date[:4])
-            decade_start = (year // 10) * 10
-            return f"{decade_start}er"
-        except (ValueError, IndexError):
+        year = parse_year(release_date)
+        if year is None:
             return "Unbekannt"
+        return f"{decade_of(year)}er"
     
-    def _get_client(self):
+    def _call(self, priority: Priority, fn, *args, **kwargs):
         """
-        Get or create basic client
+        Spotify Request über den Scheduler (Rate-Limit, Retry-After, Priorität)
         """
-        if not self.client:
-            self.client = spotipy.Spotify(
-                client_credentials_manager=SpotifyClientCredentials(
-                    client_id=self.client_id,
-                    client_secret=self.client_secret
-                )
-            )
-        return self.client
+        return self.scheduler.call(priority, fn, *args, **kwargs)
     
-    def search_tracks(self, query: str, limit: int = 20) -> List[SpotifyTrack]:
+    def search_tracks(self, query: str, limit: int = 20, owner: Optional[str] = None) -> List[SpotifyTrack]:
         """
         Suche nach Tracks (für spätere Features)
         """
-        sp = self.user_client or self._get_client()
-        results = sp.search(q=query, type='track', limit=limit)
+        sp = self.pool.get(owner)
+        results = self._call(Priority.SEARCH, sp.search, q=query, type='track', limit=limit)
         
         tracks = []
         for item in results['tracks']['items']:
@@ -0,0 +1,300 @@
+"""
+Spotify Transport - Record/Replay für Offline-Tests & Benchmarks
+
+Spotipy schickt alle Requests (API & Token) über eine `requests.Session`.
+Hier gibt es zwei austauschbare Sessions:
+
+- RecordingSession: leitet an Spotify weiter und speichert jede API-Antwort
+- ReplaySession:    beantwortet Requests aus der Fixture-Datei, optional mit
+                    künstlicher Latenz, Jitter und 429-Antworten (Retry-After)
+
+Fixtures sind gzip-komprimiertes JSON; große, für das Spiel unwichtige Felder
+(`available_markets`) werden beim Aufnehmen entfernt.
+"""
+import gzip
+import json
+import os
+import random
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from urllib3.util.retry import Retry
+
+from ..core.config import settings
+
+
+API_PREFIX = "https://api.spotify.com/v1/"
+TOKEN_URL = "https://accounts.spotify.com/api/token"
+STRIPPED_FIELDS = {"available_markets"}
+FIXTURE_VERSION = 1
+# 429 behandelt der Spotify Scheduler (Retry-After für alle Requests), nicht urllib3
+RETRY_STATUS_CODES = (500, 502, 503, 504)
+
+
+def fixture_key(method: str, url: str, params: Optional[Dict] = None) -> str:
+    """
+    Normalisierter Schlüssel: Methode + URL + sortierte Query-Parameter
+    """
+    parts = urlsplit(url)
+    query = parse_qsl(parts.query, keep_blank_values=True)
+    if params:
+        query.extend((str(k), str(v)) for k, v in params.items() if v is not None)
+    normalized = urlunsplit((parts.scheme, parts.netloc, parts.path, urlencode(sorted(query)), ""))
+    return f"{method.upper()} {normalized}"
+
+
+def _strip(value: Any) -> Any:
+    """Entferne große, ungenutzte Felder rekursiv"""
+    if isinstance(value, dict):
+        return {k: _strip(v) for k, v in value.items() if k not in STRIPPED_FIELDS}
+    if isinstance(value, list):
+        return [_strip(v) for v in value]
+    return value
+
+
+def build_response(status: int, body: Any, url: str, headers: Optional[Dict[str, str]] = None) -> requests.Response:
+    """
+    Baue eine requests.Response ohne Netzwerk
+    """
+    response = requests.Response()
+    response.status_code = status
+    response._content = json.dumps(body).encode() if body is not None else b""
+    response.headers = CaseInsensitiveDict({"Content-Type": "application/json", **(headers or {})})
+    response.url = url
+    response.encoding = "utf-8"
+    response.reason = requests.status_codes._codes.get(status, ("",))[0].upper()
+    return response
+
+
+class FixtureStore:
+    """
+    Aufgenommene Antworten (Schlüssel -> Status, Header, Body)
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.entries: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+        if os.path.exists(path):
+            self.load()
+
+    def load(self) -> None:
+        with gzip.open(self.path, "rt", encoding="utf-8") as f:
+            data = json.load(f)
+        self.entries = data.get("entries", {})
+
+    def save(self) -> None:
+        """Atomar schreiben (tmp-Datei + rename)"""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with self._lock:
+            payload = {"version": FIXTURE_VERSION, "entries": self.entries}
+            with gzip.open(tmp_path, "wt", encoding="utf-8", compresslevel=6) as f:
+                json.dump(payload, f, separators=(",", ":"))
+            os.replace(tmp_path, self.path)
+
+    def put(self, key: str, status: int, body: Any, headers: Optional[Dict[str, str]] = None) -> None:
+        entry = {"status": status, "body": _strip(body)}
+        if headers:
+            entry["headers"] = headers
+        with self._lock:
+            self.entries[key] = entry
+
+    def get(self, key: str) -> Optional[Dict]:
+        return self.entries.get(key)
+
+
+class RecordingSession(requests.Session):
+    """
+    Echte Requests an Spotify, Antworten landen im FixtureStore
+
+    - Token-Antworten (TOKEN_URL) werden nicht aufgenommen: echte Access- &
+      Refresh-Tokens gehören nicht in Fixtures (Replay nutzt einen Dummy-Token)
+    - Gespeichert wird höchstens alle `save_interval_s` Sekunden und bei
+      flush()/close(), nicht nach jedem Request (die ganze Datei wird neu gezippt)
+    """
+
+    def __init__(self, store: FixtureStore, save_interval_s: float = 5.0):
+        super().__init__()
+        self.store = store
+        self.save_interval_s = save_interval_s
+        self._dirty = False
+        self._saved_at = time.monotonic()
+
+    def request(self, method, url, params=None, data=None, **kwargs):
+        response = super().request(method, url, params=params, data=data, **kwargs)
+        if url.startswith(TOKEN_URL):
+            return response
+        try:
+            body = response.json()
+        except ValueError:
+            body = None
+        headers = {"Retry-After": response.headers["Retry-After"]} if "Retry-After" in response.headers else None
+        self.store.put(fixture_key(method, url, params), response.status_code, body, headers)
+        self._dirty = True
+        if time.monotonic() - self._saved_at >= self.save_interval_s:
+            self.flush()
+        return response
+
+    def flush(self) -> None:
+        """Aufgenommene Antworten jetzt speichern (nur wenn neue dazukamen)"""
+        if not self._dirty:
+            return
+        self._dirty = False
+        self._saved_at = time.monotonic()
+        self.store.save()
+
+    def close(self) -> None:
+        self.flush()
+        super().close()
+
+
+class ReplaySession(requests.Session):
+    """
+    Antworten aus Fixtures statt aus dem Netz
+
+    - latency_ms/jitter_ms: künstliche Antwortzeit (gleichverteilt im Jitter)
+    - error_rate: Anteil der API-Requests, die mit 429 + Retry-After antworten
+    - Token-Requests werden ohne Fixture mit einem Dummy-Token beantwortet
+    """
+
+    def __init__(self, store: FixtureStore, latency_ms: float = 0.0, jitter_ms: float = 0.0,
+                 error_rate: float = 0.0, retry_after_s: int = 1, seed: Optional[int] = None):
+        super().__init__()
+        self.store = store
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.retry_after_s = retry_after_s
+        self.rng = random.Random(seed)
+        self.calls = 0
+        self.token_calls = 0
+        self.rate_limited = 0
+
+    def request(self, method, url, params=None, data=None, **kwargs):
+        self.calls += 1
+        delay = self.latency_ms + (self.rng.uniform(0, self.jitter_ms) if self.jitter_ms else 0.0)
+        if delay > 0:
+            time.sleep(delay / 1000.0)
+
+        if url.startswith(TOKEN_URL):
+            self.token_calls += 1
+            entry = self.store.get(fixture_key(method, url, params))
+            if entry is None:
+                return build_response(200, {
+                    "access_token": "replay-token",
+                    "refresh_token": "replay-refresh",
+                    "token_type": "Bearer",
+                    "expires_in": 3600
+                }, url)
+            return build_response(entry["status"], entry["body"], url, entry.get("headers"))
+
+        if self.error_rate and self.rng.random() < self.error_rate:
+            self.rate_limited += 1
+            return build_response(429, {
+                "error": {"status": 429, "message": "API rate limit exceeded"}
+            }, url, {"Retry-After": str(self.retry_after_s)})
+
+        entry = self.store.get(fixture_key(method, url, params))
+        if entry is None:
+            return build_response(404, {
+                "error": {"status": 404, "message": f"Keine Fixture für {method} {url}"}
+            }, url)
+        return build_response(entry["status"], entry["body"], url, entry.get("headers"))
+
+
+def synthesize_playlist(store: FixtureStore, playlist_id: str, name: str,
+                        tracks: List[Dict], page_size: int = 100, owner: str = "fixture") -> None:
+    """
+    Lege Fixtures für eine Playlist an, wie Spotify sie paginiert liefert
+    (Playlist-Objekt mit erster Seite + Folgeseiten über `next`)
+    """
+    base_url = f"{API_PREFIX}playlists/{playlist_id}/tracks"
+    total = len(tracks)
+    # Gleiche Parameter wie spotipy (playlist() & playlist_tracks())
+    types = {"additional_types": "track"}
+
+    def page(offset: int) -> Dict:
+        items = [{"track": track} for track in tracks[offset:offset + page_size]]
+        next_offset = offset + page_size
+        return {
+            "href": f"{base_url}?offset={offset}&limit={page_size}",
+            "items": items,
+            "limit": page_size,
+            "offset": offset,
+            "total": total,
+            "previous": f"{base_url}?offset={max(offset - page_size, 0)}&limit={page_size}" if offset else None,
+            "next": f"{base_url}?offset={next_offset}&limit={page_size}" if next_offset < total else None
+        }
+
+    first_page = page(0)
+    store.put(fixture_key("GET", f"{API_PREFIX}playlists/{playlist_id}", types), 200, {
+        "id": playlist_id,
+        "name": name,
+        "owner": {"display_name": owner},
+        "tracks": first_page
+    })
+    store.put(fixture_key("GET", base_url, {"limit": page_size, "offset": 0, **types}), 200, first_page)
+    for offset in range(page_size, total, page_size):
+        store.put(fixture_key("GET", f"{base_url}?offset={offset}&limit={page_size}"), 200, page(offset))
+
+
+def synthesize_tracks(store: FixtureStore, tracks: Iterable[Dict]) -> None:
+    """
+    Lege Fixtures für einzelne Track-Abfragen an (`sp.track(track_id)`)
+    """
+    for track in tracks:
+        store.put(fixture_key("GET", f"{API_PREFIX}tracks/{track['id']}"), 200, track)
+
+
+def build_pooled_session() -> requests.Session:
+    """
+    Live-Session mit Keep-Alive Verbindungspool (geteilt von allen Clients)
+    """
+    session = requests.Session()
+    retry = Retry(
+        total=3,
+        connect=3,
+        read=3,
+        status=3,
+        backoff_factor=0.3,
+        status_forcelist=RETRY_STATUS_CODES,
+        allowed_methods=frozenset(["GET", "POST", "PUT", "DELETE"])
+    )
+    adapter = HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=settings.spotify_http_pool_size,
+        max_retries=retry
+    )
+    session.mount("https://", adapter)
+    return session
+
+
+def build_requests_session() -> requests.Session:
+    """
+    Transport laut Settings (`spotify_transport`: live | record | replay)
+    """
+    mode = settings.spotify_transport.lower()
+    if mode == "live":
+        return build_pooled_session()
+
+    store = FixtureStore(settings.spotify_fixture_path)
+    if mode == "record":
+        return RecordingSession(store)
+    if mode == "replay":
+        return ReplaySession(
+            store,
+            latency_ms=settings.spotify_replay_latency_ms,
+            jitter_ms=settings.spotify_replay_jitter_ms,
+            error_rate=settings.spotify_replay_429_rate,
+            retry_after_s=settings.spotify_replay_retry_after_s,
+            seed=settings.spotify_replay_seed
+        )
+    raise ValueError(f"Unbekannter Spotify-Transport: {settings.spotify_transport}")
@@ -0,0 +1,336 @@
+"""
+Tracing - Spans über alle Schichten eines Requests / Socket-Events (/admin/traces)
+
+Ein Trace beginnt bei einem HTTP-Request oder Socket.IO-Event und sammelt
+Spans darunter: GameService-Methoden, Spotify-Calls, Emits. Der aktuelle Span
+liegt in einer ContextVar - asyncio-Tasks und der Threadpool übernehmen ihn
+automatisch. Room-Events gehen über die Outbox (eigener Task), deshalb merkt
+sich jedes Event den Span beim Einreihen (`current`/`use`).
+
+- Sampling pro Trace (`TRACING_SAMPLE_RATE`, 0 = aus), Header `X-Trace: 1`
+  erzwingt einen Trace; Kinder folgen immer der Entscheidung der Wurzel
+- Abgeschlossene Spans landen in einem Ring Buffer (`TRACING_BUFFER_SIZE`)
+- Ist Tracing aus, kostet ein Span nur einen Attribut-Check
+"""
+import asyncio
+import contextvars
+import functools
+import random
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+from ..core.config import settings
+
+
+class Span:
+    """
+    Ein abgeschlossener oder laufender Abschnitt eines Traces
+    """
+
+    __slots__ = ("trace_id", "span_id", "parent_id", "name", "kind", "start_ns", "duration_ns",
+                 "attributes", "error", "_started")
+
+    sampled = True
+
+    def __init__(self, trace_id: str, parent_id: Optional[str], name: str, kind: str,
+                 attributes: Dict[str, Any]):
+        self.trace_id = trace_id
+        self.span_id = f"{random.getrandbits(64):016x}"
+        self.parent_id = parent_id
+        self.name = name
+        self.kind = kind
+        self.attributes = attributes
+        self.error: Optional[str] = None
+        self.start_ns = time.time_ns()
+        self.duration_ns: Optional[int] = None
+        self._started = time.perf_counter_ns()
+
+    def set(self, **attributes) -> None:
+        self.attributes.update(attributes)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "kind": self.kind,
+            "start_us": self.start_ns // 1000,
+            "duration_ms": round(self.duration_ns / 1e6, 3) if self.duration_ns is not None else None,
+            "attributes": self.attributes,
+            "error": self.error
+        }
+
+
+class _NoopSpan:
+    """
+    Span eines nicht gesampelten Traces (Attribute werden verworfen)
+    """
+
+    sampled = False
+    trace_id = None
+
+    def set(self, **attributes) -> None:
+        pass
+
+
+NOOP_SPAN = _NoopSpan()
+_current: contextvars.ContextVar = contextvars.ContextVar("trace_span", default=None)
+
+
+class _Scope:
+    """
+    Context Manager: setzt den Span als aktuellen, beendet ihn beim Verlassen
+    """
+
+    __slots__ = ("tracer", "span", "_token")
+
+    def __init__(self, tracer: "Tracer", span):
+        self.tracer = tracer
+        self.span = span
+        self._token = None
+
+    def __enter__(self):
+        self._token = _current.set(self.span)
+        return self.span
+
+    def __exit__(self, exc_type, exc, tb):
+        _current.reset(self._token)
+        if self.span.sampled:
+            if exc_type is not None and not issubclass(exc_type, asyncio.CancelledError):
+                self.span.error = f"{exc_type.__name__}: {exc}"
+            self.tracer.finish(self.span)
+        return False
+
+
+class _NullScope:
+    """
+    Tracing aus bzw. Trace nicht gesampelt - nichts zu tun
+    """
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return NOOP_SPAN
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SCOPE = _NullScope()
+
+
+class Tracer:
+    """
+    Erzeugt Spans und hält die abgeschlossenen im Ring Buffer
+    """
+
+    def __init__(self, sample_rate: float = 0.0, buffer_size: int = 4096):
+        self.sample_rate = sample_rate
+        self.spans: Deque[Span] = deque(maxlen=buffer_size)
+        self.stats: Dict[str, int] = {"traces": 0, "spans": 0, "unsampled": 0}
+
+    @property
+    def enabled(self) -> bool:
+        return self.sample_rate > 0
+
+    def span(self, name: str, kind: str = "internal", force: bool = False, **attributes):
+        """
+        Neuer Span unter dem aktuellen (oder Wurzel eines neuen Traces)
+        """
+        parent = _current.get()
+        if parent is None:
+            if not force and (self.sample_rate <= 0 or random.random() >= self.sample_rate):
+                if self.sample_rate <= 0:
+                    return _NULL_SCOPE
+                # Entscheidung merken, sonst würfeln die Kinder selbst
+                self.stats["unsampled"] += 1
+                return _Scope(self, NOOP_SPAN)
+            self.stats["traces"] += 1
+            return _Scope(self, Span(f"{random.getrandbits(128):032x}", None, name, kind, attributes))
+        if not parent.sampled:
+            return _NULL_SCOPE
+        return _Scope(self, Span(parent.trace_id, parent.span_id, name, kind, attributes))
+
+    def finish(self, span: Span) -> None:
+        span.duration_ns = time.perf_counter_ns() - span._started
+        self.stats["spans"] += 1
+        self.spans.append(span)
+
+    @staticmethod
+    def current():
+        """
+        Aktueller Span (zum Mitgeben an andere Tasks, z.B. Outbox)
+        """
+        return _current.get()
+
+    @staticmethod
+    def use(span) -> "_Use":
+        """
+        Context Manager: `span` als aktuellen Span setzen (ohne ihn zu beenden)
+        """
+        return _Use(span)
+
+    def traces(self, limit: int = 20, min_duration_ms: float = 0.0,
+               name: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Neueste Traces aus dem Ring Buffer (Wurzel-Span + Anzahl Spans)
+        """
+        counts: Dict[str, int] = {}
+        roots: List[Span] = []
+        for span in list(self.spans):
+            counts[span.trace_id] = counts.get(span.trace_id, 0) + 1
+            if span.parent_id is None:
+                roots.append(span)
+        result = []
+        for root in reversed(roots):
+            if root.duration_ns / 1e6 < min_duration_ms or (name and name not in root.name):
+                continue
+            result.append({**root.to_dict(), "spans": counts[root.trace_id]})
+            if len(result) >= limit:
+                break
+        return result
+
+    def trace(self, trace_id: str) -> List[Dict[str, Any]]:
+        """
+        Alle Spans eines Traces, nach Start sortiert, mit Tiefe im Baum
+        """
+        spans = sorted((span for span in list(self.spans) if span.trace_id == trace_id),
+                       key=lambda span: span.start_ns)
+        depth: Dict[str, int] = {}
+        result = []
+        for span in spans:
+            depth[span.span_id] = depth.get(span.parent_id, -1) + 1 if span.parent_id else 0
+            result.append({**span.to_dict(), "depth": depth[span.span_id]})
+        return result
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {"sample_rate": self.sample_rate, "buffered_spans": len(self.spans),
+                "buffer_size": self.spans.maxlen, **self.stats}
+
+
+class _Use:
+    __slots__ = ("span", "_token")
+
+    def __init__(self, span):
+        self.span = span
+
+    def __enter__(self):
+        self._token = _current.set(self.span)
+        return self.span
+
+    def __exit__(self, *exc):
+        _current.reset(self._token)
+        return False
+
+
+def traced(tracer: "Tracer", name: str, kind: str = "internal") -> Callable:
+    """
+    Decorator: Funktion (sync oder async) als Span
+    """
+    def decorator(fn: Callable) -> Callable:
+        if asyncio.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                if tracer.sample_rate <= 0 and _current.get() is None:
+                    return await fn(*args, **kwargs)
+                with tracer.span(name, kind):
+                    return await fn(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if tracer.sample_rate <= 0 and _current.get() is None:
+                return fn(*args, **kwargs)
+            with tracer.span(name, kind):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def trace_methods(kind: str) -> Callable:
+    """
+    Klassen-Decorator: alle öffentlichen Methoden als Spans "<Klasse>.<methode>"
+    """
+    def decorator(cls):
+        for attr, value in list(vars(cls).items()):
+            if attr.startswith("_") or not callable(value) or isinstance(value, (staticmethod, classmethod, type)):
+                continue
+            setattr(cls, attr, traced(tracer, f"{cls.__name__}.{attr}", kind)(value))
+        return cls
+    return decorator
+
+
+def trace_socketio(sio, tracer: "Tracer") -> None:
+    """
+    Socket.IO-Handler als Wurzel-Spans, `sio.emit` als Kind-Spans
+    (connect/disconnect ausgenommen - socketio ruft sie mit variabler Signatur)
+    """
+    for event, handler in list(sio.handlers.get("/", {}).items()):
+        if event in ("connect", "disconnect") or not asyncio.iscoroutinefunction(handler):
+            continue
+
+        async def wrapper(*args, _event=event, _handler=handler):
+            if tracer.sample_rate <= 0:
+                return await _handler(*args)
+            data = args[1] if len(args) > 1 else None
+            session_id = data.get("session_id") if isinstance(data, dict) else None
+            with tracer.span(f"sio {_event}", "socket", sid=args[0], session_id=session_id):
+                return await _handler(*args)
+
+        wrapper.__wrapped__ = handler
+        sio.handlers["/"][event] = wrapper
+
+    emit = sio.emit
+
+    @functools.wraps(emit)
+    async def traced_emit(event, data=None, to=None, room=None, **kwargs):
+        if _current.get() is None:  # Tracing aus oder außerhalb eines Traces
+            return await emit(event, data, to=to, room=room, **kwargs)
+        with tracer.span(f"emit {event}", "emit", room=room or to):
+            return await emit(event, data, to=to, room=room, **kwargs)
+
+    sio.emit = traced_emit
+
+
+class TracingMiddleware:
+    """
+    ASGI Middleware: Wurzel-Span pro HTTP-Request, Trace-ID im Antwort-Header
+    """
+
+    def __init__(self, app, tracer: "Tracer"):
+        self.app = app
+        self.tracer = tracer
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        force = (b"x-trace", b"1") in scope["headers"]
+        if not force and self.tracer.sample_rate <= 0:
+            await self.app(scope, receive, send)
+            return
+
+        with self.tracer.span(f"{scope['method']} {scope['path']}", "http", force=force,
+                              path=scope["path"]) as span:
+            if not span.sampled:
+                await self.app(scope, receive, send)
+                return
+
+            async def send_with_trace(message):
+                if message["type"] == "http.response.start":
+                    span.set(status=message["status"])
+                    message = {**message, "headers": [*message.get("headers", []),
+                                                      (b"x-trace-id", span.trace_id.encode())]}
+                await send(message)
+
+            await self.app(scope, receive, send_with_trace)
+            route = scope.get("route")
+            if route is not None and hasattr(route, "path"):
+                # Pfad-Vorlage statt IDs - Traces gleicher Endpoints lassen sich vergleichen
+                span.name = f"{scope['method']} {route.path}"
+
+
+# Singleton Instance
+tracer = Tracer(sample_rate=settings.tracing_sample_rate, buffer_size=settings.tracing_buffer_size)
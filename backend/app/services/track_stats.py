@@ -0,0 +1,272 @@
+"""
+Track Stats - Laufende Schwierigkeit pro Track über alle Spiele
+
+Jede Platzierung und jeder Guess erhöht ein paar Zähler des Tracks (O(1),
+ein Dict-Zugriff). Daraus ergibt sich:
+
+- Schwierigkeit: geglättete Fehlerquote bei Jahr-Wissen (Platzierung +
+  Jahrzehnt-Guess), Tracks ohne Daten liegen beim globalen Mittel
+- "Falsches Jahr": fast immer falsch platziert, meist weil `release_date`
+  das Jahr eines Remasters ist
+
+Gespeichert wird nur bei Änderungen, periodisch aus einem Hintergrund-Thread
+und beim Shutdown (Binärdatei, atomar ersetzt):
+    [b"HTS1"][Anzahl: u32][Länge IDs: u32][IDs, "\\n"-getrennt][Zähler: u32 × 7 × Anzahl]
+"""
+import os
+import random
+import struct
+import tempfile
+import threading
+from array import array
+from typing import Dict, List, Optional
+
+from ..core.config import settings
+from ..models.game import DeckOrder, SpotifyTrack
+
+
+MAGIC = b"HTS1"
+FILE_HEADER = struct.Struct("<4sII")
+
+# Zähler pro Track (Index in der Liste)
+PLACEMENTS, PLACED_CORRECT, GUESSES, TITLE_CORRECT, ARTIST_CORRECT, DECADE_GUESSES, DECADE_CORRECT = range(7)
+COUNTERS = 7
+
+
+class TrackStats:
+    """
+    Zähler pro track_id, Schwierigkeit & Deck-Reihenfolge
+    """
+
+    def __init__(self, path: str, min_samples: int = 8, bad_year_accuracy: float = 0.2,
+                 prior_weight: float = 4.0, strata: int = 4, save_interval: float = 60.0):
+        self.path = path
+        self.min_samples = min_samples
+        self.bad_year_accuracy = bad_year_accuracy
+        self.prior_weight = prior_weight
+        self.strata = strata
+        self.save_interval = save_interval
+        self._counters: Optional[Dict[str, List[int]]] = None  # erst beim ersten Zugriff geladen
+        self._misses = 0  # Fehler & Versuche über alle Tracks (globales Mittel)
+        self._attempts = 0
+        self._dirty = False
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self.stats = {"saves": 0, "save_errors": 0}
+
+    # --- Zähler ---
+
+    def record_placement(self, track_id: str, correct: bool) -> None:
+        with self._lock:
+            counters = self._track(track_id)
+            counters[PLACEMENTS] += 1
+            self._attempts += 1
+            if correct:
+                counters[PLACED_CORRECT] += 1
+            else:
+                self._misses += 1
+            self._dirty = True
+
+    def record_guess(self, track_id: str, title: bool, artist: bool, decade: Optional[bool]) -> None:
+        """decade=None: kein Jahrzehnt geraten"""
+        with self._lock:
+            counters = self._track(track_id)
+            counters[GUESSES] += 1
+            counters[TITLE_CORRECT] += title
+            counters[ARTIST_CORRECT] += artist
+            if decade is not None:
+                counters[DECADE_GUESSES] += 1
+                counters[DECADE_CORRECT] += decade
+                self._attempts += 1
+                self._misses += not decade
+            self._dirty = True
+
+    def get(self, track_id: str) -> Dict[str, int]:
+        with self._lock:
+            counters = self._loaded().get(track_id, [0] * COUNTERS)
+        return dict(zip(("placements", "placed_correct", "guesses", "title_correct",
+                         "artist_correct", "decade_guesses", "decade_correct"), counters))
+
+    def _track(self, track_id: str) -> List[int]:
+        counters = self._loaded().get(track_id)
+        if counters is None:
+            counters = self._counters[track_id] = [0] * COUNTERS
+        return counters
+
+    # --- Auswertung ---
+
+    def difficulty(self, track_id: str) -> float:
+        """
+        Fehlerquote 0..1 (Platzierung + Jahrzehnt), mit dem globalen Mittel geglättet
+        """
+        with self._lock:
+            return self._difficulty(self._loaded().get(track_id), self._prior())
+
+    def _prior(self) -> float:
+        return self._misses / self._attempts if self._attempts else 0.5
+
+    def _difficulty(self, counters: Optional[List[int]], prior: float) -> float:
+        if counters is None:
+            return prior
+        attempts = counters[PLACEMENTS] + counters[DECADE_GUESSES]
+        misses = attempts - counters[PLACED_CORRECT] - counters[DECADE_CORRECT]
+        return (misses + self.prior_weight * prior) / (attempts + self.prior_weight)
+
+    def is_bad_year(self, track_id: str) -> bool:
+        """
+        Genug Platzierungen und fast alle falsch
+        """
+        with self._lock:
+            counters = self._loaded().get(track_id)
+            if counters is None or counters[PLACEMENTS] < self.min_samples:
+                return False
+            return counters[PLACED_CORRECT] <= self.bad_year_accuracy * counters[PLACEMENTS]
+
+    def balance(self, tracks: List[SpotifyTrack], rng: Optional[random.Random] = None) -> List[SpotifyTrack]:
+        """
+        Schwierigkeit gleichmäßig übers Deck verteilen
+        Tracks nach Schwierigkeit in `strata` gleich große Gruppen, dann reihum je
+        einer aus jeder Gruppe (Gruppen-Reihenfolge pro Runde zufällig). Jedes
+        Fenster aus `strata` Karten enthält so leichte & schwere Tracks.
+        Gleich schwere Tracks behalten ihre (gemischte) Reihenfolge.
+        """
+        count = len(tracks)
+        strata = min(self.strata, count)
+        if strata < 2:
+            return list(tracks)
+        rng = rng or random
+
+        with self._lock:
+            counters = self._loaded()
+            prior = self._prior()
+            scores = [self._difficulty(counters.get(track.track_id), prior) for track in tracks]
+        ranked = sorted(range(count), key=scores.__getitem__)
+
+        groups = [ranked[count * idx // strata:count * (idx + 1) // strata] for idx in range(strata)]
+        for group in groups:
+            rng.shuffle(group)
+
+        ordered: List[SpotifyTrack] = []
+        sequence = list(range(strata))
+        for position in range(len(groups[-1])):  # letzte Gruppe ist die größte
+            rng.shuffle(sequence)
+            ordered.extend(tracks[groups[idx][position]] for idx in sequence if position < len(groups[idx]))
+        return ordered
+
+    def order(self, tracks: List[SpotifyTrack], deck_order: DeckOrder) -> List[SpotifyTrack]:
+        """
+        Gemischtes Deck in die gewünschte Reihenfolge bringen
+        (SKIP_BAD_YEARS filtert schon der DeckBuilder, siehe `exclude`)
+        """
+        if deck_order == DeckOrder.BALANCED:
+            return self.balance(tracks)
+        return tracks
+
+    def exclude(self, deck_order: DeckOrder):
+        """Filter für DeckBuilder.exclude (None = alle Tracks)"""
+        return self.is_bad_year if deck_order == DeckOrder.SKIP_BAD_YEARS else None
+
+    # --- Speichern & Laden ---
+
+    def _loaded(self) -> Dict[str, List[int]]:
+        if self._counters is None:
+            self._counters = self._read()
+            for counters in self._counters.values():
+                attempts = counters[PLACEMENTS] + counters[DECADE_GUESSES]
+                self._attempts += attempts
+                self._misses += attempts - counters[PLACED_CORRECT] - counters[DECADE_CORRECT]
+        return self._counters
+
+    def _read(self) -> Dict[str, List[int]]:
+        if not self.path or not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, "rb") as f:
+                data = f.read()
+            magic, count, ids_length = FILE_HEADER.unpack_from(data)
+            if magic != MAGIC:
+                raise ValueError("Unbekanntes Format")
+            start = FILE_HEADER.size
+            track_ids = data[start:start + ids_length].decode().split("\n") if count else []
+            values = array("I")
+            values.frombytes(data[start + ids_length:start + ids_length + count * COUNTERS * values.itemsize])
+            if len(track_ids) != count or len(values) != count * COUNTERS:
+                raise ValueError("Datei unvollständig")
+        except (OSError, ValueError, struct.error) as e:
+            print(f"⚠️  Track-Statistik {self.path} nicht lesbar, starte leer: {e}")
+            return {}
+        return {
+            track_id: values[idx * COUNTERS:(idx + 1) * COUNTERS].tolist()
+            for idx, track_id in enumerate(track_ids)
+        }
+
+    def save(self) -> bool:
+        """
+        Zähler speichern, falls seit dem letzten Speichern geändert
+        Returns: True wenn geschrieben wurde
+        """
+        if not self.path:
+            return False
+        with self._lock:
+            if not self._dirty:
+                return False
+            track_ids = list(self._counters)
+            values = array("I", [value for counters in self._counters.values() for value in counters])
+            self._dirty = False
+
+        blob = "\n".join(track_ids).encode()
+        directory = os.path.dirname(self.path) or "."
+        try:
+            os.makedirs(directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".track-stats-")
+            with os.fdopen(fd, "wb") as f:
+                f.write(FILE_HEADER.pack(MAGIC, len(track_ids), len(blob)))
+                f.write(blob)
+                f.write(values.tobytes())
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            self._dirty = True
+            self.stats["save_errors"] += 1
+            print(f"⚠️  Track-Statistik nicht gespeichert: {e}")
+            return False
+        self.stats["saves"] += 1
+        return True
+
+    def _run(self):
+        """Hintergrund-Thread: periodisch speichern"""
+        while not self._stop.wait(self.save_interval):
+            self.save()
+
+    def start(self) -> None:
+        """Speicher-Thread starten (idempotent)"""
+        if not self.path or (self._thread is not None and self._thread.is_alive()):
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="track-stats-save", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+        self.save()
+
+    def snapshot(self) -> Dict:
+        """
+        Metriken für /metrics
+        """
+        with self._lock:
+            tracks = len(self._counters) if self._counters is not None else None
+        return {"tracks": tracks, "dirty": self._dirty, **self.stats}
+
+
+# Singleton Instance
+track_stats = TrackStats(
+    path=settings.shard_path(settings.track_stats_path),
+    min_samples=settings.track_stats_min_samples,
+    bad_year_accuracy=settings.track_stats_bad_year_accuracy,
+    strata=settings.track_stats_strata,
+    save_interval=settings.track_stats_save_interval_s
+)
@@ -0,0 +1,226 @@
+"""
+Turn Scheduler - Zug-Timer für alle Sessions
+Ein Hashed Timing Wheel, getrieben von einem einzigen asyncio Task
+"""
+import asyncio
+import math
+from datetime import datetime
+from typing import Dict, Hashable, List, Optional
+from ..core.config import settings
+from .game_service import game_service
+from .websocket_service import broadcast_to_session, push_new_track
+
+
+class TimingWheel:
+    """
+    Hashed Timing Wheel
+
+    Timer landen im Slot (cursor + ticks) % slots und merken sich, wie viele
+    volle Umdrehungen sie noch warten müssen. schedule/cancel sind O(1),
+    ein Tick kostet nur die Timer im aktuellen Slot.
+    """
+
+    def __init__(self, slots: int, tick: float):
+        self.tick = tick
+        self.slots: List[Dict[Hashable, int]] = [{} for _ in range(max(slots, 1))]
+        self.cursor = 0
+        self._slot_of: Dict[Hashable, int] = {}  # key -> Slot-Index
+
+    def __len__(self) -> int:
+        return len(self._slot_of)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._slot_of
+
+    def schedule(self, key: Hashable, delay: float) -> None:
+        """
+        Plane Timer `key` in `delay` Sekunden (ersetzt einen bestehenden Timer)
+        """
+        self.cancel(key)
+        ticks = max(1, math.ceil(delay / self.tick))
+        slot = (self.cursor + ticks) % len(self.slots)
+        self.slots[slot][key] = (ticks - 1) // len(self.slots)
+        self._slot_of[key] = slot
+
+    def cancel(self, key: Hashable) -> bool:
+        """
+        Entferne Timer `key`
+        Returns: True wenn ein Timer entfernt wurde
+        """
+        slot = self._slot_of.pop(key, None)
+        if slot is None:
+            return False
+        self.slots[slot].pop(key, None)
+        return True
+
+    def advance(self) -> List[Hashable]:
+        """
+        Einen Tick weiterdrehen
+        Returns: Keys der abgelaufenen Timer
+        """
+        self.cursor = (self.cursor + 1) % len(self.slots)
+        slot = self.slots[self.cursor]
+        if not slot:
+            return []
+
+        expired = []
+        for key, rounds in list(slot.items()):
+            if rounds == 0:
+                expired.append(key)
+                del slot[key]
+                del self._slot_of[key]
+            else:
+                slot[key] = rounds - 1
+        return expired
+
+
+class TurnScheduler:
+    """
+    Turn Scheduler
+    Überspringt Züge, deren Zeitlimit abgelaufen ist, und pusht `turn_changed`
+
+    Ohne aktive Timer schläft der Task komplett (kein Polling).
+    """
+
+    def __init__(self):
+        self.wheel = TimingWheel(
+            slots=settings.turn_timer_slots,
+            tick=settings.turn_timer_tick_ms / 1000.0
+        )
+        self._task: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self.paused = False  # Drain vor dem Neustart: keine Timer mehr
+
+    def arm(self, session_id: str, seconds: float) -> None:
+        """
+        Starte (oder ersetze) den Zug-Timer einer Session
+        Angehalten (Drain): nichts - der Nachfolger stellt Timer aus turn_deadline wieder her
+        """
+        if self.paused:
+            return
+        if seconds <= 0:
+            self.cancel(session_id)
+            return
+
+        self.wheel.schedule(session_id, seconds)
+
+        if self._task is None or self._task.done():
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.get_running_loop().create_task(self._run())
+        self._wakeup.set()
+
+    def cancel(self, session_id: str) -> None:
+        """
+        Stoppe den Zug-Timer einer Session
+        """
+        self.wheel.cancel(session_id)
+
+    def stop(self) -> None:
+        """
+        Timer-Task beenden (Drain vor dem Neustart) - bis resume() läuft kein Zug ab,
+        auch nicht nach Spielzügen während des Drains (arm() wird ignoriert)
+        """
+        self.paused = True
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    def resume(self) -> None:
+        """
+        Nach stop() wieder Timer annehmen (z.B. abgebrochener Drain)
+        """
+        self.paused = False
+
+    async def announce_turn(self, session_id: str, reason: str,
+                            previous_player: Optional[str] = None) -> None:
+        """
+        Pushe `turn_changed` und starte den Timer für den neuen Zug
+        """
+        session = game_service.sessions.get(session_id)
+        if session is None or session.status != "playing":
+            self.cancel(session_id)
+            return
+
+        self.arm(session_id, session.turn_time_limit)
+
+        await broadcast_to_session(session_id, 'turn_changed', {
+            'session_id': session_id,
+            'current_player': session.current_player_turn,
+            'previous_player': previous_player,
+            'round_number': session.round_number,
+            'deadline': session.turn_deadline.isoformat() if session.turn_deadline else None,
+            'reason': reason
+        })
+
+    async def push_next_track_result(self, session_id: str, result: Dict, reason: str,
+                                     previous_player: Optional[str] = None) -> None:
+        """
+        Pushe das Ergebnis von GameService.next_track an die Session
+        """
+        if result["status"] == "playing":
+            await push_new_track(
+                session_id,
+                track=result['track'],
+                track_number=result['track_number'],
+                total_tracks=result['total_tracks'],
+                upcoming=result['upcoming']
+            )
+            await self.announce_turn(session_id, reason=reason, previous_player=previous_player)
+        else:
+            self.cancel(session_id)
+            await broadcast_to_session(session_id, 'game_finished', {
+                'session_id': session_id,
+                'final_scores': result.get('final_scores', [])
+            })
+
+    async def _on_timeout(self, session_id: str) -> None:
+        """
+        Zeitlimit abgelaufen: aktuellen Track verwerfen, nächster Spieler
+        Nur, wenn die Deadline des Zuges wirklich erreicht ist - ein veralteter Timer
+        (Zug inzwischen neu gestartet, Limit aufgehoben) überspringt niemanden
+        """
+        session = game_service.sessions.get(session_id)
+        if session is None or session.status != "playing" or session.turn_deadline is None:
+            return
+        remaining = (session.turn_deadline - datetime.now()).total_seconds()
+        if remaining > 0:
+            # Zu früh (das Wheel rundet auf Ticks, der erste Tick kommt früher): Rest abwarten
+            self.arm(session_id, remaining)
+            return
+
+        skipped_player = session.current_player_turn
+        print(f"⏰ Zeit abgelaufen in Session {session_id} - überspringe {skipped_player}")
+
+        try:
+            result = game_service.next_track(session_id)
+        except ValueError:
+            return
+
+        await self.push_next_track_result(
+            session_id, result, reason="timeout", previous_player=skipped_player
+        )
+
+    async def _run(self):
+        """Einziger Timer-Task für alle Sessions"""
+        loop = asyncio.get_running_loop()
+        next_tick = loop.time() + self.wheel.tick
+
+        while True:
+            if len(self.wheel) == 0:
+                # Keine Timer: schlafen bis arm() weckt
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                next_tick = loop.time() + self.wheel.tick
+                continue
+
+            delay = next_tick - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            next_tick += self.wheel.tick
+
+            for session_id in self.wheel.advance():
+                loop.create_task(self._on_timeout(session_id))
+
+
+# Singleton Instance
+turn_scheduler = TurnScheduler()
@@ -1,15 +1,26 @@
 """
 WebSocket Service für Live-Updates
 """
+import asyncio
+import inspect
+import json
 import socketio
-from typing import Dict, Set
+from collections import OrderedDict
+from socketio import packet as sio_packet
+from engineio import packet as eio_packet
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Set, Optional
+from ..core.config import settings
+from .rate_limiter import TokenBucket
+from .loop_monitor import loop_monitor
+from .tracing import tracer
 
 # Socket.IO Server
 sio = socketio.AsyncServer(
     async_mode='asgi',
     cors_allowed_origins='*',
-    logger=True,
-    engineio_logger=True
+    logger=settings.debug,  # Loggt jedes Paket - nur in Entwicklung
+    engineio_logger=settings.debug,
+    max_http_buffer_size=settings.socket_max_message_bytes
 )
 
 # Track connected clients per session
@@ -18,6 +29,23 @@ connected_clients: Dict[str, Set[str]] = {}  # session_id -> set of sid
 player_sessions: Dict[str, str] = {}  # sid -> session_id
 player_ids: Dict[str, str] = {}  # sid -> player_id
 
+# Zuschauer (nicht im GameService, eigener Sub-Room pro Session)
+spectators: Dict[str, Set[str]] = {}  # session_id -> set of sid
+spectator_sessions: Dict[str, str] = {}  # sid -> session_id
+
+# Backpressure: Rate-Limits pro Client & begrenzte Queues pro Room
+client_buckets: Dict[str, TokenBucket] = {}  # sid -> TokenBucket
+socket_stats: Dict[str, int] = {
+    "throttled": 0,  # Client-Events über dem Rate-Limit
+    "oversized": 0,  # Client-Events über der Payload-Grenze
+    "invalid": 0,  # Client-Events ohne gültiges Objekt
+    "dropped": 0,  # Verworfene Room-Events (Queue voll)
+    "merged": 0,  # Zusammengeführte Room-Events (neuester Stand gewinnt)
+    "slow_consumer_skips": 0,  # Events, die langsame Clients ausgelassen haben
+    "emit_errors": 0,  # Room-Events, deren Emit fehlschlug (Queue läuft weiter)
+    "spectator_emit_fallbacks": 0  # Zuschauer-Fan-outs über sio.emit() (kein direkter Versand)
+}
+
 
 @sio.event
 async def connect(sid, environ):
@@ -29,6 +57,12 @@ async def connect(sid, environ):
 async def disconnect(sid):
     """Client trennt Verbindung"""
     print(f"❌ Client disconnected: {sid}")
+    client_buckets.pop(sid, None)
+    
+    # Zuschauer haben keinen Spieler im GameService
+    if sid in spectator_sessions:
+        _remove_spectator(sid)
+        return
     
     # Hole Session und Player ID
     session_id = player_sessions.pop(sid, None)
@@ -39,6 +73,11 @@ async def disconnect(sid):
         if session_id in connected_clients:
             connected_clients[session_id].discard(sid)
         
+        # Drain vor dem Neustart: Spieler bleiben (Handoff), Client verbindet sich neu
+        from .handoff import handoff
+        if handoff.draining:
+            return
+        
         # Entferne Spieler aus Game Service
         if player_id:
             from .game_service import game_service
@@ -53,6 +92,8 @@ async def disconnect(sid):
             
             game_service.remove_player(session_id, player_id)
             
+            spectator_hub.mark_dirty(session_id)
+            
             # Informiere andere
             await sio.emit('player_left', {
                 'player_id': player_id,
@@ -91,6 +132,8 @@ async def join_lobby(sid, data):
     # Socket.IO Room beitreten
     await sio.enter_room(sid, session_id)
     
+    spectator_hub.mark_dirty(session_id)
+    
     # Informiere alle anderen in der Lobby
     await sio.emit('player_joined', {
         'player_id': player_id,
@@ -114,39 +157,424 @@ async def start_game(sid, data):
     # Setze Status auf "playing"
     from .game_service import game_service
     if session_id in game_service.sessions:
-        game_service.sessions[session_id].status = "playing"
+        game_service.set_status(session_id, "playing")
         print(f"✅ Session {session_id} Status → playing")
     
-    # Alle in der Session informieren
+    spectator_hub.mark_dirty(session_id)
+    
+    # Alle in der Session informieren (inkl. Handles zum Vorladen)
     await sio.emit('game_started', {
         'session_id': session_id,
-        'message': 'Spiel wurde gestartet!'
+        'message': 'Spiel wurde gestartet!',
+        'upcoming': game_service.get_upcoming_tracks(session_id)
     }, room=session_id)
 
 
 @sio.event
 async def guess_submitted(sid, data):
     """Spieler hat geraten"""
+    if not _admit_client_event(sid, data):
+        return
     session_id = data.get('session_id')
     
-    # An alle in der Session senden
-    await sio.emit('guess_result', data, room=session_id)
+    spectator_hub.mark_dirty(session_id)
+    
+    # An alle in der Session senden (pro Spieler zählt nur der neueste Guess)
+    enqueue_for_room(
+        session_id, 'guess_result', data,
+        merge_key=data.get('player_id') or sid
+    )
 
 
 @sio.event
 async def next_track_request(sid, data):
     """Host fordert nächsten Track an"""
+    if not _admit_client_event(sid, data):
+        return
     session_id = data.get('session_id')
     
-    # An alle in der Session senden
-    await sio.emit('new_track', data, room=session_id)
+    spectator_hub.mark_dirty(session_id)
+    
+    # Nächste Handles vom Server ergänzen (Client-Daten können sie nicht überschreiben)
+    from .game_service import game_service
+    data = {**data, 'upcoming': game_service.get_upcoming_tracks(session_id)}
+    
+    # An alle in der Session senden (nur der neueste Track zählt)
+    enqueue_for_room(session_id, 'new_track', data, merge_key='latest', droppable=False)
 
 
 async def broadcast_to_session(session_id: str, event: str, data: dict):
     """Helper: Sende Event an alle in einer Session"""
-    await sio.emit(event, data, room=session_id)
+    spectator_hub.mark_dirty(session_id)
+    enqueue_for_room(session_id, event, data, droppable=False)
 
 
 async def send_to_client(sid: str, event: str, data: dict):
     """Helper: Sende Event an spezifischen Client"""
     await sio.emit(event, data, to=sid)
+
+
+async def push_new_track(session_id: str, track: dict, track_number: int,
+                         total_tracks: int, upcoming: list):
+    """Helper: Neuer Track inkl. nächster Handles (Clients laden vorab)"""
+    await broadcast_to_session(session_id, 'new_track', {
+        'session_id': session_id,
+        'track_number': track_number,
+        'total_tracks': total_tracks,
+        'track': track,
+        'upcoming': upcoming
+    })
+
+
+def get_socket_stats() -> Dict[str, int]:
+    """Zähler für Throttling & Backpressure"""
+    return {
+        **socket_stats,
+        "queued": sum(len(outbox.items) for outbox in outboxes.values()),
+        "active_outboxes": len(outboxes)
+    }
+
+
+# =====================================================
+# BACKPRESSURE (Rate-Limits, Payload-Grenzen, Room-Queues)
+# =====================================================
+
+def _admit_client_event(sid: str, data: Any) -> bool:
+    """
+    Prüfe ein weiterzuleitendes Client-Event
+    Returns: False wenn das Event verworfen werden soll
+    """
+    bucket = client_buckets.get(sid)
+    if bucket is None:
+        bucket = TokenBucket(settings.socket_events_per_second, settings.socket_event_burst)
+        client_buckets[sid] = bucket
+    
+    # Rate-Limit zuerst: ein flutender Client kostet dann kaum noch CPU
+    if not bucket.try_acquire():
+        socket_stats["throttled"] += 1
+        return False
+    
+    if not isinstance(data, dict) or not data.get('session_id'):
+        socket_stats["invalid"] += 1
+        return False
+    
+    try:
+        size = len(json.dumps(data, separators=(',', ':')))
+    except (TypeError, ValueError):
+        socket_stats["invalid"] += 1
+        return False
+    
+    if size > settings.socket_max_payload_bytes:
+        socket_stats["oversized"] += 1
+        return False
+    
+    return True
+
+
+class RoomOutbox:
+    """
+    Begrenzte Sende-Queue eines Rooms
+    
+    - Events mit merge_key ersetzen ein noch wartendes Event mit gleichem Key
+    - Ist die Queue voll, werden verwerfbare Events fallen gelassen;
+      nicht verwerfbare Events verdrängen das älteste verwerfbare Event
+    - Verwerfbare Events überspringen Clients mit voller Engine.IO Queue
+    """
+    
+    def __init__(self, room: str):
+        self.room = room
+        self.items: "OrderedDict[Hashable, List[Any]]" = OrderedDict()
+        self._seq = 0
+        self.task: Optional[asyncio.Task] = None  # Sende-Task (Referenz hält ihn am Leben)
+    
+    def put(self, event: str, data: Any, merge_key: Optional[Hashable] = None,
+            droppable: bool = True) -> bool:
+        """
+        Reihe Event ein
+        Returns: True wenn das Event gesendet wird (auch zusammengeführt)
+        """
+        if merge_key is not None:
+            key = (event, merge_key)
+            if key in self.items:
+                self.items[key][1] = data
+                self.items[key][3] = tracer.current()
+                socket_stats["merged"] += 1
+                return True
+        else:
+            self._seq += 1
+            key = self._seq
+        
+        if len(self.items) >= settings.socket_room_queue_size:
+            if droppable:
+                socket_stats["dropped"] += 1
+                return False
+            victim = next((k for k, item in self.items.items() if item[2]), None)
+            if victim is not None:
+                del self.items[victim]
+                socket_stats["dropped"] += 1
+        
+        # Span des Einreihenden - der Emit im Outbox-Task gehört zu dessen Trace
+        self.items[key] = [event, data, droppable, tracer.current()]
+        return True
+    
+    async def drain(self):
+        """Sende alle wartenden Events in Reihenfolge"""
+        try:
+            while self.items:
+                _, (event, data, droppable, span) = self.items.popitem(last=False)
+                try:
+                    skip_sid = _slow_consumers(self.room) if droppable else None
+                    with tracer.use(span):
+                        await sio.emit(event, data, room=self.room, skip_sid=skip_sid)
+                except Exception as e:
+                    # Ein kaputtes Event darf den Room nicht stummschalten
+                    socket_stats["emit_errors"] += 1
+                    print(f"❌ Emit '{event}' an {self.room} fehlgeschlagen: {e}")
+        finally:
+            # Queue leer (oder Task abgebrochen): Room freigeben
+            # (kein await zwischen Prüfung & Entfernen)
+            if outboxes.get(self.room) is self:
+                del outboxes[self.room]
+
+
+outboxes: Dict[str, RoomOutbox] = {}  # room -> RoomOutbox
+
+
+def enqueue_for_room(room: str, event: str, data: Any,
+                     merge_key: Optional[Hashable] = None,
+                     droppable: bool = True) -> bool:
+    """
+    Reihe Event für einen Room ein (nicht blockierend)
+    Pro Room sendet genau ein Task; langsame Rooms bremsen andere nicht aus.
+    """
+    outbox = outboxes.get(room)
+    if outbox is None:
+        outbox = RoomOutbox(room)
+        outboxes[room] = outbox
+        outbox.task = asyncio.get_running_loop().create_task(outbox.drain())
+    return outbox.put(event, data, merge_key=merge_key, droppable=droppable)
+
+
+def _slow_consumers(room: str) -> Optional[List[str]]:
+    """Clients im Room, deren Engine.IO Sende-Queue überläuft"""
+    limit = settings.socket_client_queue_limit
+    slow = []
+    for sid, eio_sid in sio.manager.get_participants('/', room):
+        socket = sio.eio.sockets.get(eio_sid)
+        if socket is not None and socket.queue.qsize() > limit:
+            slow.append(sid)
+    if not slow:
+        return None
+    socket_stats["slow_consumer_skips"] += len(slow)
+    return slow
+
+
+# =====================================================
+# ZUSCHAUER-MODUS (Venue-Screens & Publikum)
+# =====================================================
+
+def spectator_room(session_id: str) -> str:
+    """Name des Zuschauer-Sub-Rooms einer Session"""
+    return f"{session_id}:spectators"
+
+
+@sio.event
+async def join_spectator(sid, data):
+    """Zuschauer tritt einer Session bei (kein Spieler im GameService)"""
+    session_id = data.get('session_id')
+    
+    from .game_service import game_service
+    if session_id not in game_service.sessions:
+        await sio.emit('spectator_error', {
+            'message': 'Session nicht gefunden'
+        }, to=sid)
+        return
+    
+    print(f"👀 Zuschauer (sid={sid}) schaut Session {session_id} zu")
+    
+    spectator_sessions[sid] = session_id
+    spectators.setdefault(session_id, set()).add(sid)
+    
+    # Eigener Sub-Room: Zuschauer hängen nicht am Event-Pfad der Spieler
+    await sio.enter_room(sid, spectator_room(session_id))
+    
+    # Sofortiger Snapshot für den neuen Zuschauer, danach gedrosselt
+    await sio.emit('spectator_state', spectator_hub.build_snapshot(session_id), to=sid)
+    spectator_hub.ensure_running()
+
+
+@sio.event
+async def leave_spectator(sid, data=None):
+    """Zuschauer verlässt die Session"""
+    session_id = spectator_sessions.get(sid)
+    if session_id:
+        await sio.leave_room(sid, spectator_room(session_id))
+    _remove_spectator(sid)
+
+
+def _remove_spectator(sid: str) -> None:
+    """Entferne Zuschauer aus der Registry"""
+    session_id = spectator_sessions.pop(sid, None)
+    if session_id and session_id in spectators:
+        spectators[session_id].discard(sid)
+        if not spectators[session_id]:
+            del spectators[session_id]
+
+
+class SpectatorHub:
+    """
+    Gedrosselter Fan-out für Zuschauer
+    
+    Spieler-Events markieren eine Session nur als "dirty" (O(1)).
+    Ein einzelner Hintergrund-Task baut höchstens N Snapshots pro Sekunde
+    und Session, kodiert jeden Snapshot genau einmal als Socket.IO Paket
+    und verteilt dieselben Bytes an alle Zuschauer des Sub-Rooms.
+    """
+    
+    def __init__(self):
+        self.dirty: Set[str] = set()  # session_ids mit Änderungen
+        self.versions: Dict[str, int] = {}  # session_id -> Snapshot-Version
+        self._task: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None
+    
+    def mark_dirty(self, session_id: Optional[str]) -> None:
+        """Session hat sich geändert - nur relevant, wenn jemand zuschaut"""
+        if session_id and session_id in spectators:
+            self.dirty.add(session_id)
+            if self._wakeup is not None:
+                self._wakeup.set()
+    
+    def ensure_running(self) -> None:
+        """Starte den Fan-out-Task (einmal pro Worker)"""
+        if self._task is None or self._task.done():
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.get_running_loop().create_task(self._run())
+    
+    def build_snapshot(self, session_id: str) -> Dict:
+        """
+        Aggregierter, öffentlicher Spielstand (ohne Lösung des aktuellen Tracks)
+        """
+        from .game_service import game_service
+        
+        version = self.versions.get(session_id, 0) + 1
+        self.versions[session_id] = version
+        
+        session = game_service.sessions.get(session_id)
+        if session is None:
+            return {'session_id': session_id, 'version': version, 'status': 'closed'}
+        
+        players = game_service.players.get(session_id, [])
+        return {
+            'session_id': session_id,
+            'version': version,
+            'status': session.status,
+            'game_mode': session.game_mode.value,
+            'round_number': session.round_number,
+            'current_player': session.current_player_turn,
+            'track_number': session.current_track_index + 1,
+            'total_tracks': len(game_service.track_queues.get(session_id, [])),
+            'leaderboard': game_service.get_leaderboard(session_id),
+            'timelines': {
+                p.player_id: [
+                    {'title': c.title, 'artist': c.artist, 'year': c.year}
+                    for c in p.timeline
+                ]
+                for p in players
+            }
+        }
+    
+    async def _run(self):
+        """Ein Task für alle Sessions: sammeln, drosseln, verteilen"""
+        loop = asyncio.get_running_loop()
+        interval = 1.0 / max(settings.spectator_updates_per_second, 0.01)
+        last_sent: Dict[str, float] = {}
+        
+        while spectators:
+            if not self.dirty:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+            
+            # Überlast: Zuschauer warten, Spieler-Events haben Vorrang
+            if loop_monitor.should_defer():
+                await asyncio.sleep(interval)
+                continue
+            
+            now = loop.time()
+            due = [s for s in self.dirty if now - last_sent.get(s, 0.0) >= interval]
+            if not due:
+                # Frühester Zeitpunkt, an dem wieder eine Session senden darf
+                next_due = min(last_sent.get(s, 0.0) for s in self.dirty) + interval
+                await asyncio.sleep(max(next_due - now, 0.0))
+                continue
+            
+            for session_id in due:
+                self.dirty.discard(session_id)
+                last_sent[session_id] = now
+                if session_id not in spectators:
+                    self.versions.pop(session_id, None)
+                    continue
+                await self._fanout(
+                    spectator_room(session_id),
+                    'spectator_state',
+                    self.build_snapshot(session_id)
+                )
+            
+            # Verwaiste Einträge aufräumen
+            for session_id in [s for s in last_sent if s not in spectators]:
+                del last_sent[session_id]
+        
+        self._task = None
+    
+    async def _fanout(self, room: str, event: str, data: Dict) -> None:
+        """
+        Sende ein einmal kodiertes Paket an alle Teilnehmer eines Rooms
+        
+        sio.emit() erzeugt pro Empfänger einen eigenen Task - bei tausenden
+        Zuschauern teuer. Hier werden die Engine.IO Pakete direkt in die
+        Sende-Queues gelegt und regelmäßig an die Event-Loop zurückgegeben,
+        damit Spieler-Events nicht warten müssen.
+        Ohne direkten Versand (andere python-socketio Version): sio.emit().
+        """
+        send = _send_eio_packet
+        if send is None:
+            socket_stats["spectator_emit_fallbacks"] += 1
+            await sio.emit(event, data, room=room)
+            return
+        
+        pkt = sio.packet_class(sio_packet.EVENT, namespace='/', data=[event, data])
+        encoded = pkt.encode()
+        if not isinstance(encoded, list):
+            encoded = [encoded]
+        eio_pkts = [eio_packet.Packet(eio_packet.MESSAGE, p) for p in encoded]
+        
+        batch = max(settings.spectator_fanout_batch, 1)
+        participants = list(sio.manager.get_participants('/', room))
+        for idx, (_, eio_sid) in enumerate(participants, start=1):
+            for p in eio_pkts:
+                await send(eio_sid, p)
+            if idx % batch == 0:
+                await asyncio.sleep(0)
+
+
+def _eio_sender(server) -> Optional[Callable[[str, Any], Awaitable[None]]]:
+    """
+    Direkter Versand eines fertigen Engine.IO Pakets (server._send_eio_packet)
+    Internes API von python-socketio 5.x - fehlt es oder hat es eine andere
+    Signatur, gibt es None und der Fan-out sendet über sio.emit()
+    """
+    send = getattr(server, "_send_eio_packet", None)
+    if not inspect.iscoroutinefunction(send):
+        return None
+    try:
+        params = list(inspect.signature(send).parameters)
+    except (TypeError, ValueError):
+        return None
+    return send if params == ["eio_sid", "eio_pkt"] else None
+
+
+_send_eio_packet = _eio_sender(sio)
+if _send_eio_packet is None:
+    print("⚠️  python-socketio ohne _send_eio_packet - Zuschauer-Fan-out über sio.emit()")
+
+spectator_hub = SpectatorHub()
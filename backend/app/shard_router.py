@@ -0,0 +1,387 @@
+"""
+Shard Router - verteilt HTTP & Socket.IO auf mehrere Worker-Prozesse
+
+Jeder Worker ist ein normaler Server (`app.main:socket_app`) mit eigenem
+`GameService` und bekommt `SHARD_INDEX`/`SHARD_COUNT` gesetzt. Der Router
+hält keinen Spielzustand, er sucht nur den Shard zur session_id
+(`app.core.sharding`) und leitet weiter:
+
+- session_id aus Query (`session_id`/`sessionId`/`owner`, OAuth `state`),
+  Pfad oder JSON-Body - der Spotify Login eines Hosts landet so auf dem
+  Worker seiner Session
+- ohne session_id (Session anlegen, Playlists, Auth, Media): reihum
+- `/game/lobbies`: an alle Shards, Listen zusammengeführt
+- `/health`, `/metrics`: an alle Shards, pro Shard zurückgegeben
+- `/admin/...`: an den Shard aus `?shard=n` (Profile etc. gelten pro Worker)
+- Socket.IO: Shard aus `sessionId` im Connect-Query (setzt das Frontend
+  bereits), WebSocket wird Frame für Frame durchgereicht
+
+Start (im backend/ Ordner):
+    python -m app.shard_router --workers 4 --port 8000
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import re
+import subprocess
+import sys
+import time
+from typing import Dict, List, Optional, Sequence
+from urllib.parse import parse_qs
+
+import httpx
+
+from .core.config import settings
+from .core.sharding import HashRing
+
+
+SESSION_IN_PATH = re.compile(r"[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}")
+SOCKETIO_PATH = "/socket.io"
+ADMIN_PATH = "/admin"
+FANOUT_LISTS = {"/game/lobbies"}
+FANOUT_STATUS = {"/health", "/metrics"}
+# Hop-by-Hop Header (RFC 7230) & Header, die httpx selbst setzt
+HOP_HEADERS = {
+    b"connection", b"keep-alive", b"proxy-connection", b"transfer-encoding",
+    b"te", b"trailer", b"upgrade", b"host", b"content-length"
+}
+
+
+def session_id_from(path: str, query_string: bytes, body: bytes = b"",
+                    content_type: str = "") -> Optional[str]:
+    """
+    session_id eines Requests (Query, dann Pfad, dann JSON-Body)
+    """
+    if query_string:
+        query = parse_qs(query_string.decode("latin-1"))
+        for name in ("session_id", "sessionId", "owner"):
+            if query.get(name):
+                return query[name][0]
+        # OAuth Callback: state = "<session_id>.<signatur>" (geprüft wird im Worker)
+        state = query.get("state")
+        if state and "." in state[0]:
+            return state[0].rsplit(".", 1)[0] or None
+    match = SESSION_IN_PATH.search(path)
+    if match:
+        return match.group(0)
+    if body and content_type.startswith("application/json"):
+        try:
+            data = json.loads(body)
+        except ValueError:
+            return None
+        if isinstance(data, dict) and isinstance(data.get("session_id"), str):
+            return data["session_id"]
+    return None
+
+
+def admin_shard_from(query_string: bytes, shards: int) -> Optional[int]:
+    """
+    Ziel-Worker eines /admin Requests (`?shard=n`, bei einem Worker optional)
+    """
+    values = parse_qs(query_string.decode("latin-1")).get("shard")
+    if not values:
+        return 0 if shards == 1 else None
+    try:
+        shard = int(values[0])
+    except ValueError:
+        return None
+    return shard if 0 <= shard < shards else None
+
+
+class ShardRouter:
+    """
+    ASGI App vor den Worker-Prozessen (kein Spielzustand)
+    """
+
+    def __init__(self, upstreams: List[str], ring: Optional[HashRing] = None,
+                 client: Optional[httpx.AsyncClient] = None,
+                 timeout: float = settings.shard_proxy_timeout_s):
+        self.upstreams = [url.rstrip("/") for url in upstreams]
+        self.ring = ring or HashRing(len(self.upstreams), settings.shard_vnodes)
+        self.timeout = timeout
+        self._client = client
+        self._round_robin = itertools.count()
+        self.stats: Dict[str, int] = {
+            "routed": 0,  # Requests mit session_id
+            "round_robin": 0,  # Requests ohne session_id
+            "fanout": 0,  # Lobbies/Health/Metrics an alle Shards
+            "websockets": 0,
+            "upstream_errors": 0
+        }
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                limits=httpx.Limits(max_connections=None, max_keepalive_connections=256)
+            )
+        return self._client
+
+    def shard_for(self, session_id: Optional[str]) -> int:
+        if session_id is None:
+            self.stats["round_robin"] += 1
+            return next(self._round_robin) % len(self.upstreams)
+        self.stats["routed"] += 1
+        return self.ring.owner(session_id)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http":
+            await self._http(scope, receive, send)
+        elif scope["type"] == "websocket":
+            await self._websocket(scope, receive, send)
+        elif scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                if self._client is not None:
+                    await self._client.aclose()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    # --- HTTP ---
+
+    async def _http(self, scope, receive, send):
+        body = b""
+        while True:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                return
+            body += message.get("body", b"")
+            if not message.get("more_body"):
+                break
+
+        path = scope["path"]
+        if scope["method"] == "GET" and (path in FANOUT_LISTS or path in FANOUT_STATUS):
+            await self._fanout(scope, send)
+            return
+
+        headers = [(name, value) for name, value in scope["headers"] if name not in HOP_HEADERS]
+        content_type = next((value.decode("latin-1") for name, value in headers if name == b"content-type"), "")
+        if path.startswith(ADMIN_PATH):
+            # Profile & Diagnose gelten pro Worker - Ziel explizit wählen
+            shard = admin_shard_from(scope["query_string"], len(self.upstreams))
+            if shard is None:
+                await _send_json(send, 400, {"detail": f"?shard=0…{len(self.upstreams) - 1} erforderlich"})
+                return
+        else:
+            session_id = session_id_from(path, scope["query_string"], body, content_type)
+            if session_id is None and path.startswith(SOCKETIO_PATH):
+                await _send_json(send, 400, {"detail": "sessionId im Socket.IO Connect-Query erforderlich"})
+                return
+            shard = self.shard_for(session_id)
+        if scope.get("client"):
+            headers.append((b"x-forwarded-for", scope["client"][0].encode()))
+        request = self.client.build_request(
+            scope["method"], self._url(shard, scope), headers=headers, content=body
+        )
+        try:
+            response = await self.client.send(request, stream=True)
+        except httpx.TransportError as e:
+            self.stats["upstream_errors"] += 1
+            await _send_json(send, 502, {"detail": f"Shard {shard} nicht erreichbar: {e}"})
+            return
+
+        try:
+            response_headers = [
+                (name, value) for name, value in response.headers.raw
+                if name.lower() not in HOP_HEADERS or name.lower() == b"content-length"
+            ]
+            response_headers.append((b"x-shard", str(shard).encode()))
+            await send({"type": "http.response.start", "status": response.status_code,
+                        "headers": response_headers})
+            # Roh durchreichen (Kompression & Content-Length bleiben wie vom Worker)
+            async for chunk in response.aiter_raw():
+                await send({"type": "http.response.body", "body": chunk, "more_body": True})
+            await send({"type": "http.response.body", "body": b""})
+        finally:
+            await response.aclose()
+
+    def _url(self, shard: int, scope) -> str:
+        url = self.upstreams[shard] + scope["path"]
+        if scope["query_string"]:
+            url += "?" + scope["query_string"].decode("latin-1")
+        return url
+
+    async def _fanout(self, scope, send):
+        """
+        GET an alle Shards - Listen zusammenführen bzw. Antworten pro Shard
+        """
+        self.stats["fanout"] += 1
+        results = await asyncio.gather(*(
+            self.client.get(self._url(shard, scope)) for shard in range(len(self.upstreams))
+        ), return_exceptions=True)
+
+        if scope["path"] in FANOUT_LISTS:
+            merged = []
+            for result in results:
+                if isinstance(result, httpx.Response) and result.status_code == 200:
+                    merged.extend(result.json())
+                else:
+                    self.stats["upstream_errors"] += 1  # Lobbies eines Shards fehlen
+            await _send_json(send, 200, merged)
+            return
+
+        shards = []
+        healthy = True
+        for result in results:
+            if isinstance(result, httpx.Response):
+                healthy = healthy and result.status_code == 200
+                shards.append(result.json())
+            else:
+                healthy = False
+                shards.append({"status": "unreachable", "error": str(result)})
+        if scope["path"] == "/metrics":
+            await _send_json(send, 200, {"router": self.stats, "shards": shards})
+        else:
+            await _send_json(send, 200 if healthy else 503, {
+                "status": "healthy" if healthy else "degraded", "shards": shards
+            })
+
+    # --- WebSocket (Socket.IO) ---
+
+    async def _websocket(self, scope, receive, send):
+        import websockets
+
+        await receive()  # websocket.connect
+        session_id = session_id_from(scope["path"], scope["query_string"])
+        if session_id is None:
+            await send({"type": "websocket.close", "code": 1008})
+            return
+
+        shard = self.shard_for(session_id)
+        url = "ws" + self._url(shard, scope)[len("http"):]
+        try:
+            upstream = await websockets.connect(url, max_size=None, ping_interval=None)
+        except (OSError, websockets.WebSocketException):
+            self.stats["upstream_errors"] += 1
+            await send({"type": "websocket.close", "code": 1011})
+            return
+        await send({"type": "websocket.accept"})
+        self.stats["websockets"] += 1
+
+        async def client_to_upstream():
+            while True:
+                message = await receive()
+                if message["type"] == "websocket.disconnect":
+                    return
+                text = message.get("text")
+                try:
+                    await upstream.send(text if text is not None else message.get("bytes", b""))
+                except websockets.ConnectionClosed:
+                    return
+
+        async def upstream_to_client():
+            try:
+                async for data in upstream:
+                    if isinstance(data, str):
+                        await send({"type": "websocket.send", "text": data})
+                    else:
+                        await send({"type": "websocket.send", "bytes": data})
+            except websockets.ConnectionClosed:
+                pass
+            await send({"type": "websocket.close", "code": 1000})
+
+        tasks = [asyncio.ensure_future(client_to_upstream()), asyncio.ensure_future(upstream_to_client())]
+        try:
+            await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await upstream.close()
+
+
+async def _send_json(send, status: int, body) -> None:
+    payload = json.dumps(body).encode()
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(payload)).encode())]
+    })
+    await send({"type": "http.response.body", "body": payload})
+
+
+def spawn_worker(index: int, count: int, host: str = "127.0.0.1", base_port: int = settings.shard_base_port,
+                 app_path: str = "app.main:socket_app", factory: bool = False, log_level: str = "warning",
+                 extra_args: Sequence[str] = (), env: Optional[Dict[str, str]] = None) -> subprocess.Popen:
+    """
+    Einen Worker-Prozess starten (Shard `index` lauscht auf base_port + index)
+    """
+    backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    command = [sys.executable, "-m", "uvicorn", app_path, "--host", host,
+               "--port", str(base_port + index), "--log-level", log_level, *extra_args]
+    if factory:
+        command.append("--factory")
+    # Eigene Prozessgruppe: Strg+C trifft nur den Router, der die Worker einmal per SIGTERM beendet
+    # (ein zweites Signal würde uvicorn ohne Shutdown/Handoff abbrechen lassen)
+    return subprocess.Popen(command, cwd=backend_dir, start_new_session=True, env={
+        **os.environ, **(env or {}), "SHARD_COUNT": str(count), "SHARD_INDEX": str(index)
+    })
+
+
+def spawn_workers(count: int, **kwargs) -> List[subprocess.Popen]:
+    """
+    Worker-Prozesse starten (Shard i lauscht auf base_port + i)
+    """
+    return [spawn_worker(index, count, **kwargs) for index in range(count)]
+
+
+def wait_for_workers(upstreams: List[str], timeout: float = 30.0) -> None:
+    """
+    Blockiert, bis alle Worker auf /health antworten
+    """
+    deadline = time.monotonic() + timeout
+    with httpx.Client() as http:
+        for url in upstreams:
+            while True:
+                try:
+                    http.get(f"{url}/health")
+                    break
+                except httpx.TransportError:
+                    if time.monotonic() > deadline:
+                        raise RuntimeError(f"Worker unter {url} nicht erreichbar")
+                    time.sleep(0.1)
+
+
+def stop_workers(workers: List[subprocess.Popen]) -> None:
+    for worker in workers:
+        worker.terminate()
+    for worker in workers:
+        try:
+            worker.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            worker.kill()
+
+
+def main():
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Sessions auf mehrere Worker-Prozesse verteilen")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--base-port", type=int, default=settings.shard_base_port)
+    parser.add_argument("--app", default="app.main:socket_app", help="ASGI App der Worker")
+    parser.add_argument("--factory", action="store_true", help="--app ist eine Factory")
+    args = parser.parse_args()
+
+    upstreams = [f"http://127.0.0.1:{args.base_port + idx}" for idx in range(args.workers)]
+    workers = spawn_workers(args.workers, base_port=args.base_port, app_path=args.app, factory=args.factory)
+    try:
+        wait_for_workers(upstreams)
+        print(f"🧩 {args.workers} Shards bereit ({args.base_port}-{args.base_port + args.workers - 1}), "
+              f"Router auf Port {args.port}")
+        uvicorn.run(ShardRouter(upstreams), host=args.host, port=args.port, log_level="warning")
+    finally:
+        stop_workers(workers)
+
+
+if __name__ == "__main__":
+    main()
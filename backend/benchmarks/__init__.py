@@ -0,0 +1,3 @@
+"""
+Benchmarks & Lastsimulationen (offline, ohne Spotify)
+"""
@@ -0,0 +1,278 @@
+"""
+Gemeinsame Helfer für Benchmarks
+Synthetische Playlists, lokaler Server, Preview-Origin, Perzentile
+"""
+import asyncio
+import logging
+import random
+import socket
+import sys
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Sequence
+
+from app.models.game import SpotifyTrack, PlaylistInfo
+
+
+WORDS = [
+    "Love", "Night", "Dance", "Heart", "Fire", "Summer", "Dream", "Light",
+    "Rain", "Road", "Girl", "Boy", "Time", "Star", "Blue", "Gold",
+    "Wild", "Forever", "Tonight", "Radio", "Money", "City", "River", "Moon"
+]
+FIRST_NAMES = [
+    "Anna", "Ben", "Clara", "David", "Elena", "Felix", "Greta", "Hugo",
+    "Ida", "Jonas", "Karla", "Leon", "Mia", "Noah", "Olga", "Paul"
+]
+LAST_NAMES = [
+    "Berg", "Falk", "Hahn", "Kraus", "Lang", "Meyer", "Neumann", "Roth",
+    "Schulz", "Vogel", "Weber", "Winter", "Young", "Ziegler"
+]
+
+
+def make_tracks(count: int, seed: int = 0, prefix: str = "syn") -> List[SpotifyTrack]:
+    """
+    Erzeuge reproduzierbare, synthetische Tracks (Jahre 1955-2024)
+    Titel + Künstler sind pro Aufruf eindeutig (sonst filtert der Deck Builder sie)
+    """
+    rng = random.Random(seed)
+    tracks = []
+    seen = set()
+    for idx in range(count):
+        year = rng.randint(1955, 2024)
+        title = " ".join(rng.sample(WORDS, rng.randint(1, 3)))
+        artist = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+        if (title, artist) in seen:
+            title = f"{title} {idx}"
+        seen.add((title, artist))
+        track_id = f"{prefix}{seed}x{idx:06d}"
+        tracks.append(SpotifyTrack(
+            track_id=track_id,
+            title=title,
+            artist=artist,
+            album=f"{title} (Album)",
+            release_date=f"{year}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+            decade=f"{(year // 10) * 10}er",
+            duration_ms=rng.randint(120_000, 330_000),
+            preview_url=None,
+            uri=f"spotify:track:{track_id}"
+        ))
+    return tracks
+
+
+def make_playlist(playlist_id: str, count: int, seed: int = 0) -> PlaylistInfo:
+    """
+    Erzeuge eine synthetische Playlist
+    """
+    tracks = make_tracks(count, seed=seed, prefix=playlist_id)
+    return PlaylistInfo(
+        playlist_id=playlist_id,
+        name=f"Synthetic {playlist_id}",
+        owner="benchmark",
+        total_tracks=len(tracks),
+        tracks=tracks
+    )
+
+
+def to_api_track(track: SpotifyTrack) -> Dict:
+    """
+    SpotifyTrack zurück ins Format der Spotify Web API (für Replay-Fixtures)
+    """
+    return {
+        "id": track.track_id,
+        "name": track.title,
+        "artists": [{"name": name} for name in track.artist.split(", ")],
+        "album": {"name": track.album, "release_date": track.release_date},
+        "duration_ms": track.duration_ms,
+        "preview_url": track.preview_url,
+        "uri": track.uri
+    }
+
+
+class SyntheticSpotify:
+    """
+    Ersatz für SpotifyService: liefert synthetische Playlists
+    """
+
+    def __init__(self, playlist_size: int, seed: int):
+        self.playlist_size = playlist_size
+        self.seed = seed
+        self._cache = {}
+
+    def get_playlist_tracks(self, playlist_id: str, owner: Optional[str] = None):
+        if playlist_id not in self._cache:
+            index = sum(ord(ch) for ch in playlist_id)
+            self._cache[playlist_id] = make_playlist(
+                playlist_id, self.playlist_size, seed=self.seed * 1000 + index
+            )
+        return self._cache[playlist_id]
+
+    def open_playlist_stream(self, playlist_id: str, owner: Optional[str] = None, page_size: int = 100):
+        from app.services.spotify_service import PlaylistStream
+
+        playlist = self.get_playlist_tracks(playlist_id)
+        tracks = playlist.tracks
+
+        def pages():
+            for offset in range(page_size, len(tracks), page_size):
+                yield tracks[offset:offset + page_size]
+
+        first = tracks[:page_size]
+        return PlaylistStream(
+            info=playlist.model_copy(update={"tracks": first, "total_tracks": len(first)}),
+            expected_total=len(tracks),
+            pages=pages()
+        )
+
+    def shuffle_tracks(self, tracks: List[SpotifyTrack]) -> List[SpotifyTrack]:
+        shuffled = tracks.copy()
+        random.shuffle(shuffled)
+        return shuffled
+
+    def release_client(self, owner: str):
+        pass
+
+
+@contextmanager
+def synthetic_spotify(playlist_size: int, seed: int):
+    """
+    Ersetze spotify_service im GameService-Modul für die Dauer der Simulation
+    """
+    from app.services.game_service import GameService
+
+    # Modul statt Singleton (app.services exportiert die Instanz unter gleichem Namen)
+    game_service_module = sys.modules[GameService.__module__]
+    original = game_service_module.spotify_service
+    synthetic = SyntheticSpotify(playlist_size, seed)
+    game_service_module.spotify_service = synthetic
+    try:
+        yield synthetic
+    finally:
+        game_service_module.spotify_service = original
+
+
+def percentile(values: Sequence[float], pct: float) -> float:
+    """
+    Perzentil (Nearest-Rank) - 0.0 bei leerer Liste
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(int(round(pct / 100.0 * len(ordered) + 0.5)) - 1, 0)
+    return ordered[min(rank, len(ordered) - 1)]
+
+
+def summarize_ms(samples: Sequence[float]) -> Dict[str, float]:
+    """
+    Latenz-Zusammenfassung in Millisekunden (Eingabe in Sekunden)
+    """
+    return {
+        "count": len(samples),
+        "p50_ms": round(percentile(samples, 50) * 1000, 3),
+        "p95_ms": round(percentile(samples, 95) * 1000, 3),
+        "p99_ms": round(percentile(samples, 99) * 1000, 3),
+        "max_ms": round(max(samples) * 1000, 3) if samples else 0.0
+    }
+
+
+def quiet_socketio_logs() -> None:
+    """
+    Socket.IO/Engine.IO loggen im Debug-Modus jedes Paket - für Messungen abschalten
+    """
+    for name in ("socketio", "socketio.server", "engineio", "engineio.server"):
+        logging.getLogger(name).setLevel(logging.WARNING)
+
+
+def free_port() -> int:
+    """
+    Freier lokaler TCP-Port
+    """
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@asynccontextmanager
+async def running_server(port: int):
+    """
+    Starte app.main:socket_app im selben Prozess (für In-Process-Messungen)
+    """
+    import uvicorn
+    from app.main import socket_app
+
+    config = uvicorn.Config(socket_app, host="127.0.0.1", port=port, log_level="warning")
+    server = uvicorn.Server(config)
+    task = asyncio.create_task(server.serve())
+    while not server.started:
+        if task.done():
+            task.result()
+        await asyncio.sleep(0.01)
+    try:
+        yield f"http://127.0.0.1:{port}"
+    finally:
+        server.should_exit = True
+        await task
+
+
+class PreviewOrigin:
+    """
+    Lokaler Ersatz für das Spotify Preview-CDN: `/clip/<name>.mp3` liefert
+    reproduzierbare Zufallsbytes (pro Name immer dieselben)
+    """
+
+    def __init__(self, base_url: str, clip_bytes: int, latency_ms: float):
+        self.base_url = base_url
+        self.clip_bytes = clip_bytes
+        self.latency_ms = latency_ms
+        self.requests = 0
+        self._clips: Dict[str, bytes] = {}
+        self._lock = threading.Lock()
+
+    def url(self, name: str) -> str:
+        return f"{self.base_url}/clip/{name}.mp3"
+
+    def clip(self, name: str) -> bytes:
+        with self._lock:
+            if name not in self._clips:
+                self._clips[name] = random.Random(name).randbytes(self.clip_bytes)
+            return self._clips[name]
+
+
+class _OriginHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        origin: PreviewOrigin = self.server.origin
+        with origin._lock:
+            origin.requests += 1
+        if origin.latency_ms:
+            time.sleep(origin.latency_ms / 1000.0)
+        if not (self.path.startswith("/clip/") and self.path.endswith(".mp3")):
+            self.send_error(404)
+            return
+        body = origin.clip(self.path[len("/clip/"):-len(".mp3")])
+        self.send_response(200)
+        self.send_header("Content-Type", "audio/mpeg")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@contextmanager
+def preview_origin(clip_bytes: int = 300_000, latency_ms: float = 0.0):
+    """
+    Starte einen Preview-Origin in einem Hintergrund-Thread
+    """
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _OriginHandler)
+    server.daemon_threads = True
+    origin = PreviewOrigin(f"http://127.0.0.1:{server.server_address[1]}", clip_bytes, latency_ms)
+    server.origin = origin
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield origin
+    finally:
+        server.shutdown()
+        server.server_close()
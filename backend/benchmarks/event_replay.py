@@ -0,0 +1,179 @@
+"""
+Event Log: Schreib-Overhead & Replay-Durchsatz
+
+Spielt Spiele mit Event Log und baut danach alle Sessions aus dem Log
+wieder auf. Gemessen wird auf einem Kern im Hauptprozess:
+
+- append:  Zeit in GameService._log pro Event-Typ (Payload bauen + schreiben + Snapshots)
+- replay:  alle Sessions aus Snapshot + Log-Rest (inkl. Deck-JSON) - durch das
+           Deck-JSON begrenzt (MB/s), deutlich unter 1 Mio Events/s
+- hot:     nur die häufigen Binär-Events (Guess, Platzierung, Zug/Track-Wechsel) -
+           nur hier gilt das Ziel von ≥1 Mio Events/s
+- restore: Replay-Zustand -> Pydantic-Models im GameService
+
+Start (im backend/ Ordner):
+    python -m benchmarks.event_replay
+    python -m benchmarks.event_replay --games 1000 --players 4 --snapshot-every 200 --out replay.json
+"""
+import argparse
+import gc
+import json
+import os
+import random
+import tempfile
+import time
+from contextlib import redirect_stdout
+from typing import Dict, List
+
+from app.models.game import GameMode
+from app.services.event_log import HEADER, EventLog, EventType, list_segments
+from app.services.game_service import GameService
+from app.services.search_index import track_search
+from app.services.snapshot import SessionState, apply_events, replay_session, restore
+
+from .common import synthetic_spotify
+from .simulate_games import Timer, play_game
+
+
+HOT_EVENTS = {EventType.GUESS, EventType.CARD_PLACED, EventType.TRACK_ADVANCED, EventType.TURN_ADVANCED}
+
+
+class _TimedGameService(GameService):
+    """GameService, der die Zeit im Event Log pro Event-Typ mitschreibt"""
+
+    def __init__(self, event_log: EventLog):
+        super().__init__(event_log=event_log)
+        self.log_samples: Dict[EventType, List[float]] = {}
+
+    def _log(self, session_id, event, payload=bytes):
+        started = time.perf_counter()
+        super()._log(session_id, event, payload)
+        self.log_samples.setdefault(event, []).append(time.perf_counter() - started)
+
+
+def _play(log: EventLog, games: int, players: int, playlist_size: int, seed: int):
+    gc.collect()
+    service = _TimedGameService(log)
+    rng = random.Random(seed)
+    random.seed(seed)
+    modes = list(GameMode)
+    stats = {"games": 0, "rounds": 0, "guesses": 0, "correct_titles": 0, "placements": 0,
+             "correct_placements": 0, "wins": {mode.value: 0 for mode in modes}}
+    started = time.perf_counter()
+    with synthetic_spotify(playlist_size, seed), open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+        session_ids = [
+            play_game(service, rng, Timer(), modes[idx % len(modes)], players,
+                      f"synthetic-{idx % 8}", 500, stats, delete=False)
+            for idx in range(games)
+        ]
+    # Autocomplete-Index ist global - sonst wächst der Heap von Lauf zu Lauf
+    for session_id in session_ids:
+        track_search.drop_session(session_id)
+    return session_ids, service.log_samples
+
+
+def _hot_split(buffer) -> int:
+    """Offset des ersten häufigen Events (davor: Session, Beitritte, Deck, Start)"""
+    offset = 0
+    while offset + HEADER.size <= len(buffer):
+        event, length = HEADER.unpack_from(buffer, offset)
+        if event in HOT_EVENTS:
+            return offset
+        offset += HEADER.size + length
+    return offset
+
+
+def measure(games: int, players: int, playlist_size: int, snapshot_every: int,
+            segment_kb: int, seed: int) -> Dict:
+    with tempfile.TemporaryDirectory() as directory:
+        log = EventLog(directory, segment_bytes=segment_kb * 1024, snapshot_every=snapshot_every)
+        session_ids, log_samples = _play(log, games, players, playlist_size, seed)
+        log.close_all()
+        events = log.stats["events"]
+        gc.collect()
+
+        # Ganze Sessions: Snapshot + Log-Rest
+        started = time.perf_counter()
+        states = [replay_session(log.session_dir(session_id)) for session_id in session_ids]
+        replay_s = time.perf_counter() - started
+        replayed = sum(state.events for state in states)
+
+        # Models bauen
+        target = GameService(event_log=EventLog(""))
+        with open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+            started = time.perf_counter()
+            for state in states:
+                restore(target, state)
+            restore_s = time.perf_counter() - started
+        for session_id in session_ids:
+            track_search.drop_session(session_id)
+
+        # Nur häufige Events (Vorspann vorher angewendet, nicht mitgemessen)
+        hot_events = 0
+        hot_s = 0.0
+        for session_id in session_ids:
+            buffer = b"".join(open(path, "rb").read() for _, path in list_segments(log.session_dir(session_id)))
+            split = _hot_split(buffer)
+            state = SessionState()
+            apply_events(state, buffer[:split])
+            before = state.events
+            started = time.perf_counter()
+            apply_events(state, buffer, split)
+            hot_s += time.perf_counter() - started
+            hot_events += state.events - before
+
+    return {
+        "config": {"games": games, "players": players, "playlist_size": playlist_size,
+                   "snapshot_every": snapshot_every, "segment_kb": segment_kb, "seed": seed},
+        "events": events,
+        "log_mb": round(log.stats["bytes"] / 2**20, 2),
+        "snapshots": log.stats["snapshots"],
+        "append_us": {
+            event.name: round(sum(samples) / len(samples) * 1e6, 2)
+            for event, samples in sorted(log_samples.items())
+        },
+        "replay": {
+            "events": replayed,
+            "seconds": round(replay_s, 4),
+            "events_per_s": round(replayed / replay_s) if replay_s else 0,
+            "mb_per_s": round(log.stats["bytes"] / 2**20 / replay_s, 1) if replay_s else 0.0
+        },
+        "hot": {
+            "events": hot_events,
+            "events_per_s": round(hot_events / hot_s) if hot_s else 0
+        },
+        "restore_ms_per_session": round(restore_s * 1000 / len(states), 3) if states else 0.0
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Event Log: Schreib-Overhead & Replay-Durchsatz")
+    parser.add_argument("--games", type=int, default=500)
+    parser.add_argument("--players", type=int, default=4)
+    parser.add_argument("--playlist-size", type=int, default=200)
+    parser.add_argument("--snapshot-every", type=int, default=200)
+    parser.add_argument("--segment-kb", type=int, default=1024)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--out", help="Ergebnisse als JSON speichern")
+    args = parser.parse_args()
+
+    result = measure(args.games, args.players, args.playlist_size,
+                     args.snapshot_every, args.segment_kb, args.seed)
+
+    replay = result["replay"]
+    print("\n📼 Event Log Replay")
+    print(f"   Events:        {result['events']} ({result['log_mb']} MB, {result['snapshots']} Snapshots)")
+    print("   Append (µs/Event):")
+    for name, micros in result["append_us"].items():
+        print(f"      {name:16s} {micros:8.2f}")
+    print(f"   Replay:        {replay['events_per_s']:,} Events/s ({replay['mb_per_s']} MB/s, inkl. Deck-JSON)")
+    print(f"   Häufige Events: {result['hot']['events_per_s']:,} Events/s")
+    print(f"   Restore:       {result['restore_ms_per_session']} ms/Session")
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(result, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,190 @@
+"""
+Handoff: Dauer eines Neustarts mit laufenden Spielen
+
+In-Process (Standard): N Sessions mitten im Spiel erzeugen, dann
+- write:   alle Sessions -> Handoff-Datei (wie im Shutdown, inkl. fsync)
+- restore: Datei -> neuer GameService (wie beim Start)
+
+Mit --e2e zusätzlich echte Prozesse: Server A lädt die Datei, bekommt
+SIGTERM (Drain + Schreiben), Server B startet und übernimmt. Gemessen wird
+SIGTERM bis A beendet und Start von B bis /health antwortet.
+
+Start (im backend/ Ordner):
+    python -m benchmarks.handoff_restart --sessions 5000
+    python -m benchmarks.handoff_restart --sessions 5000 --e2e --out handoff.json
+"""
+import argparse
+import gc
+import json
+import os
+import random
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+from typing import Dict
+
+import httpx
+
+from app.models.game import GameMode
+from app.services.game_service import GameService
+from app.services.handoff import Handoff
+from app.services.search_index import track_search
+
+from .common import free_port, synthetic_spotify
+from .simulate_games import Timer, play_game
+
+
+def _populate(sessions: int, players: int, playlist_size: int, seed: int) -> GameService:
+    """
+    Sessions mitten im Spiel (0-20 Züge gespielt, einige noch in der Lobby)
+    """
+    service = GameService()
+    rng = random.Random(seed)
+    random.seed(seed)
+    modes = list(GameMode)
+    stats = {"games": 0, "rounds": 0, "guesses": 0, "correct_titles": 0, "placements": 0,
+             "correct_placements": 0, "wins": {mode.value: 0 for mode in modes}}
+    with synthetic_spotify(playlist_size, seed), open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+        for idx in range(sessions):
+            if idx % 10 == 0:
+                service.create_session(f"Lobby {idx}", turn_time_limit=0)
+                continue
+            play_game(service, rng, Timer(), modes[idx % len(modes)], players,
+                      f"venue-{idx % 50}", rng.randint(0, 20), stats, delete=False)
+    return service
+
+
+def _drop(service: GameService) -> None:
+    # Autocomplete-Index ist global
+    for session_id in list(service.sessions):
+        track_search.drop_session(session_id)
+
+
+def _wait_health(url: str, process: subprocess.Popen, timeout: float = 120.0) -> None:
+    deadline = time.monotonic() + timeout
+    with httpx.Client() as http:
+        while time.monotonic() < deadline:
+            if process.poll() is not None:
+                raise RuntimeError("Server beendet sich beim Start")
+            try:
+                if http.get(f"{url}/health").status_code == 200:
+                    return
+            except httpx.TransportError:
+                pass
+            time.sleep(0.02)
+    raise RuntimeError(f"Server unter {url} nicht erreichbar")
+
+
+def _start_server(port: int, path: str) -> subprocess.Popen:
+    backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:socket_app",
+         "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning"],
+        cwd=backend_dir,
+        env={**os.environ, "HANDOFF_PATH": path, "EVENT_LOG_DIR": "", "TRACK_STATS_PATH": ""},
+        stdout=subprocess.DEVNULL
+    )
+
+
+def _e2e(path: str) -> Dict:
+    """
+    A übernimmt die Datei, SIGTERM an A, B übernimmt von A
+    """
+    port = free_port()
+    url = f"http://127.0.0.1:{port}"
+    first = _start_server(port, path)
+    try:
+        _wait_health(url, first)
+        sessions = httpx.get(f"{url}/metrics").json()["handoff"].get("restored_sessions", 0)
+    except BaseException:
+        first.kill()
+        raise
+
+    started = time.perf_counter()
+    first.send_signal(signal.SIGTERM)
+    first.wait(timeout=120)
+    stop_s = time.perf_counter() - started
+
+    second = _start_server(port, path)
+    try:
+        started = time.perf_counter()
+        _wait_health(url, second)
+        start_s = time.perf_counter() - started
+        metrics = httpx.get(f"{url}/metrics").json()["handoff"]
+    finally:
+        second.terminate()
+        second.wait(timeout=120)
+    return {
+        "sessions": sessions,
+        "restored_sessions": metrics.get("restored_sessions", 0),
+        "stop_s": round(stop_s, 3),
+        "start_s": round(start_s, 3),
+        "total_s": round(stop_s + start_s, 3),
+        "server_restore_ms": metrics.get("restore_ms")
+    }
+
+
+def measure(sessions: int, players: int, playlist_size: int, seed: int, e2e: bool) -> Dict:
+    service = _populate(sessions, players, playlist_size, seed)
+    gc.collect()
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "handoff.bin")
+        with open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+            write = Handoff(path).write(service)
+        _drop(service)
+        del service
+        gc.collect()
+
+        with open(path, "rb") as f:
+            data = f.read()
+        target = GameService()
+        started = time.perf_counter()
+        restored = Handoff(path).restore(target)
+        restore_s = time.perf_counter() - started
+        _drop(target)
+
+        result = {
+            "config": {"sessions": sessions, "players": players, "playlist_size": playlist_size, "seed": seed},
+            "file_mb": round(write["bytes"] / 2**20, 2),
+            "write_ms": write["write_ms"],
+            "restore_ms": round(restore_s * 1000, 1),
+            "restored": len(restored)
+        }
+        if e2e:
+            with open(path, "wb") as f:
+                f.write(data)  # restore() hat die Datei verbraucht
+            result["e2e"] = _e2e(path)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Handoff: Dauer eines Neustarts mit laufenden Spielen")
+    parser.add_argument("--sessions", type=int, default=5000)
+    parser.add_argument("--players", type=int, default=4)
+    parser.add_argument("--playlist-size", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--e2e", action="store_true", help="Zusätzlich mit echten Server-Prozessen messen")
+    parser.add_argument("--out", help="Ergebnisse als JSON speichern")
+    args = parser.parse_args()
+
+    result = measure(args.sessions, args.players, args.playlist_size, args.seed, args.e2e)
+
+    print(f"\n🔁 Handoff ({result['restored']} Sessions)")
+    print(f"   Datei:    {result['file_mb']} MB")
+    print(f"   Schreiben: {result['write_ms']} ms")
+    print(f"   Laden:    {result['restore_ms']} ms")
+    if "e2e" in result:
+        e2e = result["e2e"]
+        print(f"   Prozesse: SIGTERM→Ende {e2e['stop_s']} s, Start→/health {e2e['start_s']} s "
+              f"(gesamt {e2e['total_s']} s, {e2e['restored_sessions']} Sessions übernommen)")
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(result, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
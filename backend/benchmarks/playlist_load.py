@@ -0,0 +1,174 @@
+"""
+Playlist-Ladezeit gegen aufgenommene Spotify-Antworten (Record/Replay)
+
+Läuft komplett offline: `SpotifyService.open_playlist_stream` spricht über
+eine ReplaySession mit Fixtures statt mit Spotify. Latenz, Jitter und
+429-Antworten werden injiziert, damit das Verhalten unter realistischen
+Netzbedingungen messbar ist. Gemessen wird die Zeit bis zur ersten Page
+(ab hier kann ein Spiel im Streaming-Modus starten) und bis zur kompletten
+Playlist.
+
+Start (im backend/ Ordner):
+    python -m benchmarks.playlist_load --playlist-size 500 --latency-ms 80 --jitter-ms 40
+    python -m benchmarks.playlist_load --fixtures fixtures/spotify.json.gz --playlist 37i9dQZF1DXcBWIGoYBM5M
+    SPOTIFY_TRANSPORT=record python -m benchmarks.playlist_load --record 37i9dQZF1DXcBWIGoYBM5M
+
+Alle Requests laufen durch den Spotify Scheduler (Rate-Limit, Retry-After).
+Ohne --fixtures werden synthetische Playlists im Spotify-Format erzeugt
+(Seiten à 100 Tracks, wie die echte API).
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+from typing import Dict, List
+
+from spotipy.exceptions import SpotifyException
+
+from app.core.config import settings
+from app.services.spotify_scheduler import SpotifyScheduler
+from app.services.spotify_service import SpotifyService
+from app.services.spotify_transport import FixtureStore, ReplaySession, synthesize_playlist
+
+from .common import make_tracks, summarize_ms, to_api_track
+
+
+def build_synthetic_fixtures(path: str, playlists: int, playlist_size: int, seed: int) -> List[str]:
+    """
+    Synthetische Playlists als Fixture-Datei anlegen
+    Returns: Playlist IDs
+    """
+    store = FixtureStore(path)
+    playlist_ids = []
+    for idx in range(playlists):
+        playlist_id = f"replay{idx}"
+        tracks = make_tracks(playlist_size, seed=seed * 1000 + idx, prefix=playlist_id)
+        synthesize_playlist(store, playlist_id, f"Replay {idx}", [to_api_track(t) for t in tracks])
+        playlist_ids.append(playlist_id)
+    store.save()
+    return playlist_ids
+
+
+def replay_service(session: ReplaySession, scheduler: SpotifyScheduler) -> SpotifyService:
+    service = SpotifyService()
+    service.set_transport(session)
+    service.scheduler = scheduler
+    return service
+
+
+def measure(fixture_path: str, playlist_ids: List[str], loads: int, latency_ms: float,
+            jitter_ms: float, error_rate: float, seed: int, rate: float) -> Dict:
+    """
+    Lade jede Playlist `loads` mal mit frischem Client (kalter Token-Cache)
+    """
+    session = ReplaySession(
+        FixtureStore(fixture_path),
+        latency_ms=latency_ms,
+        jitter_ms=jitter_ms,
+        error_rate=error_rate,
+        seed=seed
+    )
+    scheduler = SpotifyScheduler(
+        rate=rate,
+        burst=settings.spotify_request_burst,
+        max_retries=settings.spotify_max_retries
+    )
+    first_pages = []
+    durations = []
+    failures = 0
+    tracks_loaded = 0
+    for _ in range(loads):
+        for playlist_id in playlist_ids:
+            service = replay_service(session, scheduler)
+            service.pool.get(None)
+            service.pool.maintain()  # Token vorab holen (wie der Refresh-Thread im Server)
+            started = time.perf_counter()
+            try:
+                stream = service.open_playlist_stream(playlist_id)
+                first_page = time.perf_counter() - started
+                count = len(stream.info.tracks) + sum(len(page) for page in stream.pages)
+            except SpotifyException:
+                failures += 1
+                continue
+            first_pages.append(first_page)
+            durations.append(time.perf_counter() - started)
+            tracks_loaded += count
+
+    return {
+        "first_page": summarize_ms(first_pages),
+        "load": summarize_ms(durations),
+        "failures": failures,
+        "requests": session.calls,
+        "rate_limited": session.rate_limited,
+        "tracks_per_load": round(tracks_loaded / len(durations), 1) if durations else 0,
+        "scheduler": scheduler.snapshot()
+    }
+
+
+def record(playlist_ids: List[str]) -> None:
+    """
+    Playlists einmalig live laden (SPOTIFY_TRANSPORT=record schreibt die Fixtures)
+    """
+    service = SpotifyService()
+    try:
+        for playlist_id in playlist_ids:
+            playlist = service.get_playlist_tracks(playlist_id)
+            print(f"🎙️  {playlist.name}: {playlist.total_tracks} Tracks aufgenommen")
+    finally:
+        service.requests_session.close()  # RecordingSession: Fixtures speichern
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Playlist-Ladezeit (Replay)")
+    parser.add_argument("--fixtures", help="Aufgenommene Fixture-Datei statt synthetischer Playlists")
+    parser.add_argument("--playlist", action="append", help="Playlist ID (mehrfach möglich)")
+    parser.add_argument("--record", nargs="+", metavar="PLAYLIST_ID",
+                        help="Playlists live laden & aufnehmen (SPOTIFY_TRANSPORT=record)")
+    parser.add_argument("--playlists", type=int, default=4, help="Anzahl synthetischer Playlists")
+    parser.add_argument("--playlist-size", type=int, default=500)
+    parser.add_argument("--loads", type=int, default=5, help="Ladevorgänge pro Playlist")
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Anteil 429-Antworten")
+    parser.add_argument("--rate", type=float, default=settings.spotify_requests_per_second,
+                        help="Requests/s des Spotify Schedulers")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--out", help="Ergebnisse als JSON speichern")
+    args = parser.parse_args()
+
+    if args.record:
+        record(args.record)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.fixtures:
+            fixture_path = args.fixtures
+            playlist_ids = args.playlist or []
+            if not playlist_ids:
+                parser.error("--playlist ist bei --fixtures erforderlich")
+        else:
+            fixture_path = os.path.join(tmp, "spotify.json.gz")
+            playlist_ids = build_synthetic_fixtures(fixture_path, args.playlists, args.playlist_size, args.seed)
+
+        result = measure(fixture_path, playlist_ids, args.loads, args.latency_ms,
+                         args.jitter_ms, args.error_rate, args.seed, args.rate)
+
+    result["config"] = vars(args)
+    load = result["load"]
+    print("\n📼 Playlist-Ladezeit (Replay)")
+    print(f"   Latenz/Jitter:  {args.latency_ms} / {args.jitter_ms} ms, 429-Rate {args.error_rate}")
+    print(f"   Tracks/Load:    {result['tracks_per_load']}")
+    print(f"   Erste Page:     {result['first_page']['p50_ms']} / {result['first_page']['p99_ms']} ms (p50/p99, Spielstart)")
+    print(f"   Load p50/p99:   {load['p50_ms']} / {load['p99_ms']} ms")
+    print(f"   Requests:       {result['requests']} ({result['rate_limited']} × 429)")
+    print(f"   Fehlgeschlagen: {result['failures']}")
+    print(f"   Scheduler:      {args.rate} req/s, {result['scheduler']['retries']} Retries")
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(result, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
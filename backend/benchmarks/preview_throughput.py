@@ -0,0 +1,198 @@
+"""
+Preview-Audio Durchsatz: /media/preview unter gleichzeitigen Zuhörern
+
+Ein lokaler Preview-Origin ersetzt das Spotify CDN. Der Server (uvicorn,
+echter Socket) läuft im Hauptprozess, die Zuhörer in eigenen Prozessen -
+so misst getrusage im Hauptprozess nur die Server-CPU.
+
+Ablauf:
+1. Kalt: jeder Clip einmal abgerufen (Download vom Origin, danach Disk-Cache)
+2. Warm: pro Stufe N Zuhörer für --duration Sekunden. Jeder Zuhörer spielt
+   Clips wie ein Browser-Audio-Element: `Range: bytes=0-` komplett lesen,
+   dann einmal spulen (Range-Request über 64 KiB)
+
+Start (im backend/ Ordner):
+    python -m benchmarks.preview_throughput
+    python -m benchmarks.preview_throughput --listeners 1 10 50 100 --duration 5 --clip-kb 350
+    python -m benchmarks.preview_throughput --origin-latency-ms 80 --out preview.json
+"""
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import random
+import resource
+import tempfile
+import time
+from typing import Dict, List
+
+from .common import free_port, make_tracks, preview_origin, quiet_socketio_logs, running_server, summarize_ms
+
+
+SEEK_BYTES = 64 * 1024
+
+
+async def _listen(base_url: str, urls: List[str], clip_bytes: int, deadline: float, seed: int) -> Dict:
+    import aiohttp
+
+    rng = random.Random(seed)
+    latencies = []
+    transferred = 0
+    requests = 0
+    errors = 0
+    async with aiohttp.ClientSession(base_url) as http:
+        while time.perf_counter() < deadline:
+            url = rng.choice(urls)
+            seek = rng.randrange(0, max(clip_bytes - SEEK_BYTES, 1))
+            for byte_range in ("bytes=0-", f"bytes={seek}-{seek + SEEK_BYTES - 1}"):
+                started = time.perf_counter()
+                async with http.get(url, headers={"Range": byte_range}) as response:
+                    body = await response.read()
+                    if response.status not in (200, 206):
+                        errors += 1
+                latencies.append(time.perf_counter() - started)
+                transferred += len(body)
+                requests += 1
+    return {"latencies": latencies, "bytes": transferred, "requests": requests, "errors": errors}
+
+
+def _client_process(args) -> Dict:
+    """Mehrere Zuhörer in einem Prozess (eigener Event-Loop)"""
+    base_url, urls, clip_bytes, listeners, duration, seed = args
+
+    async def run():
+        deadline = time.perf_counter() + duration
+        results = await asyncio.gather(*(
+            _listen(base_url, urls, clip_bytes, deadline, seed * 1000 + idx) for idx in range(listeners)
+        ))
+        merged = {"latencies": [], "bytes": 0, "requests": 0, "errors": 0}
+        for result in results:
+            merged["latencies"].extend(result["latencies"])
+            for key in ("bytes", "requests", "errors"):
+                merged[key] += result[key]
+        return merged
+
+    return asyncio.run(run())
+
+
+def _run_listeners(base_url: str, urls: List[str], clip_bytes: int, listeners: int,
+                   duration: float, processes: int, seed: int) -> List[Dict]:
+    processes = max(1, min(processes, listeners))
+    shares = [listeners // processes + (1 if idx < listeners % processes else 0) for idx in range(processes)]
+    context = multiprocessing.get_context("spawn")
+    with context.Pool(processes) as pool:
+        return pool.map(_client_process, [
+            (base_url, urls, clip_bytes, share, duration, seed + idx) for idx, share in enumerate(shares)
+        ])
+
+
+def _cpu_seconds() -> float:
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    return usage.ru_utime + usage.ru_stime
+
+
+async def measure(listener_levels: List[int], duration: float, clips: int, clip_bytes: int,
+                  origin_latency_ms: float, processes: int, seed: int) -> Dict:
+    import aiohttp
+    from app.services.game_service import game_service
+    from app.services.preview_cache import preview_cache
+
+    results: Dict = {"levels": []}
+    with tempfile.TemporaryDirectory() as cache_dir, preview_origin(clip_bytes, origin_latency_ms) as origin:
+        # Singleton vor dem ersten Zugriff auf ein leeres Verzeichnis umbiegen
+        preview_cache.directory = cache_dir
+        preview_cache.max_bytes = max(preview_cache.max_bytes, clips * clip_bytes * 2)
+
+        session = game_service.create_session("Bench Host", turn_time_limit=0)
+        tracks = [
+            track.model_copy(update={"preview_url": origin.url(track.track_id)})
+            for track in make_tracks(clips, seed=seed, prefix="preview")
+        ]
+        game_service.set_deck(session.session_id, "preview-bench", tracks)
+        urls = [f"/media/preview/{track.track_id}?session_id={session.session_id}" for track in tracks]
+
+        async with running_server(free_port()) as base_url:
+            # 1. Kalt: alle Clips parallel einmal anfordern
+            cold = []
+            async with aiohttp.ClientSession(base_url) as http:
+                async def first(url):
+                    started = time.perf_counter()
+                    async with http.get(url) as response:
+                        await response.read()
+                    cold.append(time.perf_counter() - started)
+                await asyncio.gather(*(first(url) for url in urls))
+            results["cold"] = {**summarize_ms(cold), "origin_requests": origin.requests}
+
+            # 2. Warm: Stufen mit steigender Zuhörerzahl
+            loop = asyncio.get_running_loop()
+            for listeners in listener_levels:
+                cpu_before = _cpu_seconds()
+                started = time.perf_counter()
+                parts = await loop.run_in_executor(
+                    None, _run_listeners, base_url, urls, clip_bytes, listeners, duration, processes, seed
+                )
+                elapsed = time.perf_counter() - started
+                cpu = _cpu_seconds() - cpu_before
+
+                latencies = [value for part in parts for value in part["latencies"]]
+                transferred = sum(part["bytes"] for part in parts)
+                requests = sum(part["requests"] for part in parts)
+                megabytes = transferred / (1024 * 1024)
+                results["levels"].append({
+                    "listeners": listeners,
+                    "requests": requests,
+                    "errors": sum(part["errors"] for part in parts),
+                    "requests_per_s": round(requests / duration, 1),
+                    "mb_per_s": round(megabytes / duration, 1),
+                    "latency": summarize_ms(latencies),
+                    "server_cpu_s": round(cpu, 3),
+                    "cpu_ms_per_mb": round(cpu * 1000 / megabytes, 3) if megabytes else 0.0,
+                    # Prozessstart der Zuhörer liegt außerhalb von duration, zählt aber nicht zur Server-CPU
+                    "cpu_pct_per_listener": round(cpu / elapsed / listeners * 100, 3)
+                })
+
+        results["origin_requests"] = origin.requests
+        results["cache"] = preview_cache.snapshot()
+        game_service.delete_session(session.session_id)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Preview-Audio Durchsatz (Range-Requests, Disk-Cache)")
+    parser.add_argument("--listeners", type=int, nargs="+", default=[1, 10, 50])
+    parser.add_argument("--duration", type=float, default=5.0, help="Sekunden pro Stufe")
+    parser.add_argument("--clips", type=int, default=40, help="Anzahl verschiedener Clips")
+    parser.add_argument("--clip-kb", type=int, default=350, help="Clip-Größe (30s MP3 ≈ 350 KB)")
+    parser.add_argument("--origin-latency-ms", type=float, default=0.0)
+    parser.add_argument("--processes", type=int, default=os.cpu_count() or 2,
+                        help="Client-Prozesse (Zuhörer werden verteilt)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--out", help="Ergebnisse als JSON speichern")
+    args = parser.parse_args()
+
+    quiet_socketio_logs()
+    result = asyncio.run(measure(
+        args.listeners, args.duration, args.clips, args.clip_kb * 1024,
+        args.origin_latency_ms, args.processes, args.seed
+    ))
+    result["config"] = vars(args)
+
+    cold = result["cold"]
+    print("\n🎧 Preview-Durchsatz")
+    print(f"   Clips:          {args.clips} × {args.clip_kb} KB, Origin-Latenz {args.origin_latency_ms} ms")
+    print(f"   Kalt p50/p99:   {cold['p50_ms']} / {cold['p99_ms']} ms ({cold['origin_requests']} Origin-Requests)")
+    for level in result["levels"]:
+        latency = level["latency"]
+        print(f"   {level['listeners']:>4} Zuhörer:   {level['mb_per_s']:>7} MB/s, "
+              f"{level['requests_per_s']:>7} req/s, p50/p99 {latency['p50_ms']} / {latency['p99_ms']} ms, "
+              f"CPU {level['cpu_ms_per_mb']} ms/MB, {level['cpu_pct_per_listener']} %/Zuhörer")
+    print(f"   Origin gesamt:  {result['origin_requests']} Requests")
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(result, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+Profiler: Kosten eines Profils im laufenden Worker
+
+Startet `python -m app.server` (wie `server_launchers`) und misst dieselbe
+HTTP-Last dreimal: ohne Profil, während `/admin/profile` mit 5 ms und mit
+1 ms Abtastintervall läuft. Dazu die Dauer eines einzelnen mitgeschnittenen
+Requests (`/admin/profile/next`) gegenüber dem Median ohne Mitschnitt.
+
+Start (im backend/ Ordner):
+    python -m benchmarks.profiler_overhead
+    python -m benchmarks.profiler_overhead --duration 10 --out profiler.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import time
+from typing import Dict
+
+import httpx
+
+from . import socket_load
+from .common import free_port
+from .server_launchers import group_cpu_seconds, http_load, start_launcher, stop_launcher
+
+
+TOKEN = "bench-admin"
+
+
+async def _load(url: str, pgid: int, args, interval_ms: float = 0.0) -> Dict:
+    """
+    HTTP-Last, optional parallel zu einem Sampling-Profil
+    """
+    profile = None
+    async with httpx.AsyncClient(base_url=url, timeout=args.duration + 30) as admin:
+        if interval_ms:
+            profile = asyncio.create_task(admin.post("/admin/profile", headers={"X-Admin-Token": TOKEN}, params={
+                "duration_s": args.duration + 1, "interval_ms": interval_ms}))
+            await asyncio.sleep(0.2)
+        cpu = group_cpu_seconds(pgid)
+        result = await http_load(url, args.concurrency, args.duration)
+        result["server_cpu_ms_per_request"] = round(
+            (group_cpu_seconds(pgid) - cpu) * 1000 / max(result["count"], 1), 3)
+        if profile is not None:
+            response = await profile
+            response.raise_for_status()
+            result["profile_lines"] = len(response.text.splitlines())
+    return result
+
+
+async def _capture(url: str, repeats: int) -> Dict:
+    """
+    Einzelne Leaderboard-Requests mit und ohne Mitschnitt
+    """
+    async with httpx.AsyncClient(base_url=url, timeout=30) as http:
+        session_id = (await http.post("/game/session/create", json={"host_name": "Profil"})).json()["session_id"]
+        path = f"/game/leaderboard/{session_id}"
+        plain, captured = [], []
+        for _ in range(repeats):
+            started = time.perf_counter()
+            await http.get(path)
+            plain.append(time.perf_counter() - started)
+
+            waiting = asyncio.create_task(http.post("/admin/profile/next", headers={"X-Admin-Token": TOKEN},
+                                                    params={"kind": "request", "match": path, "format": "json"}))
+            await asyncio.sleep(0.05)
+            started = time.perf_counter()
+            await http.get(path)
+            captured.append(time.perf_counter() - started)
+            result = (await waiting).json()
+        plain.sort()
+        captured.sort()
+        return {
+            "plain_p50_ms": round(plain[len(plain) // 2] * 1000, 3),
+            "captured_p50_ms": round(captured[len(captured) // 2] * 1000, 3),
+            "stacks": len(result["stacks"])
+        }
+
+
+async def measure(args) -> Dict:
+    port = free_port()
+    url = f"http://127.0.0.1:{port}"
+    os.environ["ADMIN_TOKEN"] = TOKEN
+    process = start_launcher("prod", port, 1)
+    try:
+        await socket_load.wait_for_server(url, timeout=60.0)
+        return {
+            "off": await _load(url, process.pid, args),
+            "sampling_5ms": await _load(url, process.pid, args, 5.0),
+            "sampling_1ms": await _load(url, process.pid, args, 1.0),
+            "capture": await _capture(url, args.repeats)
+        }
+    finally:
+        stop_launcher(process)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Profiler: Kosten eines Profils im laufenden Worker")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=6.0, help="Sekunden HTTP-Last pro Messung")
+    parser.add_argument("--repeats", type=int, default=20, help="Einzelne Mitschnitte")
+    parser.add_argument("--out", help="Ergebnisse als JSON speichern")
+    args = parser.parse_args()
+
+    result = asyncio.run(measure(args))
+
+    print(f"\n🔬 Profiler ({os.cpu_count()} CPUs)")
+    print("   Profil          HTTP req/s   Server-CPU/Req")
+    for name in ("off", "sampling_5ms", "sampling_1ms"):
+        point = result[name]
+        print(f"   {name:14s} {point['requests_per_s']:11,.1f}   {point['server_cpu_ms_per_request']:10.3f} ms")
+    capture = result["capture"]
+    print(f"   Einzel-Mitschnitt: {capture['plain_p50_ms']} ms → {capture['captured_p50_ms']} ms "
+          f"({capture['stacks']} Stacks)")
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump({"config": vars(args), **result}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
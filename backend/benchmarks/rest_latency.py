@@ -0,0 +1,253 @@
+"""
+In-Process REST Latenz-Suite mit Regressions-Baselines
+
+Treibt die FastAPI App direkt über ASGI (kein Netzwerk), Spotify wird durch
+synthetische Playlists ersetzt. Pro Endpoint werden p50/p95/p99 Latenz und
+Allokationen (tracemalloc, eigener Durchlauf) gemessen und mit der
+gespeicherten Baseline verglichen.
+
+Start (im backend/ Ordner):
+    python -m benchmarks.rest_latency                      # messen & vergleichen
+    python -m benchmarks.rest_latency --save-baseline      # Baseline aktualisieren
+    python -m benchmarks.rest_latency --threshold-pct 15   # strengere Grenze
+
+Exit-Code 1, wenn ein Endpoint die Baseline um mehr als --threshold-pct überschreitet.
+"""
+import argparse
+import asyncio
+import gc
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+from contextlib import redirect_stdout
+from typing import Callable, Dict, List, Sequence
+
+import httpx
+
+from .common import percentile, quiet_socketio_logs, synthetic_spotify
+
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines", "rest_latency.json")
+DEFAULT_METRICS = "p50_ms"  # p95/p99 schwanken auf geteilten Maschinen stark
+
+
+class EndpointRecorder:
+    """
+    Misst Latenz & Allokationen pro Endpoint
+    """
+
+    def __init__(self, trace_allocations: bool):
+        self.trace_allocations = trace_allocations
+        self.latencies: Dict[str, List[float]] = {}
+        self.allocations: Dict[str, List[int]] = {}
+
+    async def call(self, name: str, request: Callable) -> httpx.Response:
+        if self.trace_allocations:
+            tracemalloc.reset_peak()
+            before, _ = tracemalloc.get_traced_memory()
+            response = await request()
+            _, peak = tracemalloc.get_traced_memory()
+            self.allocations.setdefault(name, []).append(peak - before)
+        else:
+            started = time.perf_counter()
+            response = await request()
+            self.latencies.setdefault(name, []).append(time.perf_counter() - started)
+        response.raise_for_status()
+        return response
+
+
+async def run_iteration(http: httpx.AsyncClient, recorder: EndpointRecorder, rng: random.Random, players: int):
+    """
+    Ein kompletter Durchlauf: Lobby → Spiel → Platzierung → Abfragen
+    """
+    response = await recorder.call("create", lambda: http.post(
+        "/game/session/create", json={"host_name": "Bench Host", "game_mode": "pro"}
+    ))
+    session_id = response.json()["session_id"]
+
+    for idx in range(players - 1):
+        await recorder.call("join", lambda: http.post(
+            "/game/session/player/add", json={"session_id": session_id, "player_name": f"Bench {idx}"}
+        ))
+
+    await recorder.call("lobbies", lambda: http.get("/game/lobbies"))
+
+    await recorder.call("load_playlist", lambda: http.post(
+        "/game/session/playlist/load",
+        json={"session_id": session_id, "playlist_id": f"bench-{rng.randrange(4)}"}
+    ))
+
+    response = await recorder.call("start", lambda: http.post(f"/game/start?session_id={session_id}"))
+    player_id = response.json()["current_player"]
+
+    await recorder.call("place_card", lambda: http.post("/game/place-card", json={
+        "session_id": session_id,
+        "player_id": player_id,
+        "position": rng.randint(0, 1),
+        "title_guess": "Love Night",
+        "artist_guess": "Anna Berg"
+    }))
+
+    await recorder.call("leaderboard", lambda: http.get(f"/game/leaderboard/{session_id}"))
+    await recorder.call("timeline", lambda: http.get(f"/game/timeline/{session_id}/{player_id}"))
+
+    # Aufräumen, damit /game/lobbies nicht mit jeder Iteration wächst
+    from app.services.game_service import game_service
+    game_service.delete_session(session_id)
+
+
+async def measure(iterations: int, warmup: int, players: int, seed: int, trace_allocations: bool) -> EndpointRecorder:
+    from app.main import app
+
+    rng = random.Random(seed)
+    random.seed(seed)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as http:
+        warm = EndpointRecorder(trace_allocations=False)
+        for _ in range(warmup):
+            await run_iteration(http, warm, rng, players)
+
+        recorder = EndpointRecorder(trace_allocations)
+        for _ in range(iterations):
+            await run_iteration(http, recorder, rng, players)
+    return recorder
+
+
+def calibrate(rounds: int = 5) -> float:
+    """
+    Referenz-Workload (JSON + Pydantic) in ms - bestes von `rounds` Läufen
+
+    Maschinen schwanken (CPU-Takt, Nachbarlast). Baselines werden mit dem
+    Verhältnis der Kalibrierungen skaliert, damit nur echte Regressionen zählen.
+    """
+    from app.models.game import TimelineCard
+
+    best = float("inf")
+    for _ in range(rounds):
+        started = time.perf_counter()
+        for idx in range(2000):
+            card = TimelineCard(position=idx, track_id="t", title="Title", artist="Artist", year=1990)
+            json.loads(json.dumps(card.model_dump()))
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+
+def build_report(timings: List[EndpointRecorder], allocations: EndpointRecorder) -> Dict[str, Dict]:
+    """
+    Pro Perzentil das beste Ergebnis aller Wiederholungen
+    (robuster gegen Störungen durch andere Prozesse als ein einzelner Lauf)
+    """
+    report = {}
+    for name in timings[0].latencies:
+        runs = [timing.latencies[name] for timing in timings]
+        allocs = allocations.allocations.get(name, [])
+        report[name] = {
+            "count": sum(len(samples) for samples in runs),
+            "p50_ms": round(min(percentile(samples, 50) for samples in runs) * 1000, 4),
+            "p95_ms": round(min(percentile(samples, 95) for samples in runs) * 1000, 4),
+            "p99_ms": round(min(percentile(samples, 99) for samples in runs) * 1000, 4),
+            "alloc_peak_kb": round(sum(allocs) / len(allocs) / 1024, 2) if allocs else None
+        }
+    return report
+
+
+def compare(report: Dict[str, Dict], baseline: Dict[str, Dict], threshold_pct: float,
+            scale: float = 1.0, metrics: Sequence[str] = (DEFAULT_METRICS,)) -> List[str]:
+    """
+    Returns: Liste der Regressionen (leer = alles gut)
+    `scale` = aktuelle Kalibrierung / Baseline-Kalibrierung
+    """
+    regressions = []
+    for name, current in report.items():
+        base = baseline.get(name)
+        if not base:
+            continue
+        for metric in metrics:
+            if not base.get(metric):
+                continue
+            expected = base[metric] * scale
+            change = (current[metric] - expected) / expected * 100
+            current[f"{metric}_change_pct"] = round(change, 1)
+            if change > threshold_pct:
+                regressions.append(
+                    f"{name} {metric}: {expected:.3f} → {current[metric]:.3f} ms (+{change:.1f} %)"
+                )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="In-Process REST Latenz-Suite")
+    parser.add_argument("--iterations", type=int, default=300)
+    parser.add_argument("--warmup", type=int, default=30)
+    parser.add_argument("--repeats", type=int, default=3, help="Wiederholungen (bestes Ergebnis zählt)")
+    parser.add_argument("--players", type=int, default=4)
+    parser.add_argument("--playlist-size", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--threshold-pct", type=float, default=25.0,
+                        help="Erlaubte Verschlechterung gegenüber der Baseline")
+    parser.add_argument("--metrics", default=DEFAULT_METRICS,
+                        help="Verglichene Kennzahlen, kommagetrennt (z.B. p50_ms,p95_ms)")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--save-baseline", action="store_true", help="Ergebnis als neue Baseline speichern")
+    parser.add_argument("--out", help="Ergebnisse zusätzlich als JSON speichern")
+    args = parser.parse_args()
+
+    quiet_socketio_logs()
+    with synthetic_spotify(args.playlist_size, args.seed), open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+        timings = []
+        calibrations = []
+        for _ in range(max(args.repeats, 1)):
+            gc.collect()
+            calibrations.append(calibrate())
+            timings.append(asyncio.run(measure(args.iterations, args.warmup, args.players, args.seed, False)))
+        calibration_ms = round(min(calibrations), 4)
+        tracemalloc.start()
+        allocations = asyncio.run(measure(max(args.iterations // 5, 1), 0, args.players, args.seed, True))
+        tracemalloc.stop()
+
+    report = build_report(timings, allocations)
+
+    regressions = []
+    if not args.save_baseline and os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        scale = calibration_ms / baseline["calibration_ms"] if baseline.get("calibration_ms") else 1.0
+        print(f"\n📏 Kalibrierung: {calibration_ms} ms (Baseline-Faktor {scale:.2f})")
+        metrics = [m.strip() for m in args.metrics.split(",") if m.strip()]
+        regressions = compare(report, baseline["endpoints"], args.threshold_pct, scale, metrics)
+
+    print("\n🌐 REST Latenz (in-process)")
+    print("   Endpoint        p50 (ms)  p95 (ms)  p99 (ms)  Alloc (KB)")
+    for name, row in report.items():
+        print(f"   {name:14s} {row['p50_ms']:9.3f} {row['p95_ms']:9.3f} {row['p99_ms']:9.3f} {row['alloc_peak_kb']!s:>11}")
+
+    result = {
+        "config": vars(args) | {"baseline": os.path.relpath(args.baseline)},
+        "calibration_ms": calibration_ms,
+        "endpoints": report
+    }
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(result, f, indent=2)
+
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(args.baseline), exist_ok=True)
+        with open(args.baseline, "w") as f:
+            json.dump(result, f, indent=2)
+        print(f"\n💾 Baseline gespeichert: {args.baseline}")
+        return
+
+    if regressions:
+        print(f"\n❌ Regressionen (> {args.threshold_pct} %):")
+        for line in regressions:
+            print(f"   {line}")
+        sys.exit(1)
+    print("\n✅ Keine Regressionen")
+
+
+if __name__ == "__main__":
+    main()
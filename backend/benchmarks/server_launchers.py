@@ -0,0 +1,189 @@
+"""
+Server-Start im Vergleich: Entwicklung vs. Produktion
+
+Startet den Server nacheinander auf drei Arten und misst jeweils dieselbe Last:
+- dev:    uvicorn --reload, DEBUG an (wie `python -m app.main`)
+- script: uvicorn ohne Reload, DEBUG an (wie start_backend.sh)
+- prod:   `python -m app.server` (uvloop/httptools, DEBUG aus, SERVER_WORKERS)
+
+Last:
+- http:   C gleichzeitige Clients, Leaderboard/Timeline/Health im Wechsel
+- socket: `benchmarks.socket_load` gegen den laufenden Server
+          (Guess-Broadcasts pro Sekunde, Emit→Empfang Latenz)
+
+Client und Server teilen sich die Maschine - aussagekräftig ist vor allem
+die Server-CPU pro Request/Zustellung (alle Prozesse der Gruppe, /proc).
+
+Start (im backend/ Ordner):
+    python -m benchmarks.server_launchers
+    python -m benchmarks.server_launchers --launchers script,prod --workers 2 --out launchers.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import signal
+import subprocess
+import sys
+import time
+from argparse import Namespace
+from typing import Dict, List
+
+import aiohttp
+
+from . import socket_load
+from .common import free_port, summarize_ms
+
+
+LAUNCHERS = ("dev", "script", "prod")
+
+
+def start_launcher(launcher: str, port: int, workers: int) -> subprocess.Popen:
+    backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    uvicorn = [sys.executable, "-m", "uvicorn", "app.main:socket_app", "--host", "127.0.0.1", "--port", str(port)]
+    commands = {
+        "dev": uvicorn + ["--reload"],
+        "script": uvicorn,
+        "prod": [sys.executable, "-m", "app.server"]
+    }
+    env = {**os.environ, "DEBUG": "true", "SERVER_HOST": "127.0.0.1", "SERVER_PORT": str(port),
+           "SERVER_WORKERS": str(workers), "SHARD_BASE_PORT": str(free_port()),
+           "EVENT_LOG_DIR": "", "TRACK_STATS_PATH": "", "HANDOFF_PATH": ""}
+    return subprocess.Popen(commands[launcher], cwd=backend_dir, env=env, start_new_session=True,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+
+def stop_launcher(process: subprocess.Popen) -> None:
+    # Ganze Prozessgruppe (Reloader-Kind bzw. Worker)
+    os.killpg(process.pid, signal.SIGTERM)
+    try:
+        process.wait(timeout=30)
+    except subprocess.TimeoutExpired:
+        os.killpg(process.pid, signal.SIGKILL)
+        process.wait()
+
+
+def group_cpu_seconds(pgid: int) -> float:
+    """
+    CPU-Zeit aller Prozesse der Gruppe (Reloader + Kind, Router + Worker)
+    """
+    total = 0
+    for pid in os.listdir("/proc"):
+        if not pid.isdigit():
+            continue
+        try:
+            with open(f"/proc/{pid}/stat") as f:
+                fields = f.read().rsplit(")", 1)[1].split()
+        except OSError:
+            continue
+        if int(fields[2]) == pgid:
+            total += int(fields[11]) + int(fields[12])  # utime + stime
+    return total / os.sysconf("SC_CLK_TCK")
+
+
+async def http_load(url: str, concurrency: int, duration: float) -> Dict:
+    """
+    Jeder Client eine eigene Session, danach Lese-Requests bis zur Deadline
+    (aiohttp - httpx wäre selbst der Engpass)
+    """
+    latencies: List[float] = []
+
+    async def client(http: aiohttp.ClientSession, idx: int):
+        async with http.post(f"{url}/game/session/create", json={"host_name": f"Bench {idx}"}) as response:
+            session_id = (await response.json())["session_id"]
+        async with http.get(f"{url}/game/leaderboard/{session_id}") as response:
+            player_id = (await response.json())[0]["player_id"]
+        paths = [f"{url}/game/leaderboard/{session_id}", f"{url}/game/timeline/{session_id}/{player_id}",
+                 f"{url}/health"]
+        count = 0
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            async with http.get(paths[count % len(paths)]) as response:
+                response.raise_for_status()
+                await response.read()
+            latencies.append(time.perf_counter() - started)
+            count += 1
+
+    connector = aiohttp.TCPConnector(limit=concurrency)
+    async with aiohttp.ClientSession(connector=connector) as http:
+        deadline = time.perf_counter() + duration
+        await asyncio.gather(*(client(http, idx) for idx in range(concurrency)))
+    return {"requests_per_s": round(len(latencies) / duration, 1), **summarize_ms(latencies)}
+
+
+async def measure(launcher: str, args) -> Dict:
+    port = free_port()
+    url = f"http://127.0.0.1:{port}"
+    process = start_launcher(launcher, port, args.workers)
+    try:
+        started = time.perf_counter()
+        await socket_load.wait_for_server(url, timeout=60.0)
+        startup_s = time.perf_counter() - started
+        cpu = group_cpu_seconds(process.pid)
+        http = await http_load(url, args.concurrency, args.duration)
+        http["server_cpu_ms_per_request"] = round(
+            (group_cpu_seconds(process.pid) - cpu) * 1000 / max(http["count"], 1), 3)
+        cpu = group_cpu_seconds(process.pid)
+        sockets = await socket_load.run(Namespace(
+            url=url, clients=args.clients, sessions=args.sessions, guesses=args.guesses,
+            interval_ms=args.interval_ms, connect_batch=50, drain_s=1.0
+        ))
+        socket_cpu_ms = (group_cpu_seconds(process.pid) - cpu) * 1000
+    finally:
+        stop_launcher(process)
+    return {
+        "launcher": launcher,
+        "startup_s": round(startup_s, 2),
+        "http": http,
+        "socket": {
+            "deliveries_per_s": sockets["deliveries"]["per_second"],
+            "delivery_ratio": sockets["deliveries"]["ratio"],
+            "server_cpu_ms_per_delivery": round(socket_cpu_ms / max(sockets["deliveries"]["received"], 1), 3),
+            "emit_to_receive": sockets["emit_to_receive"]
+        }
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Entwicklungs- vs. Produktions-Start")
+    parser.add_argument("--launchers", default=",".join(LAUNCHERS), help="Kommagetrennt: dev,script,prod")
+    parser.add_argument("--workers", type=int, default=1, help="SERVER_WORKERS für prod")
+    parser.add_argument("--concurrency", type=int, default=32, help="Gleichzeitige HTTP-Clients")
+    parser.add_argument("--duration", type=float, default=10.0, help="Sekunden HTTP-Last")
+    parser.add_argument("--clients", type=int, default=100, help="Socket.IO Clients")
+    parser.add_argument("--sessions", type=int, default=10)
+    parser.add_argument("--guesses", type=int, default=20)
+    parser.add_argument("--interval-ms", type=float, default=50.0)
+    parser.add_argument("--out", help="Ergebnisse als JSON speichern")
+    args = parser.parse_args()
+
+    results = []
+    for launcher in args.launchers.split(","):
+        if launcher not in LAUNCHERS:
+            parser.error(f"Unbekannter Start '{launcher}'")
+        results.append(asyncio.run(measure(launcher, args)))
+
+    print(f"\n🚀 Server-Start ({os.cpu_count()} CPUs, prod mit {args.workers} Worker)")
+    print("   Start     HTTP req/s   p50/p99 ms        Server-CPU/Req   Zustellungen/s   "
+          "Emit→Empfang p50/p99   Server-CPU/Zustellung")
+    for result in results:
+        http, socket = result["http"], result["socket"]
+        latency = socket["emit_to_receive"]
+        print(f"   {result['launcher']:7s} {http['requests_per_s']:12,.1f}   "
+              f"{http['p50_ms']:6.2f} / {http['p99_ms']:6.2f}   {http['server_cpu_ms_per_request']:10.3f} ms   "
+              f"{socket['deliveries_per_s']:14,.1f}   {latency['p50_ms']:6.2f} / {latency['p99_ms']:6.2f} ms"
+              f"   {socket['server_cpu_ms_per_delivery']:17.3f} ms")
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump({
+                "meta": {"timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                         "python": platform.python_version(), "cpus": os.cpu_count()},
+                "config": vars(args),
+                "results": results
+            }, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,206 @@
+"""
+Sharding: Platzierungen pro Sekunde über die Anzahl Worker-Prozesse
+
+Startet pro Messpunkt N Worker (`app.shard_router.spawn_workers`, Spotify
+durch synthetische Playlists ersetzt) und C Client-Prozesse, die über HTTP
+komplette Spiele spielen (create → join → load → start → place-card/next).
+Gezählt werden Platzierungen über alle Shards.
+
+- direct: Clients verbinden sich direkt zum Shard (wie ein L7-Loadbalancer
+          mit Hash-Ring) - misst nur die Worker
+- router: alles über `python -m app.shard_router` (ein Prozess mehr)
+
+Skaliert nur mit freien Kernen - Worker und Clients teilen sich die Maschine.
+
+Start (im backend/ Ordner):
+    python -m benchmarks.shard_scaling --workers 1,2,4
+    python -m benchmarks.shard_scaling --workers 1,2,4,8 --mode router --duration 20 --out shards.json
+"""
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+from contextlib import ExitStack
+from typing import Dict, List
+
+import httpx
+
+from app.shard_router import spawn_workers, stop_workers, wait_for_workers
+
+from .common import free_port, quiet_socketio_logs, summarize_ms, synthetic_spotify
+
+
+WORKER_APP = "benchmarks.shard_scaling:worker_app"
+_worker_stack = ExitStack()
+
+
+def worker_app():
+    """
+    Factory für uvicorn --factory: Server mit synthetischen Playlists, ohne Logs
+    """
+    quiet_socketio_logs()
+    sys.stdout = open(os.devnull, "w")
+    _worker_stack.enter_context(synthetic_spotify(int(os.environ.get("BENCH_PLAYLIST_SIZE", "200")), seed=1))
+    from app.main import socket_app
+    return socket_app
+
+
+async def _play_games(http: httpx.AsyncClient, base_url: str, rng: random.Random, players: int,
+                      deadline: float, latencies: List[float], counts: Dict[str, int]):
+    """
+    Spiele nacheinander bis zur Deadline (eine Session zur Zeit)
+    """
+    while time.perf_counter() < deadline:
+        response = await http.post(f"{base_url}/game/session/create",
+                                   json={"host_name": "Shard Bot", "turn_time_limit": 0})
+        response.raise_for_status()
+        session_id = response.json()["session_id"]
+        for idx in range(players - 1):
+            await http.post(f"{base_url}/game/session/player/add",
+                            json={"session_id": session_id, "player_name": f"Bot {idx}"})
+        await http.post(f"{base_url}/game/session/playlist/load",
+                        json={"session_id": session_id, "playlist_id": f"shard-{rng.randrange(8)}",
+                              "streaming": False})
+        response = await http.post(f"{base_url}/game/start", params={"session_id": session_id})
+        response.raise_for_status()
+        player_id = response.json()["current_player"]
+        counts["games"] += 1
+
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            response = await http.post(f"{base_url}/game/place-card", json={
+                "session_id": session_id, "player_id": player_id, "position": rng.randint(0, 1)
+            })
+            response.raise_for_status()
+            latencies.append(time.perf_counter() - started)
+            counts["placements"] += 1
+            if response.json()["won_game"]:
+                break
+            result = (await http.post(f"{base_url}/game/next", json={"session_id": session_id})).json()
+            if result.get("status") != "playing":
+                break
+            player_id = result["current_player"]
+
+
+def _client_process(urls: List[str], via_router: bool, concurrency: int, players: int,
+                    duration: float, seed: int, queue) -> None:
+    """
+    Ein Client-Prozess mit `concurrency` gleichzeitigen Spielen
+    """
+    async def run():
+        rng = random.Random(seed)
+        latencies: List[float] = []
+        counts = {"games": 0, "placements": 0}
+        limits = httpx.Limits(max_connections=concurrency * 2, max_keepalive_connections=concurrency * 2)
+        deadline = time.perf_counter() + duration
+        async with httpx.AsyncClient(limits=limits, timeout=30.0) as http:
+            # Direkt: Spiele gleichmäßig auf die Shards verteilen (Session entsteht auf dem Shard)
+            await asyncio.gather(*(
+                _play_games(http, urls[0] if via_router else urls[(seed + idx) % len(urls)],
+                            random.Random(rng.random()), players, deadline, latencies, counts)
+                for idx in range(concurrency)
+            ))
+        queue.put({"counts": counts, "latencies": latencies})
+
+    asyncio.run(run())
+
+
+def measure(workers: int, clients: int, concurrency: int, players: int, duration: float,
+            mode: str, playlist_size: int, seed: int) -> Dict:
+    base_port = free_port()
+    os.environ["BENCH_PLAYLIST_SIZE"] = str(playlist_size)
+    worker_urls = [f"http://127.0.0.1:{base_port + idx}" for idx in range(workers)]
+    router = None
+    if mode == "router":
+        router_port = free_port()
+        router = subprocess.Popen(
+            [sys.executable, "-m", "app.shard_router", "--workers", str(workers), "--host", "127.0.0.1",
+             "--port", str(router_port), "--base-port", str(base_port), "--app", WORKER_APP, "--factory"],
+            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+            stdout=subprocess.DEVNULL
+        )
+        processes = [router]
+        urls = [f"http://127.0.0.1:{router_port}"]
+    else:
+        processes = spawn_workers(workers, base_port=base_port, app_path=WORKER_APP, factory=True)
+        urls = worker_urls
+
+    try:
+        wait_for_workers(urls if mode == "direct" else urls + worker_urls)
+        context = multiprocessing.get_context("spawn")
+        queue = context.Queue()
+        children = [
+            context.Process(target=_client_process,
+                            args=(urls, mode == "router", concurrency, players, duration, seed + idx, queue))
+            for idx in range(clients)
+        ]
+        started = time.perf_counter()
+        for child in children:
+            child.start()
+        results = [queue.get() for _ in children]
+        elapsed = time.perf_counter() - started
+        for child in children:
+            child.join()
+    finally:
+        stop_workers(processes)
+
+    placements = sum(result["counts"]["placements"] for result in results)
+    latencies = [sample for result in results for sample in result["latencies"]]
+    return {
+        "workers": workers,
+        "games": sum(result["counts"]["games"] for result in results),
+        "placements": placements,
+        "placements_per_s": round(placements / duration, 1),
+        "wall_s": round(elapsed, 2),
+        "place_card": summarize_ms(latencies)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sharding: Platzierungen/s über Worker-Anzahl")
+    parser.add_argument("--workers", default="1,2,4", help="Kommagetrennte Worker-Anzahlen")
+    parser.add_argument("--mode", choices=["direct", "router"], default="direct")
+    parser.add_argument("--clients", type=int, default=0, help="Client-Prozesse (0 = so viele wie Worker)")
+    parser.add_argument("--concurrency", type=int, default=16, help="Gleichzeitige Spiele pro Client-Prozess")
+    parser.add_argument("--players", type=int, default=4)
+    parser.add_argument("--duration", type=float, default=10.0, help="Sekunden pro Messpunkt")
+    parser.add_argument("--playlist-size", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--out", help="Ergebnisse als JSON speichern")
+    args = parser.parse_args()
+
+    points = []
+    for workers in [int(value) for value in args.workers.split(",")]:
+        point = measure(workers, args.clients or workers, args.concurrency, args.players,
+                        args.duration, args.mode, args.playlist_size, args.seed)
+        points.append(point)
+
+    baseline = points[0]["placements_per_s"] / points[0]["workers"] if points[0]["placements_per_s"] else 0
+    print(f"\n🧩 Sharding ({args.mode}, {os.cpu_count()} CPUs)")
+    print("   Worker   Platzierungen/s   Speedup   Effizienz   place-card p50/p99")
+    for point in points:
+        speedup = point["placements_per_s"] / points[0]["placements_per_s"] if points[0]["placements_per_s"] else 0
+        point["speedup"] = round(speedup, 2)
+        point["efficiency"] = round(point["placements_per_s"] / (baseline * point["workers"]), 2) if baseline else 0
+        latency = point["place_card"]
+        print(f"   {point['workers']:6d}   {point['placements_per_s']:15,.1f}   {point['speedup']:6.2f}x"
+              f"   {point['efficiency']:9.0%}   {latency['p50_ms']:.1f} / {latency['p99_ms']:.1f} ms")
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump({
+                "meta": {"timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                         "python": platform.python_version(), "cpus": os.cpu_count()},
+                "config": vars(args),
+                "points": points
+            }, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,285 @@
+"""
+Headless Spiel-Simulator & GameService Durchsatz-Benchmark
+
+Spielt tausende komplette Spiele mit Bot-Spielern direkt gegen den
+GameService - ohne Server, ohne Netzwerk, ohne Spotify. Synthetische
+Playlists ersetzen `spotify_service`, alle Zufallsentscheidungen hängen
+nur vom Seed ab.
+
+Start (im backend/ Ordner):
+    python -m benchmarks.simulate_games --games 2000 --players 4 --seed 42
+"""
+import argparse
+import bisect
+import json
+import os
+import random
+import resource
+import time
+import tracemalloc
+from contextlib import contextmanager, redirect_stdout
+from typing import Dict, List, Optional
+
+from app.models.game import GameMode, GuessRequest, PlacementRequest
+from app.services.game_service import GameService
+
+from .common import summarize_ms, synthetic_spotify
+
+
+class Bot:
+    """
+    Bot-Spieler mit Trefferquoten für Platzierung & Titel/Künstler
+    """
+
+    def __init__(self, rng: random.Random, placement_skill: float, guess_skill: float, typo_rate: float):
+        self.rng = rng
+        self.placement_skill = placement_skill
+        self.guess_skill = guess_skill
+        self.typo_rate = typo_rate
+
+    def choose_position(self, timeline, year: int) -> int:
+        """Richtige Position mit Wahrscheinlichkeit `placement_skill`, sonst eine falsche"""
+        years = [card.year for card in timeline]
+        lo = bisect.bisect_left(years, year)
+        hi = bisect.bisect_right(years, year)
+        if self.rng.random() < self.placement_skill:
+            return self.rng.randint(lo, hi)
+        wrong = [pos for pos in range(len(timeline) + 1) if pos < lo or pos > hi]
+        return self.rng.choice(wrong) if wrong else lo
+
+    def answer(self, solution: str, distractor: str) -> str:
+        """Richtig, mit Tippfehler oder komplett falsch"""
+        roll = self.rng.random()
+        if roll < self.guess_skill:
+            return solution
+        if roll < self.guess_skill + self.typo_rate:
+            return self._typo(solution)
+        return distractor
+
+    def decade(self, year: int) -> str:
+        if self.rng.random() < self.guess_skill:
+            return f"{(year // 10) * 10}er"
+        return f"{(year // 10) * 10 + self.rng.choice([-10, 10])}er"
+
+    def _typo(self, text: str) -> str:
+        if len(text) < 2:
+            return text + "x"
+        chars = list(text)
+        idx = self.rng.randrange(len(chars) - 1)
+        op = self.rng.choice(("swap", "drop", "insert", "case"))
+        if op == "swap":
+            chars[idx], chars[idx + 1] = chars[idx + 1], chars[idx]
+        elif op == "drop":
+            del chars[idx]
+        elif op == "insert":
+            chars.insert(idx, self.rng.choice("aeiourst"))
+        else:
+            chars[idx] = chars[idx].swapcase()
+        return "".join(chars)
+
+
+class Timer:
+    """
+    Sammelt Laufzeiten pro Operation
+    """
+
+    def __init__(self):
+        self.samples: Dict[str, List[float]] = {}
+
+    @contextmanager
+    def measure(self, op: str):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.samples.setdefault(op, []).append(time.perf_counter() - started)
+
+
+def play_game(service: GameService, rng: random.Random, timer: Timer, mode: GameMode,
+              players: int, playlist_id: str, max_turns: int, stats: Dict, delete: bool = True) -> str:
+    """
+    Ein komplettes Spiel von Lobby bis Sieg (oder leerer Playlist)
+    delete=False: Session bleibt bestehen (z.B. für Replay-Vergleiche)
+    Returns: session_id
+    """
+    with timer.measure("create_session"):
+        session = service.create_session("Bot Host", game_mode=mode, turn_time_limit=0)
+    session_id = session.session_id
+
+    for idx in range(players - 1):
+        with timer.measure("add_player"):
+            service.add_player(session_id, f"Bot {idx + 1}")
+
+    bots = {
+        player.player_id: Bot(
+            rng,
+            placement_skill=rng.uniform(0.4, 0.9),
+            guess_skill=rng.uniform(0.2, 0.7),
+            typo_rate=rng.uniform(0.05, 0.25)
+        )
+        for player in service.players[session_id]
+    }
+
+    with timer.measure("load_playlist"):
+        service.load_playlist(session_id, playlist_id)
+    with timer.measure("start_game"):
+        service.start_game(session_id)
+
+    deck = service.track_queues[session_id]
+    for _ in range(max_turns):
+        if session.status != "playing":
+            break
+
+        player_id = session.current_player_turn
+        bot = bots[player_id]
+        track = service.solutions[session_id]
+        year = int(track.release_date[:4])
+        distractor = deck[rng.randrange(len(deck))]
+
+        title_guess = bot.answer(track.title, distractor.title)
+        artist_guess = bot.answer(track.artist, distractor.artist)
+
+        with timer.measure("check_guess"):
+            result = service.check_guess(GuessRequest(
+                session_id=session_id,
+                player_id=player_id,
+                title_guess=title_guess,
+                artist_guess=artist_guess,
+                decade_guess=bot.decade(year)
+            ))
+        stats["guesses"] += 1
+        stats["correct_titles"] += int(result.correct_title)
+
+        player = service._find_player(session_id, player_id)
+        placement = PlacementRequest(
+            session_id=session_id,
+            player_id=player_id,
+            position=bot.choose_position(player.timeline, year),
+            title_guess=title_guess if mode in (GameMode.PRO, GameMode.EXPERT) else None,
+            artist_guess=artist_guess if mode in (GameMode.PRO, GameMode.EXPERT) else None,
+            year_guess=year if mode == GameMode.EXPERT and rng.random() < bot.guess_skill else None
+        )
+        with timer.measure("place_card"):
+            placed = service.place_card_in_timeline(placement)
+        stats["placements"] += 1
+        stats["correct_placements"] += int(placed.correct)
+
+        if placed.won_game:
+            stats["wins"][mode.value] += 1
+            break
+
+        with timer.measure("next_track"):
+            service.next_track(session_id)
+
+    stats["games"] += 1
+    stats["rounds"] += session.round_number
+
+    if delete:
+        with timer.measure("delete_session"):
+            service.delete_session(session_id)
+    return session_id
+
+
+def simulate(games: int, players: int = 4, playlist_size: int = 200, playlists: int = 8,
+             seed: int = 42, modes: Optional[List[GameMode]] = None, max_turns: int = 500,
+             trace_memory: bool = False) -> Dict:
+    """
+    Spiele `games` Spiele und liefere Durchsatz, Latenzen & Spielstatistik
+    """
+    modes = modes or list(GameMode)
+    rng = random.Random(seed)
+    random.seed(seed)  # shuffle_tracks nutzt das globale random-Modul
+    timer = Timer()
+    stats = {
+        "games": 0,
+        "rounds": 0,
+        "guesses": 0,
+        "correct_titles": 0,
+        "placements": 0,
+        "correct_placements": 0,
+        "wins": {mode.value: 0 for mode in modes}
+    }
+
+    if trace_memory:
+        tracemalloc.start()
+
+    service = GameService()
+    started = time.perf_counter()
+    with synthetic_spotify(playlist_size, seed), open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+        for game_idx in range(games):
+            play_game(
+                service, rng, timer,
+                mode=modes[game_idx % len(modes)],
+                players=players,
+                playlist_id=f"synthetic-{rng.randrange(playlists)}",
+                max_turns=max_turns,
+                stats=stats
+            )
+    elapsed = time.perf_counter() - started
+
+    peak_traced = None
+    if trace_memory:
+        _, peak_traced = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    return {
+        "config": {
+            "games": games,
+            "players": players,
+            "playlist_size": playlist_size,
+            "playlists": playlists,
+            "seed": seed,
+            "modes": [mode.value for mode in modes]
+        },
+        "elapsed_s": round(elapsed, 3),
+        "games_per_s": round(stats["games"] / elapsed, 2) if elapsed else 0.0,
+        "placements_per_s": round(stats["placements"] / elapsed, 2) if elapsed else 0.0,
+        "operations": {op: summarize_ms(samples) for op, samples in sorted(timer.samples.items())},
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        "peak_traced_mb": round(peak_traced / 2**20, 2) if peak_traced is not None else None,
+        "stats": stats
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless GameService Simulation")
+    parser.add_argument("--games", type=int, default=2000)
+    parser.add_argument("--players", type=int, default=4)
+    parser.add_argument("--playlist-size", type=int, default=200)
+    parser.add_argument("--playlists", type=int, default=8, help="Anzahl verschiedener Playlists")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--mode", action="append", choices=[m.value for m in GameMode],
+                        help="Nur diese Modi spielen (mehrfach möglich)")
+    parser.add_argument("--trace-memory", action="store_true",
+                        help="Peak-Speicher per tracemalloc messen (langsamer)")
+    parser.add_argument("--out", help="Ergebnisse als JSON speichern")
+    args = parser.parse_args()
+
+    result = simulate(
+        games=args.games,
+        players=args.players,
+        playlist_size=args.playlist_size,
+        playlists=args.playlists,
+        seed=args.seed,
+        modes=[GameMode(m) for m in args.mode] if args.mode else None,
+        trace_memory=args.trace_memory
+    )
+
+    print("\n🤖 Headless Simulation")
+    print(f"   Spiele:        {result['stats']['games']} in {result['elapsed_s']} s")
+    print(f"   Spiele/s:      {result['games_per_s']}")
+    print(f"   Platzierung/s: {result['placements_per_s']}")
+    print(f"   Peak RSS:      {result['peak_rss_mb']} MB")
+    if result["peak_traced_mb"] is not None:
+        print(f"   Peak Python:   {result['peak_traced_mb']} MB")
+    print("\n   Operation        p50 (ms)   p99 (ms)")
+    for op, summary in result["operations"].items():
+        print(f"   {op:15s} {summary['p50_ms']:9.3f} {summary['p99_ms']:10.3f}")
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(result, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,282 @@
+"""
+Socket.IO Lastgenerator für Room Fan-out
+
+Startet N simulierte Socket.IO Clients verteilt auf M Sessions und spielt den
+echten Ablauf `join_lobby` → `start_game` → `guess_submitted`. Gemessen werden
+Verbindungsaufbau, Emit-to-Receive Latenz (jeder Empfänger im Room) sowie
+CPU & Speicher des Server-Prozesses. Ergebnisse landen als JSON-Datei, damit
+Versionen verglichen werden können.
+
+Ohne --url wird ein lokaler Server (`uvicorn app.main:socket_app`) als eigener
+Prozess gestartet; CPU/RSS werden dann über /proc gemessen (Linux).
+
+Start (im backend/ Ordner):
+    python -m benchmarks.socket_load --clients 200 --sessions 20 --out socket_load.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from typing import Dict, List, Optional
+
+import httpx
+import socketio
+
+from .common import free_port, summarize_ms
+
+
+class ProcessSampler:
+    """
+    Misst CPU-Auslastung & RSS eines Prozesses über /proc
+    """
+
+    def __init__(self, pid: int, interval: float = 0.5):
+        self.pid = pid
+        self.interval = interval
+        self.cpu_percent: List[float] = []
+        self.rss_mb: List[float] = []
+        self._task: Optional[asyncio.Task] = None
+        self._ticks = os.sysconf("SC_CLK_TCK")
+
+    def _cpu_seconds(self) -> float:
+        with open(f"/proc/{self.pid}/stat") as f:
+            fields = f.read().rsplit(")", 1)[1].split()
+        return (int(fields[11]) + int(fields[12])) / self._ticks  # utime + stime
+
+    def _rss(self) -> float:
+        with open(f"/proc/{self.pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+        return 0.0
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        last_cpu, last_wall = self._cpu_seconds(), loop.time()
+        while True:
+            await asyncio.sleep(self.interval)
+            cpu, wall = self._cpu_seconds(), loop.time()
+            self.cpu_percent.append(100.0 * (cpu - last_cpu) / (wall - last_wall))
+            self.rss_mb.append(self._rss())
+            last_cpu, last_wall = cpu, wall
+
+    def start(self):
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    def summary(self) -> Dict:
+        return {
+            "cpu_percent_avg": round(sum(self.cpu_percent) / len(self.cpu_percent), 1) if self.cpu_percent else None,
+            "cpu_percent_max": round(max(self.cpu_percent), 1) if self.cpu_percent else None,
+            "rss_mb_max": round(max(self.rss_mb), 1) if self.rss_mb else None,
+            "rss_mb_last": round(self.rss_mb[-1], 1) if self.rss_mb else None
+        }
+
+
+class SimulatedClient:
+    """
+    Ein Socket.IO Client (Spieler) in einer Session
+    """
+
+    def __init__(self, client_id: str, session_id: str, latencies: List[float]):
+        self.client_id = client_id
+        self.session_id = session_id
+        self.latencies = latencies
+        self.received = 0
+        self.connect_time = 0.0
+        self.sio = socketio.AsyncClient(reconnection=False)
+        self.joined = asyncio.Event()
+        self.started = asyncio.Event()
+
+        @self.sio.on('joined_lobby')
+        async def on_joined(data):
+            self.joined.set()
+
+        @self.sio.on('game_started')
+        async def on_started(data):
+            self.started.set()
+
+        @self.sio.on('guess_result')
+        async def on_guess_result(data):
+            sent_at = data.get('sent_at') if isinstance(data, dict) else None
+            if sent_at is not None:
+                self.latencies.append(time.perf_counter() - sent_at)
+                self.received += 1
+
+    async def connect_and_join(self, url: str):
+        started = time.perf_counter()
+        await self.sio.connect(url, transports=['websocket'])
+        await self.sio.emit('join_lobby', {
+            'session_id': self.session_id,
+            'player_name': self.client_id
+        })
+        await self.joined.wait()
+        self.connect_time = time.perf_counter() - started
+
+    async def play(self, guesses: int, interval: float):
+        for seq in range(guesses):
+            await self.sio.emit('guess_submitted', {
+                'session_id': self.session_id,
+                'player_id': self.client_id,
+                'seq': seq,
+                'title_guess': 'Bohemian Rhapsody',
+                'sent_at': time.perf_counter()
+            })
+            await asyncio.sleep(interval)
+
+
+def start_local_server(port: int) -> subprocess.Popen:
+    """
+    Server als eigenen Prozess starten (damit CPU/RSS getrennt messbar sind)
+    """
+    backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:socket_app",
+         "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning"],
+        cwd=backend_dir,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL
+    )
+
+
+async def wait_for_server(url: str, timeout: float = 20.0):
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient() as http:
+        while time.monotonic() < deadline:
+            try:
+                if (await http.get(f"{url}/health")).status_code < 500:
+                    return
+            except httpx.TransportError:
+                pass
+            await asyncio.sleep(0.2)
+    raise RuntimeError(f"Server unter {url} nicht erreichbar")
+
+
+async def run(args) -> Dict:
+    server = None
+    url = args.url
+    if url is None:
+        port = free_port()
+        server = start_local_server(port)
+        url = f"http://127.0.0.1:{port}"
+
+    sampler = None
+    try:
+        await wait_for_server(url)
+        if server is not None:
+            sampler = ProcessSampler(server.pid)
+            sampler.start()
+
+        latencies: List[float] = []
+        clients: List[SimulatedClient] = []
+        async with httpx.AsyncClient(base_url=url) as http:
+            session_ids = []
+            for idx in range(args.sessions):
+                response = await http.post('/game/session/create', json={'host_name': f'Load Host {idx}'})
+                session_ids.append(response.json()['session_id'])
+
+            for idx in range(args.clients):
+                session_id = session_ids[idx % len(session_ids)]
+                clients.append(SimulatedClient(f"client-{idx}", session_id, latencies))
+
+            # Verbindungen in Wellen aufbauen (realistischer als alle gleichzeitig)
+            for start in range(0, len(clients), args.connect_batch):
+                await asyncio.gather(*(
+                    client.connect_and_join(url) for client in clients[start:start + args.connect_batch]
+                ))
+
+            # Pro Session startet der erste Client (Host) das Spiel
+            hosts = {}
+            for client in clients:
+                hosts.setdefault(client.session_id, client)
+            for host in hosts.values():
+                await host.sio.emit('start_game', {'session_id': host.session_id})
+            await asyncio.gather(*(client.started.wait() for client in clients))
+
+            play_started = time.perf_counter()
+            await asyncio.gather(*(client.play(args.guesses, args.interval_ms / 1000.0) for client in clients))
+            await asyncio.sleep(args.drain_s)
+            play_elapsed = time.perf_counter() - play_started
+
+            server_metrics = (await http.get('/metrics')).json()
+
+        for client in clients:
+            await client.sio.disconnect()
+
+        per_session = [sum(1 for c in clients if c.session_id == s) for s in session_ids]
+        expected = sum(n * n * args.guesses for n in per_session)
+        received = sum(client.received for client in clients)
+
+        return {
+            "meta": {
+                "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                "python": platform.python_version(),
+                "url": url if args.url else "local"
+            },
+            "config": {
+                "clients": args.clients,
+                "sessions": args.sessions,
+                "guesses": args.guesses,
+                "interval_ms": args.interval_ms
+            },
+            "connect": summarize_ms([c.connect_time for c in clients]),
+            "emit_to_receive": summarize_ms(latencies),
+            "deliveries": {
+                "expected": expected,
+                "received": received,
+                "ratio": round(received / expected, 4) if expected else None,
+                "per_second": round(received / play_elapsed, 1) if play_elapsed else None
+            },
+            "server": sampler.summary() if sampler else None,
+            "server_metrics": server_metrics
+        }
+    finally:
+        if sampler:
+            await sampler.stop()
+        if server is not None:
+            server.terminate()
+            server.wait(timeout=10)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Socket.IO Lastgenerator")
+    parser.add_argument("--clients", type=int, default=100)
+    parser.add_argument("--sessions", type=int, default=10)
+    parser.add_argument("--guesses", type=int, default=20, help="Guesses pro Client")
+    parser.add_argument("--interval-ms", type=float, default=200.0, help="Pause zwischen Guesses")
+    parser.add_argument("--connect-batch", type=int, default=50)
+    parser.add_argument("--drain-s", type=float, default=1.0, help="Wartezeit auf letzte Events")
+    parser.add_argument("--url", help="Bestehenden Server nutzen statt lokal zu starten")
+    parser.add_argument("--out", default="socket_load.json", help="Ergebnis-Datei (JSON)")
+    args = parser.parse_args()
+
+    result = asyncio.run(run(args))
+
+    with open(args.out, "w") as f:
+        json.dump(result, f, indent=2)
+
+    latency = result["emit_to_receive"]
+    print("\n📡 Socket.IO Last")
+    print(f"   Clients/Sessions: {args.clients}/{args.sessions}")
+    print(f"   Connect p50/p99:  {result['connect']['p50_ms']} / {result['connect']['p99_ms']} ms")
+    print(f"   Latenz p50/p99:   {latency['p50_ms']} / {latency['p99_ms']} ms")
+    print(f"   Zustellung:       {result['deliveries']['received']}/{result['deliveries']['expected']}")
+    if result["server"]:
+        print(f"   Server CPU avg:   {result['server']['cpu_percent_avg']} %")
+        print(f"   Server RSS max:   {result['server']['rss_mb_max']} MB")
+    print(f"   → {args.out}")
+
+
+if __name__ == "__main__":
+    main()
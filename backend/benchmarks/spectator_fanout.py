@@ -0,0 +1,152 @@
+"""
+Zuschauer-Fan-out: ein Snapshot an viele Zuschauer
+
+Vergleicht den Fan-out des SpectatorHub (Paket einmal kodiert, direkt in die
+Engine.IO Sende-Queues, Event-Loop alle SPECTATOR_FANOUT_BATCH Sends frei)
+mit sio.emit() (ein Task pro Empfänger - der Fallback ohne _send_eio_packet).
+Engine.IO selbst ist durch einen zählenden Stub ersetzt, gemessen wird also
+nur der Weg bis zur Sende-Queue, auf einem Kern im Hauptprozess:
+
+- fanout_ms: Dauer eines Fan-outs an alle Zuschauer
+- stall_ms:  längste Zeit, in der kein anderer Task lief (Spieler-Events warten)
+
+Start (im backend/ Ordner):
+    python -m benchmarks.spectator_fanout
+    python -m benchmarks.spectator_fanout --spectators 100 1000 5000 --repeats 20 --out fanout.json
+"""
+import argparse
+import asyncio
+import io
+import json
+import time
+from contextlib import redirect_stdout
+from typing import Dict, List
+
+from app.core.config import settings
+from app.services import websocket_service
+from app.services.game_service import game_service
+from app.services.websocket_service import SpectatorHub, sio, spectator_room
+
+from .common import make_tracks, quiet_socketio_logs, summarize_ms
+
+
+def demo_snapshot(players: int, cards: int) -> Dict:
+    """
+    Snapshot einer laufenden Session (Spieler mit je `cards` Timeline-Karten)
+    """
+    session = game_service.create_session("Venue Host", turn_time_limit=0)
+    for idx in range(players - 1):
+        game_service.add_player(session.session_id, f"Spieler {idx}")
+    game_service.set_deck(session.session_id, "pl", make_tracks(200, seed=1))
+    game_service.start_game(session.session_id)
+    tracks = make_tracks(cards, seed=2, prefix="card")
+    for player in game_service.players[session.session_id]:
+        player.timeline = [player.timeline[0].model_copy(update={"title": t.title, "artist": t.artist})
+                           for t in tracks]
+    return SpectatorHub().build_snapshot(session.session_id)
+
+
+async def measure_path(fanout, spectators: int, repeats: int) -> Dict:
+    """
+    `repeats` Fan-outs an `spectators` Zuschauer, dazu ein Task, der Stalls misst
+    """
+    loop = asyncio.get_running_loop()
+    stalls: List[float] = []
+    running = True
+
+    async def ticker():
+        last = loop.time()
+        while running:
+            await asyncio.sleep(0)
+            now = loop.time()
+            stalls.append(now - last)
+            last = now
+
+    task = loop.create_task(ticker())
+    await asyncio.sleep(0)
+    durations = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        await fanout()
+        durations.append(time.perf_counter() - started)
+        await asyncio.sleep(0)
+    running = False
+    await task
+    return {
+        "fanout": summarize_ms(durations),
+        "per_spectator_us": round(sum(durations) / repeats / spectators * 1e6, 3),
+        "stall_max_ms": round(max(stalls) * 1000, 3) if stalls else 0.0
+    }
+
+
+async def measure(spectator_counts: List[int], repeats: int, players: int, cards: int) -> Dict:
+    snapshot = demo_snapshot(players, cards)
+    payload_bytes = len(json.dumps(["spectator_state", snapshot], separators=(",", ":")))
+    sends = {"count": 0}
+
+    async def send_packet(eio_sid, eio_pkt):
+        sends["count"] += 1  # Stub für Engine.IO (keine echten Sockets)
+
+    original_send = sio.eio.send_packet
+    sio.eio.send_packet = send_packet
+    results = []
+    try:
+        for count in spectator_counts:
+            room = spectator_room(f"bench-{count}")
+            sids = [(f"sid-{count}-{idx}", f"eio-{count}-{idx}") for idx in range(count)]
+            for sid, eio_sid in sids:
+                sio.manager.basic_enter_room(sid, "/", room, eio_sid=eio_sid)
+            hub = SpectatorHub()
+
+            sends["count"] = 0
+            shared = await measure_path(lambda: hub._fanout(room, "spectator_state", snapshot), count, repeats)
+            assert sends["count"] == count * repeats
+            sends["count"] = 0
+            emit = await measure_path(lambda: sio.emit("spectator_state", snapshot, room=room), count, repeats)
+            assert sends["count"] == count * repeats
+
+            for sid, _ in sids:
+                sio.manager.basic_leave_room(sid, "/", room)
+            results.append({"spectators": count, "hub": shared, "emit": emit})
+    finally:
+        sio.eio.send_packet = original_send
+
+    return {
+        "config": {"repeats": repeats, "players": players, "cards": cards,
+                   "batch": settings.spectator_fanout_batch,
+                   "direct_send": websocket_service._send_eio_packet is not None},
+        "payload_bytes": payload_bytes,
+        "results": results
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Zuschauer-Fan-out: SpectatorHub vs. sio.emit")
+    parser.add_argument("--spectators", type=int, nargs="+", default=[100, 1000, 5000])
+    parser.add_argument("--repeats", type=int, default=10)
+    parser.add_argument("--players", type=int, default=6)
+    parser.add_argument("--cards", type=int, default=10, help="Timeline-Karten pro Spieler im Snapshot")
+    parser.add_argument("--out", help="Ergebnisse als JSON speichern")
+    args = parser.parse_args()
+
+    quiet_socketio_logs()
+    with redirect_stdout(io.StringIO()):  # GameService loggt jeden Spielzug
+        result = asyncio.run(measure(args.spectators, args.repeats, args.players, args.cards))
+
+    print("\n👀 Zuschauer-Fan-out")
+    print(f"   Snapshot: {result['payload_bytes']} Bytes, Batch {result['config']['batch']}")
+    print(f"   {'Zuschauer':>10s} {'Hub p50':>10s} {'µs/Zusch.':>10s} {'Stall':>9s}"
+          f" {'emit p50':>10s} {'µs/Zusch.':>10s} {'Stall':>9s}")
+    for entry in result["results"]:
+        hub, emit = entry["hub"], entry["emit"]
+        print(f"   {entry['spectators']:>10d} {hub['fanout']['p50_ms']:>8.2f}ms {hub['per_spectator_us']:>10.2f}"
+              f" {hub['stall_max_ms']:>7.2f}ms {emit['fanout']['p50_ms']:>8.2f}ms"
+              f" {emit['per_spectator_us']:>10.2f} {emit['stall_max_ms']:>7.2f}ms")
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(result, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
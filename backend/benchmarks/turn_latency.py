@@ -0,0 +1,114 @@
+"""
+Turn-to-Audio Latenz (End-to-End mit simuliertem Client)
+
+Misst die Zeit vom `POST /game/next` des Hosts bis zum Audio-Start auf dem
+simulierten Playback-Device:
+
+- legacy:   Client wartet auf `new_track`, holt die URI über
+            `/game/current-track/{session_id}` und lädt danach das Audio
+- prefetch: Client bekommt URI + nächste Handles direkt im `new_track` Push
+            und hat das Audio der angekündigten Tracks bereits vorgeladen
+
+Start (im backend/ Ordner):
+    python -m benchmarks.turn_latency --rounds 50 --audio-fetch-ms 150
+"""
+import argparse
+import asyncio
+import json
+
+import httpx
+import socketio
+
+from .common import free_port, make_tracks, quiet_socketio_logs, running_server, summarize_ms
+
+
+async def measure(mode: str, rounds: int, audio_fetch_ms: float, seed: int) -> list:
+    """
+    Spiele `rounds` Züge und messe Turn-to-Audio pro Zug (Sekunden)
+    """
+    from app.services.game_service import game_service
+
+    loop = asyncio.get_running_loop()
+    audio_fetch = audio_fetch_ms / 1000.0
+
+    async with running_server(free_port()) as base_url:
+        session = game_service.create_session(host_name="Bench Host")
+        session_id = session.session_id
+        game_service.track_queues[session_id] = make_tracks(rounds + 10, seed=seed)
+        game_service.start_game(session_id)
+
+        new_tracks: asyncio.Queue = asyncio.Queue()
+        joined = asyncio.Event()
+        prefetched = set()
+
+        client = socketio.AsyncClient()
+
+        @client.on('joined_lobby')
+        async def on_joined(data):
+            joined.set()
+
+        @client.on('new_track')
+        async def on_new_track(data):
+            new_tracks.put_nowait(data)
+
+        await client.connect(base_url, transports=['websocket'])
+        await client.emit('join_lobby', {'session_id': session_id, 'player_name': 'Bench'})
+        await joined.wait()
+
+        latencies = []
+        async with httpx.AsyncClient(base_url=base_url) as http:
+            for _ in range(rounds):
+                started = loop.time()
+                await http.post('/game/next', json={'session_id': session_id})
+                data = await new_tracks.get()
+
+                if mode == 'legacy':
+                    response = await http.get(f'/game/current-track/{session_id}')
+                    uri = response.json()['uri']
+                    await asyncio.sleep(audio_fetch)
+                else:
+                    uri = data['track']['uri']
+                    if uri not in prefetched:
+                        await asyncio.sleep(audio_fetch)
+                    # Vorladen passiert zwischen den Zügen, nicht im kritischen Pfad
+                    prefetched.update(handle['uri'] for handle in data['upcoming'])
+
+                latencies.append(loop.time() - started)
+
+        await client.disconnect()
+        game_service.delete_session(session_id)
+
+    return latencies
+
+
+async def run(args) -> dict:
+    results = {}
+    for mode in ('legacy', 'prefetch'):
+        latencies = await measure(mode, args.rounds, args.audio_fetch_ms, args.seed)
+        results[mode] = summarize_ms(latencies[1:])  # Erster Zug ohne Vorladen
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Turn-to-Audio Latenz messen")
+    parser.add_argument("--rounds", type=int, default=50)
+    parser.add_argument("--audio-fetch-ms", type=float, default=150.0,
+                        help="Simulierte Ladezeit des Audios auf dem Playback-Device")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--out", help="Ergebnisse als JSON speichern")
+    args = parser.parse_args()
+
+    quiet_socketio_logs()
+    results = asyncio.run(run(args))
+
+    print("\n⏱️  Turn-to-Audio Latenz")
+    for mode, summary in results.items():
+        print(f"   {mode:9s} p50={summary['p50_ms']:8.2f} ms  p99={summary['p99_ms']:8.2f} ms")
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
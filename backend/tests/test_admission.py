@@ -0,0 +1,169 @@
+"""
+Tests für Admission Control (Loop-Lag EWMA, Verzögern/Ablehnen, /health bei Überlast)
+"""
+import sys
+import os
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from app.core.admission import AdmissionControlMiddleware, admission_stats
+from app.core.config import settings
+from app.services.loop_monitor import LoopLagMonitor
+
+
+@pytest.fixture
+def thresholds(monkeypatch):
+    monkeypatch.setattr(settings, "loop_lag_defer_ms", 50.0)
+    monkeypatch.setattr(settings, "loop_lag_shed_ms", 200.0)
+    monkeypatch.setattr(settings, "loop_lag_max_defer_ms", 200)
+    monkeypatch.setattr(settings, "low_priority_paths", "/playlist/search, /game/lobbies")
+
+
+async def ok_app(scope, receive, send):
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b"ok"})
+
+
+def test_ewma_rises_fast_falls_slow_and_sets_level(thresholds):
+    monitor = LoopLagMonitor()
+    assert monitor.level == "ok"
+
+    monitor.record(120.0)  # steigt mit RISE=0,5
+    assert monitor.lag_ms == pytest.approx(60.0) and monitor.level == "defer"
+    monitor.record(400.0)
+    assert monitor.lag_ms == pytest.approx(230.0) and monitor.level == "shed"
+    assert monitor.snapshot()["max_ms"] == 400.0
+
+    monitor.record(0.0)  # fällt mit FALL=0,1 - ein guter Wert reicht nicht
+    assert monitor.lag_ms == pytest.approx(207.0) and monitor.level == "shed"
+    for _ in range(3):
+        monitor.record(0.0)
+    assert monitor.level == "defer"  # 150,9 ms
+    for _ in range(11):
+        monitor.record(0.0)
+    assert monitor.level == "ok" and not monitor.should_defer()
+
+
+def test_middleware_defers_and_sheds_only_low_priority_paths(thresholds):
+    monitor = LoopLagMonitor()
+    client = httpx.AsyncClient(transport=httpx.ASGITransport(app=AdmissionControlMiddleware(ok_app, monitor)),
+                               base_url="http://test")
+
+    async def timed(path):
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        response = await client.get(path)
+        return response, loop.time() - started
+
+    async def recover_after(seconds):
+        await asyncio.sleep(seconds)
+        monitor.lag_ms = 0.0
+
+    async def scenario():
+        before = dict(admission_stats)
+        results = {}
+
+        monitor.lag_ms = 100.0  # defer
+        results["game"] = await timed("/game/place")  # Spielzug: nie betroffen
+        results["timeout"] = await timed("/game/lobbies")  # bleibt verzögert: nach max. Wartezeit durch
+        recovery = asyncio.get_running_loop().create_task(recover_after(0.1))
+        results["recovered"] = await timed("/playlist/search?q=abba")
+        await recovery
+
+        monitor.lag_ms = 500.0  # shed
+        results["shed"] = await timed("/game/lobbies/open")
+        results["shed_game"] = await timed("/game/place")
+        results["other_prefix"] = await timed("/playlist/load")  # kein Prefix-Treffer
+        await client.aclose()
+        return results, {key: admission_stats[key] - before[key] for key in admission_stats}
+
+    results, stats = asyncio.run(scenario())
+    game, game_s = results["game"]
+    assert game.status_code == 200 and game_s < 0.05
+
+    timeout, timeout_s = results["timeout"]
+    assert timeout.status_code == 200 and 0.2 <= timeout_s < 0.5
+
+    recovered, recovered_s = results["recovered"]
+    assert recovered.status_code == 200 and 0.1 <= recovered_s < 0.2
+
+    shed, shed_s = results["shed"]
+    assert shed.status_code == 503 and shed_s < 0.05
+    assert shed.headers["retry-after"] == "1" and "ausgelastet" in shed.json()["detail"]
+    assert results["shed_game"][0].status_code == 200
+    assert results["other_prefix"][0].status_code == 200
+    assert stats == {"deferred": 2, "shed": 1}
+
+
+def test_deferred_request_is_shed_when_lag_keeps_rising(thresholds):
+    monitor = LoopLagMonitor()
+    monitor.lag_ms = 100.0
+    middleware = AdmissionControlMiddleware(ok_app, monitor)
+
+    async def overload():
+        await asyncio.sleep(0.06)
+        monitor.lag_ms = 300.0
+
+    async def scenario():
+        task = asyncio.get_running_loop().create_task(overload())
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=middleware), base_url="http://test") as http:
+            response = await http.get("/playlist/search")
+        await task
+        return response
+
+    assert asyncio.run(scenario()).status_code == 503
+
+
+def test_defer_wait_counts_real_time_under_lag(thresholds):
+    monitor = LoopLagMonitor()
+    monitor.lag_ms = 100.0  # bleibt verzögert, erholt sich nie
+    middleware = AdmissionControlMiddleware(ok_app, monitor)
+
+    async def scenario():
+        loop = asyncio.get_running_loop()
+        done = False
+
+        async def blocker():
+            # Genau der Lag, der verzögert: jeder Loop-Durchlauf hängt 80 ms
+            while not done:
+                time.sleep(0.08)
+                await asyncio.sleep(0)
+
+        task = loop.create_task(blocker())
+        started = loop.time()
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=middleware), base_url="http://test") as http:
+            response = await http.get("/playlist/search")
+        waited = loop.time() - started
+        done = True
+        await task
+        return response, waited
+
+    response, waited = asyncio.run(scenario())
+    assert response.status_code == 200
+    # max. 200 ms + ein Loop-Durchlauf (Schritte zählen: >= 4 * 130 ms)
+    assert waited < 0.4
+
+
+def test_health_reports_503_while_shedding(thresholds, monkeypatch):
+    from app.main import app
+    from app.services.loop_monitor import loop_monitor
+
+    async def health():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as http:
+            return await http.get("/health")
+
+    monkeypatch.setattr(loop_monitor, "lag_ms", 100.0)
+    response = asyncio.run(health())
+    assert response.status_code == 200 and response.json()["load_level"] == "defer"
+
+    monkeypatch.setattr(loop_monitor, "lag_ms", 250.0)
+    response = asyncio.run(health())
+    assert response.status_code == 503
+    assert response.json()["status"] == "overloaded" and response.json()["loop_lag_ms"] == 250.0
@@ -0,0 +1,147 @@
+"""
+Tests für den Deck Builder (mehrere Playlists, Duplikat-Filter)
+"""
+import sys
+import os
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import asyncio
+import threading
+import time
+
+import httpx
+
+from app.services import playlist_loader as loader_module
+from app.services.deck_builder import DeckBuilder, parse_year, strip_version
+from app.services.game_service import GameService, game_service
+from app.services.playlist_loader import PlaylistLoader
+from benchmarks.common import make_tracks, synthetic_spotify
+
+
+def test_parse_year():
+    assert parse_year("1994-08-23") == 1994
+    assert parse_year("1994-08") == 1994
+    assert parse_year("1994") == 1994
+    for invalid in (None, "", "0000", "19", "unknown", "9999-01-01"):
+        assert parse_year(invalid) is None
+
+
+def test_strip_version():
+    assert strip_version("Bohemian Rhapsody - Remastered 2011") == "Bohemian Rhapsody"
+    assert strip_version("Heroes - 2017 Remaster") == "Heroes"
+    assert strip_version("Hey Jude (Remastered 2015) [Stereo]") == "Hey Jude"
+    assert strip_version("Something - Single Version") == "Something"
+    assert strip_version("Song - Live") == "Song - Live"
+    assert strip_version("Version") == "Version"
+    assert strip_version("Song - Live - 2011 Remaster") == "Song - Live"
+    assert strip_version("Song - Re-Edit") == "Song"
+
+
+def test_strip_version_is_linear_on_long_titles():
+    # Viele " - " ohne Stichwort: früher exponentielles Backtracking im Regex
+    title = " - ".join(f"Teil {idx}" for idx in range(5000))
+    started = time.perf_counter()
+    assert strip_version(title) == title
+    assert strip_version(title + " - Remastered") == title
+    assert time.perf_counter() - started < 0.1
+
+
+def test_duplicates_by_id_and_by_title():
+    original, other = make_tracks(2, seed=1)
+    remaster = original.model_copy(update={
+        "track_id": "remaster",
+        "title": f"{original.title} - Remastered 2011",
+        "artist": f"{original.artist.upper()}, Guest"
+    })
+    broken = other.model_copy(update={"track_id": "broken", "title": "Broken", "release_date": "0000"})
+
+    builder = DeckBuilder(["a", "b"])
+    kept = builder.filter([original, other, original, remaster, broken])
+
+    assert kept == [original, other]
+    assert builder.stats == {"accepted": 2, "duplicate_ids": 1, "duplicate_titles": 1, "invalid_dates": 1,
+                             "bad_years": 0}
+    assert builder.rejected == 3
+
+
+def test_load_playlists_merges_without_duplicates():
+    service = GameService()
+    session = service.create_session("Host", turn_time_limit=0)
+
+    with synthetic_spotify(120, seed=4) as spotify:
+        shared = spotify.get_playlist_tracks("a").tracks[:30]
+        spotify.get_playlist_tracks("b").tracks[:30] = shared
+        count = service.load_playlists(session.session_id, ["a", "b"])
+
+    deck = service.track_queues[session.session_id]
+    assert count == len(deck) == 210
+    assert len({track.track_id for track in deck}) == 210
+    assert session.playlist_ids == ["a", "b"]
+    assert service.deck_builders[session.session_id].stats["duplicate_ids"] == 30
+
+
+def test_streaming_merge_filters_late_duplicates(monkeypatch):
+    async def fake_broadcast(session_id, event, data):
+        events.append((event, data))
+
+    events = []
+    monkeypatch.setattr(loader_module, "broadcast_to_session", fake_broadcast)
+    loader = PlaylistLoader()
+
+    async def scenario():
+        session = game_service.create_session("Host", turn_time_limit=0)
+        session_id = session.session_id
+
+        result = await loader.load(session_id, ["x", "x-copy"])
+        assert result["expected_total"] == 600
+        assert result["loading"]
+
+        await loader.tasks[session_id]
+        deck = game_service.track_queues[session_id]
+        assert len({track.track_id for track in deck}) == len(deck) == 300
+        game_service.delete_session(session_id)
+
+    with synthetic_spotify(300, seed=8) as spotify:
+        # Zweite Playlist = gleiche Songs unter anderen IDs (z.B. Remaster-Compilation)
+        copy = spotify.get_playlist_tracks("x-copy")
+        copy.tracks[:] = [
+            track.model_copy(update={"track_id": f"copy{idx}", "title": f"{track.title} - Remastered"})
+            for idx, track in enumerate(spotify.get_playlist_tracks("x").tracks)
+        ]
+        asyncio.run(scenario())
+
+    event, data = events[-1]
+    assert event == "playlist_loaded"
+    assert data["playlist_ids"] == ["x", "x-copy"]
+    assert data["total_tracks"] == 300
+    assert data["skipped"] == 300
+
+
+def test_non_streaming_load_sets_deck_on_event_loop(monkeypatch):
+    from app.main import app
+
+    threads = []
+    set_deck = game_service.set_deck
+
+    def recording_set_deck(*args, **kwargs):
+        threads.append(threading.get_ident())
+        return set_deck(*args, **kwargs)
+
+    monkeypatch.setattr(game_service, "set_deck", recording_set_deck)
+    session = game_service.create_session("Host", turn_time_limit=0)
+
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as http:
+            return await http.post("/game/session/playlist/load", json={
+                "session_id": session.session_id, "playlist_ids": ["a", "b"], "streaming": False
+            })
+
+    with synthetic_spotify(120, seed=6):
+        response = asyncio.run(run())
+
+    assert response.status_code == 200
+    assert response.json()["track_count"] == len(game_service.track_queues[session.session_id]) > 200
+    assert threads == [threading.get_ident()]  # Spotify im Threadpool, set_deck im Event-Loop
+    game_service.delete_session(session.session_id)
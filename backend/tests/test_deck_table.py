@@ -0,0 +1,93 @@
+"""
+Tests für die Jahr/Jahrzehnt-Spalten und die Deck-Statistik
+"""
+import sys
+import os
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import statistics
+import time
+from collections import Counter
+
+import pytest
+
+from app.models.game import GuessRequest
+from app.services.deck_table import DeckTable, parse_decade
+from app.services.game_service import GameService
+from benchmarks.common import make_tracks
+
+
+def test_parse_decade():
+    assert parse_decade("1980er") == 1980
+    assert parse_decade("1984") == 1980
+    assert parse_decade("80er") == 1980
+    assert parse_decade("80's") == 1980
+    assert parse_decade("00er") == 2000
+    assert parse_decade(" 2010s ") == 2010
+    for invalid in (None, "", "achtziger", "198"):
+        assert parse_decade(invalid) is None
+
+
+def test_columns_match_release_dates():
+    tracks = make_tracks(500, seed=11)
+    table = DeckTable(tracks)
+
+    assert len(table) == 500
+    for track in tracks:
+        year = int(track.release_date[:4])
+        assert table.year(track) == year
+        assert table.decade(track) == (year // 10) * 10
+    assert len(table) == 500  # kein erneutes Einlesen
+
+
+def test_invalid_year_is_rejected():
+    track = make_tracks(1, seed=1)[0].model_copy(update={"release_date": "unknown"})
+    with pytest.raises(ValueError):
+        DeckTable([track])
+
+
+def test_stats_match_reference():
+    tracks = make_tracks(2000, seed=12)
+    years = [int(track.release_date[:4]) for track in tracks]
+    stats = DeckTable(tracks).stats()
+    counts = Counter(years)
+
+    assert stats["track_count"] == 2000
+    assert stats["spread"] == max(years) - min(years)
+    assert stats["median_year"] == statistics.median_low(years)
+    assert stats["stdev"] == round(statistics.pstdev(years), 2)
+    assert stats["histogram"] == {str(year): n for year, n in sorted(counts.items())}
+    assert sum(stats["decades"].values()) == 2000
+    same_year = sum(n * (n - 1) for n in counts.values()) / (2000 * 1999)
+    assert stats["duplicate_year_density"] == round(same_year, 4)
+
+
+def test_stats_for_large_deck_are_fast():
+    table = DeckTable(make_tracks(10_000, seed=13))
+    started = time.perf_counter()
+    stats = table.stats()
+    assert time.perf_counter() - started < 0.05
+    assert stats["track_count"] == 10_000
+
+
+def test_decade_guess_uses_integer_decade():
+    service = GameService()
+    session = service.create_session("Host", turn_time_limit=0)
+    service.set_deck(session.session_id, "pl", make_tracks(20, seed=14))
+    host = service.players[session.session_id][0]
+    solution = service.track_queues[session.session_id][0]
+    service.solutions[session.session_id] = solution
+    decade = (int(solution.release_date[:4]) // 10) * 10
+
+    result = service.check_guess(GuessRequest(
+        session_id=session.session_id,
+        player_id=host.player_id,
+        decade_guess=f"{decade % 100:02d}er"
+    ))
+    assert result.correct_decade
+    assert result.correct_answers["decade"] == solution.decade
+
+    stats = service.get_deck_stats(session.session_id)
+    assert stats["track_count"] == 20
@@ -0,0 +1,119 @@
+"""
+Tests für Event Log, Snapshots & Replay
+"""
+import sys
+import os
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import random
+
+from app.models.game import GameMode
+from app.services.event_log import DELETED_MARKER, EventLog, EventType, iter_events, list_segments, list_snapshots
+from app.services.game_service import GameService
+from app.services.snapshot import recover, replay_session
+from benchmarks.common import make_tracks, synthetic_spotify
+from benchmarks.simulate_games import Timer, play_game
+
+
+def new_stats():
+    return {"games": 0, "rounds": 0, "guesses": 0, "correct_titles": 0, "placements": 0,
+            "correct_placements": 0, "wins": {mode.value: 0 for mode in GameMode}}
+
+
+def dump(service: GameService, session_id: str):
+    """Vergleichbarer Zustand einer Session (Models als Dicts)"""
+    solution = service.solutions.get(session_id)
+    return {
+        "session": service.sessions[session_id].model_dump(),
+        "players": [player.model_dump() for player in service.players[session_id]],
+        "deck": [track.model_dump() for track in service.track_queues.get(session_id, [])],
+        "solution": solution.model_dump() if solution else None
+    }
+
+
+def test_recover_rebuilds_identical_sessions(tmp_path):
+    log = EventLog(str(tmp_path), segment_bytes=4096, snapshot_every=25)
+    service = GameService(event_log=log)
+    rng = random.Random(3)
+    random.seed(3)
+
+    with synthetic_spotify(60, seed=3):
+        kept = [
+            play_game(service, rng, Timer(), mode, 3, f"pl-{idx}", 40, new_stats(), delete=False)
+            for idx, mode in enumerate(GameMode)
+        ]
+        deleted = play_game(service, rng, Timer(), GameMode.ORIGINAL, 2, "pl-x", 40, new_stats())
+
+        # Nachgeladene Page mitten im Spiel, Spieler verlässt die Session
+        waiting = service.create_session("Host", turn_time_limit=30)
+        service.add_player(waiting.session_id, "Gast")
+        leaving = service.add_player(waiting.session_id, "Geht")
+        service.load_playlist(waiting.session_id, "pl-w")
+        service.start_game(waiting.session_id)
+        service.extend_deck(waiting.session_id, make_tracks(30, seed=8, prefix="late"))
+        service.remove_player(waiting.session_id, leaving.player_id)
+        service.next_track(waiting.session_id)
+        kept.append(waiting.session_id)
+
+    log.close_all()
+    assert any(len(list_segments(log.session_dir(sid))) > 1 for sid in kept)
+    assert any(list_snapshots(log.session_dir(sid)) for sid in kept)
+
+    restored_service = GameService(event_log=EventLog(str(tmp_path)))
+    restored = recover(restored_service, restored_service.event_log)
+
+    assert sorted(restored) == sorted(kept)
+    assert deleted not in restored_service.sessions
+    for session_id in kept:
+        assert dump(restored_service, session_id) == dump(service, session_id)
+
+    # Wiederhergestellte Session spielt weiter und loggt in ein neues Segment
+    session_id = waiting.session_id
+    segments = list_segments(log.session_dir(session_id))
+    restored_service.next_track(session_id)
+    assert list_segments(log.session_dir(session_id))[-1][0] == segments[-1][0] + 1
+
+
+def test_torn_record_at_segment_end_is_ignored(tmp_path):
+    log = EventLog(str(tmp_path))
+    service = GameService(event_log=log)
+    session = service.create_session("Host", turn_time_limit=0)
+    service.set_deck(session.session_id, "pl", make_tracks(10, seed=4))
+    service.start_game(session.session_id)
+    log.close_all()
+
+    (_, path), = list_segments(log.session_dir(session.session_id))
+    with open(path, "ab") as f:
+        f.write(bytes([EventType.GUESS, 17, 0, 0, 0]) + b"\x01" * 5)  # halber Record
+
+    state = replay_session(log.session_dir(session.session_id))
+    assert state.session["status"] == "playing"
+    assert [event for event, _ in iter_events(log.session_dir(session.session_id))] == [
+        EventType.SESSION_CREATED, EventType.PLAYER_JOINED, EventType.DECK_SET, EventType.GAME_STARTED
+    ]
+
+
+def test_delete_on_snapshot_boundary(tmp_path):
+    # SESSION_DELETED ist das 4. Event - fällig wäre ein Snapshot der schon entfernten Session
+    log = EventLog(str(tmp_path), snapshot_every=4)
+    service = GameService(event_log=log)
+    session = service.create_session("Host", turn_time_limit=0)
+    service.add_player(session.session_id, "Gast")
+    assert service.delete_session(session.session_id)
+
+    directory = log.session_dir(session.session_id)
+    assert os.path.exists(os.path.join(directory, DELETED_MARKER))
+    assert list_snapshots(directory) == []
+    assert recover(GameService(event_log=EventLog(str(tmp_path))), log) == []
+
+
+def test_disabled_log_writes_nothing():
+    log = EventLog("")
+    service = GameService(event_log=log)
+    session = service.create_session("Host", turn_time_limit=0)
+    service.set_deck(session.session_id, "pl", make_tracks(5, seed=1))
+    service.start_game(session.session_id)
+    assert log.stats["events"] == 0
+    assert log.session_ids() == []
@@ -0,0 +1,91 @@
+"""
+Tests für den Export beendeter Spiele (Arrow IPC, Hintergrund-Thread)
+"""
+import sys
+import os
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import random
+
+from app.models.game import GameMode
+from app.services.game_export import GameExporter, aggregate, list_files, read_table
+from app.services.game_service import GameService
+from benchmarks.common import synthetic_spotify
+from benchmarks.simulate_games import Timer, play_game
+
+
+def play(exporter: GameExporter, games: int, seed: int = 7):
+    service = GameService(exporter=exporter)
+    rng = random.Random(seed)
+    random.seed(seed)
+    stats = {"games": 0, "rounds": 0, "guesses": 0, "correct_titles": 0, "placements": 0,
+             "correct_placements": 0, "wins": {mode.value: 0 for mode in GameMode}}
+    modes = list(GameMode)
+    with synthetic_spotify(60, seed=seed):
+        for idx in range(games):
+            play_game(service, rng, Timer(), modes[idx % len(modes)], 3, f"pl-{idx % 3}", 200, stats)
+    return service, stats
+
+
+def test_finished_games_are_exported_in_batches(tmp_path):
+    exporter = GameExporter(str(tmp_path), batch_games=3, flush_seconds=60)
+    service, stats = play(exporter, games=8)
+    exporter.stop()
+
+    assert service.game_records == {}
+    assert exporter.stats["games"] == 8
+    assert exporter.stats["batches"] == 3  # 3 + 3 + Rest beim Stop
+
+    games = read_table(str(tmp_path), "games")
+    placements = read_table(str(tmp_path), "placements")
+    guesses = read_table(str(tmp_path), "guesses")
+    assert games.num_rows == 8
+    assert placements.num_rows == stats["placements"]
+    assert guesses.num_rows == stats["guesses"]
+    assert sum(games["correct_placements"].to_pylist()) == stats["correct_placements"]
+    assert sum(games.column("reason").to_pylist().count(reason) for reason in ("won", "deck_exhausted")) == 8
+
+    summary = aggregate(str(tmp_path), min_placements=1)
+    assert set(summary["game_length_by_mode"]) == {mode.value for mode in GameMode}
+    assert set(summary["guess_accuracy_by_mode"]) == {mode.value for mode in GameMode}
+    assert summary["hardest_tracks"][0]["correct_mean"] <= summary["hardest_tracks"][-1]["correct_mean"]
+
+
+def test_files_rotate_and_torn_tail_is_readable(tmp_path):
+    exporter = GameExporter(str(tmp_path), batch_games=1, rotate_bytes=1)
+    play(exporter, games=4, seed=9)
+    exporter.stop()
+
+    files = list_files(str(tmp_path), "games")
+    assert len(files) == 4  # jede Datei nach dem ersten Batch voll
+    with open(files[-1], "r+b") as f:
+        f.truncate(os.path.getsize(files[-1]) - 10)
+    assert read_table(str(tmp_path), "games").num_rows == 3
+
+
+def test_flush_writes_pending_games(tmp_path):
+    exporter = GameExporter(str(tmp_path), batch_games=100, flush_seconds=60)
+    play(exporter, games=2, seed=3)
+    assert exporter.flush()
+    assert read_table(str(tmp_path), "games").num_rows == 2
+    exporter.stop()
+
+
+def test_report_reads_all_shard_directories(tmp_path):
+    directory = str(tmp_path / "exports")
+    for shard, games in ((0, 2), (1, 3)):
+        # Wie settings.shard_path(GAME_EXPORT_DIR) im Worker mit SHARD_INDEX=shard
+        exporter = GameExporter(f"{directory}.shard-{shard}", batch_games=100, flush_seconds=60)
+        play(exporter, games=games, seed=shard + 1)
+        exporter.stop()
+
+    assert not os.path.exists(directory)  # nur exports.shard-0 & exports.shard-1
+    assert read_table(directory, "games").num_rows == 5
+    assert aggregate(directory, min_placements=1)["games"] == 5
+
+
+def test_disabled_export_records_nothing():
+    service, _ = play(GameExporter(""), games=2)
+    assert service.game_records == {}
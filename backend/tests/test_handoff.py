@@ -0,0 +1,112 @@
+"""
+Tests für Drain & Handoff beim Neustart
+"""
+import sys
+import os
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import asyncio
+import random
+from datetime import timedelta
+
+import httpx
+
+from app.models.game import GameMode
+from app.services.game_service import GameService
+from app.services.handoff import Handoff
+from app.services.snapshot import player_fields, session_fields
+from benchmarks.common import synthetic_spotify
+from benchmarks.simulate_games import Timer, play_game
+
+
+def play(service: GameService, games: int, seed: int = 4):
+    rng = random.Random(seed)
+    random.seed(seed)
+    stats = {"games": 0, "rounds": 0, "guesses": 0, "correct_titles": 0, "placements": 0,
+             "correct_placements": 0, "wins": {mode.value: 0 for mode in GameMode}}
+    modes = list(GameMode)
+    with synthetic_spotify(50, seed=seed):
+        # Wenige Züge: Spiele laufen beim Handoff noch
+        return [play_game(service, rng, Timer(), modes[idx % len(modes)], 3, f"pl-{idx % 2}",
+                          idx % 7, stats, delete=False)
+                for idx in range(games)]
+
+
+def test_sessions_survive_handoff(tmp_path):
+    old = GameService()
+    session_ids = play(old, games=12)
+    lobby = old.create_session("Lobby Host", turn_time_limit=0)
+    for session_id in session_ids[:4]:
+        old.sessions[session_id].turn_deadline = old.sessions[session_id].started_at + timedelta(seconds=60)
+
+    path = str(tmp_path / "handoff.bin")
+    stats = Handoff(path).write(old)
+    assert stats["written_sessions"] == 13
+
+    new = GameService()
+    restored = Handoff(path).restore(new)
+    assert sorted(restored) == sorted(session_ids + [lobby.session_id])
+    assert not os.path.exists(path)  # nur einmal laden
+
+    for session_id in restored:
+        before, after = session_fields(old.sessions[session_id]), session_fields(new.sessions[session_id])
+        if before["turn_deadline"]:
+            assert after.pop("turn_deadline") >= before.pop("turn_deadline")  # Neustart zählt nicht
+        assert after == before
+        assert [player_fields(p) for p in new.players[session_id]] == \
+            [player_fields(p) for p in old.players[session_id]]
+        assert [t.track_id for t in new.track_queues.get(session_id, [])] == \
+            [t.track_id for t in old.track_queues.get(session_id, [])]
+        if session_id in old.solutions:
+            assert new.solutions[session_id] == old.solutions[session_id]
+
+    # Gleiche Playlist -> gemeinsame Track-Objekte
+    first, second = session_ids[0], session_ids[2]
+    shared = {id(t) for t in new.track_queues[first]} & {id(t) for t in new.track_queues[second]}
+    assert shared
+
+
+def test_stale_or_broken_handoff_is_ignored(tmp_path):
+    path = str(tmp_path / "handoff.bin")
+    old = GameService()
+    play(old, games=2)
+    Handoff(path).write(old)
+    assert Handoff(path, max_age_s=-1).restore(GameService()) == []
+    assert not os.path.exists(path)
+
+    with open(path, "wb") as f:
+        f.write(b"kein zlib")
+    assert Handoff(path).restore(GameService()) == []
+
+
+def test_draining_rejects_new_lobbies_and_keeps_players():
+    from app.main import app
+    from app.services import websocket_service
+    from app.services.game_service import game_service
+    from app.services.handoff import handoff
+
+    session = game_service.create_session("Host", turn_time_limit=0)
+    host_id = game_service.players[session.session_id][0].player_id
+    websocket_service.player_sessions["sid-drain"] = session.session_id
+    websocket_service.player_ids["sid-drain"] = host_id
+
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as http:
+            assert (await http.post("/game/session/create", json={"host_name": "Neu"})).status_code == 503
+            health = await http.get("/health")
+            assert health.status_code == 503
+            assert health.json()["status"] == "draining"
+        await websocket_service.disconnect("sid-drain")
+
+    handoff.begin_drain()
+    try:
+        asyncio.run(run())
+    finally:
+        handoff.draining = False
+
+    # Host-Socket weg, Session & Spieler bleiben für den Handoff
+    assert "sid-drain" not in websocket_service.player_sessions
+    assert game_service.players[session.session_id][0].player_id == host_id
+    game_service.delete_session(session.session_id)
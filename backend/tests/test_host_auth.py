@@ -0,0 +1,74 @@
+"""
+Tests für den Host-Nachweis (host_token, signierter OAuth state, /auth & /playlist)
+"""
+import sys
+import os
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import asyncio
+from urllib.parse import parse_qs, urlparse
+
+import httpx
+
+from app.core.host_auth import host_token, oauth_state, owner_from_state, verify_host_token
+from app.main import app
+from app.services.game_service import game_service
+from app.services.spotify_service import spotify_service
+
+
+def request(method, url, **kwargs):
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as http:
+            return await http.request(method, url, **kwargs)
+
+    return asyncio.run(run())
+
+
+def test_tokens_and_state_are_bound_to_the_session():
+    assert verify_host_token("s1", host_token("s1"))
+    assert not verify_host_token("s2", host_token("s1"))
+    assert not verify_host_token("s1", None)
+    assert not verify_host_token("s1", "ä")
+
+    assert owner_from_state(oauth_state("s1")) == "s1"
+    assert owner_from_state("s1") is None
+    assert owner_from_state("s2." + oauth_state("s1").split(".")[1]) is None
+    assert owner_from_state(host_token("s1")) is None
+
+
+def test_only_the_host_can_bind_a_spotify_login(monkeypatch):
+    created = request("POST", "/game/session/create", json={"host_name": "Host"}).json()
+    session_id, token = created["session_id"], created["host_token"]
+    assert created["host_player_id"] and verify_host_token(session_id, token)
+
+    # Mitspieler kennen die session_id, aber nicht den host_token
+    assert request("GET", "/auth/login", params={"owner": session_id}).status_code == 403
+    assert request("GET", "/auth/login", params={"owner": session_id},
+                   headers={"X-Host-Token": host_token("andere")}).status_code == 403
+    assert request("POST", "/auth/set-token", params={"access_token": "t", "owner": session_id}).status_code == 403
+    assert request("POST", "/auth/set-token", params={"access_token": "t"},
+                   headers={"X-Host-Token": token}).status_code == 422
+    assert request("GET", "/playlist/search/tracks", params={"query": "abba", "owner": session_id}).status_code == 403
+
+    login = request("GET", "/auth/login", params={"owner": session_id}, headers={"X-Host-Token": token})
+    assert login.status_code == 200
+    state = parse_qs(urlparse(login.json()["auth_url"]).query)["state"][0]
+    assert state != session_id and owner_from_state(state) == session_id
+
+    # Callback: Owner nur aus dem signierten state
+    bound = []
+    monkeypatch.setattr(spotify_service, "authenticate_with_code",
+                        lambda code, owner: bound.append(owner) or {"access_token": "a", "expires_in": 3600})
+    assert request("GET", "/auth/callback", params={"code": "c", "state": session_id}).status_code == 400
+    assert request("GET", "/auth/callback", params={"code": "c"}).status_code == 400
+    callback = request("GET", "/auth/callback", params={"code": "c", "state": state})
+    assert callback.status_code == 200 and callback.json()["owner"] == session_id
+    assert bound == [session_id]
+
+    assert request("POST", "/auth/set-token", params={"access_token": "t", "owner": session_id},
+                   headers={"X-Host-Token": token}).status_code == 200
+    assert spotify_service.pool.get(session_id) is not spotify_service.pool.get("gast")
+    spotify_service.release_client(session_id)
+    game_service.delete_session(session_id)
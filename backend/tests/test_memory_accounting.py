@@ -0,0 +1,160 @@
+"""
+Tests für Memory Accounting (Bytes pro Session, Kapazität, /admin/memory)
+"""
+import sys
+import os
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import asyncio
+import tracemalloc
+
+import httpx
+import pytest
+
+from app.core.config import settings
+from app.models.game import PlacementRequest
+from app.services.game_service import GameService
+from app.services.memory_accounting import MemoryAccounting
+from benchmarks.common import make_tracks
+
+
+def no_sockets(session_id):
+    return 0, 0
+
+
+def test_report_splits_parts_and_remeasures_only_changes(monkeypatch):
+    monkeypatch.setattr(settings, "memory_measure_budget_ms", 10_000.0)  # alles sofort messen
+    service = GameService()
+    accounting = MemoryAccounting(service, socket_bytes=no_sockets)
+
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    sessions = []
+    for idx in range(20):
+        session = service.create_session(f"Host {idx}", turn_time_limit=0)
+        service.add_player(session.session_id, "Gast")
+        service.set_deck(session.session_id, "pl", make_tracks(300, seed=idx, prefix=f"m{idx}"))
+        sessions.append(session.session_id)
+    retained = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+
+    report = accounting.report(top=3)
+    assert report["sessions"] == 20 and report["tracks"] == 6000
+    assert report["by_status"] == {"waiting": {"sessions": 20, "bytes": report["bytes"]["total"]}}
+    timelines = report["bytes"]["timelines"]  # nur leere Listen
+    assert timelines < report["bytes"]["players"]
+    assert report["bytes"]["deck"] > 10 * report["bytes"]["players"]
+    # Schätzung liegt nah an dem, was tracemalloc für die Sessions sieht
+    assert 0.8 < report["bytes"]["total"] / retained < 1.3
+    assert len(report["largest"]) == 3
+
+    # Eine Karte platziert: nur Spieler & Timelines dieser Session neu gemessen
+    service.start_game(sessions[0])
+    measured = accounting.stats["measured"]
+    host = service.players[sessions[0]][0]
+    service.place_card_in_timeline(PlacementRequest(session_id=sessions[0], player_id=host.player_id,
+                                                    position=0))
+    report = accounting.report()
+    assert accounting.stats["measured"] - measured == 1
+    assert report["bytes"]["timelines"] > timelines
+    assert report["by_status"]["playing"]["sessions"] == 1
+
+    service.delete_session(sessions[1])
+    assert accounting.report()["sessions"] == 19
+
+
+def test_measure_budget_estimates_the_rest(monkeypatch):
+    service = GameService()
+    accounting = MemoryAccounting(service, socket_bytes=no_sockets)
+    for idx in range(5):
+        session = service.create_session(f"Host {idx}", turn_time_limit=0)
+        service.set_deck(session.session_id, "pl", make_tracks(200, seed=idx, prefix=f"b{idx}"))
+    monkeypatch.setattr(settings, "memory_measure_budget_ms", 10_000.0)
+    exact = accounting.report()["bytes"]["deck"]
+
+    for session_id in list(service.sessions):
+        service.extend_deck(session_id, make_tracks(50, seed=99, prefix=f"x{session_id}"))
+    monkeypatch.setattr(settings, "memory_measure_budget_ms", 0.0)
+    report = accounting.report()
+    assert all(entry["estimated"] for entry in report["largest"])
+    assert report["accounting"]["estimated"] >= 5
+    # Schätzung über die bisher gemessenen Bytes pro Track
+    assert report["bytes"]["deck"] == pytest.approx(exact * 250 / 200, rel=0.05)
+
+
+def test_capacity_projection_and_admin_endpoint(monkeypatch):
+    from app.main import app
+    from app.services.game_service import game_service
+
+    accounting = MemoryAccounting(GameService(), socket_bytes=no_sockets)
+    projection = accounting.capacity(playlist_size=500, players=4, budget_mb=256, cards=10)
+    unit = projection["per_unit"]
+    assert unit["source"] == "sample"
+    assert projection["per_session_bytes"] == \
+        unit["session"] + 500 * unit["track"] + 4 * (unit["player"] + 10 * unit["card"] + unit["client"])
+    assert projection["sessions"] == \
+        (256 * 1024 * 1024 - projection["baseline_bytes"]) // projection["per_session_bytes"]
+    with pytest.raises(ValueError):
+        accounting.capacity(playlist_size=0)
+
+    session = game_service.create_session("Speicher Host", turn_time_limit=0)
+    game_service.set_deck(session.session_id, "pl", make_tracks(100, seed=3, prefix="admin"))
+    monkeypatch.setattr(settings, "admin_token", "geheim")
+    admin = {"X-Admin-Token": "geheim"}
+
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as http:
+            assert (await http.get("/admin/memory")).status_code == 403
+            report = (await http.get("/admin/memory", headers=admin)).json()
+            capacity = await http.get("/admin/memory/capacity", headers=admin,
+                                      params={"playlist_size": 200, "budget_mb": 128})
+            invalid = await http.get("/admin/memory/capacity", headers=admin, params={"playlist_size": 0})
+            metrics = (await http.get("/metrics")).json()
+            return report, capacity, invalid, metrics
+
+    report, capacity, invalid, metrics = asyncio.run(run())
+    entry = next(entry for entry in report["largest"] if entry["session_id"] == session.session_id)
+    assert entry["tracks"] == 100 and entry["deck"] > 0
+    assert capacity.status_code == 200 and capacity.json()["sessions"] >= 0
+    assert invalid.status_code == 400
+    # /metrics: nur Kennzahlen des letzten Reports (den /admin/memory gerade gebaut hat)
+    assert metrics["memory"]["sessions"] == report["sessions"]
+    assert "by_status" not in metrics["memory"] and "largest" not in metrics["memory"]
+    game_service.delete_session(session.session_id)
+
+
+def test_background_refresh_yields_and_measures_everything(monkeypatch):
+    monkeypatch.setattr(settings, "memory_measure_budget_ms", 0.0)  # nach jeder Session freigeben
+    service = GameService()
+    accounting = MemoryAccounting(service, socket_bytes=no_sockets)
+    for idx in range(10):
+        session = service.create_session(f"Host {idx}", turn_time_limit=0)
+        service.set_deck(session.session_id, "pl", make_tracks(100, seed=idx, prefix=f"r{idx}"))
+
+    async def scenario():
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0)
+
+        task = asyncio.get_running_loop().create_task(ticker())
+        await asyncio.sleep(0)
+        victim = list(service.sessions)[-1]
+        refresh = asyncio.get_running_loop().create_task(accounting.refresh())
+        await asyncio.sleep(0)
+        service.delete_session(victim)  # während des Laufs gelöscht
+        report = await refresh
+        task.cancel()
+        return ticks, report
+
+    ticks, report = asyncio.run(scenario())
+    assert ticks >= 10  # Event-Loop lief zwischen den Scheiben weiter
+    assert accounting.stats["slices"] >= 10
+    assert report["sessions"] == 9
+    assert not any(entry["estimated"] for entry in report["largest"])
+    assert accounting.snapshot()["bytes_total"] == report["bytes"]["total"]
@@ -0,0 +1,139 @@
+"""
+Tests für Streaming-Import von Playlists
+"""
+import sys
+import os
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import asyncio
+import random
+import threading
+from collections import Counter
+
+from app.core.config import settings
+from app.services import playlist_loader as loader_module
+from app.services.game_service import GameService, game_service
+from app.services.playlist_loader import PlaylistLoader
+from app.services.spotify_scheduler import SpotifyScheduler
+from app.services.spotify_service import SpotifyService
+from app.services.spotify_transport import FixtureStore, ReplaySession, synthesize_playlist
+from benchmarks.common import make_tracks, synthetic_spotify, to_api_track
+
+
+def playing_session(service: GameService, deck_size: int):
+    session = service.create_session("Host", turn_time_limit=0)
+    service.set_deck(session.session_id, "pl", make_tracks(deck_size, seed=5))
+    session.status = "playing"
+    session.current_track_index = 1
+    return session
+
+
+def test_extend_deck_keeps_dealt_cards():
+    service = GameService()
+    session = playing_session(service, 10)
+    deck = service.track_queues[session.session_id]
+    protected = session.current_track_index + 1 + settings.prefetch_track_count
+    head = deck[:protected]
+
+    extra = make_tracks(40, seed=6, prefix="extra")
+    assert service.extend_deck(session.session_id, extra) == 50
+
+    assert deck[:protected] == head
+    assert len({track.track_id for track in deck}) == 50
+
+
+def test_extend_deck_is_uniform_over_undealt_positions():
+    random.seed(1)
+    service = GameService()
+    protected = 2 + settings.prefetch_track_count
+    positions = Counter()
+    newcomer = make_tracks(1, seed=9, prefix="new")
+
+    for _ in range(3000):
+        session = playing_session(service, 10)
+        service.extend_deck(session.session_id, newcomer)
+        deck = service.track_queues[session.session_id]
+        positions[next(i for i, t in enumerate(deck) if t.track_id == newcomer[0].track_id)] += 1
+        service.delete_session(session.session_id)
+
+    slots = 11 - protected
+    assert set(positions) == set(range(protected, 11))
+    expected = 3000 / slots
+    assert all(abs(count - expected) < expected * 0.25 for count in positions.values())
+
+
+def test_first_page_needs_one_request(tmp_path):
+    store = FixtureStore(str(tmp_path / "spotify.json.gz"))
+    synthesize_playlist(store, "big", "Big", [to_api_track(t) for t in make_tracks(1000, seed=2)])
+    session = ReplaySession(store)
+    service = SpotifyService()
+    service.set_transport(session)
+    service.scheduler = SpotifyScheduler(rate=1000, burst=100)
+
+    stream = service.open_playlist_stream("big")
+    first_calls = session.calls - session.token_calls
+
+    assert first_calls == 1
+    assert len(stream.info.tracks) == 100
+    assert stream.expected_total == 1000
+    assert sum(len(page) for page in stream.pages) == 900
+
+
+def test_game_starts_before_playlist_is_complete(monkeypatch):
+    events = []
+
+    async def fake_broadcast(session_id, event, data):
+        events.append((event, data))
+
+    monkeypatch.setattr(loader_module, "broadcast_to_session", fake_broadcast)
+    loader = PlaylistLoader()
+
+    async def scenario():
+        session = game_service.create_session("Host", turn_time_limit=0)
+        session_id = session.session_id
+        game_service.add_player(session_id, "Gast")
+
+        result = await loader.load(session_id, ["stream"])
+        assert result == {"track_count": 100, "expected_total": 450, "skipped": 0, "loading": True}
+
+        game_service.start_game(session_id)
+        start_cards = [p.timeline[0].track_id for p in game_service.players[session_id]]
+
+        await loader.tasks[session_id]
+        deck = game_service.track_queues[session_id]
+        assert len({track.track_id for track in deck}) == 450
+        assert [p.timeline[0].track_id for p in game_service.players[session_id]] == start_cards
+        assert not loader.is_loading(session_id)
+        game_service.delete_session(session_id)
+
+    with synthetic_spotify(450, seed=3):
+        asyncio.run(scenario())
+
+    assert events[-1][0] == "playlist_loaded"
+    assert events[-1][1]["total_tracks"] == 450
+
+
+def test_first_page_deck_is_set_on_event_loop(monkeypatch):
+    threads = []
+    set_deck = game_service.set_deck
+
+    def recording_set_deck(*args, **kwargs):
+        threads.append(threading.get_ident())
+        return set_deck(*args, **kwargs)
+
+    monkeypatch.setattr(game_service, "set_deck", recording_set_deck)
+    loader = PlaylistLoader()
+
+    async def scenario():
+        session = game_service.create_session("Host", turn_time_limit=0)
+        result = await loader.load(session.session_id, ["stream"])
+        assert result["track_count"] == 100
+        loader.cancel(session.session_id)
+        game_service.delete_session(session.session_id)
+
+    with synthetic_spotify(450, seed=4):
+        asyncio.run(scenario())
+
+    assert threads == [threading.get_ident()]  # asyncio.run läuft im Test-Thread
@@ -0,0 +1,208 @@
+"""
+Tests für Preview-Cache & /media/preview (Range Requests)
+"""
+import sys
+import os
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import asyncio
+import threading
+import time
+
+import httpx
+import pytest
+
+from app.api import media as media_module
+from app.core.range_response import body_stats, parse_range
+from app.services.game_service import GameService, game_service
+from app.services.preview_cache import PreviewCache
+from app.services.spotify_service import spotify_service
+from benchmarks.common import make_tracks, preview_origin
+
+
+CLIP = 50_000
+
+
+def make_cache(directory, clips: float = 10, workers: int = 2) -> PreviewCache:
+    return PreviewCache(str(directory), max_bytes=int(CLIP * clips), max_clip_bytes=CLIP * 2, workers=workers)
+
+
+def test_parse_range():
+    assert parse_range(None, 100) is None
+    assert parse_range("bytes=0-", 100) == (0, 99)
+    assert parse_range("bytes=10-19", 100) == (10, 19)
+    assert parse_range("bytes=90-500", 100) == (90, 99)
+    assert parse_range("bytes=-30", 100) == (70, 99)
+    assert parse_range("bytes=0-1,5-6", 100) is None  # Mehrfach-Bereich -> ganze Datei
+    for invalid in ("bytes=100-", "bytes=20-10", "bytes=-0"):
+        with pytest.raises(ValueError):
+            parse_range(invalid, 100)
+
+
+def test_fetch_once_then_serve_from_disk(tmp_path):
+    cache = make_cache(tmp_path)
+    with preview_origin(CLIP) as origin:
+        assert cache.open("a") is None
+        with cache.fetch("a", origin.url("a")) as handle:
+            assert handle.read() == origin.clip("a")
+        with cache.open("a") as handle:
+            assert handle.read() == origin.clip("a")
+        assert origin.requests == 1
+
+    stats = cache.snapshot()
+    assert (stats["hits"], stats["misses"], stats["fetches"]) == (1, 1, 1)
+
+
+def test_concurrent_requests_share_one_download(tmp_path):
+    cache = make_cache(tmp_path)
+    with preview_origin(CLIP, latency_ms=50) as origin:
+        results = []
+
+        def listener():
+            with cache.fetch("shared", origin.url("shared")) as handle:
+                results.append(handle.read())
+
+        threads = [threading.Thread(target=listener) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert origin.requests == 1
+        assert results == [origin.clip("shared")] * 8
+
+
+def test_lru_eviction_and_restart(tmp_path):
+    cache = make_cache(tmp_path, clips=2.5)
+    with preview_origin(CLIP) as origin:
+        for name in ("a", "b"):
+            cache.fetch(name, origin.url(name)).close()
+        cache.open("a").close()  # a ist jetzt neuer als b
+        cache.fetch("c", origin.url("c")).close()
+
+    assert cache.open("b") is None
+    assert sorted(os.listdir(tmp_path)) == ["a.mp3", "c.mp3"]
+    assert cache.snapshot()["evictions"] == 1
+
+    restarted = make_cache(tmp_path, clips=2.5)
+    assert restarted.snapshot()["clips"] == 0  # erst beim ersten Zugriff eingelesen
+    restarted.open("a").close()
+    assert restarted.snapshot()["bytes"] == 2 * CLIP
+
+
+def test_oversized_clip_is_rejected(tmp_path):
+    cache = PreviewCache(str(tmp_path), max_bytes=CLIP * 10, max_clip_bytes=CLIP // 2)
+    with preview_origin(CLIP) as origin:
+        with pytest.raises(ValueError):
+            cache.fetch("big", origin.url("big"))
+    assert os.listdir(tmp_path) == []
+    assert cache.snapshot()["fetch_errors"] == 1
+
+
+def test_next_tracks_are_prefetched(tmp_path, monkeypatch):
+    cache = make_cache(tmp_path)
+    game_module = sys.modules[GameService.__module__]
+    monkeypatch.setattr(game_module, "preview_cache", cache)
+
+    service = GameService()
+    session = service.create_session("Host", turn_time_limit=0)
+    with preview_origin(CLIP) as origin:
+        tracks = [
+            track.model_copy(update={"preview_url": origin.url(track.track_id)})
+            for track in make_tracks(10, seed=21)
+        ]
+        service.set_deck(session.session_id, "pl", tracks)
+        service.start_game(session.session_id)
+
+        deadline = time.time() + 5
+        while cache.snapshot()["prefetched"] < 4 and time.time() < deadline:
+            time.sleep(0.01)
+        cache.stop()
+
+        deck = service.track_queues[session.session_id]
+        start = session.current_track_index
+        for track in deck[start:start + 4]:
+            assert cache.open(track.track_id) is not None
+
+
+def test_preview_endpoint_supports_ranges(tmp_path, monkeypatch):
+    from app.main import app
+
+    cache = make_cache(tmp_path)
+    monkeypatch.setattr(media_module, "preview_cache", cache)
+
+    async def scenario(origin):
+        session = game_service.create_session("Host", turn_time_limit=0)
+        session_id = session.session_id
+        with_preview, without_preview = make_tracks(2, seed=22)
+        with_preview = with_preview.model_copy(update={"preview_url": origin.url("clip")})
+        game_service.set_deck(session_id, "pl", [with_preview, without_preview])
+        body = origin.clip("clip")
+        url = f"/media/preview/{with_preview.track_id}?session_id={session_id}"
+        before = dict(body_stats)
+
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as http:
+            full = await http.get(url)
+            assert full.status_code == 200
+            assert full.content == body
+            assert full.headers["accept-ranges"] == "bytes"
+            assert full.headers["content-type"] == "audio/mpeg"
+
+            part = await http.get(url, headers={"Range": "bytes=100-199"})
+            assert part.status_code == 206
+            assert part.headers["content-range"] == f"bytes 100-199/{CLIP}"
+            assert part.content == body[100:200]
+
+            tail = await http.get(url, headers={"Range": "bytes=-50"})
+            assert tail.content == body[-50:]
+            # Ohne zerocopysend-Extension (wie uvicorn) geht jeder Body über os.pread
+            assert body_stats["pread_bodies"] - before["pread_bodies"] == 3
+            assert body_stats["zerocopy_bodies"] == before["zerocopy_bodies"]
+
+            beyond = await http.get(url, headers={"Range": f"bytes={CLIP}-"})
+            assert beyond.status_code == 416
+
+            cached = await http.get(url, headers={"If-None-Match": full.headers["etag"]})
+            assert cached.status_code == 304
+
+            head = await http.head(url)
+            assert head.status_code == 200
+            assert head.headers["content-length"] == str(CLIP)
+            assert head.content == b""
+
+            missing = await http.get(f"/media/preview/{without_preview.track_id}?session_id={session_id}")
+            assert missing.status_code == 404
+            invalid = await http.get("/media/preview/bad.id")
+            assert invalid.status_code == 400
+
+        game_service.delete_session(session_id)
+
+    with preview_origin(CLIP) as origin:
+        asyncio.run(scenario(origin))
+        assert origin.requests == 1
+
+
+def test_preview_lookup_never_uses_the_host_token(tmp_path, monkeypatch):
+    from app.main import app
+
+    monkeypatch.setattr(media_module, "preview_cache", make_cache(tmp_path))
+    owners = []
+
+    def get_track_info(track_id, owner=None):
+        owners.append(owner)
+        raise ValueError("nicht gefunden")
+
+    monkeypatch.setattr(spotify_service, "get_track_info", get_track_info)
+    session_id = game_service.create_session("Host", turn_time_limit=0).session_id
+
+    async def scenario():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as http:
+            # Track nicht im Deck: Spotify-Abfrage mit Client Credentials, nicht als Host
+            return await http.get(f"/media/preview/fremd123?session_id={session_id}")
+
+    assert asyncio.run(scenario()).status_code == 404
+    assert owners == [None]
+    game_service.delete_session(session_id)
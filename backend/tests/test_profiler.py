@@ -0,0 +1,142 @@
+"""
+Tests für den Profiler (/admin/profile)
+"""
+import sys
+import os
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import asyncio
+import time
+
+import httpx
+import socketio
+
+from app.core.config import settings
+from app.services.profiler import Profiler, frame_name, instrument_socketio, to_collapsed, top_functions
+
+
+def burn_cpu(seconds: float):
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        sum(range(200))
+
+
+def test_frame_name_without_qualname():
+    # Python < 3.11: Code-Objekte haben kein co_qualname
+    class Code:
+        co_name = "methode"
+
+    class Frame:
+        f_code = Code()
+        f_globals = {"__name__": "app.modul"}
+
+    assert frame_name(Frame()) == "app.modul:methode"
+    assert frame_name(sys._getframe()) == f"{__name__}:test_frame_name_without_qualname"
+
+
+def test_sampling_finds_hot_function():
+    profiler = Profiler(max_duration_s=5)
+
+    async def run():
+        async def hot():
+            await asyncio.sleep(0.01)
+            burn_cpu(0.3)
+        task = asyncio.create_task(hot())
+        result = await profiler.sample(0.5, interval_ms=2)
+        await task
+        return result
+
+    result = asyncio.run(run())
+    assert result["samples"] > 50
+    hot = sum(weight for stack, weight in result["stacks"].items() if stack.endswith("burn_cpu"))
+    assert 0.2e6 < hot < 0.4e6  # ~0.3s in µs, obwohl burn_cpu die GIL hält
+    assert top_functions(result["stacks"])[0]["function"].endswith("burn_cpu")
+    line = to_collapsed(result["stacks"]).splitlines()[0]
+    assert line.rsplit(" ", 1)[1].isdigit()
+    assert not profiler.busy
+
+
+def test_capture_next_socket_event_counts_only_its_task():
+    profiler = Profiler(max_duration_s=5)
+    sio = socketio.AsyncServer(async_mode="asgi")
+
+    @sio.event
+    async def guess_submitted(sid, data):
+        burn_cpu(0.05)
+        await asyncio.sleep(0.1)  # dazwischen läuft `other`
+        return "ok"
+
+    instrument_socketio(sio, profiler)
+    handler = sio.handlers["/"]["guess_submitted"]
+
+    async def other():
+        await asyncio.sleep(0.02)
+        burn_cpu(0.08)
+
+    async def run():
+        waiting = asyncio.create_task(profiler.capture_next("event", "guess_submitted", timeout_s=5))
+        await asyncio.sleep(0)
+        results = await asyncio.gather(handler("sid-1", {}), other())
+        assert results[0] == "ok"
+        return await waiting
+
+    result = asyncio.run(run())
+    assert result["mode"] == "event" and result["unit"] == "us"
+    assert result["duration_s"] >= 0.15
+    burned = sum(weight for stack, weight in result["stacks"].items()
+                 if "guess_submitted" in stack and "burn_cpu" in stack)
+    foreign = sum(weight for stack, weight in result["stacks"].items() if "other" in stack)
+    assert 40_000 < burned < 80_000  # ~50 ms eigene CPU, µs
+    assert foreign == 0  # `other` lief im selben Thread, zählt aber nicht
+    assert not profiler.busy
+
+    # Ohne Anforderung: Handler läuft ganz normal
+    assert asyncio.run(handler("sid-2", {})) == "ok"
+    assert profiler.stats["captures"] == 1
+
+
+def test_admin_profile_endpoints(monkeypatch):
+    from app.main import app
+    from app.services.game_service import game_service
+
+    session = game_service.create_session("Profil Host", turn_time_limit=0)
+
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as http:
+            assert (await http.post("/admin/profile", params={"duration_s": 0.1})).status_code == 404
+            monkeypatch.setattr(settings, "admin_token", "geheim")
+            assert (await http.post("/admin/profile", params={"duration_s": 0.1},
+                                    headers={"X-Admin-Token": "falsch"})).status_code == 403
+
+            headers = {"X-Admin-Token": "geheim"}
+            response = await http.post("/admin/profile", params={"duration_s": 0.2, "interval_ms": 2},
+                                       headers=headers)
+            assert response.status_code == 200
+            assert response.headers["x-profile-mode"] == "sampling"
+
+            assert (await http.post("/admin/profile", params={"duration_s": 999},
+                                    headers=headers)).status_code == 400
+
+            async def leaderboard():
+                await asyncio.sleep(0.05)
+                return await http.get(f"/game/leaderboard/{session.session_id}")
+
+            profile, board = await asyncio.gather(
+                http.post("/admin/profile/next", headers=headers, params={
+                    "kind": "request", "match": "/game/leaderboard", "format": "json"}),
+                leaderboard()
+            )
+            assert board.status_code == 200
+            result = profile.json()
+            assert result["target"] == f"/game/leaderboard/{session.session_id}"
+            assert any("get_leaderboard" in stack for stack in result["stacks"])
+            assert result["top"]
+
+            timeout = await http.post("/admin/profile/next", headers=headers,
+                                      params={"kind": "event", "match": "gibt_es_nicht", "timeout_s": 0.05})
+            assert timeout.status_code == 408
+
+    asyncio.run(run())
+    game_service.delete_session(session.session_id)
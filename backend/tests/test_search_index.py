@@ -0,0 +1,126 @@
+"""
+Tests für den lokalen Autocomplete-Index
+"""
+import sys
+import os
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import json
+import threading
+import time
+
+from app.core.config import settings
+from app.services.game_service import GameService
+from app.services.search_index import SearchIndex, TrackSearch, normalize_text
+from benchmarks.common import make_tracks
+
+
+def test_normalize_text():
+    assert normalize_text("Beyoncé - Crazy in Love!") == "beyonce crazy in love"
+    assert normalize_text("  AC/DC ") == "ac dc"
+    assert normalize_text("Кино") == "кино"
+    assert normalize_text("?!") == ""
+
+
+def test_fuzzy_match_uses_same_normalization():
+    service = GameService()
+    assert service._fuzzy_match("beyonce", "Beyoncé")
+    assert service._fuzzy_match("ac dc", "AC/DC")
+    assert not service._fuzzy_match("   ", "Queen")
+
+
+def test_prefix_search_with_multiple_words():
+    index = SearchIndex()
+    index.add("title", "Bohemian Rhapsody")
+    index.add("title", "Rhapsody in Blue")
+    index.add("artist", "Queen")
+    index.add("title", "Bohemian Like You")
+
+    assert [hit["text"] for hit in index.search("bohem")] == ["Bohemian Like You", "Bohemian Rhapsody"]
+    assert [hit["text"] for hit in index.search("rhap boh")] == ["Bohemian Rhapsody"]
+    assert [hit["text"] for hit in index.search("rhapsody")] == ["Rhapsody in Blue", "Bohemian Rhapsody"]
+    assert index.search("que", kind="title") == []
+    assert index.search("que", kind="artist") == [{"text": "Queen", "kind": "artist"}]
+
+
+def test_session_hits_before_catalog(tmp_path):
+    catalog = tmp_path / "catalog.jsonl"
+    catalog.write_text("\n".join(json.dumps(item) for item in [
+        {"title": "Love Story", "artist": "Taylor Swift"},
+        {"title": "Love Me Do", "artist": "The Beatles"}
+    ]))
+    search = TrackSearch()
+    search._catalog = TrackSearch.load_catalog(str(catalog))
+    search.index_session("s1", make_tracks(50, seed=1))
+
+    hits = search.search("love", session_id="s1", kind="title", limit=50)
+    texts = [hit["text"] for hit in hits]
+    assert "Love Story" in texts and "Love Me Do" in texts
+    assert texts.index("Love Story") > 0  # Deck zuerst
+    assert search.search("l", session_id="s1") == []  # zu kurz
+
+    search.drop_session("s1")
+    assert [hit["text"] for hit in search.search("love st")] == ["Love Story"]
+
+
+def test_search_does_not_wait_for_catalog(tmp_path, monkeypatch):
+    catalog = tmp_path / "catalog.jsonl"
+    catalog.write_text(json.dumps({"title": "Love Story", "artist": "Taylor Swift"}))
+    monkeypatch.setattr(settings, "search_catalog_path", str(catalog))
+    release = threading.Event()
+    load = TrackSearch.load_catalog
+
+    def slow_load(path):
+        release.wait(5)  # großer Katalog
+        return load(path)
+
+    monkeypatch.setattr(TrackSearch, "load_catalog", staticmethod(slow_load))
+    search = TrackSearch()
+    search.index_session("s1", [make_tracks(1, seed=1)[0].model_copy(update={"title": "Love Me Do"})])
+
+    started = time.perf_counter()
+    hits = search.search("love", session_id="s1", kind="title")
+    assert time.perf_counter() - started < 0.5  # nicht auf den Katalog gewartet
+    assert [hit["text"] for hit in hits] == ["Love Me Do"]
+
+    release.set()
+    search.start_loading().join(5)
+    assert [hit["text"] for hit in search.search("love", session_id="s1", kind="title")] == \
+        ["Love Me Do", "Love Story"]
+
+
+def test_top_hits_match_full_sort():
+    index = SearchIndex()
+    index.add_tracks(make_tracks(3000, seed=4))
+    index.add("title", "S")  # beginnt mit der Query & kürzester Eintrag
+
+    for query, kind, limit in [("s", None, 8), ("s", "artist", 5), ("lo", None, 8), ("love ni", None, 3),
+                               ("summer", "title", 20), ("a", None, 1000)]:
+        normalized = normalize_text(query)
+        expected = sorted(
+            (not entry_normalized.startswith(normalized), len(entry_normalized), text, entry_kind)
+            for entry_kind, text, entry_normalized in index.entries
+            if (not kind or entry_kind == kind)
+            and all(any(word.startswith(part) for word in entry_normalized.split()) for part in normalized.split())
+        )[:limit]
+        assert index.search(query, kind=kind, limit=limit) == \
+            [{"text": text, "kind": entry_kind} for _, _, text, entry_kind in expected]
+    assert index.search("s")[0] == {"text": "S", "kind": "title"}
+
+
+def test_lookup_is_fast_on_large_index():
+    index = SearchIndex()
+    index.add_tracks(make_tracks(20000, seed=2))
+    index.search("warmup")
+
+    samples = []
+    for query in ["s", "lo", "love ni", "summer", "anna b", "gold rive", "ze"] * 20:
+        started = time.perf_counter()
+        index.search(query)
+        samples.append(time.perf_counter() - started)
+    samples.sort()
+    # Autocomplete pro Tastendruck: unter einer Millisekunde, auch für 1-Buchstaben-Prefixe
+    assert samples[len(samples) // 2] < 0.0005
+    assert samples[int(len(samples) * 0.95)] < 0.001
@@ -0,0 +1,56 @@
+"""
+Tests für den Produktions-Start (Loop/HTTP-Auswahl, Worker-Supervisor)
+"""
+import sys
+import os
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import importlib.util
+import subprocess
+import time
+
+import pytest
+
+from app import server
+from app.server import HTTP_PARSERS, LOOPS, WorkerSupervisor, select_implementation, worker_args
+
+
+def test_select_implementation():
+    fastest = "uvloop" if importlib.util.find_spec("uvloop") else "asyncio"
+    assert select_implementation("auto", LOOPS) == fastest
+    assert select_implementation("asyncio", LOOPS) == "asyncio"
+    assert select_implementation("h11", HTTP_PARSERS) == "h11"
+    with pytest.raises(ValueError):
+        select_implementation("tornado", LOOPS)
+    with pytest.raises(ValueError):
+        select_implementation("nicht-da", ("nicht-da",))
+
+    assert worker_args({"loop": "uvloop", "http": "httptools", "access_log": False}) == \
+        ["--loop", "uvloop", "--http", "httptools", "--no-access-log"]
+
+
+def test_supervisor_restarts_crashed_worker(monkeypatch):
+    spawned = []
+
+    def fake_spawn(index, count, **kwargs):
+        # Erster Start stürzt sofort ab, der Neustart läuft weiter
+        code = "import sys; sys.exit(3)" if not spawned else "import time; time.sleep(30)"
+        spawned.append((index, count, kwargs["extra_args"]))
+        return subprocess.Popen([sys.executable, "-c", code])
+
+    monkeypatch.setattr(server, "spawn_worker", fake_spawn)
+    stats = {}
+    supervisor = WorkerSupervisor(1, 9000, extra_args=["--loop", "asyncio"], restart_delay_s=0.0, stats=stats)
+    supervisor.start()
+    try:
+        deadline = time.monotonic() + 10
+        while stats["worker_restarts"] == 0 and time.monotonic() < deadline:
+            time.sleep(0.05)
+        assert stats["worker_restarts"] == 1
+        assert spawned == [(0, 1, ["--loop", "asyncio"])] * 2
+        assert supervisor.workers[0].poll() is None
+    finally:
+        supervisor.stop(timeout=5)
+    assert supervisor.workers[0].poll() is not None
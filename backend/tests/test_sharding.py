@@ -0,0 +1,135 @@
+"""
+Tests für Sharding (Hash-Ring, Routing im Shard Router)
+"""
+import sys
+import os
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import asyncio
+import uuid
+from collections import Counter
+
+import httpx
+from fastapi import FastAPI, Request
+
+from app.core.config import settings
+from app.core.sharding import HashRing, new_session_id
+from app.core.host_auth import oauth_state
+from app.shard_router import ShardRouter, admin_shard_from, session_id_from
+
+
+def test_ring_is_balanced_and_stable():
+    keys = [str(uuid.UUID(int=idx * 7919 + 1)) for idx in range(6000)]
+    ring = HashRing(4, vnodes=64)
+    owners = [ring.owner(key) for key in keys]
+    counts = Counter(owners)
+    assert set(counts) == {0, 1, 2, 3}
+    assert all(0.15 < count / len(keys) < 0.35 for count in counts.values())
+
+    # Anderer Prozess / neue Instanz -> gleiche Zuordnung
+    assert owners == [HashRing(4, vnodes=64).owner(key) for key in keys]
+
+    # Neuer Shard übernimmt nur einen Teil, der Rest bleibt wo er war
+    grown = HashRing(5, vnodes=64)
+    moved = sum(1 for key, owner in zip(keys, owners) if grown.owner(key) not in (owner, 4))
+    assert moved == 0
+    assert 0.1 < sum(1 for key in keys if grown.owner(key) == 4) / len(keys) < 0.3
+
+
+def test_new_session_ids_belong_to_own_shard():
+    ring = HashRing(3)
+    for shard in range(3):
+        assert all(ring.owner(new_session_id(ring, shard)) == shard for _ in range(20))
+
+
+def test_shard_path(monkeypatch):
+    assert settings.shard_path("cache/stats.bin") == "cache/stats.bin"
+    monkeypatch.setattr(settings, "shard_count", 4)
+    monkeypatch.setattr(settings, "shard_index", 2)
+    assert settings.shard_path("cache/stats.bin") == "cache/stats.shard-2.bin"
+    assert settings.shard_path("data/events/") == "data/events.shard-2"
+    assert settings.shard_path("") == ""
+
+
+def test_session_id_from_request():
+    sid = str(uuid.uuid4())
+    player = str(uuid.uuid4())
+    assert session_id_from("/game/start", f"session_id={sid}".encode()) == sid
+    assert session_id_from("/socket.io/", f"sessionId={sid}&EIO=4".encode()) == sid
+    assert session_id_from(f"/game/timeline/{sid}/{player}", b"") == sid
+    assert session_id_from("/game/guess", b"", f'{{"session_id": "{sid}"}}'.encode(), "application/json") == sid
+    assert session_id_from("/game/guess", b"", b"{kaputt", "application/json") is None
+    assert session_id_from("/game/session/create", b"", b'{"host_name": "A"}', "application/json") is None
+    # Spotify Login des Hosts: Worker seiner Session (owner, signierter state)
+    assert session_id_from("/auth/login", f"owner={sid}".encode()) == sid
+    assert session_id_from("/auth/set-token", f"access_token=t&owner={sid}".encode()) == sid
+    assert session_id_from("/playlist/search/tracks", f"query=abba&owner={sid}".encode()) == sid
+    assert session_id_from("/auth/callback", f"code=c&state={oauth_state(sid)}".encode()) == sid
+    assert session_id_from("/auth/callback", b"code=c&state=ohne-signatur") is None
+
+    assert admin_shard_from(b"shard=2&duration_s=5", 3) == 2
+    assert admin_shard_from(b"duration_s=5", 3) is None
+    assert admin_shard_from(b"duration_s=5", 1) == 0
+    assert admin_shard_from(b"shard=3", 3) is None
+
+
+def _shard_app(index: int) -> FastAPI:
+    shard = FastAPI()
+
+    @shard.post("/game/session/create")
+    async def create():
+        return {"shard": index}
+
+    @shard.get("/game/leaderboard/{session_id}")
+    async def leaderboard(session_id: str):
+        return {"shard": index, "session_id": session_id}
+
+    @shard.post("/game/guess")
+    async def guess(request: Request):
+        return {"shard": index, **(await request.json())}
+
+    @shard.get("/game/lobbies")
+    async def lobbies():
+        return [{"session_id": f"lobby-{index}"}]
+
+    @shard.get("/health")
+    async def health():
+        return {"status": "healthy", "shard": index}
+
+    return shard
+
+
+def test_router_forwards_to_owner_and_merges_lobbies():
+    upstreams = [f"http://shard-{idx}" for idx in range(3)]
+    client = httpx.AsyncClient(mounts={
+        url: httpx.ASGITransport(app=_shard_app(idx)) for idx, url in enumerate(upstreams)
+    })
+    router = ShardRouter(upstreams, client=client)
+    session_ids = [str(uuid.UUID(int=idx + 1)) for idx in range(12)]
+
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=router), base_url="http://router") as http:
+            for session_id in session_ids:
+                owner = router.ring.owner(session_id)
+                response = await http.get(f"/game/leaderboard/{session_id}")
+                assert response.json() == {"shard": owner, "session_id": session_id}
+                assert response.headers["x-shard"] == str(owner)
+                response = await http.post("/game/guess", json={"session_id": session_id, "player_id": "p"})
+                assert response.json()["shard"] == owner
+
+            created = [(await http.post("/game/session/create", json={})).json()["shard"] for _ in range(6)]
+            assert sorted(created) == [0, 0, 1, 1, 2, 2]
+
+            lobbies = (await http.get("/game/lobbies")).json()
+            assert sorted(lobby["session_id"] for lobby in lobbies) == ["lobby-0", "lobby-1", "lobby-2"]
+            health = await http.get("/health")
+            assert health.status_code == 200
+            assert [shard["shard"] for shard in health.json()["shards"]] == [0, 1, 2]
+
+            response = await http.get("/socket.io/?EIO=4&transport=polling")
+            assert response.status_code == 400
+        await client.aclose()
+
+    asyncio.run(run())
@@ -0,0 +1,27 @@
+"""
+Tests für den Headless Spiel-Simulator (offline, reproduzierbar)
+"""
+import os
+import sys
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.models.game import GameMode
+from benchmarks.simulate_games import simulate
+
+
+def test_simulation_plays_all_modes():
+    result = simulate(games=16, players=3, playlist_size=80, seed=11)
+
+    assert result["stats"]["games"] == 16
+    assert result["stats"]["placements"] > 0
+    assert set(result["stats"]["wins"]) == {mode.value for mode in GameMode}
+    assert "place_card" in result["operations"]
+
+
+def test_simulation_is_repeatable_from_seed():
+    first = simulate(games=12, players=4, playlist_size=60, seed=5)
+    second = simulate(games=12, players=4, playlist_size=60, seed=5)
+
+    assert first["stats"] == second["stats"]
@@ -0,0 +1,121 @@
+"""
+Tests für Socket.IO Backpressure (Room-Queue, Client-Event-Prüfung, Token Bucket)
+"""
+import sys
+import os
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import asyncio
+
+import pytest
+
+from app.core.config import settings
+from app.services import websocket_service
+from app.services.rate_limiter import TokenBucket
+from app.services.websocket_service import (
+    RoomOutbox, _admit_client_event, client_buckets, enqueue_for_room, outboxes, socket_stats
+)
+
+
+def stats_delta(before, *keys):
+    return {key: socket_stats[key] - before[key] for key in keys}
+
+
+def test_outbox_merges_events_with_same_key():
+    outbox = RoomOutbox("room")
+    before = dict(socket_stats)
+
+    assert outbox.put("scores", {"v": 1}, merge_key="s1")
+    assert outbox.put("chat", {"text": "hi"})
+    assert outbox.put("scores", {"v": 2}, merge_key="s1")  # ersetzt v=1 an seiner Position
+    assert outbox.put("scores", {"v": 9}, merge_key="s2")  # anderer Key: eigenes Event
+
+    assert [(event, data) for event, data, _, _ in outbox.items.values()] == \
+        [("scores", {"v": 2}), ("chat", {"text": "hi"}), ("scores", {"v": 9})]
+    assert stats_delta(before, "merged", "dropped") == {"merged": 1, "dropped": 0}
+
+
+def test_full_outbox_drops_droppable_and_evicts_oldest_droppable(monkeypatch):
+    monkeypatch.setattr(settings, "socket_room_queue_size", 3)
+    outbox = RoomOutbox("room")
+    before = dict(socket_stats)
+
+    assert outbox.put("critical", 0, droppable=False)
+    assert outbox.put("chat", 1)
+    assert outbox.put("chat", 2)
+    assert not outbox.put("chat", 3)  # voll: verwerfbares Event fällt weg
+    assert outbox.put("critical", 4, droppable=False)  # verdrängt das älteste verwerfbare (1)
+    assert outbox.put("critical", 5, droppable=False)  # verdrängt 2
+    assert outbox.put("critical", 6, droppable=False)  # nichts mehr verwerfbar: Queue wächst
+
+    assert [data for _, data, _, _ in outbox.items.values()] == [0, 4, 5, 6]
+    assert stats_delta(before, "dropped") == {"dropped": 3}
+
+
+def test_failing_emit_does_not_mute_the_room(monkeypatch):
+    sent = []
+
+    async def emit(event, data=None, room=None, skip_sid=None):
+        if event == "bad":
+            raise TypeError("nicht serialisierbar")
+        sent.append(event)
+
+    monkeypatch.setattr(websocket_service.sio, "emit", emit)
+    before = dict(socket_stats)
+
+    async def scenario():
+        enqueue_for_room("muted", "bad", object(), droppable=False)
+        enqueue_for_room("muted", "after", {}, droppable=False)
+        task = outboxes["muted"].task
+        await task
+        assert "muted" not in outboxes  # Task beendet: Room freigegeben
+        enqueue_for_room("muted", "good", {}, droppable=False)
+        await outboxes["muted"].task
+
+    asyncio.run(scenario())
+    assert sent == ["after", "good"]
+    assert stats_delta(before, "emit_errors") == {"emit_errors": 1}
+    assert "muted" not in outboxes
+
+
+def test_admit_client_event_counts_invalid_oversized_and_throttled(monkeypatch):
+    monkeypatch.setattr(settings, "socket_events_per_second", 0.0)
+    monkeypatch.setattr(settings, "socket_event_burst", 5)
+    monkeypatch.setattr(settings, "socket_max_payload_bytes", 64)
+    sid = "sid-admit"
+    client_buckets.pop(sid, None)
+    before = dict(socket_stats)
+
+    assert _admit_client_event(sid, {"session_id": "s", "position": 1})
+    assert not _admit_client_event(sid, ["kein", "objekt"])
+    assert not _admit_client_event(sid, {"position": 1})  # ohne session_id
+    assert not _admit_client_event(sid, {"session_id": "s", "x": object()})  # nicht serialisierbar
+    assert not _admit_client_event(sid, {"session_id": "s", "blob": "x" * 100})
+    # Burst (5) verbraucht, Rate 0: ab jetzt gedrosselt - auch gültige Events
+    assert not _admit_client_event(sid, {"session_id": "s"})
+    assert not _admit_client_event(sid, {"session_id": "s", "blob": "x" * 100})
+
+    assert stats_delta(before, "invalid", "oversized", "throttled") == \
+        {"invalid": 3, "oversized": 1, "throttled": 2}
+    client_buckets.pop(sid, None)
+
+
+def test_token_bucket_refills_up_to_burst():
+    bucket = TokenBucket(rate=2.0, burst=3, now=0.0)
+
+    assert all(bucket.try_acquire(now=0.0) for _ in range(3))
+    assert not bucket.try_acquire(now=0.0)
+    assert bucket.time_until_available(now=0.0) == pytest.approx(0.5)
+
+    assert bucket.try_acquire(now=0.5)  # ein Token nachgefüllt
+    assert not bucket.try_acquire(now=0.5)
+    assert bucket.time_until_available(tokens=2.0, now=0.5) == pytest.approx(1.0)
+
+    bucket.try_acquire(tokens=0.0, now=100.0)  # lange Pause: höchstens burst
+    assert bucket.tokens == 3
+    assert bucket.try_acquire(now=99.0)  # Uhr rückwärts: nichts nachgefüllt, Zeitstempel bleibt
+    assert bucket.tokens == 2 and bucket.updated_at == 100.0
+
+    assert TokenBucket(rate=0.0, burst=0, now=0.0).time_until_available(now=1.0) == float("inf")
@@ -0,0 +1,139 @@
+"""
+Tests für den Zuschauer-Fan-out (Drosselung, Dirty-Zusammenfassung, einmal kodierte Pakete)
+"""
+import sys
+import os
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import asyncio
+import json
+
+from socketio import packet as sio_packet
+
+from app.core.config import settings
+from app.services import websocket_service
+from app.services.game_service import game_service
+from app.services.websocket_service import SpectatorHub, _eio_sender, sio, socket_stats, spectator_room, spectators
+
+
+class Room:
+    """Zuschauer direkt im Socket.IO Manager (ohne Verbindung)"""
+
+    def __init__(self, room: str, count: int):
+        self.room = room
+        self.sids = [(f"{room}-sid-{idx}", f"{room}-eio-{idx}") for idx in range(count)]
+
+    def __enter__(self):
+        for sid, eio_sid in self.sids:
+            sio.manager.basic_enter_room(sid, "/", self.room, eio_sid=eio_sid)
+        return self
+
+    def __exit__(self, *exc):
+        for sid, _ in self.sids:
+            sio.manager.basic_leave_room(sid, "/", self.room)
+
+
+def recording_sender(monkeypatch):
+    sent = []
+
+    async def send(eio_sid, eio_pkt):
+        sent.append((eio_sid, eio_pkt))
+
+    monkeypatch.setattr(websocket_service, "_send_eio_packet", send)
+    return sent
+
+
+def snapshot_of(eio_pkt):
+    event, data = json.loads(eio_pkt.data[1:])  # "2" = Socket.IO EVENT
+    return event, data
+
+
+def test_fanout_encodes_once_and_shares_the_packet(monkeypatch):
+    sent = recording_sender(monkeypatch)
+    encodes = []
+    encode = sio_packet.Packet.encode
+
+    def counting_encode(self):
+        encodes.append(self)
+        return encode(self)
+
+    monkeypatch.setattr(sio_packet.Packet, "encode", counting_encode)
+    monkeypatch.setattr(settings, "spectator_fanout_batch", 2)
+
+    with Room("fanout:spectators", 5) as room:
+        asyncio.run(SpectatorHub()._fanout(room.room, "spectator_state", {"version": 7}))
+
+    assert len(encodes) == 1
+    assert sorted(eio_sid for eio_sid, _ in sent) == sorted(eio_sid for _, eio_sid in room.sids)
+    assert len({id(eio_pkt) for _, eio_pkt in sent}) == 1  # dieselben Bytes für alle
+    assert snapshot_of(sent[0][1]) == ("spectator_state", {"version": 7})
+
+
+def test_fanout_falls_back_to_emit_without_private_sender(monkeypatch):
+    emitted = []
+
+    async def emit(event, data=None, room=None, **kwargs):
+        emitted.append((event, data, room))
+
+    monkeypatch.setattr(websocket_service, "_send_eio_packet", None)
+    monkeypatch.setattr(sio, "emit", emit)
+    before = socket_stats["spectator_emit_fallbacks"]
+
+    asyncio.run(SpectatorHub()._fanout("s:spectators", "spectator_state", {"version": 1}))
+
+    assert emitted == [("spectator_state", {"version": 1}, "s:spectators")]
+    assert socket_stats["spectator_emit_fallbacks"] == before + 1
+
+    class Changed:
+        async def _send_eio_packet(self, sid, pkt, extra):
+            pass
+
+    class Sync:
+        def _send_eio_packet(self, eio_sid, eio_pkt):
+            pass
+
+    assert _eio_sender(object()) is None
+    assert _eio_sender(Changed()) is None
+    assert _eio_sender(Sync()) is None
+    assert _eio_sender(sio) is not None
+
+
+def test_dirty_marks_coalesce_and_updates_are_throttled(monkeypatch):
+    sent = recording_sender(monkeypatch)
+    monkeypatch.setattr(settings, "spectator_updates_per_second", 10.0)  # höchstens alle 100 ms
+    session = game_service.create_session("Zuschauer Host", turn_time_limit=0)
+    session_id = session.session_id
+    hub = SpectatorHub()
+
+    async def scenario():
+        spectators[session_id] = {"zuschauer"}
+        hub.ensure_running()
+        # Viele Änderungen vor dem ersten Lauf: ein einziger Snapshot
+        for _ in range(100):
+            hub.mark_dirty(session_id)
+        await asyncio.sleep(0.02)
+        first = len(sent)
+
+        # 0,5 s lang alle 5 ms eine Änderung
+        loop = asyncio.get_running_loop()
+        ends = loop.time() + 0.5
+        while loop.time() < ends:
+            hub.mark_dirty(session_id)
+            await asyncio.sleep(0.005)
+        await asyncio.sleep(0.15)  # letzte Änderung noch senden
+        del spectators[session_id]
+        hub.mark_dirty(session_id)  # ohne Zuschauer: ignoriert
+        hub._task.cancel()
+        return first
+
+    with Room(spectator_room(session_id), 1):
+        first = asyncio.run(scenario())
+    game_service.delete_session(session_id)
+
+    versions = [snapshot_of(eio_pkt)[1]["version"] for _, eio_pkt in sent]
+    assert first == 1
+    assert versions == list(range(1, len(versions) + 1))  # ein Snapshot pro Versand
+    assert 5 <= len(sent) <= 8  # ~100 Änderungen in 0,65 s, gedrosselt auf 10/s
+    assert not hub.dirty
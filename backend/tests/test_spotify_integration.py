@@ -34,7 +34,7 @@ def test_spotify_auth():
     # Generate Auth URL
     print("\n2️⃣  Generiere Auth URL...")
     try:
-        auth_url = spotify_service.get_auth_url()
+        auth_url = spotify_service.get_auth_url("integration-test")  # Owner = Session ID
         print(f"   ✅ Auth URL generiert")
         print(f"\n   🔗 Öffne diese URL im Browser:")
         print(f"   {auth_url}\n")
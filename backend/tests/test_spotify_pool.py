@@ -0,0 +1,86 @@
+"""
+Tests für den Spotify Client Pool (Clients pro Host, Token-Refresh)
+"""
+import sys
+import os
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import time
+
+import pytest
+
+from app.core.config import settings
+from app.services.spotify_pool import APP_OWNER, SpotifyClientPool
+from app.services.spotify_transport import FixtureStore, ReplaySession
+
+
+def make_pool(tmp_path):
+    session = ReplaySession(FixtureStore(str(tmp_path / "spotify.json.gz")))
+    pool = SpotifyClientPool("id", "secret", "http://localhost/callback", "scope", session)
+    return pool, session
+
+
+def test_clients_are_keyed_by_owner(tmp_path):
+    pool, _ = make_pool(tmp_path)
+    pool.set_token("token-a", owner="session-a")
+    pool.set_token("token-b", owner="session-b")
+
+    client_a = pool.get("session-a")
+    assert client_a is pool.get("session-a")
+    assert client_a is not pool.get("session-b")
+
+    # Unbekannter Owner: Client Credentials
+    app_client = pool.get("session-c")
+    assert app_client is pool.get(None)
+    assert app_client is not client_a
+
+    pool.release("session-a")
+    assert pool.get("session-a") is app_client
+
+
+def test_user_tokens_are_never_shared(tmp_path):
+    pool, _ = make_pool(tmp_path)
+    pool.set_token("token-host", owner="host")
+
+    # Ohne eigenen Login: Client Credentials, nie der Token einer anderen Session
+    app_client = pool.get(None)
+    assert pool.get("guest") is app_client
+    assert pool.get("host") is not app_client
+
+    for owner in (None, "", APP_OWNER):
+        with pytest.raises(ValueError):
+            pool.set_token("token", owner=owner)
+        with pytest.raises(ValueError):
+            pool.authenticate("code", owner=owner)
+    assert set(pool._clients) == {"host", APP_OWNER}
+
+
+def test_tokens_are_refreshed_before_expiry(tmp_path):
+    pool, session = make_pool(tmp_path)
+    token_info = pool.authenticate("code", owner="host")
+    assert token_info["access_token"] == "replay-token"
+
+    pool.get(None)
+    assert pool.maintain() == 1  # App-Token vorwärmen, User-Token ist frisch
+    calls = session.token_calls
+
+    # Kurz vor Ablauf: beide Tokens werden im Hintergrund erneuert
+    soon = token_info["expires_at"] - settings.spotify_token_refresh_margin_s + 1
+    assert pool.maintain(now=soon) == 2
+    assert session.token_calls == calls + 2
+    assert pool.stats["refreshes"] == 3
+
+
+def test_idle_clients_are_evicted(tmp_path):
+    pool, _ = make_pool(tmp_path)
+    pool.set_token("token", owner="old")
+    pool.get(None)
+    pool._clients["old"].last_used = time.monotonic() - settings.spotify_client_idle_ttl_s - 1
+
+    pool.maintain()
+
+    assert "old" not in pool._clients
+    assert APP_OWNER in pool._clients
+    assert pool.stats["evicted"] == 1
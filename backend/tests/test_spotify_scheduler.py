@@ -0,0 +1,103 @@
+"""
+Tests für den Spotify Scheduler (Rate-Limit, Retry-After, Prioritäten)
+"""
+import sys
+import os
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import threading
+import time
+
+import pytest
+from spotipy.exceptions import SpotifyException
+
+from app.services.spotify_scheduler import Priority, SpotifyBusyError, SpotifyScheduler
+from app.services.spotify_service import SpotifyService
+from app.services.spotify_transport import FixtureStore, ReplaySession, synthesize_playlist
+from benchmarks.common import make_tracks, to_api_track
+
+
+class FakeSpotify:
+    """Antwortet die ersten `failures` Aufrufe mit 429"""
+
+    def __init__(self, failures: int, retry_after: str = "0.05"):
+        self.failures = failures
+        self.retry_after = retry_after
+        self.calls = 0
+
+    def __call__(self, value):
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise SpotifyException(429, -1, "rate limited", headers={"Retry-After": self.retry_after})
+        return value
+
+
+def test_retries_after_rate_limit():
+    scheduler = SpotifyScheduler(rate=100, burst=10, max_retries=3)
+    fake = FakeSpotify(failures=2)
+
+    started = time.monotonic()
+    assert scheduler.call(Priority.GAME, fake, "ok") == "ok"
+
+    assert time.monotonic() - started >= 0.1
+    assert fake.calls == 3
+    assert scheduler.stats["rate_limited"] == 2
+    assert scheduler.stats["calls"] == 1
+
+
+def test_gives_up_after_max_retries():
+    scheduler = SpotifyScheduler(rate=100, burst=10, max_retries=1)
+    fake = FakeSpotify(failures=5, retry_after="0")
+
+    with pytest.raises(SpotifyException):
+        scheduler.call(Priority.GAME, fake, "ok")
+    assert fake.calls == 2
+
+
+def test_game_requests_overtake_search():
+    scheduler = SpotifyScheduler(rate=50, burst=1)
+    scheduler.blocked_until = time.monotonic() + 0.2  # wie nach einem 429
+    order = []
+
+    def worker(priority, name):
+        scheduler.call(priority, order.append, name)
+
+    threads = [threading.Thread(target=worker, args=(Priority.SEARCH, f"search-{idx}")) for idx in range(3)]
+    for thread in threads:
+        thread.start()
+    time.sleep(0.05)
+    game = threading.Thread(target=worker, args=(Priority.GAME, "game"))
+    game.start()
+    for thread in threads + [game]:
+        thread.join()
+
+    assert order[0] == "game"
+    assert order[1:] == ["search-0", "search-1", "search-2"]
+    assert scheduler.snapshot()["wait_ms"]["search"]["count"] == 3
+
+
+def test_search_times_out_while_blocked():
+    scheduler = SpotifyScheduler(rate=100, burst=10, low_priority_max_wait=0.05)
+    scheduler.blocked_until = time.monotonic() + 5
+
+    with pytest.raises(SpotifyBusyError):
+        scheduler.call(Priority.SEARCH, str, "x")
+    assert scheduler.stats["timeouts"] == 1
+    assert scheduler.snapshot()["queue_depth"]["search"] == 0
+
+
+def test_playlist_load_survives_replayed_429s(tmp_path):
+    store = FixtureStore(str(tmp_path / "spotify.json.gz"))
+    synthesize_playlist(store, "pl", "Replay", [to_api_track(t) for t in make_tracks(450, seed=1)])
+
+    service = SpotifyService()
+    service.set_transport(ReplaySession(store, error_rate=0.4, retry_after_s=0, seed=7))
+    service.scheduler = SpotifyScheduler(rate=1000, burst=100, max_retries=10)
+
+    playlist = service.get_playlist_tracks("pl")
+
+    assert playlist.total_tracks == 450
+    assert service.requests_session.rate_limited > 0
+    assert service.scheduler.stats["rate_limited"] == service.requests_session.rate_limited
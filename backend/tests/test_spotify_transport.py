@@ -0,0 +1,101 @@
+"""
+Tests für Record/Replay Transport der Spotify API
+"""
+import sys
+import os
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+import requests
+from spotipy.exceptions import SpotifyException
+
+from app.services.spotify_scheduler import SpotifyScheduler
+from app.services.spotify_service import SpotifyService
+from app.services.spotify_transport import (
+    API_PREFIX, TOKEN_URL, FixtureStore, RecordingSession, ReplaySession, build_response, fixture_key,
+    synthesize_playlist, synthesize_tracks
+)
+from benchmarks.common import make_tracks, to_api_track
+
+
+def make_service(tmp_path, size=250, **replay_options):
+    store = FixtureStore(str(tmp_path / "spotify.json.gz"))
+    tracks = [to_api_track(t) for t in make_tracks(size, seed=3, prefix="pl")]
+    synthesize_playlist(store, "pl", "Replay", tracks)
+    synthesize_tracks(store, tracks[:1])
+    store.save()
+
+    session = ReplaySession(FixtureStore(store.path), **replay_options)
+    service = SpotifyService()
+    service.set_transport(session)
+    # Ohne Retries, damit injizierte 429 direkt sichtbar sind
+    service.scheduler = SpotifyScheduler(rate=1000, burst=100, max_retries=0)
+    return service, session, tracks
+
+
+def test_fixture_key_sorts_query():
+    a = fixture_key("get", "https://api.spotify.com/v1/x?b=2&a=1")
+    b = fixture_key("GET", "https://api.spotify.com/v1/x", {"a": 1, "b": 2, "c": None})
+    assert a == b
+
+
+def test_replay_paginates_playlist(tmp_path):
+    service, session, tracks = make_service(tmp_path)
+
+    playlist = service.get_playlist_tracks("pl")
+
+    assert playlist.total_tracks == 250
+    assert [t.track_id for t in playlist.tracks] == [t["id"] for t in tracks]
+    # Token + Playlist (mit erster Seite) + 2 Folgeseiten
+    assert session.calls == 4
+
+    track = service.get_track_info(tracks[0]["id"])
+    assert track.title == tracks[0]["name"]
+
+
+def test_replay_injects_rate_limits(tmp_path):
+    service, session, _ = make_service(tmp_path, error_rate=1.0, retry_after_s=7)
+
+    with pytest.raises(SpotifyException) as exc:
+        service.get_playlist_tracks("pl")
+
+    assert exc.value.http_status == 429
+    assert exc.value.headers["Retry-After"] == "7"
+    assert session.rate_limited == 1
+
+
+def test_missing_fixture_is_404(tmp_path):
+    service, _, _ = make_service(tmp_path)
+
+    with pytest.raises(SpotifyException) as exc:
+        service.get_track_info("unknown")
+
+    assert exc.value.http_status == 404
+
+
+def test_recording_skips_tokens_and_saves_on_flush(tmp_path, monkeypatch):
+    def fake_request(self, method, url, params=None, data=None, **kwargs):
+        if url.startswith(TOKEN_URL):
+            return build_response(200, {"access_token": "echt", "refresh_token": "geheim"}, url)
+        return build_response(200, {"url": url}, url)
+
+    monkeypatch.setattr(requests.Session, "request", fake_request)
+    store = FixtureStore(str(tmp_path / "record.json.gz"))
+    saves = []
+    save = store.save
+    monkeypatch.setattr(store, "save", lambda: saves.append(1) or save())
+
+    session = RecordingSession(store, save_interval_s=60)
+    session.request("POST", TOKEN_URL, data={"grant_type": "client_credentials"})
+    for offset in range(0, 1000, 100):
+        session.request("GET", f"{API_PREFIX}playlists/pl/tracks", params={"offset": offset})
+    assert saves == []  # nicht nach jedem Request
+
+    session.close()
+    session.flush()  # nichts Neues: kein weiteres Schreiben
+    assert saves == [1]
+    entries = FixtureStore(store.path).entries
+    assert len(entries) == 10
+    assert not any(TOKEN_URL in key for key in entries)
@@ -0,0 +1,146 @@
+"""
+Tests für Tracing (Spans, Kontext über Tasks/Threads, /admin/traces)
+"""
+import sys
+import os
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import asyncio
+
+import httpx
+
+from app.core.config import settings
+from app.services.tracing import Tracer, traced
+
+
+def test_spans_follow_tasks_and_threads():
+    tracer = Tracer(sample_rate=1.0, buffer_size=100)
+
+    @traced(tracer, "work", "service")
+    def work():
+        with tracer.span("spotify track", "spotify"):
+            return 42
+
+    async def child():
+        await asyncio.sleep(0)
+        return await asyncio.to_thread(work)
+
+    async def run():
+        with tracer.span("sio guess_submitted", "socket") as root:
+            assert await asyncio.create_task(child()) == 42
+        return root
+
+    root = asyncio.run(run())
+    spans = tracer.trace(root.trace_id)
+    assert [(span["name"], span["depth"]) for span in spans] == \
+        [("sio guess_submitted", 0), ("work", 1), ("spotify track", 2)]
+    assert spans[1]["parent_id"] == root.span_id
+    assert tracer.traces()[0]["spans"] == 3
+
+
+def test_sampling_decision_is_per_trace():
+    tracer = Tracer(sample_rate=0.0, buffer_size=100)
+    with tracer.span("aus") as span:
+        assert not span.sampled
+        with tracer.span("kind"):
+            pass
+    assert not tracer.spans
+
+    tracer.sample_rate = 1e-12  # Wurzel wird (praktisch) nie gesampelt
+    with tracer.span("wurzel"):
+        with tracer.span("kind") as span:
+            assert not span.sampled  # würfelt nicht selbst
+    assert not tracer.spans
+    assert tracer.stats["unsampled"] == 1
+
+    with tracer.span("erzwungen", force=True):
+        try:
+            with tracer.span("fehler"):
+                raise ValueError("kaputt")
+        except ValueError:
+            pass
+    assert [span.name for span in tracer.spans] == ["fehler", "erzwungen"]
+    assert tracer.spans[0].error == "ValueError: kaputt"
+
+
+def test_request_trace_reaches_game_service_and_emit(monkeypatch):
+    from app.main import app
+    from app.services.game_service import game_service
+
+    monkeypatch.setattr(settings, "admin_token", "geheim")
+    admin = {"X-Admin-Token": "geheim"}
+
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as http:
+            session = (await http.post("/game/session/create", json={"host_name": "Trace"})).json()
+            response = await http.post("/game/session/player/add", headers={"X-Trace": "1"},
+                                       json={"session_id": session["session_id"], "player_name": "Gast"})
+            assert response.status_code == 200
+            trace_id = response.headers["x-trace-id"]
+            await asyncio.sleep(0.05)  # Outbox-Task sendet nach der Antwort
+
+            trace = (await http.get(f"/admin/traces/{trace_id}", headers=admin)).json()
+            listed = (await http.get("/admin/traces", headers=admin, params={"name": "player/add"})).json()
+            assert (await http.post("/admin/traces/sampling", headers=admin,
+                                    params={"rate": 2})).status_code == 400
+            return session["session_id"], trace["spans"], listed["traces"]
+
+    session_id, spans, listed = asyncio.run(run())
+    names = [(span["name"], span["kind"]) for span in spans]
+    assert names[0] == ("POST /game/session/player/add", "http")
+    assert ("GameService.add_player", "service") in names
+    assert ("emit player_joined", "emit") in names  # aus dem Outbox-Task, gleicher Trace
+    assert spans[0]["attributes"]["status"] == 200
+    assert listed[0]["trace_id"] == spans[0]["trace_id"]
+    game_service.delete_session(session_id)
+
+
+def test_multi_playlist_load_keeps_trace_in_worker_threads(monkeypatch):
+    from app.services import playlist_loader as loader_module
+    from app.services.game_service import game_service
+    from app.services.playlist_loader import PlaylistLoader
+    from app.services.tracing import tracer
+    from benchmarks.common import synthetic_spotify
+
+    async def fake_broadcast(session_id, event, data):
+        pass
+
+    monkeypatch.setattr(loader_module, "broadcast_to_session", fake_broadcast)
+    seen = []  # (Aufruf, aktueller Span) aus den Worker-Threads
+
+    def recording(spotify):
+        open_stream = spotify.open_playlist_stream
+
+        def open_playlist_stream(playlist_id, owner=None):
+            seen.append(("open", tracer.current()))
+            stream = open_stream(playlist_id, owner)
+            original = stream.pages
+
+            def pages():
+                for page in original:
+                    seen.append(("page", tracer.current()))
+                    yield page
+            stream.pages = pages()
+            return stream
+        return open_playlist_stream
+
+    async def scenario():
+        loader = PlaylistLoader()
+        session = game_service.create_session("Trace Host", turn_time_limit=0)
+        with tracer.span("POST /game/session/playlist/load", "http", force=True) as root:
+            await loader.load(session.session_id, ["a", "b", "c"])
+            await loader.tasks[session.session_id]
+        game_service.delete_session(session.session_id)
+        return root
+
+    with synthetic_spotify(250, seed=7) as spotify:
+        monkeypatch.setattr(spotify, "open_playlist_stream", recording(spotify))
+        with monkeypatch.context() as patch:
+            patch.setattr(settings, "playlist_fetch_workers", 3)
+            root = asyncio.run(scenario())
+
+    assert [kind for kind, _ in seen].count("open") == 3
+    assert [kind for kind, _ in seen].count("page") == 6
+    assert all(span is not None and span.trace_id == root.trace_id for _, span in seen)
@@ -0,0 +1,51 @@
+"""
+Tests für gepushte Tracks (new_track): nur Playback-Handles, nie die Lösung
+"""
+import sys
+import os
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import asyncio
+
+import httpx
+
+from app.core.config import settings
+from app.services import websocket_service
+from app.services.game_service import game_service
+from benchmarks.common import make_tracks
+
+
+def test_pushed_tracks_carry_no_solution(monkeypatch):
+    from app.main import app
+
+    pushed = []
+
+    async def broadcast(session_id, event, data, **kwargs):
+        if event == "new_track":
+            pushed.append(data)
+
+    monkeypatch.setattr(websocket_service, "broadcast_to_session", broadcast)
+    session = game_service.create_session("Host", turn_time_limit=0)
+    session_id = session.session_id
+    game_service.add_player(session_id, "Gast")
+    tracks = make_tracks(20, seed=12)
+    game_service.set_deck(session_id, "pl", tracks)
+    solutions = {value for track in tracks for value in (track.title, track.artist, track.release_date)}
+
+    async def scenario():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as http:
+            assert (await http.post(f"/game/start?session_id={session_id}")).status_code == 200
+            for _ in range(2):
+                assert (await http.post("/game/next", json={"session_id": session_id})).status_code == 200
+
+    asyncio.run(scenario())
+    game_service.delete_session(session_id)
+
+    assert len(pushed) == 3
+    for data in pushed:
+        assert len(data["upcoming"]) == settings.prefetch_track_count
+        assert all(set(handle) == {"uri", "duration_ms"} for handle in data["upcoming"])
+        assert not {"title", "artist", "year", "release_date", "album"} & set(data["track"])
+        assert not solutions & {str(value) for value in data["track"].values()}
@@ -0,0 +1,138 @@
+"""
+Tests für Track-Statistik & deck_order
+"""
+import sys
+import os
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import random
+
+from app.models.game import DeckOrder, PlacementRequest
+from app.services.event_log import EventLog
+from app.services.game_service import GameService
+from app.services.snapshot import replay_session
+from app.services.track_stats import TrackStats
+from benchmarks.common import make_tracks
+
+
+def test_counters_difficulty_and_bad_years():
+    stats = TrackStats("", min_samples=4, bad_year_accuracy=0.25)
+    for _ in range(4):
+        stats.record_placement("remaster", correct=False)
+        stats.record_placement("easy", correct=True)
+    stats.record_guess("easy", title=True, artist=False, decade=True)
+    stats.record_guess("easy", title=False, artist=False, decade=None)
+
+    assert stats.get("easy") == {"placements": 4, "placed_correct": 4, "guesses": 2, "title_correct": 1,
+                                 "artist_correct": 0, "decade_guesses": 1, "decade_correct": 1}
+    assert stats.difficulty("remaster") > stats.difficulty("unknown") > stats.difficulty("easy")
+    assert stats.is_bad_year("remaster")
+    assert not stats.is_bad_year("easy")
+    assert not stats.is_bad_year("unknown")
+
+
+def test_counters_survive_restart(tmp_path):
+    path = str(tmp_path / "stats.bin")
+    stats = TrackStats(path)
+    assert not stats.save()  # nichts geändert
+    stats.record_placement("a", correct=True)
+    stats.record_guess("b", title=True, artist=True, decade=False)
+    assert stats.save()
+    assert not stats.save()
+
+    restarted = TrackStats(path)
+    assert restarted.get("a")["placed_correct"] == 1
+    assert restarted.get("b")["decade_guesses"] == 1
+    assert restarted.difficulty("b") > restarted.difficulty("a")
+
+    with open(path, "r+b") as f:
+        f.truncate(20)
+    assert TrackStats(path).get("a")["placements"] == 0  # kaputte Datei -> leer
+
+
+def test_balanced_order_spreads_difficulty():
+    stats = TrackStats("", strata=4)
+    tracks = make_tracks(100, seed=5)
+    rng = random.Random(2)
+    levels = {}
+    for idx, track in enumerate(tracks):
+        level = idx % 4  # 0 = leicht ... 3 = schwer
+        levels[track.track_id] = level
+        for attempt in range(12):
+            stats.record_placement(track.track_id, correct=attempt >= level * 3)
+
+    ordered = stats.balance(tracks, rng)
+    assert sorted(t.track_id for t in ordered) == sorted(t.track_id for t in tracks)
+    for start in range(0, 100, 4):
+        assert sorted(levels[t.track_id] for t in ordered[start:start + 4]) == [0, 1, 2, 3]
+
+    uneven = tracks[:7]  # ungleich große Gruppen
+    assert sorted(t.track_id for t in stats.balance(uneven, rng)) == sorted(t.track_id for t in uneven)
+
+
+def test_streamed_pages_keep_balanced_deck_balanced(tmp_path):
+    stats = TrackStats("", strata=4)
+    tracks = make_tracks(1000, seed=9)
+    levels = {}
+    for idx, track in enumerate(tracks):
+        # Erste Page gemischt, danach je Page nur eine Schwierigkeit (z.B. nach Jahr sortiert)
+        level = idx % 4 if idx < 100 else (idx // 100) % 4
+        levels[track.track_id] = level
+        for attempt in range(12):
+            stats.record_placement(track.track_id, correct=attempt >= level * 3)
+
+    random.seed(4)
+    service = GameService(track_stats=stats, event_log=EventLog(str(tmp_path)))
+    session_id = service.create_session("Host", turn_time_limit=0).session_id
+    service.set_deck(session_id, "pl", tracks[:100], deck_order=DeckOrder.BALANCED)
+    for start in range(100, 1000, 100):
+        service.extend_deck(session_id, tracks[start:start + 100])
+
+    deck = [levels[track.track_id] for track in service.track_queues[session_id]]
+    assert len(deck) == 1000
+    share = {level: deck.count(level) / len(deck) for level in range(4)}
+    for start in range(0, len(deck), 40):
+        block = deck[start:start + 40]
+        # Zufällige Positionen weichen hier um 7-11 Karten ab
+        assert all(abs(block.count(level) - 40 * share[level]) <= 5 for level in range(4))
+
+    # Replay aus dem Event Log ergibt dieselbe Reihenfolge
+    service.event_log.close_all()
+    state = replay_session(service.event_log.session_dir(session_id))
+    assert [row[0] for row in state.deck] == [track.track_id for track in service.track_queues[session_id]]
+
+
+def test_skip_bad_years_filters_initial_deck_and_later_pages():
+    stats = TrackStats("", min_samples=3)
+    tracks = make_tracks(40, seed=6)
+    bad = {track.track_id for track in tracks[::5]}
+    for track_id in bad:
+        for _ in range(3):
+            stats.record_placement(track_id, correct=False)
+
+    service = GameService(track_stats=stats)
+    session = service.create_session("Host", turn_time_limit=0)
+    session_id = session.session_id
+    service.set_deck(session_id, "pl", tracks[:20], deck_order=DeckOrder.SKIP_BAD_YEARS)
+    service.extend_deck(session_id, tracks[20:])
+
+    deck_ids = {track.track_id for track in service.track_queues[session_id]}
+    assert deck_ids == {track.track_id for track in tracks} - bad
+    assert service.deck_builders[session_id].stats["bad_years"] == len(bad)
+    assert session.deck_order == DeckOrder.SKIP_BAD_YEARS
+
+
+def test_placements_and_guesses_update_stats():
+    stats = TrackStats("")
+    service = GameService(track_stats=stats)
+    session = service.create_session("Host", turn_time_limit=0)
+    session_id = session.session_id
+    service.set_deck(session_id, "pl", make_tracks(10, seed=7))
+    service.start_game(session_id)
+
+    player_id = session.current_player_turn
+    solution = service.solutions[session_id]
+    service.place_card_in_timeline(PlacementRequest(session_id=session_id, player_id=player_id, position=0))
+    assert stats.get(solution.track_id)["placements"] == 1
@@ -0,0 +1,144 @@
+"""
+Tests für Turn Scheduler & Zug-Rotation
+"""
+import asyncio
+import os
+import sys
+from datetime import datetime, timedelta
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.game_service import GameService
+from app.services.turn_scheduler import TimingWheel, TurnScheduler
+from app.services import turn_scheduler as turn_scheduler_module
+from benchmarks.common import make_tracks
+
+
+def _advance(wheel: TimingWheel, ticks: int) -> list:
+    expired = []
+    for _ in range(ticks):
+        expired.extend(wheel.advance())
+    return expired
+
+
+def test_wheel_fires_after_delay():
+    wheel = TimingWheel(slots=8, tick=1.0)
+    wheel.schedule("a", 3)
+    assert _advance(wheel, 2) == []
+    assert _advance(wheel, 1) == ["a"]
+    assert len(wheel) == 0
+
+
+def test_wheel_multiple_rounds_and_cancel():
+    wheel = TimingWheel(slots=4, tick=1.0)
+    wheel.schedule("long", 10)
+    wheel.schedule("gone", 2)
+    assert wheel.cancel("gone")
+    assert _advance(wheel, 9) == []
+    assert _advance(wheel, 1) == ["long"]
+
+
+def test_wheel_reschedule_replaces_timer():
+    wheel = TimingWheel(slots=8, tick=1.0)
+    wheel.schedule("a", 2)
+    wheel.schedule("a", 5)
+    assert _advance(wheel, 4) == []
+    assert _advance(wheel, 1) == ["a"]
+
+
+def _playing_session(service: GameService, players: int = 3, limit: int = 30):
+    session = service.create_session("Host", turn_time_limit=limit)
+    for idx in range(players - 1):
+        service.add_player(session.session_id, f"Spieler {idx}")
+    service.track_queues[session.session_id] = make_tracks(20, seed=3)
+    service.start_game(session.session_id)
+    return session
+
+
+def test_turn_limit_is_off_by_default():
+    service = GameService()
+    session = service.create_session("Host")
+    service.add_player(session.session_id, "Gast")
+    service.track_queues[session.session_id] = make_tracks(20, seed=3)
+    service.start_game(session.session_id)
+
+    assert session.turn_time_limit == 0
+    assert session.turn_deadline is None
+    service.advance_turn(session.session_id)
+    assert session.turn_deadline is None
+
+
+def test_advance_turn_rotates_and_counts_rounds():
+    service = GameService()
+    session = _playing_session(service)
+    order = [p.player_id for p in service.players[session.session_id]]
+
+    assert session.current_player_turn == order[0]
+    assert service.advance_turn(session.session_id) == order[1]
+    assert service.advance_turn(session.session_id) == order[2]
+    assert session.round_number == 1
+    assert service.advance_turn(session.session_id) == order[0]
+    assert session.round_number == 2
+    assert session.turn_deadline is not None
+
+
+def test_timeout_skips_turn(monkeypatch):
+    service = GameService()
+    monkeypatch.setattr(turn_scheduler_module, "game_service", service)
+    session = _playing_session(service)
+    order = [p.player_id for p in service.players[session.session_id]]
+    index_before = session.current_track_index
+    session.turn_deadline = datetime.now() - timedelta(milliseconds=1)
+
+    async def run():
+        scheduler = TurnScheduler()
+        await scheduler._on_timeout(session.session_id)
+        assert session.session_id in scheduler.wheel
+        scheduler.cancel(session.session_id)
+
+    asyncio.run(run())
+
+    assert session.current_player_turn == order[1]
+    assert session.current_track_index == index_before + 1
+
+
+def test_stale_timer_does_not_skip_turn(monkeypatch):
+    service = GameService()
+    monkeypatch.setattr(turn_scheduler_module, "game_service", service)
+    session = _playing_session(service)
+    player, index = session.current_player_turn, session.current_track_index
+
+    async def run():
+        scheduler = TurnScheduler()
+        session.turn_deadline = datetime.now() + timedelta(seconds=5)  # Zug inzwischen neu gestartet
+        await scheduler._on_timeout(session.session_id)
+        assert session.session_id in scheduler.wheel  # wartet auf die echte Deadline
+        session.turn_deadline = None  # Limit aufgehoben
+        scheduler.cancel(session.session_id)
+        await scheduler._on_timeout(session.session_id)
+        assert session.session_id not in scheduler.wheel
+        scheduler.stop()
+
+    asyncio.run(run())
+    assert (session.current_player_turn, session.current_track_index) == (player, index)
+
+
+def test_stopped_scheduler_ignores_arm_until_resumed():
+    async def run():
+        scheduler = TurnScheduler()
+        scheduler.arm("vorher", 30)
+        scheduler.stop()  # Drain
+        assert scheduler._task is None
+
+        # Spielzug während des Drains: announce_turn -> arm() darf den Task nicht neu starten
+        scheduler.arm("s1", 0.01)
+        assert scheduler._task is None and "s1" not in scheduler.wheel
+        await asyncio.sleep(0.05)
+
+        scheduler.resume()
+        scheduler.arm("s1", 30)
+        assert scheduler._task is not None and "s1" in scheduler.wheel
+        scheduler.stop()
+
+    asyncio.run(run())
@@ -1,14 +1,46 @@
-import { useState } from 'react'
+import { useEffect, useState } from 'react'
 import { Music, User, Calendar } from 'lucide-react'
+import { autocomplete } from '../services/api'
+
+/**
+ * Vorschläge aus dem Deck der Session (entprellt)
+ */
+function useSuggestions(sessionId, query, kind) {
+  const [suggestions, setSuggestions] = useState([])
+
+  useEffect(() => {
+    if (!sessionId || query.trim().length < 2) {
+      setSuggestions([])
+      return
+    }
+    let cancelled = false
+    const timer = setTimeout(async () => {
+      try {
+        const results = await autocomplete(sessionId, query, kind)
+        if (!cancelled) setSuggestions(results.map((item) => item.text))
+      } catch (error) {
+        if (!cancelled) setSuggestions([])
+      }
+    }, 120)
+    return () => {
+      cancelled = true
+      clearTimeout(timer)
+    }
+  }, [sessionId, query, kind])
+
+  return suggestions
+}
 
 /**
  * GuessInputs - Eingabefelder für Titel, Künstler, Jahr
  * Je nach Spielmodus werden unterschiedliche Felder angezeigt
  */
-function GuessInputs({ gameMode = 'original', onSubmit, disabled = false }) {
+function GuessInputs({ sessionId, gameMode = 'original', onSubmit, disabled = false }) {
   const [titleGuess, setTitleGuess] = useState('')
   const [artistGuess, setArtistGuess] = useState('')
   const [yearGuess, setYearGuess] = useState('')
+  const titleSuggestions = useSuggestions(sessionId, titleGuess, 'title')
+  const artistSuggestions = useSuggestions(sessionId, artistGuess, 'artist')
 
   const showGuessInputs = gameMode === 'pro' || gameMode === 'expert'
   const showYearInput = gameMode === 'expert'
@@ -48,6 +80,8 @@ function GuessInputs({ gameMode = 'original', onSubmit, disabled = false }) {
             type="text"
             value={titleGuess}
             onChange={(e) => setTitleGuess(e.target.value)}
+            list="title-suggestions"
+            autoComplete="off"
             placeholder="z.B. Bohemian Rhapsody"
             disabled={disabled}
             className="w-full px-4 py-2 bg-gray-900 border border-gray-700 rounded-lg
@@ -55,6 +89,9 @@ function GuessInputs({ gameMode = 'original', onSubmit, disabled = false }) {
                      focus:outline-none focus:border-hister-pink
                      disabled:opacity-50 disabled:cursor-not-allowed"
           />
+          <datalist id="title-suggestions">
+            {titleSuggestions.map((text) => <option key={text} value={text} />)}
+          </datalist>
         </div>
 
         {/* Künstler Input */}
@@ -66,6 +103,8 @@ function GuessInputs({ gameMode = 'original', onSubmit, disabled = false }) {
             type="text"
             value={artistGuess}
             onChange={(e) => setArtistGuess(e.target.value)}
+            list="artist-suggestions"
+            autoComplete="off"
             placeholder="z.B. Queen"
             disabled={disabled}
             className="w-full px-4 py-2 bg-gray-900 border border-gray-700 rounded-lg
@@ -73,6 +112,9 @@ function GuessInputs({ gameMode = 'original', onSubmit, disabled = false }) {
                      focus:outline-none focus:border-hister-pink
                      disabled:opacity-50 disabled:cursor-not-allowed"
           />
+          <datalist id="artist-suggestions">
+            {artistSuggestions.map((text) => <option key={text} value={text} />)}
+          </datalist>
         </div>
 
         {/* Jahr Input (nur EXPERT) */}
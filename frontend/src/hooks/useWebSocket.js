@@ -64,6 +64,12 @@ export function useWebSocket(sessionId, handlers = {}) {
       handlers.onGuessResult?.(data)
     })
 
+    // Server startet neu (Deploy) - Socket.IO verbindet sich danach selbst neu
+    socket.on('server_restarting', (data) => {
+      console.log('🔁 Server startet neu, Reconnect in', data.reconnect_in_ms, 'ms')
+      handlers.onServerRestarting?.(data)
+    })
+
     socket.on('leaderboard_update', (data) => {
       console.log('🏆 Leaderboard Update:', data)
       handlers.onLeaderboardUpdate?.(data)
@@ -189,6 +189,7 @@ function GamePage() {
 
         {/* Guess Inputs (PRO/EXPERT) */}
         <GuessInputs 
+          sessionId={sessionId}
           gameMode={gameMode}
           onSubmit={handleGuessSubmit}
           disabled={loading || !isMyTurn || selectedPosition === null}
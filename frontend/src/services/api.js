@@ -71,6 +71,14 @@ export const getLeaderboard = async (sessionId) => {
   return response.data
 }
 
+// Autocomplete (lokaler Index im Backend, kein Spotify Request)
+export const autocomplete = async (sessionId, query, kind) => {
+  const response = await api.get('/game/autocomplete', {
+    params: { session_id: sessionId, q: query, kind }
+  })
+  return response.data
+}
+
 // Session Players
 export const getSessionPlayers = async (sessionId) => {
   const response = await api.get(`/game/session/${sessionId}/players`)